@@ -3,13 +3,20 @@ from typing import Annotated, TypeAlias
 
 import certifi
 from fastapi import Depends
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
 from pymongo.mongo_client import MongoClient
 from pymongo.server_api import ServerApi
-from pymongo.synchronous.database import Database
 
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DB_NAME = os.getenv("DB_NAME", "odes")
+# Connection-pool bounds for each client.  Every API worker process (see
+# API_WORKERS) and every Celery worker opens its own client, so a node holds
+# up to (processes x MONGODB_MAX_POOL_SIZE) connections - size this so the
+# whole deployment stays under the cluster's connection limit.
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
 
 # A single MongoClient is shared across all requests in the process.
 # MongoClient is thread-safe and manages its own internal connection pool,
@@ -17,23 +24,46 @@ DB_NAME = os.getenv("DB_NAME", "odes")
 # (the previous approach) caused a fresh pool to be allocated for every HTTP
 # request, which under polling-heavy workloads (e.g., schedule generation)
 # quickly exhausted MongoDB Atlas's connection limit.
+#
+# The API uses the asyncio client (``_get_async_client``) so a Mongo round
+# trip never blocks uvicorn's event loop; the synchronous one is for the
+# worker's direct-Mongo data source and scripts.  Both are created lazily, on
+# first use, so each pre-forked API worker builds its own after start-up
+# rather than inheriting a pool (and its sockets) from the parent.
 _client: MongoClient | None = None
+_async_client: AsyncMongoClient | None = None
+
+
+def _client_options() -> dict:
+    return {
+        "server_api": ServerApi("1"),
+        "tlsCAFile": certifi.where(),
+        "maxPoolSize": MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": MONGODB_MIN_POOL_SIZE,
+    }
 
 
 def _get_client() -> MongoClient:
     global _client
     if _client is None:
-        _client = MongoClient(
-            MONGODB_URI,
-            server_api=ServerApi("1"),
-            tlsCAFile=certifi.where(),
-        )
+        _client = MongoClient(MONGODB_URI, **_client_options())
     return _client
 
 
+def _get_async_client() -> AsyncMongoClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncMongoClient(MONGODB_URI, **_client_options())
+    return _async_client
+
+
+def get_async_database() -> AsyncDatabase:
+    return _get_async_client().get_database(DB_NAME)
+
+
 def get_db():
     """Dependency that provides a MongoDB database handle from the shared client."""
-    yield _get_client().get_database(DB_NAME)
+    yield get_async_database()
 
 
-DB: TypeAlias = Annotated[Database, Depends(get_db)]
+DB: TypeAlias = Annotated[AsyncDatabase, Depends(get_db)]
@@ -0,0 +1,129 @@
+"""Apply the per-model index registry and report queries that still scan.
+
+Each persisted model declares its indexes next to its collection name
+(``models.<Model>.INDEXES``).  ``ensure_indexes`` creates them; it is
+idempotent - ``createIndexes`` with an existing, identical spec is a no-op -
+so the API runs it on every start-up.
+
+``explain_hot_queries`` runs the query planner over ``HOT_QUERIES``, the
+filters the repositories and the solver snapshot issue on every schedule
+view, and returns the ones whose winning plan is still a collection scan.
+Placeholder values are fine: the plan depends on the filter's shape, not
+on what it matches.
+
+    python -m app.libs.db.indexes            # ensure + report against MONGODB_URI
+"""
+
+from typing import Dict, List, Tuple, Type
+
+from pydantic import BaseModel
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.database import Database
+
+from app.libs.db import models
+
+
+INDEXED_MODELS: List[Type[BaseModel]] = [
+    models.User,
+    models.Group,
+    models.Room,
+    models.Course,
+    models.Activity,
+    models.Schedule,
+    models.ScheduledActivity,
+    models.Reservation,
+    models.SolveTelemetry,
+]
+
+# (collection, filter) pairs issued on hot paths.
+HOT_QUERIES: List[Tuple[str, Dict]] = [
+    (models.User.COLLECTION_NAME, {"email": ""}),
+    (models.User.COLLECTION_NAME, {"group_ids": ""}),
+    (models.User.COLLECTION_NAME, {"user_roles.institution": {"$exists": True}}),
+    (models.User.COLLECTION_NAME, {"user_roles.institution": models.UserRole.STUDENT.value}),
+    (models.User.COLLECTION_NAME, {"provider_identities.google": ""}),
+    (models.Group.COLLECTION_NAME, {"institution_id": ""}),
+    (models.Group.COLLECTION_NAME, {"parent_group_id": ""}),
+    (models.Room.COLLECTION_NAME, {"institution_id": ""}),
+    (models.Course.COLLECTION_NAME, {"institution_id": ""}),
+    (models.Activity.COLLECTION_NAME, {"institution_id": ""}),
+    (models.Activity.COLLECTION_NAME, {"group_ids": ""}),
+    (models.Activity.COLLECTION_NAME, {"professor_id": ""}),
+    (models.Activity.COLLECTION_NAME, {"course_id": ""}),
+    (models.Schedule.COLLECTION_NAME, {"institution_id": ""}),
+    (models.ScheduledActivity.COLLECTION_NAME, {"schedule_id": ""}),
+    (models.ScheduledActivity.COLLECTION_NAME, {"schedule_id": "", "room_id": ""}),
+    (models.Reservation.COLLECTION_NAME, {"institution_id": ""}),
+    (models.Reservation.COLLECTION_NAME,
+     {"room_id": "", "date": "", "status": models.ReservationStatus.APPROVED.value}),
+]
+
+
+class CollectionScan(BaseModel):
+    collection: str
+    filter: Dict
+
+
+def ensure_indexes(db: Database) -> List[str]:
+    """Create every registered index; return their names."""
+    names = []
+    for model in INDEXED_MODELS:
+        names += db.get_collection(model.COLLECTION_NAME).create_indexes(model.INDEXES)
+    return names
+
+
+async def ensure_indexes_async(db: AsyncDatabase) -> List[str]:
+    names = []
+    for model in INDEXED_MODELS:
+        names += await db.get_collection(model.COLLECTION_NAME).create_indexes(model.INDEXES)
+    return names
+
+
+def _explain_command(collection: str, query: Dict) -> Dict:
+    return {"explain": {"find": collection, "filter": query}, "verbosity": "queryPlanner"}
+
+
+def _has_collscan(plan: Dict) -> bool:
+    if plan.get("stage") == "COLLSCAN":
+        return True
+    children = plan.get("inputStages", []) + [
+        plan[key] for key in ("inputStage", "queryPlan") if key in plan
+    ]
+    return any(_has_collscan(child) for child in children)
+
+
+def _scan_or_none(collection: str, query: Dict, explained: Dict) -> CollectionScan | None:
+    if _has_collscan(explained["queryPlanner"]["winningPlan"]):
+        return CollectionScan(collection=collection, filter=query)
+    return None
+
+
+def explain_hot_queries(db: Database) -> List[CollectionScan]:
+    """The hot queries the planner would still answer with a collection scan."""
+    scans = []
+    for collection, query in HOT_QUERIES:
+        scan = _scan_or_none(collection, query, db.command(_explain_command(collection, query)))
+        if scan is not None:
+            scans.append(scan)
+    return scans
+
+
+async def explain_hot_queries_async(db: AsyncDatabase) -> List[CollectionScan]:
+    scans = []
+    for collection, query in HOT_QUERIES:
+        explained = await db.command(_explain_command(collection, query))
+        scan = _scan_or_none(collection, query, explained)
+        if scan is not None:
+            scans.append(scan)
+    return scans
+
+
+if __name__ == "__main__":
+    from app.libs.db.db import DB_NAME, _get_client
+
+    database = _get_client().get_database(DB_NAME)
+    print(f"Ensured indexes: {', '.join(ensure_indexes(database))}")
+    collection_scans = explain_hot_queries(database)
+    for s in collection_scans:
+        print(f"COLLSCAN  {s.collection}  {s.filter}")
+    print(f"{len(collection_scans)} of {len(HOT_QUERIES)} hot queries scan their collection.")
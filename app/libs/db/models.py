@@ -3,6 +3,7 @@ from datetime import datetime, timezone
 from typing import Optional, List, Dict, ClassVar
 
 from pydantic import BaseModel, Field, EmailStr, computed_field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 from app.libs.stringproc.stringproc import generate_id
 
@@ -93,6 +94,14 @@ class User(BaseModel):
         return bool(self.hashed_password)
 
     COLLECTION_NAME: ClassVar[str] = "users"
+    # ``user_roles`` and ``provider_identities`` are keyed by institution id /
+    # provider name, so they get wildcard indexes rather than one per key.
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel("email", unique=True),
+        IndexModel("group_ids"),
+        IndexModel("user_roles.$**"),
+        IndexModel("provider_identities.$**"),
+    ]
 
     class Config:
         populate_by_name = True
@@ -106,6 +115,11 @@ class Group(BaseModel):
     timeslot_preferences: List[TimeslotPreference] = Field(default_factory=list)
 
     COLLECTION_NAME: ClassVar[str] = "groups"
+    # (institution_id, _id) also serves the _id-ordered, paginated lists.
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("institution_id", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel("parent_group_id"),
+    ]
 
     class Config:
         populate_by_name = True
@@ -119,6 +133,9 @@ class Room(BaseModel):
     features: List[str] = Field(default_factory=list)
 
     COLLECTION_NAME: ClassVar[str] = "rooms"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("institution_id", ASCENDING), ("_id", ASCENDING)]),
+    ]
 
     class Config:
         populate_by_name = True
@@ -146,6 +163,9 @@ class Course(BaseModel):
     name: str
 
     COLLECTION_NAME: ClassVar[str] = "courses"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("institution_id", ASCENDING), ("_id", ASCENDING)]),
+    ]
 
     class Config:
         populate_by_name = True
@@ -176,6 +196,12 @@ class Activity(BaseModel):
     selected_timeslot: Optional[SelectedTimeslot] = None
 
     COLLECTION_NAME: ClassVar[str] = "activities"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("institution_id", ASCENDING), ("_id", ASCENDING)]),
+        IndexModel("group_ids"),
+        IndexModel("professor_id"),
+        IndexModel("course_id"),
+    ]
 
     class Config:
         populate_by_name = True
@@ -199,8 +225,17 @@ class Schedule(BaseModel):
     # from the institution's ``last_schedule_number`` counter.  ``None`` on
     # legacy records created before this field existed.
     name: Optional[str] = None
+    # Incremental generations: the schedule whose timetable this one was
+    # re-solved from.  ``None`` for schedules generated from scratch.
+    base_schedule_id: Optional[str] = None
+    # Bumped after every write to this schedule's records and to its
+    # institution's activities or groups; keys the API's snapshot cache.
+    version: int = 0
 
     COLLECTION_NAME: ClassVar[str] = "schedules"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("institution_id", ASCENDING), ("_id", ASCENDING)]),
+    ]
 
     class Config:
         populate_by_name = True
@@ -215,6 +250,97 @@ class ScheduledActivity(BaseModel):
     active_weeks: List[int] = Field(default_factory=list)
 
     COLLECTION_NAME: ClassVar[str] = "scheduled_activities"
+    # The prefix serves the per-schedule reads; the room suffix the
+    # reservation conflict check.
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("schedule_id", ASCENDING), ("room_id", ASCENDING)]),
+    ]
+
+    class Config:
+        populate_by_name = True
+
+
+class PackedSchedule(BaseModel):
+    """A schedule's scheduled activities as parallel columns, one document
+    per schedule (``app.libs.scheduling.packed``).  Activities and rooms are
+    stored once and referenced by index; the numeric columns are
+    little-endian arrays.  Derived from the ``scheduled_activities``
+    documents at ``version`` and stale as soon as the schedule's version
+    moves on."""
+    schedule_id: str = Field(alias="_id")
+    version: int
+    record_ids: List[str] = Field(default_factory=list)
+    activity_ids: List[str] = Field(default_factory=list)
+    room_ids: List[str] = Field(default_factory=list)
+    activity_index: bytes = b""     # uint32 per record, into activity_ids
+    room_index: bytes = b""         # uint32 per record, into room_ids
+    start_timeslot: bytes = b""     # uint32 per record
+    weeks_mask: bytes = b""         # uint64 per record, bit w = active in week w
+
+    COLLECTION_NAME: ClassVar[str] = "packed_schedules"
+
+    class Config:
+        populate_by_name = True
+
+
+class ActivityHint(BaseModel):
+    """Where an activity sat in the last generated timetable.  Keyed by the
+    activity's fingerprint (``app.libs.scheduling.hints``), not its id, so it
+    survives activities being deleted and re-created with the same content.
+    The room is kept as its pool (features, capacity) - the solver picks
+    pools, not rooms."""
+    fingerprint: str
+    start_timeslot: int
+    room_features: List[str] = Field(default_factory=list)
+    room_capacity: int
+    active_weeks: List[int] = Field(default_factory=list)
+
+
+class SolutionHints(BaseModel):
+    """The schedule generator's warm-start cache, one document per institution."""
+    institution_id: str = Field(alias="_id")
+    hints: List[ActivityHint] = Field(default_factory=list)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    COLLECTION_NAME: ClassVar[str] = "solution_hints"
+
+    class Config:
+        populate_by_name = True
+
+
+class SolveTelemetry(BaseModel):
+    """Features and timings of one schedule generation, recorded by the
+    worker.  ``app.libs.scheduling.eta`` fits its duration model to the
+    most recent runs, so budgets and ETAs follow the deployment's hardware."""
+    id: str = Field(default_factory=generate_id, alias="_id")
+    institution_id: str
+    schedule_id: str
+    recorded_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    succeeded: bool
+    num_activities: int
+    num_free_activities: int      # not pinned to a previous timetable
+    num_groups: int
+    num_rooms: int
+    num_room_pools: int
+    weeks: int
+    num_search_workers: int
+    optimizer: str
+    phase1_preset: Optional[str] = None     # ``presets`` in the worker
+    phase2_preset: Optional[str] = None
+    build_seconds: Optional[float] = None
+    phase1_seconds: Optional[float] = None
+    phase2_seconds: Optional[float] = None
+    solver_budget_seconds: Optional[float] = None
+    stagnation_seconds: Optional[float] = None
+    # Longest wait between two improving phase-2 incumbents.
+    max_improvement_gap_seconds: Optional[float] = None
+    stop_reason: Optional[str] = None   # phase-2 status, else phase-1 status
+    total_seconds: float                # job start to end, I/O included
+
+    COLLECTION_NAME: ClassVar[str] = "solve_telemetry"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel([("recorded_at", DESCENDING)]),
+    ]
 
     class Config:
         populate_by_name = True
@@ -242,6 +368,10 @@ class Reservation(BaseModel):
     decided_at: Optional[datetime] = None
 
     COLLECTION_NAME: ClassVar[str] = "reservations"
+    INDEXES: ClassVar[List[IndexModel]] = [
+        IndexModel("institution_id"),
+        IndexModel([("room_id", ASCENDING), ("date", ASCENDING), ("status", ASCENDING)]),
+    ]
 
     class Config:
         populate_by_name = True
@@ -0,0 +1,268 @@
+"""Pure loaders for the YAML sample data in ``data/``.
+
+Every ``build_*`` function turns the YAML fixtures into model instances
+without touching MongoDB.  ``populate_db`` inserts what they return; the
+worker's offline benchmark feeds them straight into the solver.  Model ids are
+generated client-side (``generate_id``), so the ids built here are exactly the
+ids that end up in the database.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional
+
+import yaml
+
+from app.libs.db import models
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def load_yaml(filename: str):
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        return yaml.safe_load(f)
+
+
+def build_institution() -> models.Institution:
+    data = load_yaml("institution.yaml")
+    tg = data["time_grid"]
+    return models.Institution(
+        name=data["name"],
+        time_grid_config=models.TimeGridConfig(
+            weeks=tg["weeks"],
+            days=tg["days"],
+            timeslots_per_day=tg["timeslots_per_day"],
+            max_timeslots_per_day_per_group=tg["max_timeslots_per_day_per_group"],
+            start_hour=tg.get("start_hour", 8),
+            start_minute=tg.get("start_minute", 0),
+            timeslot_duration_minutes=tg.get("timeslot_duration_minutes", 60),
+            start_day=tg.get("start_day", 0),
+        )
+    )
+
+
+def build_rooms(institution_id: str) -> List[models.Room]:
+    data = load_yaml("rooms.yaml")
+    return [
+        models.Room(
+            institution_id=institution_id,
+            name=r["name"],
+            capacity=r["capacity"],
+            features=r.get("features", []),
+        )
+        for r in data["rooms"]
+    ]
+
+
+def build_professors(institution_id: str) -> List[models.User]:
+    data = load_yaml("professors.yaml")
+    return [
+        models.User(
+            name=p["name"],
+            email=p["email"],
+            user_roles={institution_id: [models.UserRole.PROFESSOR]},
+        )
+        for p in data
+    ]
+
+
+# ── Per-subtree default timeslot preferences ─────────────────────────────────
+# Applied to a named group AND every descendant of it, so the preference lands
+# directly on each group's own document - every master group and master
+# optional subgroup an activity might target - rather than relying on any
+# ancestor look-up.
+#
+# Windows are keyed by slot-in-day.  With the institution grid (start_hour=8,
+# 60-minute slots) slot-in-day s starts at hour 8 + s:
+#   08-10 (slots 0,1)     -> DESIRED      (ideal)
+#   10-12 (slots 2,3)     -> NOT_IDEAL    (soft penalty)
+#   12-16 (slots 4,5,6,7) -> UNAVAILABLE  (hard block)
+#   16-18 (slots 8,9)     -> NOT_IDEAL    (soft penalty)
+#   18-20 (slots 10,11)   -> DESIRED      (ideal)
+_MASTER_SLOT_PREFERENCES = {
+    0: models.TimeslotPreferenceValue.DESIRED,
+    1: models.TimeslotPreferenceValue.DESIRED,
+    2: models.TimeslotPreferenceValue.NOT_IDEAL,
+    3: models.TimeslotPreferenceValue.NOT_IDEAL,
+    4: models.TimeslotPreferenceValue.UNAVAILABLE,
+    5: models.TimeslotPreferenceValue.UNAVAILABLE,
+    6: models.TimeslotPreferenceValue.UNAVAILABLE,
+    7: models.TimeslotPreferenceValue.UNAVAILABLE,
+    8: models.TimeslotPreferenceValue.NOT_IDEAL,
+    9: models.TimeslotPreferenceValue.NOT_IDEAL,
+    10: models.TimeslotPreferenceValue.DESIRED,
+    11: models.TimeslotPreferenceValue.DESIRED,
+}
+
+# Root group name -> {slot_in_day: preference}.  The preference applies to the
+# named group and ALL of its descendants.
+_SUBTREE_PREFERENCE_ROOTS = {
+    "Master": _MASTER_SLOT_PREFERENCES,
+}
+
+
+def _build_group_preferences(slot_prefs: Dict[int, "models.TimeslotPreferenceValue"],
+                             days: int, tpd: int) -> List[models.TimeslotPreference]:
+    """Expand a per-day {slot_in_day: preference} map to absolute within-week
+    slots for every day (slot = day * tpd + slot_in_day)."""
+    prefs: List[models.TimeslotPreference] = []
+    for d in range(days):
+        for s, value in slot_prefs.items():
+            if s < tpd:
+                prefs.append(models.TimeslotPreference(slot=d * tpd + s, preference=value))
+    return prefs
+
+
+def _build_group_node(
+    institution_id: str,
+    node,
+    parent_id: Optional[str],
+    out: List[models.Group],
+    subtree_prefs: Dict[str, List[models.TimeslotPreference]],
+    inherited_prefs: List[models.TimeslotPreference],
+):
+    name = node if isinstance(node, str) else node["name"]
+    children = [] if isinstance(node, str) else node.get("children", [])
+
+    # This node's preferences: if it (or an ancestor) is a preference root, use
+    # that root's preferences; the assignment then flows to all descendants.
+    prefs = subtree_prefs.get(name, inherited_prefs)
+
+    group = models.Group(
+        institution_id=institution_id,
+        name=name,
+        parent_group_id=parent_id,
+        timeslot_preferences=prefs,
+    )
+    out.append(group)
+
+    for child in children:
+        _build_group_node(institution_id, child, group.id, out, subtree_prefs, prefs)
+
+
+def build_groups(institution_id: str) -> List[models.Group]:
+    """Build the group tree from groups.yaml, parents before children."""
+    data = load_yaml("groups.yaml")
+
+    grid = load_yaml("institution.yaml")["time_grid"]
+    days, tpd = grid["days"], grid["timeslots_per_day"]
+    subtree_prefs = {
+        gname: _build_group_preferences(slot_prefs, days, tpd)
+        for gname, slot_prefs in _SUBTREE_PREFERENCE_ROOTS.items()
+    }
+
+    groups: List[models.Group] = []
+    for node in data:
+        _build_group_node(institution_id, node, None, groups, subtree_prefs, [])
+    return groups
+
+
+def build_courses(institution_id: str) -> List[models.Course]:
+    data = load_yaml("courses.yaml")
+    return [models.Course(name=name, institution_id=institution_id) for name in data]
+
+
+def _is_numbered_group(name: str) -> bool:
+    """True if the group name starts with at least 3 consecutive digits (e.g. '101', '505 BDTS')."""
+    return bool(re.match(r'^\d{3}', name))
+
+
+def build_students(institution_id: str, groups: Dict[str, str]) -> List[models.User]:
+    """Build the student roster: 26 students per numbered group, split evenly
+    across its semigroups.  ``groups`` maps group name -> group id."""
+    data = load_yaml("groups.yaml")
+
+    all_students = []
+    student_counter = [0]
+
+    def assign(count: int, path: List[str]):
+        group_ids = [str(groups[n]) for n in path if n in groups]
+        for _ in range(count):
+            student_counter[0] += 1
+            idx = student_counter[0]
+            all_students.append(models.User(
+                name=f"student_{idx}",
+                email=f"student.{idx}@fmi.unibuc.ro",
+                user_roles={institution_id: [models.UserRole.STUDENT]},
+                group_ids=group_ids,
+            ))
+
+    def walk(node, ancestors: List[str]):
+        name = node if isinstance(node, str) else node["name"]
+
+        # Skip all optional subtrees entirely (no students)
+        if name.startswith("Optionale"):
+            return
+
+        children = [] if isinstance(node, str) else node.get("children", [])
+        current_path = ancestors + [name]
+
+        if _is_numbered_group(name):
+            if not children:
+                # Leaf numbered group (e.g. "501 ASM"): 26 students
+                assign(26, current_path)
+            else:
+                # Has semigroups: distribute 26 students evenly across children
+                n = len(children)
+                per_semigroup = 26 // n
+                for child in children:
+                    child_name = child if isinstance(child, str) else child["name"]
+                    assign(per_semigroup, current_path + [child_name])
+        else:
+            # Non-numbered group: recurse into children
+            for child in children:
+                walk(child, current_path)
+
+    for root_node in data:
+        walk(root_node, [])
+
+    return all_students
+
+
+def build_activities(
+    institution_id: str,
+    courses: Dict[str, str],
+    groups: Dict[str, str],
+    profs: Dict[str, str],
+) -> List[models.Activity]:
+    """Build every activity in data/activities/*.yaml.  The dicts map course,
+    group and professor *names* to their ids."""
+    activities_dir = os.path.join(DATA_DIR, "activities")
+    all_activities = []
+
+    for filename in sorted(os.listdir(activities_dir)):
+        if not filename.endswith(".yaml"):
+            continue
+        with open(os.path.join(activities_dir, filename)) as f:
+            data = yaml.safe_load(f)
+        group_name = data["group"]
+        for act in data.get("activities", []):
+            professor_name = act.get("professor")
+            activity_type = models.ActivityType(act["type"])
+            required_features = act.get("required_room_features", [])
+            if activity_type == models.ActivityType.LABORATORY and "laborator" not in required_features:
+                required_features = list(required_features) + ["laborator"]
+            sel_ts_data = act.get("selected_timeslot")
+            selected_timeslot = None
+            if sel_ts_data is not None:
+                selected_timeslot = models.SelectedTimeslot(
+                    start_timeslot=sel_ts_data["start"],
+                    active_weeks=sel_ts_data["weeks"],
+                )
+            extra_group_ids = [
+                groups[g] for g in act.get("additional_groups", []) if g in groups
+            ]
+            all_activities.append(models.Activity(
+                institution_id=institution_id,
+                course_id=courses[act["course"]],
+                activity_type=activity_type,
+                duration_slots=act["duration_slots"],
+                frequency=models.Frequency(act["frequency"]),
+                group_ids=[groups[group_name]] + extra_group_ids,
+                professor_id=profs.get(professor_name) if professor_name else None,
+                required_room_features=required_features,
+                selected_timeslot=selected_timeslot,
+            ))
+
+    return all_activities
@@ -0,0 +1,224 @@
+"""Interval index over a schedule's records for interactive conflict checks.
+
+A proposed edit (a batch of moves) is checked against every other record of
+the schedule for room, professor and group clashes.  Comparing each moved
+record with all M records costs O(N x M) per batch, which on a
+2,000-record schedule is too slow for drag-and-drop.
+
+``ConflictIndex`` buckets the records' placements by (resource, day),
+where a resource is a room, a professor or a leaf group, and keeps each
+bucket sorted by start slot.  A moved record then only looks at the
+buckets of its own room, professor and leaves, and bisects each to the few
+entries that can overlap it - O(log M) plus the clashes found.  The index
+describes the schedule as stored, so it can be cached and reused for every
+batch until the schedule changes.  Weeks are compared as bitmasks, so a
+biweekly record meets only the records active in one of its weeks.
+
+Groups clash when they share a leaf: a group occupies every leaf below it,
+so a parent clashes with its children but two sibling groups - disjoint
+sets of students - do not.  This matches the solver's model.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, replace
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from app.libs.db import models
+from app.libs.scheduling.group_index import GroupIndex
+
+
+ROOM = "room"
+PROFESSOR = "professor"
+GROUP = "group"
+_KINDS = (ROOM, PROFESSOR, GROUP)
+
+
+@dataclass(frozen=True)
+class RecordPlacement:
+    """Where a scheduled-activity record sits (before or after an edit)."""
+    record_id: str
+    activity_id: str
+    room_id: str
+    start_timeslot: int
+    active_weeks: Tuple[int, ...]
+
+
+class _Entry:
+    __slots__ = ("pos", "start", "end", "weeks")
+
+    def __init__(self, pos: int, start: int, end: int, weeks: int):
+        self.pos = pos
+        self.start = start
+        self.end = end
+        self.weeks = weeks
+
+
+class _Bucket:
+    """Entries of one (resource, day), sorted by start slot."""
+    __slots__ = ("entries", "starts", "max_duration")
+
+    def __init__(self, entries: List[_Entry]):
+        entries.sort(key=lambda e: (e.start, e.pos))
+        self.entries = entries
+        self.starts = [e.start for e in entries]
+        self.max_duration = max(e.end - e.start for e in entries)
+
+    def overlapping(self, start: int, end: int, weeks: int) -> Iterable[_Entry]:
+        # An entry can reach ``start`` only if it began less than
+        # ``max_duration`` slots earlier.
+        lo = bisect_left(self.starts, start - self.max_duration + 1)
+        hi = bisect_left(self.starts, end)
+        for e in self.entries[lo:hi]:
+            if e.end > start and e.weeks & weeks:
+                yield e
+
+
+class ConflictIndex:
+    """Built once over a schedule's current placements; ``find_new_conflicts``
+    then answers any batch of moves without rebuilding it."""
+
+    def __init__(
+        self,
+        placements: List[RecordPlacement],
+        activities_by_id: Dict[str, models.Activity],
+        group_index: GroupIndex,
+        time_grid: models.TimeGridConfig,
+    ):
+        self.placements = placements
+        self.activities_by_id = activities_by_id
+        self.tpd = time_grid.timeslots_per_day
+        self.all_weeks = (1 << time_grid.weeks) - 1
+        self._leaves: Dict[str, FrozenSet[str]] = {
+            a.id: frozenset(group_index.leaves_of(a)) for a in activities_by_id.values()
+        }
+        self.position: Dict[str, int] = {p.record_id: i for i, p in enumerate(placements)}
+
+        grouped: Dict[Tuple[str, str, int], List[_Entry]] = {}
+        for pos, p in enumerate(placements):
+            activity = activities_by_id.get(p.activity_id)
+            if activity is None:
+                continue
+            day, entry = self._entry(pos, p, activity)
+            for key in self._resources(p, activity):
+                grouped.setdefault(key + (day,), []).append(entry)
+        self._buckets: Dict[Tuple[str, str, int], _Bucket] = {
+            key: _Bucket(entries) for key, entries in grouped.items()
+        }
+
+    def weeks_mask(self, p: RecordPlacement, activity: models.Activity) -> int:
+        """Weeks ``p`` is active in, as a bitmask (weekly activities: all weeks)."""
+        if activity.frequency == models.Frequency.WEEKLY:
+            return self.all_weeks
+        mask = 0
+        for w in p.active_weeks:
+            mask |= 1 << w
+        return mask
+
+    def _entry(self, pos: int, p: RecordPlacement, activity: models.Activity) -> Tuple[int, _Entry]:
+        day, slot = divmod(p.start_timeslot, self.tpd)
+        return day, _Entry(pos, slot, slot + activity.duration_slots, self.weeks_mask(p, activity))
+
+    def _resources(self, p: RecordPlacement, activity: models.Activity) -> Iterable[Tuple[str, str]]:
+        if p.room_id:
+            yield ROOM, p.room_id
+        if activity.professor_id:
+            yield PROFESSOR, activity.professor_id
+        for leaf_id in self._leaves.get(activity.id, ()):
+            yield GROUP, leaf_id
+
+    def _clashes_at(self, p: RecordPlacement, skip: Set[int]) -> Dict[int, Set[str]]:
+        """Indexed records, other than those in ``skip``, clashing with ``p``."""
+        activity = self.activities_by_id[p.activity_id]
+        day, me = self._entry(-1, p, activity)
+        found: Dict[int, Set[str]] = {}
+        for kind, resource in self._resources(p, activity):
+            bucket = self._buckets.get((kind, resource, day))
+            if bucket is None:
+                continue
+            for e in bucket.overlapping(me.start, me.end, me.weeks):
+                if e.pos not in skip:
+                    found.setdefault(e.pos, set()).add(kind)
+        return found
+
+    def _overlap(self, a: RecordPlacement, b: RecordPlacement) -> bool:
+        """Whether two placements overlap in time (same day, a shared week)."""
+        day_a, ea = self._entry(-1, a, self.activities_by_id[a.activity_id])
+        day_b, eb = self._entry(-1, b, self.activities_by_id[b.activity_id])
+        return (
+            day_a == day_b
+            and ea.start < eb.end and eb.start < ea.end
+            and bool(ea.weeks & eb.weeks)
+        )
+
+    def _shared(self, a: RecordPlacement, b: RecordPlacement) -> Set[str]:
+        """The resources two placements share (ignoring time)."""
+        act_a = self.activities_by_id[a.activity_id]
+        act_b = self.activities_by_id[b.activity_id]
+        kinds = set()
+        if a.room_id and a.room_id == b.room_id:
+            kinds.add(ROOM)
+        if act_a.professor_id and act_a.professor_id == act_b.professor_id:
+            kinds.add(PROFESSOR)
+        if self._leaves[act_a.id] & self._leaves[act_b.id]:
+            kinds.add(GROUP)
+        return kinds
+
+    def find_new_conflicts(
+        self,
+        changes: Dict[str, Tuple[int, str]],
+    ) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        """Conflicts a batch of moves would introduce.
+
+        ``changes`` maps record id -> (new start timeslot, new room id).  All
+        moves apply at once, so swapping two records is not a self-conflict.
+        A clash is reported only if it is new: a pair that already overlapped
+        at its original positions is skipped (for a room clash, only if it
+        was in the same room then too).
+
+        Returns ``(record_id, [(kind, other_record_id), ...])`` for each moved
+        record with at least one new conflict, in schedule order."""
+        moved: Dict[int, RecordPlacement] = {}
+        for record_id, (start, room_id) in changes.items():
+            pos = self.position.get(record_id)
+            if pos is None:
+                continue
+            p = self.placements[pos]
+            if p.activity_id in self.activities_by_id:
+                moved[pos] = replace(p, start_timeslot=start, room_id=room_id)
+        skip = set(moved)
+
+        results = []
+        for pos in sorted(moved):
+            p = moved[pos]
+            # Unmoved records come from the index; moved ones are compared
+            # pairwise at their new positions (a batch is small).
+            found = self._clashes_at(p, skip)
+            for other, q in moved.items():
+                if other != pos and self._overlap(p, q):
+                    kinds = self._shared(p, q)
+                    if kinds:
+                        found.setdefault(other, set()).update(kinds)
+
+            items: List[Tuple[str, str]] = []
+            for other in sorted(found):
+                orig_a, orig_b = self.placements[pos], self.placements[other]
+                was_overlapping = self._overlap(orig_a, orig_b)
+                for kind in _KINDS:
+                    if kind not in found[other]:
+                        continue
+                    if was_overlapping and (kind != ROOM or orig_a.room_id == orig_b.room_id):
+                        continue
+                    items.append((kind, orig_b.record_id))
+            if items:
+                results.append((p.record_id, items))
+        return results
+
+
+def placement_from_record(raw: dict) -> RecordPlacement:
+    return RecordPlacement(
+        record_id=str(raw["_id"]),
+        activity_id=str(raw["activity_id"]),
+        room_id=str(raw.get("room_id", "")),
+        start_timeslot=raw["start_timeslot"],
+        active_weeks=tuple(raw.get("active_weeks", [])),
+    )
@@ -23,8 +23,23 @@ Three solver-time helpers, used in different places:
   - ``estimate_solver_typical_seconds`` : expected runtime accounting for
                                           watchdog firing. Drives the
                                           user-facing ETA.
+
+The constants below are only the defaults.  The worker records every run's
+features and timings (``models.SolveTelemetry``, stored by
+``app.libs.scheduling.telemetry``), and ``fit_calibration`` refits the
+coefficients to the deployment's recent runs.  Every helper takes the
+resulting ``EtaCalibration``; without one (or with fewer than
+``MIN_CALIBRATION_RUNS`` runs recorded) it uses the defaults.
 """
 
+import math
+import statistics
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.libs.db import models
+
 # Fixed overhead: data fetching from the API, DB writes, network round-trips.
 _OVERHEAD_SECONDS = 20
 
@@ -54,34 +69,67 @@ _SOLVER_MAX_SECONDS = 7200     # 2-hour hard ceiling
 # 4780 = c * 700**1.3 → c ≈ 0.96.  Clamped to [MIN, worst-case budget].
 _SOLVER_TYPICAL_COEF = 0.96
 
+# Stagnation patience: _STAGNATION_COEF * n ** _STAGNATION_EXPONENT, clamped.
+_STAGNATION_COEF = 0.4
+_STAGNATION_EXPONENT = 1.2
+_STAGNATION_MIN_SECONDS = 60
+_STAGNATION_MAX_SECONDS = 300
+
+# Fitting.  Coefficients are refit from this many runs on; the solver
+# exponent only from _EXPONENT_FIT_RUNS runs spanning at least
+# _EXPONENT_FIT_SPREAD x in size (otherwise the slope is noise).
+MIN_CALIBRATION_RUNS = 5
+_EXPONENT_FIT_RUNS = 8
+_EXPONENT_FIT_SPREAD = 2.0
+_SOLVER_EXPONENT_RANGE = (1.0, 2.0)
+# The watchdog is set to this multiple of the longest observed wait between
+# improvements (90th percentile over runs), so it rarely cuts a live search.
+_STAGNATION_SAFETY = 2.0
+
+
+class EtaCalibration(BaseModel):
+    """Coefficients of the duration model.  The defaults are the hand
+    calibration above; ``fit_calibration`` replaces them from telemetry."""
+    overhead_seconds: float = _OVERHEAD_SECONDS
+    build_coef: float = _BUILD_COEF
+    build_exponent: float = _BUILD_EXPONENT
+    solver_typical_coef: float = _SOLVER_TYPICAL_COEF
+    solver_exponent: float = _SOLVER_EXPONENT
+    # Worst-case budget over typical runtime (3.36 / 0.96 by hand).
+    solver_budget_ratio: float = _SOLVER_COEF / _SOLVER_TYPICAL_COEF
+    stagnation_coef: float = _STAGNATION_COEF
+    # Successful runs the coefficients were fitted to (0: defaults).
+    num_runs: int = 0
 
-def _power(base: float, exponent: float) -> float:
-    """math.pow without importing math (keep deps minimal)."""
-    return base ** exponent
 
+DEFAULT_CALIBRATION = EtaCalibration()
 
-def estimate_model_build_seconds(num_activities: int) -> int:
+
+def estimate_model_build_seconds(num_activities: int, calibration: Optional[EtaCalibration] = None) -> int:
     """Power-law estimate of the wall-clock time to construct the CP-SAT
     model (allocation vars + all hard/soft constraints)."""
+    c = calibration or DEFAULT_CALIBRATION
     if num_activities <= 0:
         return 0
-    return int(_BUILD_COEF * _power(num_activities, _BUILD_EXPONENT))
+    return int(c.build_coef * math.pow(num_activities, c.build_exponent))
 
 
-def estimate_solver_seconds(num_activities: int) -> int:
+def estimate_solver_seconds(num_activities: int, calibration: Optional[EtaCalibration] = None) -> int:
     """Time budget for the CP-SAT solver itself.
 
     Excludes model-build and data-fetch overhead - those happen before/after
     the solver runs.  Bounded between SOLVER_MIN and SOLVER_MAX so we don't
     burn cycles on trivial problems or promise unrealistic times on huge
     ones."""
+    c = calibration or DEFAULT_CALIBRATION
     if num_activities <= 0:
         return _SOLVER_MIN_SECONDS
-    raw = int(_SOLVER_COEF * _power(num_activities, _SOLVER_EXPONENT))
+    coef = c.solver_typical_coef * c.solver_budget_ratio
+    raw = int(coef * math.pow(num_activities, c.solver_exponent))
     return max(_SOLVER_MIN_SECONDS, min(_SOLVER_MAX_SECONDS, raw))
 
 
-def estimate_stagnation_seconds(num_activities: int) -> int:
+def estimate_stagnation_seconds(num_activities: int, calibration: Optional[EtaCalibration] = None) -> int:
     """Max wall-clock time without an objective improvement before we
     give up early on the CP-SAT search.
 
@@ -91,13 +139,14 @@ def estimate_stagnation_seconds(num_activities: int) -> int:
     With 4 parallel search threads improvements arrive frequently; 300 s of
     idle reliably signals convergence.
     """
+    c = calibration or DEFAULT_CALIBRATION
     if num_activities <= 0:
-        return 60
-    raw = int(0.4 * _power(num_activities, 1.2))
-    return max(60, min(300, raw))
+        return _STAGNATION_MIN_SECONDS
+    raw = int(c.stagnation_coef * math.pow(num_activities, _STAGNATION_EXPONENT))
+    return max(_STAGNATION_MIN_SECONDS, min(_STAGNATION_MAX_SECONDS, raw))
 
 
-def estimate_solver_typical_seconds(num_activities: int) -> int:
+def estimate_solver_typical_seconds(num_activities: int, calibration: Optional[EtaCalibration] = None) -> int:
     """Expected/typical solver runtime - the basis for the user-facing ETA.
 
     The two-phase solve (phase-1 feasibility + phase-2 optimisation with the
@@ -112,14 +161,15 @@ def estimate_solver_typical_seconds(num_activities: int) -> int:
     Clamped to ``[_SOLVER_MIN_SECONDS, worst-case budget]`` so it never exceeds
     the hard ceiling we actually grant CP-SAT.
     """
+    c = calibration or DEFAULT_CALIBRATION
     if num_activities <= 0:
         return _SOLVER_MIN_SECONDS
-    raw = int(_SOLVER_TYPICAL_COEF * _power(num_activities, _SOLVER_EXPONENT))
-    worst = estimate_solver_seconds(num_activities)
+    raw = int(c.solver_typical_coef * math.pow(num_activities, c.solver_exponent))
+    worst = estimate_solver_seconds(num_activities, c)
     return max(_SOLVER_MIN_SECONDS, min(worst, raw))
 
 
-def estimate_total_duration_seconds(num_activities: int) -> int:
+def estimate_total_duration_seconds(num_activities: int, calibration: Optional[EtaCalibration] = None) -> int:
     """Total end-to-end ETA: overhead + model build + *typical* solver time.
 
     This is what the UI shows as the expected duration.  We use the
@@ -127,10 +177,89 @@ def estimate_total_duration_seconds(num_activities: int) -> int:
     tracks realistic completion - most runs end via stagnation early-exit
     well before ``max_time_in_seconds`` would expire.  The hard ceiling is
     still enforced inside the worker (via ``estimate_solver_seconds``)."""
+    c = calibration or DEFAULT_CALIBRATION
     if num_activities <= 0:
-        return _OVERHEAD_SECONDS + _SOLVER_MIN_SECONDS
+        return int(c.overhead_seconds) + _SOLVER_MIN_SECONDS
     return (
-        _OVERHEAD_SECONDS
-        + estimate_model_build_seconds(num_activities)
-        + estimate_solver_typical_seconds(num_activities)
+        int(c.overhead_seconds)
+        + estimate_model_build_seconds(num_activities, c)
+        + estimate_solver_typical_seconds(num_activities, c)
     )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Fitting to telemetry
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _log(x: float) -> float:
+    # Guard against zero timings of trivial runs.
+    return math.log(max(x, 1e-3))
+
+
+def _fit_coef(samples: List[Tuple[float, float]], exponent: float) -> float:
+    """Coefficient ``c`` of ``seconds = c * n ** exponent`` over ``(n, seconds)``
+    samples: the median of the log residuals, so a few outliers (a noisy
+    neighbour, a swap storm) do not drag it."""
+    return math.exp(statistics.median(_log(t) - exponent * _log(n) for n, t in samples))
+
+
+def _fit_exponent(samples: List[Tuple[float, float]], default: float) -> float:
+    """Least-squares slope of log(seconds) over log(n), clamped to
+    ``_SOLVER_EXPONENT_RANGE``; ``default`` when the sizes are too alike."""
+    sizes = [n for n, _ in samples]
+    if len(samples) < _EXPONENT_FIT_RUNS or max(sizes) < _EXPONENT_FIT_SPREAD * min(sizes):
+        return default
+    xs = [_log(n) for n, _ in samples]
+    ys = [_log(t) for _, t in samples]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    low, high = _SOLVER_EXPONENT_RANGE
+    return max(low, min(high, slope))
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def fit_calibration(runs: List[models.SolveTelemetry]) -> EtaCalibration:
+    """Refit the duration model to recorded runs.
+
+    Failed runs are ignored, and so is everything when fewer than
+    ``MIN_CALIBRATION_RUNS`` succeeded.  Each coefficient is fitted on its own
+    phase: build time over all activities, solver time (phase 1 + phase 2)
+    over the activities the solver was free to move, the overhead as what is
+    left of the job's wall time.  The worst-case budget keeps its ratio to
+    the typical runtime."""
+    runs = [r for r in runs if r.succeeded and r.num_free_activities > 0]
+    if len(runs) < MIN_CALIBRATION_RUNS:
+        return DEFAULT_CALIBRATION
+
+    calibration = EtaCalibration(num_runs=len(runs))
+
+    build = [(r.num_activities, r.build_seconds) for r in runs if r.build_seconds is not None]
+    if build:
+        calibration.build_coef = _fit_coef(build, calibration.build_exponent)
+
+    solver = [
+        (r.num_free_activities, (r.phase1_seconds or 0.0) + (r.phase2_seconds or 0.0))
+        for r in runs if r.phase1_seconds is not None
+    ]
+    if solver:
+        calibration.solver_exponent = _fit_exponent(solver, calibration.solver_exponent)
+        calibration.solver_typical_coef = _fit_coef(solver, calibration.solver_exponent)
+
+    gaps = [
+        r.max_improvement_gap_seconds / math.pow(r.num_free_activities, _STAGNATION_EXPONENT)
+        for r in runs if r.max_improvement_gap_seconds is not None
+    ]
+    if gaps:
+        calibration.stagnation_coef = _STAGNATION_SAFETY * _percentile(gaps, 0.9)
+
+    overhead = [
+        r.total_seconds - (r.build_seconds or 0.0) - (r.phase1_seconds or 0.0) - (r.phase2_seconds or 0.0)
+        for r in runs
+    ]
+    calibration.overhead_seconds = max(0.0, statistics.median(overhead))
+    return calibration
@@ -0,0 +1,95 @@
+"""Inverted index over an institution's group tree and the activities on it.
+
+An activity on a group occupies every leaf below it, and a group's per-day
+cap counts its own activities plus its ancestors'.  Both questions reduce to
+"which activities sit on this group or one of its ancestors", which a naive
+scan answers in O(groups x activities x depth).  ``GroupIndex`` builds the
+parent chains and a group -> activities map once, in time linear in the
+tree and the activities' group lists, and answers each query from those.
+
+Used by the solver's model builders and decomposition, and by the API's
+conflict checker for ancestor look-ups.
+"""
+
+from typing import Dict, Iterable, List, Set
+
+from app.libs.db import models
+
+
+class GroupIndex:
+    def __init__(
+        self,
+        groups: Iterable[models.Group],
+        activities: Iterable[models.Activity] = (),
+    ):
+        self.groups_by_id: Dict[str, models.Group] = {g.id: g for g in groups}
+        self.activities: List[models.Activity] = list(activities)
+
+        # group id -> ancestor ids, nearest parent first.
+        self.ancestors: Dict[str, List[str]] = {}
+        for gid in self.groups_by_id:
+            self._ancestors_of(gid)
+
+        child_ids = {g.parent_group_id for g in self.groups_by_id.values() if g.parent_group_id}
+        self.leaf_ids: List[str] = [gid for gid in self.groups_by_id if gid not in child_ids]
+        # group id -> leaves at or below it.
+        self.leaves_under: Dict[str, List[str]] = {}
+        for leaf_id in self.leaf_ids:
+            for gid in self.lineage(leaf_id):
+                self.leaves_under.setdefault(gid, []).append(leaf_id)
+
+        # group id -> positions (in ``activities``) of the activities placed on it directly.
+        self._direct: Dict[str, List[int]] = {}
+        for i, a in enumerate(self.activities):
+            for gid in a.group_ids:
+                self._direct.setdefault(gid, []).append(i)
+        self._on_lineage: Dict[str, List[models.Activity]] = {}
+
+    def _ancestors_of(self, gid: str) -> List[str]:
+        cached = self.ancestors.get(gid)
+        if cached is not None:
+            return cached
+        # Walk up to the first group whose chain is known (or the root), then
+        # fill the chains back down.  The ``seen`` guard stops on a corrupt,
+        # cyclic parent link instead of looping forever.
+        path: List[str] = []
+        seen: Set[str] = set()
+        cur = gid
+        while cur is not None and cur not in self.ancestors and cur not in seen:
+            seen.add(cur)
+            path.append(cur)
+            g = self.groups_by_id.get(cur)
+            cur = g.parent_group_id if g else None
+        above = self.ancestors.get(cur, []) if cur is not None else []
+        if cur is not None and cur not in seen:
+            above = [cur] + above
+        for node in reversed(path):
+            self.ancestors[node] = above
+            above = [node] + above
+        return self.ancestors[gid]
+
+    def lineage(self, gid: str) -> List[str]:
+        """``gid`` followed by its ancestors."""
+        return [gid] + self.ancestors.get(gid, [])
+
+    def activities_on_lineage(self, gid: str) -> List[models.Activity]:
+        """Activities on ``gid`` or any of its ancestors, in input order.
+
+        For a leaf, exactly the activities that occupy it; for any group, the
+        activities its per-day cap counts."""
+        cached = self._on_lineage.get(gid)
+        if cached is None:
+            positions: Set[int] = set()
+            for g in self.lineage(gid):
+                positions.update(self._direct.get(g, ()))
+            cached = [self.activities[i] for i in sorted(positions)]
+            self._on_lineage[gid] = cached
+        return cached
+
+    def leaves_of(self, activity: models.Activity) -> List[str]:
+        """The leaf groups ``activity`` occupies."""
+        leaves: Dict[str, None] = {}
+        for gid in activity.group_ids:
+            for leaf_id in self.leaves_under.get(gid, [gid]):
+                leaves[leaf_id] = None
+        return list(leaves)
@@ -0,0 +1,77 @@
+"""The schedule generator's warm-start cache.
+
+After every generation the worker stores each activity's final placement
+(start, room pool, active weeks) under a fingerprint of the activity's
+content; the next generation for the institution hints every activity whose
+fingerprint still matches.  Fingerprints ignore the activity id, so hints
+survive re-imports, and any edit that changes what the solver sees about an
+activity (duration, groups, professor, ...) simply invalidates its hint.
+
+Shared by the API's ``/institutions/{id}/solution-hints`` endpoints (the
+``_async`` variants) and the worker's direct-Mongo data source.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.synchronous.database import Database
+
+from app.libs.db import models
+
+
+def activity_fingerprint(activity: models.Activity) -> str:
+    """Stable digest of everything about ``activity`` the solver reads,
+    except its id and pinned timeslot."""
+    content = [
+        activity.course_id,
+        activity.activity_type.value,
+        activity.duration_slots,
+        sorted(activity.group_ids),
+        activity.professor_id,
+        activity.frequency.value,
+        sorted(activity.required_room_features),
+    ]
+    return hashlib.sha1(json.dumps(content).encode()).hexdigest()
+
+
+def load_solution_hints(db: Database, institution_id: str) -> List[models.ActivityHint]:
+    collection = db.get_collection(models.SolutionHints.COLLECTION_NAME)
+    doc = collection.find_one({"_id": institution_id})
+    if not doc:
+        return []
+    return models.SolutionHints(**doc).hints
+
+
+def _hints_document(institution_id: str, hints: List[models.ActivityHint]) -> dict:
+    return models.SolutionHints(
+        institution_id=institution_id, hints=hints, updated_at=datetime.now(timezone.utc),
+    ).model_dump(by_alias=True)
+
+
+def save_solution_hints(db: Database, institution_id: str, hints: List[models.ActivityHint]):
+    collection = db.get_collection(models.SolutionHints.COLLECTION_NAME)
+    return collection.replace_one(
+        {"_id": institution_id}, _hints_document(institution_id, hints), upsert=True,
+    )
+
+
+async def load_solution_hints_async(db: AsyncDatabase, institution_id: str) -> List[models.ActivityHint]:
+    collection = db.get_collection(models.SolutionHints.COLLECTION_NAME)
+    doc = await collection.find_one({"_id": institution_id})
+    if not doc:
+        return []
+    return models.SolutionHints(**doc).hints
+
+
+async def save_solution_hints_async(
+    db: AsyncDatabase,
+    institution_id: str,
+    hints: List[models.ActivityHint],
+):
+    collection = db.get_collection(models.SolutionHints.COLLECTION_NAME)
+    return await collection.replace_one(
+        {"_id": institution_id}, _hints_document(institution_id, hints), upsert=True,
+    )
@@ -0,0 +1,122 @@
+"""Packed, columnar form of a schedule's scheduled activities.
+
+A generated schedule is stored as one document per record, each with its
+own UUID, a repeated schedule id and an ``active_weeks`` list, and every
+read used to fetch, decode and validate all of them.  ``pack`` folds them
+into a single ``models.PackedSchedule``: the distinct activity and room ids
+once, then per record an activity index, a room index, a start slot and a
+week bitmask, each column one flat little-endian array.
+
+``unpack`` restores the records exactly - ids included, active weeks in
+ascending order - so the packed document can stand in for the per-record
+documents on reads.  ``columns`` decodes the numeric columns to int lists
+for the API's packed response.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, List
+
+from app.libs.db import models
+
+
+# Bits in a ``weeks_mask`` entry.
+MAX_WEEKS = 64
+
+_UINT32 = "I"
+_UINT64 = "Q"
+_NUMERIC_COLUMNS = {
+    "activity_index": _UINT32,
+    "room_index": _UINT32,
+    "start_timeslot": _UINT32,
+    "weeks_mask": _UINT64,
+}
+
+
+def _encode(typecode: str, values: Iterable[int]) -> bytes:
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def _decode(typecode: str, data: bytes) -> List[int]:
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tolist()
+
+
+def weeks_to_mask(weeks: Iterable[int]) -> int:
+    mask = 0
+    for w in weeks:
+        if not 0 <= w < MAX_WEEKS:
+            raise ValueError(f"Week {w} does not fit a {MAX_WEEKS}-bit week mask")
+        mask |= 1 << w
+    return mask
+
+
+def mask_to_weeks(mask: int) -> List[int]:
+    return [w for w in range(mask.bit_length()) if mask >> w & 1]
+
+
+def pack(
+    schedule_id: str,
+    version: int,
+    records: List[models.ScheduledActivity],
+) -> models.PackedSchedule:
+    """Pack ``records`` (all of ``schedule_id``, read at ``version``)."""
+    activity_positions: Dict[str, int] = {}
+    room_positions: Dict[str, int] = {}
+    activity_index, room_index, starts, masks = [], [], [], []
+    for r in records:
+        activity_index.append(activity_positions.setdefault(r.activity_id, len(activity_positions)))
+        room_index.append(room_positions.setdefault(r.room_id, len(room_positions)))
+        starts.append(r.start_timeslot)
+        masks.append(weeks_to_mask(r.active_weeks))
+
+    return models.PackedSchedule(
+        schedule_id=schedule_id,
+        version=version,
+        record_ids=[r.id for r in records],
+        activity_ids=list(activity_positions),
+        room_ids=list(room_positions),
+        activity_index=_encode(_UINT32, activity_index),
+        room_index=_encode(_UINT32, room_index),
+        start_timeslot=_encode(_UINT32, starts),
+        weeks_mask=_encode(_UINT64, masks),
+    )
+
+
+def columns(packed: models.PackedSchedule) -> Dict[str, List[int]]:
+    """The numeric columns of ``packed`` as int lists, by field name."""
+    return {
+        name: _decode(typecode, getattr(packed, name))
+        for name, typecode in _NUMERIC_COLUMNS.items()
+    }
+
+
+def unpack(packed: models.PackedSchedule) -> List[models.ScheduledActivity]:
+    """The records ``packed`` was built from, in the same order."""
+    cols = columns(packed)
+    # A schedule has only a handful of distinct week patterns.
+    weeks_by_mask: Dict[int, List[int]] = {}
+    for mask in cols["weeks_mask"]:
+        if mask not in weeks_by_mask:
+            weeks_by_mask[mask] = mask_to_weeks(mask)
+    return [
+        models.ScheduledActivity(
+            id=record_id,
+            schedule_id=packed.schedule_id,
+            activity_id=packed.activity_ids[a],
+            room_id=packed.room_ids[r],
+            start_timeslot=start,
+            active_weeks=weeks_by_mask[mask],
+        )
+        for record_id, a, r, start, mask in zip(
+            packed.record_ids,
+            cols["activity_index"], cols["room_index"],
+            cols["start_timeslot"], cols["weeks_mask"],
+        )
+    ]
@@ -0,0 +1,79 @@
+"""Live progress of a schedule generation, from the worker to the browser.
+
+The worker publishes a ``ProgressEvent`` at every phase change and every few
+seconds while the solver searches; the API relays them to clients as
+Server-Sent Events (``GET /api/v1/schedules/{id}/progress``), so a client
+learns about new incumbents, the optimality gap and the final status without
+polling the schedule.
+
+Events travel over the Celery broker, on the ``EXCHANGE`` topic exchange
+with the schedule id as routing key.  They are transient - non-durable, not
+persisted, expiring after ``EVENT_TTL_SECONDS`` - so a client that connects
+mid-run sees the next event; the schedule document stays the source of
+truth for the status.
+"""
+
+import os
+from enum import Enum
+from typing import Optional
+
+from kombu import Exchange
+from pydantic import BaseModel, computed_field
+
+
+BROKER_URL = os.getenv("CELERY_BROKER_URL")
+EXCHANGE = Exchange("schedule_progress", type="topic", durable=False, delivery_mode="transient")
+EVENT_TTL_SECONDS = 60
+
+
+class ProgressPhase(str, Enum):
+    LOADING = "loading"
+    FEASIBILITY = "feasibility"
+    OPTIMISE = "optimise"
+    SAVING = "saving"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+TERMINAL_PHASES = (ProgressPhase.COMPLETED, ProgressPhase.FAILED)
+
+
+def relative_gap(objective: Optional[float], bound: Optional[float]) -> Optional[float]:
+    """Relative gap between an objective and its best bound - CP-SAT's own
+    definition, so it matches the gap in the solver's log."""
+    if objective is None or bound is None:
+        return None
+    return abs(objective - bound) / max(1.0, abs(objective))
+
+
+class SolverProgress(BaseModel):
+    """What the solver knows about its own search."""
+    phase: ProgressPhase
+    phase_elapsed_seconds: float = 0.0
+    budget_seconds: Optional[float] = None
+    best_objective: Optional[float] = None
+    best_bound: Optional[float] = None
+    # Seconds since the last improving incumbent, and the limit after which
+    # the stagnation watchdog stops the search.
+    idle_seconds: Optional[float] = None
+    stagnation_seconds: Optional[float] = None
+
+    @computed_field
+    @property
+    def gap(self) -> Optional[float]:
+        """Relative gap between the best objective and the best bound."""
+        return relative_gap(self.best_objective, self.best_bound)
+
+
+class ProgressEvent(SolverProgress):
+    schedule_id: str
+    # Since the job started.
+    elapsed_seconds: float = 0.0
+    # Intermediate timetables saved so far - a client re-reads the schedule's
+    # scheduled activities when this grows.
+    incumbents_published: int = 0
+    message: Optional[str] = None
+
+    @property
+    def terminal(self) -> bool:
+        return self.phase in TERMINAL_PHASES
@@ -0,0 +1,164 @@
+"""Everything the schedule generator reads about one institution, in one load.
+
+``load_solver_snapshot`` runs server-side filtered, projected queries so the
+cost tracks the size of the institution being scheduled, not of the whole
+``users`` collection:
+
+  - professors are fetched by id, projected down to *this* institution's
+    timeslot preferences and per-day cap (no hashed passwords, no other
+    institutions' preferences);
+  - students are never materialised - an aggregation returns the per-group
+    head count the room-capacity filter needs;
+  - the remaining collections are iterated straight off the cursor into
+    their models.
+
+Shared by the API's ``/institutions/{id}/solver-snapshot`` endpoint
+(``load_solver_snapshot_async``, on the API's asyncio client) and the worker's
+direct-Mongo data source (``load_solver_snapshot``), so both produce the same
+payload from the same queries.
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.synchronous.database import Database
+
+from app.libs.db import models
+
+
+class SolverProfessor(BaseModel):
+    """A professor as the solver sees them, for a single institution."""
+    id: str
+    timeslot_preferences: List[models.TimeslotPreference] = Field(default_factory=list)
+    max_timeslots_per_day: Optional[int] = None
+
+
+class SolverSnapshot(BaseModel):
+    institution: models.Institution
+    rooms: List[models.Room] = Field(default_factory=list)
+    groups: List[models.Group] = Field(default_factory=list)
+    activities: List[models.Activity] = Field(default_factory=list)
+    professors: List[SolverProfessor] = Field(default_factory=list)
+    # group id -> number of enrolled students (enrollment is propagated up to
+    # ancestors, so internal groups carry their full size).
+    group_student_counts: Dict[str, int] = Field(default_factory=dict)
+
+
+_ROOM_PROJECTION = {"institution_id": 1, "name": 1, "capacity": 1, "features": 1}
+
+
+def _professor_projection(institution_id: str) -> dict:
+    return {
+        f"timeslot_preferences.{institution_id}": 1,
+        f"max_timeslots_per_day.{institution_id}": 1,
+    }
+
+
+def _professor_from_doc(doc: dict, institution_id: str) -> SolverProfessor:
+    return SolverProfessor(
+        id=doc["_id"],
+        timeslot_preferences=doc.get("timeslot_preferences", {}).get(institution_id, []),
+        max_timeslots_per_day=doc.get("max_timeslots_per_day", {}).get(institution_id),
+    )
+
+
+def _student_count_pipeline(institution_id: str) -> List[dict]:
+    return [
+        {"$match": {f"user_roles.{institution_id}": models.UserRole.STUDENT.value}},
+        {"$project": {"group_ids": 1}},
+        {"$unwind": "$group_ids"},
+        {"$group": {"_id": "$group_ids", "count": {"$sum": 1}}},
+    ]
+
+
+def _find_professors(db: Database, institution_id: str, professor_ids: List[str]):
+    collection = db.get_collection(models.User.COLLECTION_NAME)
+    projection = _professor_projection(institution_id)
+    for doc in collection.find({"_id": {"$in": professor_ids}}, projection):
+        yield _professor_from_doc(doc, institution_id)
+
+
+def count_students_per_group(db: Database, institution_id: str) -> Dict[str, int]:
+    collection = db.get_collection(models.User.COLLECTION_NAME)
+    pipeline = _student_count_pipeline(institution_id)
+    return {doc["_id"]: doc["count"] for doc in collection.aggregate(pipeline)}
+
+
+def load_solver_snapshot(db: Database, institution_id: str) -> Optional[SolverSnapshot]:
+    """Load the solver's input for ``institution_id``; ``None`` if it doesn't exist."""
+    institution_data = db.get_collection(models.Institution.COLLECTION_NAME).find_one(
+        {"_id": institution_id}
+    )
+    if not institution_data:
+        return None
+
+    by_institution = {"institution_id": institution_id}
+    activities = [
+        models.Activity(**doc)
+        for doc in db.get_collection(models.Activity.COLLECTION_NAME).find(by_institution)
+    ]
+    rooms = [
+        models.Room(**doc)
+        for doc in db.get_collection(models.Room.COLLECTION_NAME).find(
+            by_institution, _ROOM_PROJECTION
+        )
+    ]
+    groups = [
+        models.Group(**doc)
+        for doc in db.get_collection(models.Group.COLLECTION_NAME).find(by_institution)
+    ]
+    professor_ids = sorted({a.professor_id for a in activities if a.professor_id})
+    return SolverSnapshot(
+        institution=models.Institution(**institution_data),
+        rooms=rooms,
+        groups=groups,
+        activities=activities,
+        professors=list(_find_professors(db, institution_id, professor_ids)),
+        group_student_counts=count_students_per_group(db, institution_id),
+    )
+
+
+async def load_solver_snapshot_async(
+    db: AsyncDatabase,
+    institution_id: str,
+) -> Optional[SolverSnapshot]:
+    """``load_solver_snapshot`` on an asyncio database handle."""
+    institution_data = await db.get_collection(models.Institution.COLLECTION_NAME).find_one(
+        {"_id": institution_id}
+    )
+    if not institution_data:
+        return None
+
+    by_institution = {"institution_id": institution_id}
+    activities = [
+        models.Activity(**doc)
+        async for doc in db.get_collection(models.Activity.COLLECTION_NAME).find(by_institution)
+    ]
+    rooms = [
+        models.Room(**doc)
+        async for doc in db.get_collection(models.Room.COLLECTION_NAME).find(
+            by_institution, _ROOM_PROJECTION
+        )
+    ]
+    groups = [
+        models.Group(**doc)
+        async for doc in db.get_collection(models.Group.COLLECTION_NAME).find(by_institution)
+    ]
+    professor_ids = sorted({a.professor_id for a in activities if a.professor_id})
+    users = db.get_collection(models.User.COLLECTION_NAME)
+    professors = [
+        _professor_from_doc(doc, institution_id)
+        async for doc in users.find(
+            {"_id": {"$in": professor_ids}}, _professor_projection(institution_id)
+        )
+    ]
+    counts_cursor = await users.aggregate(_student_count_pipeline(institution_id))
+    return SolverSnapshot(
+        institution=models.Institution(**institution_data),
+        rooms=rooms,
+        groups=groups,
+        activities=activities,
+        professors=professors,
+        group_student_counts={doc["_id"]: doc["count"] async for doc in counts_cursor},
+    )
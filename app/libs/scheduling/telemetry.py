@@ -0,0 +1,58 @@
+"""Run telemetry of the schedule generator, and the ETA calibration fitted to it.
+
+The worker records one ``models.SolveTelemetry`` per generation - problem
+size, search workers, phase timings, why the search stopped.  The duration
+model in ``app.libs.scheduling.eta`` is refit to the ``CALIBRATION_WINDOW``
+most recent runs of the deployment (every institution: what is calibrated is
+the hardware), so solver budgets, stagnation limits and the ``/schedule-eta``
+endpoint follow the machines and data the deployment actually has.
+
+Shared by the API's telemetry / calibration endpoints (the ``_async``
+variants) and the worker's direct-Mongo data source.
+"""
+
+import os
+from typing import List
+
+from pymongo import DESCENDING
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.synchronous.database import Database
+
+from app.libs.db import models
+from app.libs.scheduling import eta
+
+
+CALIBRATION_WINDOW = int(os.getenv("ETA_CALIBRATION_WINDOW", "200"))
+
+
+def save_solve_telemetry(db: Database, telemetry: models.SolveTelemetry):
+    collection = db.get_collection(models.SolveTelemetry.COLLECTION_NAME)
+    return collection.insert_one(telemetry.model_dump(by_alias=True))
+
+
+def load_recent_telemetry(db: Database, limit: int = CALIBRATION_WINDOW) -> List[models.SolveTelemetry]:
+    collection = db.get_collection(models.SolveTelemetry.COLLECTION_NAME)
+    cursor = collection.find().sort("recorded_at", DESCENDING).limit(limit)
+    return [models.SolveTelemetry(**doc) for doc in cursor]
+
+
+def load_eta_calibration(db: Database) -> eta.EtaCalibration:
+    return eta.fit_calibration(load_recent_telemetry(db))
+
+
+async def save_solve_telemetry_async(db: AsyncDatabase, telemetry: models.SolveTelemetry):
+    collection = db.get_collection(models.SolveTelemetry.COLLECTION_NAME)
+    return await collection.insert_one(telemetry.model_dump(by_alias=True))
+
+
+async def load_recent_telemetry_async(
+    db: AsyncDatabase,
+    limit: int = CALIBRATION_WINDOW,
+) -> List[models.SolveTelemetry]:
+    collection = db.get_collection(models.SolveTelemetry.COLLECTION_NAME)
+    cursor = collection.find().sort("recorded_at", DESCENDING).limit(limit)
+    return [models.SolveTelemetry(**doc) async for doc in cursor]
+
+
+async def load_eta_calibration_async(db: AsyncDatabase) -> eta.EtaCalibration:
+    return eta.fit_calibration(await load_recent_telemetry_async(db))
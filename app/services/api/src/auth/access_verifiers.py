@@ -1,38 +1,23 @@
 from fastapi import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 from starlette import status
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.repositories import (
-    users as users_repo,
-    schedules as schedules_repo
-)
+from app.services.api.src.auth import principals
+from app.services.api.src.repositories import schedules as schedules_repo
 
 logger = get_logger()
 
 
-def _get_user_or_401(db: Database, user_id: str) -> models.User:
-    """Look up a user by ID; raise 401 (not a bare crash) if not found."""
-    user_data = users_repo.find_user_by_id(db, user_id)
-    if user_data is None:
-        logger.error(f"User not found for access check: {user_id}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return models.User(**user_data)
-
-
-def raise_activity_forbidden(
-        db: Database,
+async def raise_activity_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         activity: models.Activity,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the activity"""
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if activity.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing activity {activity.id}")
@@ -51,14 +36,14 @@ def raise_activity_forbidden(
         )
 
 
-def raise_course_forbidden(
-        db: Database,
+async def raise_course_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         course: models.Course,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the course"""
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if course.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing course {course.id}")
@@ -76,14 +61,14 @@ def raise_course_forbidden(
         )
 
 
-def raise_group_forbidden(
-        db: Database,
+async def raise_group_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         group: models.Group,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the group"""
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if group.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing group {group.id}")
@@ -101,14 +86,14 @@ def raise_group_forbidden(
         )
 
 
-def raise_institution_forbidden(
-        db: Database,
+async def raise_institution_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         institution_id: str,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 Forbidden for institution access"""
-    current_user = _get_user_or_401(db, current_user_id)
+    current_user = await principals.get_principal(db, current_user_id)
     if admin_only:
         if models.UserRole.ADMIN not in current_user.user_roles.get(institution_id, []):
             error_message = (
@@ -132,14 +117,14 @@ def raise_institution_forbidden(
             )
 
 
-def raise_room_forbidden(
-        db: Database,
+async def raise_room_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         room: models.Room,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the room"""
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if room.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing room {room.id}")
@@ -156,15 +141,15 @@ def raise_room_forbidden(
         )
 
 
-def raise_scheduled_activity_forbidden(
-        db: Database,
+async def raise_scheduled_activity_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         scheduled_activity: models.ScheduledActivity,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the scheduled activity"""
     # Get the schedule to find the institution
-    schedule_data = schedules_repo.find_schedule_by_id(db, scheduled_activity.schedule_id)
+    schedule_data = await schedules_repo.find_schedule_by_id(db, scheduled_activity.schedule_id)
     if not schedule_data:
         logger.error(f"Schedule not found: {scheduled_activity.schedule_id}")
         raise HTTPException(
@@ -173,7 +158,7 @@ def raise_scheduled_activity_forbidden(
         )
 
     schedule = models.Schedule(**schedule_data)
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if schedule.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing"
@@ -194,14 +179,14 @@ def raise_scheduled_activity_forbidden(
         )
 
 
-def raise_schedule_forbidden(
-        db: Database,
+async def raise_schedule_forbidden(
+        db: AsyncDatabase,
         current_user_id: str,
         schedule: models.Schedule,
         admin_only: bool = False
 ) -> None:
     """Raise HTTP 403 if the user does not have access to the schedule"""
-    user = _get_user_or_401(db, current_user_id)
+    user = await principals.get_principal(db, current_user_id)
 
     if schedule.institution_id not in user.user_roles:
         logger.error(f"User {current_user_id} forbidden from accessing schedule {schedule.id}")
@@ -0,0 +1,90 @@
+"""Bounded executor for CPU-heavy auth primitives.
+
+A bcrypt hash or check takes ~250 ms of pure CPU.  Run inline in an
+``async def`` it stalls the whole event loop; run on Starlette's default
+thread pool (40 threads, unbounded queue) a login storm still piles up
+behind it and starves every other offloaded call.  bcrypt releases the GIL,
+so a small dedicated pool gets real parallelism while leaving the default
+pool and the loop free.
+
+The pool admits at most ``AUTH_POOL_WORKERS + AUTH_POOL_MAX_QUEUE`` calls at
+once; anything beyond that is turned away with 503 + ``Retry-After`` instead
+of queueing for seconds - a client retrying later beats every client timing
+out together.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from fastapi import HTTPException
+from starlette import status
+
+from app.libs.logging.logger import get_logger
+from app.libs.stringproc import stringproc
+from app.services.api.src.dtos.output import auth as dto_out
+
+
+AUTH_POOL_WORKERS = int(os.getenv("AUTH_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+AUTH_POOL_MAX_QUEUE = int(os.getenv("AUTH_POOL_MAX_QUEUE", "32"))
+# Roughly how long a full queue takes to drain; sent as Retry-After.
+_RETRY_AFTER_SECONDS = 2
+
+logger = get_logger()
+
+T = TypeVar("T")
+
+_executor = ThreadPoolExecutor(max_workers=AUTH_POOL_WORKERS, thread_name_prefix="auth-cpu")
+_lock = threading.Lock()
+_in_flight = 0
+_completed = 0
+_rejected = 0
+
+
+async def run(fn: Callable[..., T], *args) -> T:
+    """Run ``fn(*args)`` on the auth pool; raise 503 if the pool is saturated."""
+    global _in_flight, _completed, _rejected
+    with _lock:
+        if _in_flight >= AUTH_POOL_WORKERS + AUTH_POOL_MAX_QUEUE:
+            _rejected += 1
+            rejected = _rejected
+        else:
+            _in_flight += 1
+            rejected = None
+    if rejected is not None:
+        logger.warning(f"Auth pool saturated ({_in_flight} in flight); rejected call #{rejected}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy. Please retry shortly.",
+            headers={"Retry-After": str(_RETRY_AFTER_SECONDS)},
+        )
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        with _lock:
+            _in_flight -= 1
+            _completed += 1
+
+
+async def hash_password(password) -> str:
+    return await run(stringproc.hash_password, password)
+
+
+async def verify_password(password, hashed: str) -> bool:
+    return await run(stringproc.verify_password, password, hashed)
+
+
+def stats() -> dto_out.AuthPoolStats:
+    """Current load of this process's auth pool."""
+    with _lock:
+        return dto_out.AuthPoolStats(
+            workers=AUTH_POOL_WORKERS,
+            max_queue=AUTH_POOL_MAX_QUEUE,
+            running=min(_in_flight, AUTH_POOL_WORKERS),
+            queued=max(0, _in_flight - AUTH_POOL_WORKERS),
+            completed=_completed,
+            rejected=_rejected,
+        )
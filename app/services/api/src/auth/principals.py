@@ -0,0 +1,102 @@
+"""The authenticated caller's roles, resolved once per request.
+
+Authorisation only ever needs ``user_roles``, yet a single request used to
+re-read and re-validate the whole user document in every access verifier
+and list filter it passed through - often three or four times.
+
+``get_principal`` memoises the caller's roles for the duration of the
+request (``PrincipalScopeMiddleware`` opens a fresh memo per request) and,
+when ``ROLE_CACHE_TTL_SECONDS`` is set, across requests in a small
+per-process TTL cache.  Role writes in this process call ``forget``; other
+API processes may serve the old roles until their entry expires, so keep
+the TTL short.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from pymongo.asynchronous.database import AsyncDatabase
+from starlette import status
+
+from app.libs.db import models
+from app.libs.logging.logger import get_logger
+from app.services.api.src.repositories import users as users_repo
+
+
+# 0 disables the cross-request cache; the per-request memo is always on.
+ROLE_CACHE_TTL_SECONDS = float(os.getenv("ROLE_CACHE_TTL_SECONDS", "0"))
+_ROLE_CACHE_MAX_ENTRIES = 10_000
+
+logger = get_logger()
+
+
+class Principal(BaseModel):
+    id: str
+    user_roles: Dict[str, List[models.UserRole]]
+
+
+_request_principals: ContextVar[Optional[Dict[str, Principal]]] = ContextVar(
+    "request_principals", default=None
+)
+# user id -> (expiry on the monotonic clock, principal)
+_role_cache: Dict[str, Tuple[float, Principal]] = {}
+
+
+class PrincipalScopeMiddleware:
+    """Give each HTTP request its own principal memo."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _request_principals.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_principals.reset(token)
+
+
+async def get_principal(db: AsyncDatabase, user_id: str) -> Principal:
+    """The roles of ``user_id``; raise 401 if the user no longer exists."""
+    memo = _request_principals.get()
+    if memo is not None and user_id in memo:
+        return memo[user_id]
+
+    principal = None
+    if ROLE_CACHE_TTL_SECONDS > 0:
+        cached = _role_cache.get(user_id)
+        if cached is not None and cached[0] > time.monotonic():
+            principal = cached[1]
+
+    if principal is None:
+        user_data = await users_repo.find_user_roles_by_id(db, user_id)
+        if user_data is None:
+            logger.error(f"User not found for access check: {user_id}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        principal = Principal(id=user_id, user_roles=user_data.get("user_roles", {}))
+        if ROLE_CACHE_TTL_SECONDS > 0:
+            if len(_role_cache) >= _ROLE_CACHE_MAX_ENTRIES:
+                _role_cache.clear()
+            _role_cache[user_id] = (time.monotonic() + ROLE_CACHE_TTL_SECONDS, principal)
+
+    if memo is not None:
+        memo[user_id] = principal
+    return principal
+
+
+def forget(user_id: str) -> None:
+    """Drop ``user_id``'s cached roles after they change."""
+    _role_cache.pop(user_id, None)
+    memo = _request_principals.get()
+    if memo is not None:
+        memo.pop(user_id, None)
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -27,3 +27,36 @@ class SetActiveSchedule(BaseModel):
     Pass schedule_id=null to unset the active schedule.
     """
     schedule_id: Optional[str] = None
+
+
+class UpdateSolutionHints(BaseModel):
+    """
+    DTO for replacing the schedule generator's warm-start hints
+    """
+    hints: List[models.ActivityHint]
+
+
+class RecordSolveTelemetry(BaseModel):
+    """
+    DTO for recording the features and timings of one schedule generation
+    """
+    schedule_id: str
+    succeeded: bool
+    num_activities: int
+    num_free_activities: int
+    num_groups: int
+    num_rooms: int
+    num_room_pools: int
+    weeks: int
+    num_search_workers: int
+    optimizer: str
+    phase1_preset: Optional[str] = None
+    phase2_preset: Optional[str] = None
+    build_seconds: Optional[float] = None
+    phase1_seconds: Optional[float] = None
+    phase2_seconds: Optional[float] = None
+    solver_budget_seconds: Optional[float] = None
+    stagnation_seconds: Optional[float] = None
+    max_improvement_gap_seconds: Optional[float] = None
+    stop_reason: Optional[str] = None
+    total_seconds: float
@@ -8,6 +8,9 @@ from app.libs.db import models
 class CreateSchedule(BaseModel):
     """DTO for creating a schedule"""
     institution_id: str
+    # Re-solve from the institution's active schedule: activities unaffected
+    # by edits since then keep their slot and room.
+    incremental: bool = False
 
 
 class UpdateSchedule(BaseModel):
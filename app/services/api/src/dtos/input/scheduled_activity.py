@@ -30,3 +30,12 @@ class InsertManyScheduledActivities(BaseModel):
     DTO for inserting many scheduled_activities
     """
     scheduled_activities: List[models.ScheduledActivity] = Field(default_factory=list)
+
+
+class PatchScheduledActivities(BaseModel):
+    """
+    DTO for applying a diff to a schedule's scheduled_activities
+    """
+    # Inserted, or replaced when a record with the same id exists.
+    upserts: List[models.ScheduledActivity] = Field(default_factory=list)
+    delete_ids: List[str] = Field(default_factory=list)
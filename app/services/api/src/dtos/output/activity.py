@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -10,6 +10,7 @@ class GetAllActivities(BaseModel):
     DTO for retrieving all activities
     """
     activities: List[models.Activity]
+    next_cursor: Optional[str] = None  # set when ?limit= cut the list short
 
 
 class GetActivity(BaseModel):
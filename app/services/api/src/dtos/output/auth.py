@@ -8,4 +8,14 @@ class AccessToken(BaseModel):
     included in the JSON response body.
     """
     access_token: str
-    token_type: str = "Bearer"
\ No newline at end of file
+    token_type: str = "Bearer"
+
+
+class AuthPoolStats(BaseModel):
+    """Load of the password-hashing pool in the answering API process."""
+    workers: int
+    max_queue: int
+    running: int
+    queued: int
+    completed: int
+    rejected: int
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -10,6 +10,7 @@ class GetAllCourses(BaseModel):
     DTO for retrieving all courses
     """
     courses: List[models.Course]
+    next_cursor: Optional[str] = None  # set when ?limit= cut the list short
 
 
 class GetCourse(BaseModel):
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -10,6 +10,7 @@ class GetAllGroups(BaseModel):
     DTO for retrieving all groups
     """
     groups: List[models.Group]
+    next_cursor: Optional[str] = None  # set when ?limit= cut the list short
 
 
 class GetGroup(BaseModel):
@@ -1,8 +1,10 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
 from app.libs.db import models
+from app.libs.scheduling.eta import EtaCalibration
+from app.libs.scheduling.snapshot import SolverSnapshot
 
 
 class GetAllInstitutions(BaseModel):
@@ -10,6 +12,7 @@ class GetAllInstitutions(BaseModel):
     DTO for retrieving all institutions
     """
     institutions: List[models.Institution]
+    next_cursor: Optional[str] = None  # set when ?limit= cut the list short
 
 
 class GetInstitution(BaseModel):
@@ -59,3 +62,24 @@ class GetInstitutionSchedules(BaseModel):
     DTO for retrieving schedules of an institution
     """
     schedules: List[models.Schedule]
+
+
+class GetInstitutionSolverSnapshot(BaseModel):
+    """
+    DTO for retrieving the schedule generator's input for an institution
+    """
+    snapshot: SolverSnapshot
+
+
+class GetInstitutionSolutionHints(BaseModel):
+    """
+    DTO for retrieving the schedule generator's warm-start hints
+    """
+    hints: List[models.ActivityHint]
+
+
+class GetEtaCalibration(BaseModel):
+    """
+    DTO for retrieving the schedule generator's fitted duration model
+    """
+    calibration: EtaCalibration
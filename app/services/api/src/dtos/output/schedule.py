@@ -1,4 +1,4 @@
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -8,6 +8,7 @@ from app.libs.db import models
 class GetAllSchedules(BaseModel):
     """DTO for retrieving all schedules"""
     schedules: List[models.Schedule]
+    next_cursor: Optional[str] = None  # set when ?limit= cut the list short
 
 
 class GetSchedule(BaseModel):
@@ -20,6 +21,23 @@ class GetScheduledActivitiesBySchedule(BaseModel):
     scheduled_activities: List[models.ScheduledActivity]
 
 
+class GetPackedScheduledActivities(BaseModel):
+    """DTO for retrieving scheduled_activities by schedule as parallel columns.
+
+    Record ``i`` is ``record_ids[i]``, placing ``activity_ids[activity_index[i]]``
+    in ``room_ids[room_index[i]]`` at ``start_timeslot[i]``, active in every
+    week ``w`` whose bit is set in ``weeks_mask[i]``."""
+    schedule_id: str
+    version: int
+    record_ids: List[str]
+    activity_ids: List[str]
+    room_ids: List[str]
+    activity_index: List[int]
+    room_index: List[int]
+    start_timeslot: List[int]
+    weeks_mask: List[int]
+
+
 # ── Conflict check response ───────────────────────────────────────────────────
 
 class ConflictItem(BaseModel):
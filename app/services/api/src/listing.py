@@ -0,0 +1,139 @@
+"""Cursor pagination, field projections and NDJSON streaming for list endpoints.
+
+Every ``GET /api/v1/<collection>/`` list endpoint takes the same query
+parameters (``ListParams``):
+
+    limit   page size; omitted, every matching document is returned
+    cursor  continue after this ``_id`` - the previous page's ``next_cursor``
+    fields  comma-separated fields to return (``_id`` always is)
+    format  ``json`` (default) or ``ndjson``
+
+Documents are ordered by ``_id``, so a cursor is simply the last id seen and
+stays valid while documents are added or removed.  The services put the
+caller's institution scope into the query itself, so Mongo only ever reads
+the caller's tenants; ``find`` adds the cursor, projection and order, and
+``respond`` renders the result:
+
+* ``json`` without ``fields``: the endpoint's usual DTO, plus ``next_cursor``;
+* ``json`` with ``fields``: the same envelope around the projected documents;
+* ``ndjson``: one document per line, written as Mongo returns each batch, so
+  memory stays flat however large the result.  To resume, pass the last
+  line's ``_id`` as ``cursor``.
+"""
+
+import os
+from typing import Annotated, Dict, List, Literal, Optional, Type
+
+from fastapi import Depends, HTTPException, Query
+from pydantic import BaseModel
+from pydantic_core import to_json
+from pymongo import ASCENDING
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.cursor import AsyncCursor
+from starlette import status
+from starlette.responses import Response, StreamingResponse
+
+from app.libs.logging.logger import get_logger
+
+
+MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+logger = get_logger()
+
+
+class ListParams:
+    """Query parameters shared by the list endpoints."""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None),
+        format: Literal["json", "ndjson"] = Query("json"),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else []
+        self.format = format
+
+
+LIST = Annotated[ListParams, Depends()]
+
+
+def _projection(model: Type[BaseModel], fields: List[str]) -> Optional[Dict[str, int]]:
+    if not fields:
+        return None
+    # Fields hidden from responses (e.g. hashed_password) cannot be requested.
+    visible = {
+        name: info.alias or name
+        for name, info in model.model_fields.items()
+        if not info.exclude
+    }
+    visible.update({alias: alias for alias in list(visible.values())})
+    unknown = [f for f in fields if f not in visible]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}"
+        )
+    return {"_id": 1, **{visible[f]: 1 for f in fields}}
+
+
+def find(collection: AsyncCollection, query: Dict, model: Type[BaseModel], params: ListParams) -> AsyncCursor:
+    """Cursor over the documents of ``collection`` matching ``query``, in
+    ``_id`` order, from ``params.cursor`` on."""
+    if params.cursor is not None:
+        query = {"$and": [query, {"_id": {"$gt": params.cursor}}]}
+    cursor = collection.find(query, _projection(model, params.fields)).sort("_id", ASCENDING)
+    if params.limit is not None:
+        # One extra document tells a JSON page whether there is a next one.
+        cursor = cursor.limit(params.limit + (params.format == "json"))
+    return cursor
+
+
+async def _ndjson(cursor: AsyncCursor, model: Type[BaseModel], params: ListParams, key: str):
+    try:
+        async for doc in cursor:
+            if params.fields:
+                yield to_json(doc) + b"\n"
+            else:
+                yield model(**doc).model_dump_json(by_alias=True).encode() + b"\n"
+    except Exception as e:
+        # The status line is long gone; the client sees a truncated stream.
+        logger.error(f"Failed while streaming {key}: {e}")
+        raise
+
+
+async def respond(
+        cursor: AsyncCursor,
+        params: ListParams,
+        model: Type[BaseModel],
+        dto: Type[BaseModel],
+        key: str,
+):
+    """Render ``cursor`` as ``dto`` (whose list field is ``key``) or as NDJSON."""
+    if params.format == "ndjson":
+        return StreamingResponse(_ndjson(cursor, model, params, key), media_type=NDJSON_MEDIA_TYPE)
+
+    try:
+        docs = await cursor.to_list()
+    except Exception as e:
+        logger.error(f"Failed to retrieve {key}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error retrieving {key}: {str(e)}"
+        )
+
+    next_cursor = None
+    if params.limit is not None and len(docs) > params.limit:
+        docs = docs[:params.limit]
+        next_cursor = str(docs[-1]["_id"])
+    logger.info(f"Fetched {len(docs)} {key}")
+
+    if params.fields:
+        return Response(
+            content=to_json({key: docs, "next_cursor": next_cursor}),
+            media_type="application/json",
+        )
+    return dto(**{key: [model(**doc) for doc in docs]}, next_cursor=next_cursor)
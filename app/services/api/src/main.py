@@ -1,8 +1,15 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.libs.db import db, indexes
+from app.libs.logging.logger import get_logger
+from app.services.api.src.auth.principals import PrincipalScopeMiddleware
 from app.services.api.src.routes.auth import router as auth_router
 from app.services.api.src.routes.rooms import router as rooms_router
 from app.services.api.src.routes.users import router as users_router
@@ -14,9 +21,46 @@ from app.services.api.src.routes.institutions import router as institutions_rout
 from app.services.api.src.routes.scheduled_activities import router as scheduled_activities_router
 from app.services.api.src.routes.reservations import router as reservations_router
 
+# Number of uvicorn worker processes.  Each is a separate interpreter with its
+# own event loop and Mongo pool, so CPU-bound request work (bcrypt, JWT,
+# Pydantic validation) scales with the node's cores instead of sharing one.
+# With more than one worker, SIGHUP to the parent restarts them one by one
+# (graceful reload, e.g. after a config change); in-flight requests get
+# API_GRACEFUL_SHUTDOWN_SECONDS to finish.
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+API_GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("API_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "true").lower() == "true"
+
+logger = get_logger()
+
+
+async def _ensure_indexes():
+    try:
+        database = db.get_async_database()
+        names = await indexes.ensure_indexes_async(database)
+        logger.info(f"Ensured {len(names)} indexes")
+        for scan in await indexes.explain_hot_queries_async(database):
+            logger.warning(f"Hot query scans its collection: {scan.collection} {scan.filter}")
+    except Exception as e:
+        logger.error(f"Failed to ensure indexes: {e}")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Apply the index registry (idempotent) and warn about any hot query the
+    # planner would still answer with a collection scan.  Runs in the
+    # background: the API serves without indexes, just slower, so an
+    # unreachable or slow Mongo must not hold up start-up.
+    task = asyncio.create_task(_ensure_indexes()) if ENSURE_INDEXES else None
+    yield
+    if task is not None:
+        task.cancel()
+
+
 app = FastAPI(
     title="ODES API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 app.add_middleware(
   CORSMiddleware,
@@ -25,6 +69,7 @@ app.add_middleware(
   allow_methods=["*"],
   allow_headers=["*"],
 )
+app.add_middleware(PrincipalScopeMiddleware)
 
 app.include_router(auth_router)
 app.include_router(users_router)
@@ -44,4 +89,14 @@ def redirect_to_docs():
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080, proxy_headers=True, forwarded_allow_ips="*")
+    # Multiple workers need the app as an import string so each process
+    # imports it itself (and opens its own Mongo client after start-up).
+    uvicorn.run(
+        "app.services.api.src.main:app" if API_WORKERS > 1 else app,
+        host="0.0.0.0",
+        port=8080,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        workers=API_WORKERS,
+        timeout_graceful_shutdown=API_GRACEFUL_SHUTDOWN_SECONDS,
+    )
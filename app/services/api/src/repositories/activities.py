@@ -1,64 +1,87 @@
-from pymongo.synchronous.database import Database
+from typing import List, Optional
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
+
+
+def find_activities_by_institution_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
+    collection = db.get_collection(models.Activity.COLLECTION_NAME)
+    return listing.find(collection, {"institution_id": {"$in": institution_ids}}, models.Activity, params)
+
+
+async def find_activity_ids_by_institution_ids(
+        db: AsyncDatabase,
+        institution_ids: List[str],
+        professor_id: Optional[str] = None,
+        group_ids: Optional[List[str]] = None,
+) -> List[str]:
+    collection = db.get_collection(models.Activity.COLLECTION_NAME)
+    query = {"institution_id": {"$in": institution_ids}}
+    if professor_id is not None:
+        query["professor_id"] = professor_id
+    if group_ids is not None:
+        query["group_ids"] = {"$in": group_ids}
+    return await collection.distinct("_id", query)
 
 
-def find_all_activities(db: Database):
+async def find_activity_by_id(db: AsyncDatabase, activity_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return await collection.find_one({"_id": activity_id})
 
 
-def find_activity_by_id(db: Database, activity_id: str):
+async def find_activities_by_ids(db: AsyncDatabase, activity_ids: List[str]):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.find_one({"_id": activity_id})
+    return await collection.find({"_id": {"$in": activity_ids}}).to_list()
 
 
-def insert_activity(db: Database, activity: models.Activity):
+async def insert_activity(db: AsyncDatabase, activity: models.Activity):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.insert_one(activity.model_dump(by_alias=True))
+    return await collection.insert_one(activity.model_dump(by_alias=True))
 
 
-def update_activity_by_id(db: Database, activity_id: str, update_data: dict):
+async def update_activity_by_id(db: AsyncDatabase, activity_id: str, update_data: dict):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.update_one({"_id": activity_id}, {"$set": update_data})
+    return await collection.update_one({"_id": activity_id}, {"$set": update_data})
 
 
-def delete_activity_by_id(db: Database, activity_id: str):
+async def delete_activity_by_id(db: AsyncDatabase, activity_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.delete_one({"_id": activity_id})
+    return await collection.delete_one({"_id": activity_id})
 
 
-def find_activities_by_course_id(db: Database, course_id: str):
+async def find_activities_by_course_id(db: AsyncDatabase, course_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.find({"course_id": course_id}).to_list()
+    return await collection.find({"course_id": course_id}).to_list()
 
 
-def delete_activities_by_course_id(db: Database, course_id: str):
+async def delete_activities_by_course_id(db: AsyncDatabase, course_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.delete_many({"course_id": course_id})
+    return await collection.delete_many({"course_id": course_id})
 
 
-def find_activities_by_institution_id(db: Database, institution_id: str):
+async def find_activities_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def find_activities_by_group_id(db: Database, group_id: str):
+async def find_activities_by_group_id(db: AsyncDatabase, group_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
     # group_ids is a list - MongoDB matches if group_id appears anywhere in it.
-    return collection.find({"group_ids": group_id}).to_list()
+    return await collection.find({"group_ids": group_id}).to_list()
 
 
-def find_activities_by_professor_id(db: Database, professor_id: str):
+async def find_activities_by_professor_id(db: AsyncDatabase, professor_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.find({"professor_id": professor_id}).to_list()
+    return await collection.find({"professor_id": professor_id}).to_list()
 
 
-def delete_activities_by_institution_id(db: Database, institution_id: str):
+async def delete_activities_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.delete_many({"institution_id": institution_id})
 
 
-def delete_activities_by_group_id(db: Database, group_id: str):
+async def delete_activities_by_group_id(db: AsyncDatabase, group_id: str):
     collection = db.get_collection(models.Activity.COLLECTION_NAME)
-    return collection.delete_many({"group_ids": group_id})
+    return await collection.delete_many({"group_ids": group_id})
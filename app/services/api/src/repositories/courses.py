@@ -1,38 +1,41 @@
-from pymongo.synchronous.database import Database
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
 
 
-def find_all_courses(db: Database):
+def find_courses_by_institution_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return listing.find(collection, {"institution_id": {"$in": institution_ids}}, models.Course, params)
 
 
-def find_course_by_id(db: Database, course_id: str):
+async def find_course_by_id(db: AsyncDatabase, course_id: str):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.find_one({"_id": course_id})
+    return await collection.find_one({"_id": course_id})
 
 
-def insert_course(db: Database, course: models.Course):
+async def insert_course(db: AsyncDatabase, course: models.Course):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.insert_one(course.model_dump(by_alias=True))
+    return await collection.insert_one(course.model_dump(by_alias=True))
 
 
-def update_course_by_id(db: Database, course_id: str, update_data: dict):
+async def update_course_by_id(db: AsyncDatabase, course_id: str, update_data: dict):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.update_one({"_id": course_id}, {"$set": update_data})
+    return await collection.update_one({"_id": course_id}, {"$set": update_data})
 
 
-def delete_course_by_id(db: Database, course_id: str):
+async def delete_course_by_id(db: AsyncDatabase, course_id: str):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.delete_one({"_id": course_id})
+    return await collection.delete_one({"_id": course_id})
 
 
-def find_courses_by_institution_id(db: Database, institution_id: str):
+async def find_courses_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def delete_courses_by_institution_id(db: Database, institution_id: str):
+async def delete_courses_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Course.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.delete_many({"institution_id": institution_id})
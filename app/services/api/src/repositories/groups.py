@@ -1,48 +1,51 @@
-from pymongo.synchronous.database import Database
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
 
 
-def find_all_groups(db: Database):
+def find_groups_by_institution_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return listing.find(collection, {"institution_id": {"$in": institution_ids}}, models.Group, params)
 
 
-def find_group_by_id(db: Database, group_id: str):
+async def find_group_by_id(db: AsyncDatabase, group_id: str):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.find_one({"_id": group_id})
+    return await collection.find_one({"_id": group_id})
 
 
-def insert_group(db: Database, group: models.Group):
+async def insert_group(db: AsyncDatabase, group: models.Group):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.insert_one(group.model_dump(by_alias=True))
+    return await collection.insert_one(group.model_dump(by_alias=True))
 
 
-def update_group_by_id(db: Database, group_id: str, update_data: dict):
+async def update_group_by_id(db: AsyncDatabase, group_id: str, update_data: dict):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.update_one({"_id": group_id}, {"$set": update_data})
+    return await collection.update_one({"_id": group_id}, {"$set": update_data})
 
 
-def delete_group_by_id(db: Database, group_id: str):
+async def delete_group_by_id(db: AsyncDatabase, group_id: str):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.delete_one({"_id": group_id})
+    return await collection.delete_one({"_id": group_id})
 
 
-def find_groups_by_institution_id(db: Database, institution_id: str):
+async def find_groups_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def find_groups_by_parent_group_id(db: Database, parent_group_id: str):
+async def find_groups_by_parent_group_id(db: AsyncDatabase, parent_group_id: str):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.find({"parent_group_id": parent_group_id}).to_list()
+    return await collection.find({"parent_group_id": parent_group_id}).to_list()
 
 
-def update_groups_by_parent_group_id(db: Database, parent_group_id: str, update_data: dict):
+async def update_groups_by_parent_group_id(db: AsyncDatabase, parent_group_id: str, update_data: dict):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.update_many({"parent_group_id": parent_group_id}, {"$set": update_data})
+    return await collection.update_many({"parent_group_id": parent_group_id}, {"$set": update_data})
 
 
-def delete_groups_by_institution_id(db: Database, institution_id: str):
+async def delete_groups_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Group.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.delete_many({"institution_id": institution_id})
@@ -1,35 +1,43 @@
+from typing import List
+
 from pymongo import ReturnDocument
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
+
+
+async def find_all_institutions(db: AsyncDatabase):
+    collection = db.get_collection(models.Institution.COLLECTION_NAME)
+    return await collection.find({}).to_list()
 
 
-def find_all_institutions(db: Database):
+def find_institutions_by_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
     collection = db.get_collection(models.Institution.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return listing.find(collection, {"_id": {"$in": institution_ids}}, models.Institution, params)
 
 
-def find_institution_by_id(db: Database, institution_id: str):
+async def find_institution_by_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Institution.COLLECTION_NAME)
-    return collection.find_one({"_id": institution_id})
+    return await collection.find_one({"_id": institution_id})
 
 
-def insert_institution(db: Database, institution: models.Institution):
+async def insert_institution(db: AsyncDatabase, institution: models.Institution):
     collection = db.get_collection(models.Institution.COLLECTION_NAME)
-    return collection.insert_one(institution.model_dump(by_alias=True))
+    return await collection.insert_one(institution.model_dump(by_alias=True))
 
 
-def update_institution_by_id(db: Database, institution_id: str, update_data: dict):
+async def update_institution_by_id(db: AsyncDatabase, institution_id: str, update_data: dict):
     collection = db.get_collection(models.Institution.COLLECTION_NAME)
-    return collection.update_one({"_id": institution_id}, {"$set": update_data})
+    return await collection.update_one({"_id": institution_id}, {"$set": update_data})
 
 
-def delete_institution_by_id(db: Database, institution_id: str):
+async def delete_institution_by_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Institution.COLLECTION_NAME)
-    return collection.delete_one({"_id": institution_id})
+    return await collection.delete_one({"_id": institution_id})
 
 
-def get_next_schedule_number(db: Database, institution_id: str) -> int:
+async def get_next_schedule_number(db: AsyncDatabase, institution_id: str) -> int:
     """Atomically allocate the next monotonically-increasing schedule
     number for an institution.
 
@@ -49,9 +57,9 @@ def get_next_schedule_number(db: Database, institution_id: str) -> int:
     # Step 1: backfill (one-time, only if counter is missing/0 AND legacy
     # schedules exist).  The match clause makes this safe under concurrent
     # callers - only one will succeed in setting the initial value.
-    existing_count = sched_coll.count_documents({"institution_id": institution_id})
+    existing_count = await sched_coll.count_documents({"institution_id": institution_id})
     if existing_count > 0:
-        inst_coll.update_one(
+        await inst_coll.update_one(
             {
                 "_id": institution_id,
                 "$or": [
@@ -63,7 +71,7 @@ def get_next_schedule_number(db: Database, institution_id: str) -> int:
         )
 
     # Step 2: atomic increment + read.
-    result = inst_coll.find_one_and_update(
+    result = await inst_coll.find_one_and_update(
         {"_id": institution_id},
         {"$inc": {"last_schedule_number": 1}},
         return_document=ReturnDocument.AFTER,
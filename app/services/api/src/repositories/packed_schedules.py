@@ -0,0 +1,20 @@
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.libs.db import models
+
+
+async def find_packed_schedule_by_schedule_id(db: AsyncDatabase, schedule_id: str):
+    collection = db.get_collection(models.PackedSchedule.COLLECTION_NAME)
+    return await collection.find_one({"_id": schedule_id})
+
+
+async def replace_packed_schedule(db: AsyncDatabase, packed_schedule: models.PackedSchedule):
+    collection = db.get_collection(models.PackedSchedule.COLLECTION_NAME)
+    return await collection.replace_one(
+        {"_id": packed_schedule.schedule_id}, packed_schedule.model_dump(by_alias=True), upsert=True,
+    )
+
+
+async def delete_packed_schedule_by_schedule_id(db: AsyncDatabase, schedule_id: str):
+    collection = db.get_collection(models.PackedSchedule.COLLECTION_NAME)
+    return await collection.delete_one({"_id": schedule_id})
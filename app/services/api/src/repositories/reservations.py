@@ -1,25 +1,25 @@
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 
 
-def insert_reservation(db: Database, reservation: models.Reservation):
+async def insert_reservation(db: AsyncDatabase, reservation: models.Reservation):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.insert_one(reservation.model_dump(by_alias=True))
+    return await collection.insert_one(reservation.model_dump(by_alias=True))
 
 
-def find_reservation_by_id(db: Database, reservation_id: str):
+async def find_reservation_by_id(db: AsyncDatabase, reservation_id: str):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.find_one({"_id": reservation_id})
+    return await collection.find_one({"_id": reservation_id})
 
 
-def find_reservations_by_institution_id(db: Database, institution_id: str):
+async def find_reservations_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def find_approved_reservations_for_room_on_date(
-    db: Database, room_id: str, date: str, exclude_id: str | None = None
+async def find_approved_reservations_for_room_on_date(
+    db: AsyncDatabase, room_id: str, date: str, exclude_id: str | None = None
 ):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
     query: dict = {
@@ -29,19 +29,19 @@ def find_approved_reservations_for_room_on_date(
     }
     if exclude_id:
         query["_id"] = {"$ne": exclude_id}
-    return collection.find(query).to_list()
+    return await collection.find(query).to_list()
 
 
-def update_reservation_by_id(db: Database, reservation_id: str, update_data: dict):
+async def update_reservation_by_id(db: AsyncDatabase, reservation_id: str, update_data: dict):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.update_one({"_id": reservation_id}, {"$set": update_data})
+    return await collection.update_one({"_id": reservation_id}, {"$set": update_data})
 
 
-def delete_reservation_by_id(db: Database, reservation_id: str):
+async def delete_reservation_by_id(db: AsyncDatabase, reservation_id: str):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.delete_one({"_id": reservation_id})
+    return await collection.delete_one({"_id": reservation_id})
 
 
-def delete_reservations_by_institution_id(db: Database, institution_id: str):
+async def delete_reservations_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Reservation.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.delete_many({"institution_id": institution_id})
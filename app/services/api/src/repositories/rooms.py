@@ -1,38 +1,41 @@
-from pymongo.synchronous.database import Database
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
 
 
-def find_all_rooms(db: Database):
+def find_rooms_by_institution_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return listing.find(collection, {"institution_id": {"$in": institution_ids}}, models.Room, params)
 
 
-def find_room_by_id(db: Database, room_id: str):
+async def find_room_by_id(db: AsyncDatabase, room_id: str):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.find_one({"_id": room_id})
+    return await collection.find_one({"_id": room_id})
 
 
-def insert_room(db: Database, room: models.Room):
+async def insert_room(db: AsyncDatabase, room: models.Room):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.insert_one(room.model_dump(by_alias=True))
+    return await collection.insert_one(room.model_dump(by_alias=True))
 
 
-def update_room_by_id(db: Database, room_id: str, update_data: dict):
+async def update_room_by_id(db: AsyncDatabase, room_id: str, update_data: dict):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.update_one({"_id": room_id}, {"$set": update_data})
+    return await collection.update_one({"_id": room_id}, {"$set": update_data})
 
 
-def delete_room_by_id(db: Database, room_id: str):
+async def delete_room_by_id(db: AsyncDatabase, room_id: str):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.delete_one({"_id": room_id})
+    return await collection.delete_one({"_id": room_id})
 
 
-def find_rooms_by_institution_id(db: Database, institution_id: str):
+async def find_rooms_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def delete_rooms_by_institution_id(db: Database, institution_id: str):
+async def delete_rooms_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Room.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.delete_many({"institution_id": institution_id})
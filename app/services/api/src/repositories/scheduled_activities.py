@@ -1,49 +1,107 @@
-from typing import List
+from typing import Dict, List, Optional
 
-from pymongo.synchronous.database import Database
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
 
 
-def find_all_scheduled_activities(db: Database):
+def find_scheduled_activities_by_schedule_ids(
+        db: AsyncDatabase,
+        schedule_ids: List[str],
+        params: listing.ListParams,
+        room_id: Optional[str] = None,
+        activity_ids: Optional[List[str]] = None,
+        week: Optional[int] = None,
+):
+    collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
+    query = {"schedule_id": {"$in": schedule_ids}}
+    if room_id is not None:
+        query["room_id"] = room_id
+    if activity_ids is not None:
+        query["activity_id"] = {"$in": activity_ids}
+    if week is not None:
+        # A record without active weeks runs every week.
+        query["$or"] = [{"active_weeks": week}, {"active_weeks": []}]
+    return listing.find(collection, query, models.ScheduledActivity, params)
+
+
+async def find_scheduled_activity_by_id(db: AsyncDatabase, scheduled_activity_id: str):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return await collection.find_one({"_id": scheduled_activity_id})
 
 
-def find_scheduled_activity_by_id(db: Database, scheduled_activity_id: str):
+async def insert_scheduled_activity(db: AsyncDatabase, scheduled_activity: models.ScheduledActivity):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.find_one({"_id": scheduled_activity_id})
+    return await collection.insert_one(scheduled_activity.model_dump(by_alias=True))
 
 
-def insert_scheduled_activity(db: Database, scheduled_activity: models.ScheduledActivity):
+async def update_scheduled_activity_by_id(db: AsyncDatabase, scheduled_activity_id: str, update_data: dict):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.insert_one(scheduled_activity.model_dump(by_alias=True))
+    return await collection.update_one({"_id": scheduled_activity_id}, {"$set": update_data})
 
 
-def update_scheduled_activity_by_id(db: Database, scheduled_activity_id: str, update_data: dict):
+async def bulk_update_scheduled_activities(
+        db: AsyncDatabase,
+        schedule_id: str,
+        updates: Dict[str, dict],
+        session: Optional[AsyncClientSession] = None,
+):
+    """``$set`` each record id's update data in one round trip; ids outside
+    ``schedule_id`` are left untouched."""
+    if not updates:
+        return None
+    collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
+    operations = [
+        UpdateOne({"_id": record_id, "schedule_id": schedule_id}, {"$set": update_data})
+        for record_id, update_data in updates.items()
+    ]
+    return await collection.bulk_write(operations, ordered=False, session=session)
+
+
+async def apply_scheduled_activities_delta(
+        db: AsyncDatabase,
+        schedule_id: str,
+        upserts: List[models.ScheduledActivity],
+        delete_ids: List[str],
+):
+    """Upsert ``upserts`` and delete ``delete_ids`` in one round trip; only
+    records of ``schedule_id`` are touched."""
+    operations = [
+        ReplaceOne(
+            {"_id": sa.id, "schedule_id": schedule_id}, sa.model_dump(by_alias=True), upsert=True,
+        )
+        for sa in upserts
+    ]
+    if delete_ids:
+        operations.append(DeleteMany({"_id": {"$in": delete_ids}, "schedule_id": schedule_id}))
+    if not operations:
+        return None
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.update_one({"_id": scheduled_activity_id}, {"$set": update_data})
+    return await collection.bulk_write(operations, ordered=False)
 
 
-def delete_scheduled_activity_by_id(db: Database, scheduled_activity_id: str):
+async def delete_scheduled_activity_by_id(db: AsyncDatabase, scheduled_activity_id: str):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.delete_one({"_id": scheduled_activity_id})
+    return await collection.delete_one({"_id": scheduled_activity_id})
 
 
-def delete_scheduled_activities_by_schedule_id(db: Database, schedule_id: str):
+async def delete_scheduled_activities_by_schedule_id(db: AsyncDatabase, schedule_id: str):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.delete_many({"schedule_id": schedule_id})
+    return await collection.delete_many({"schedule_id": schedule_id})
 
 
-def find_scheduled_activities_by_schedule_id(db: Database, schedule_id: str):
+async def find_scheduled_activities_by_schedule_id(db: AsyncDatabase, schedule_id: str):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
-    return collection.find({"schedule_id": schedule_id}).to_list()
+    return await collection.find({"schedule_id": schedule_id}).to_list()
 
 
-def insert_many_scheduled_activities(
-        db: Database,
+async def insert_many_scheduled_activities(
+        db: AsyncDatabase,
         scheduled_activities: List[models.ScheduledActivity]
 ):
     collection = db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
     documents = [activity.model_dump(by_alias=True) for activity in scheduled_activities]
-    return collection.insert_many(documents)
+    return await collection.insert_many(documents)
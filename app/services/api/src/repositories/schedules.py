@@ -1,38 +1,56 @@
-from pymongo.synchronous.database import Database
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
+
+
+def find_schedules_by_institution_ids(db: AsyncDatabase, institution_ids: List[str], params: listing.ListParams):
+    collection = db.get_collection(models.Schedule.COLLECTION_NAME)
+    return listing.find(collection, {"institution_id": {"$in": institution_ids}}, models.Schedule, params)
+
+
+async def find_schedule_ids_by_institution_ids(db: AsyncDatabase, institution_ids: List[str]) -> List[str]:
+    collection = db.get_collection(models.Schedule.COLLECTION_NAME)
+    return await collection.distinct("_id", {"institution_id": {"$in": institution_ids}})
+
+
+async def find_schedule_by_id(db: AsyncDatabase, schedule_id: str):
+    collection = db.get_collection(models.Schedule.COLLECTION_NAME)
+    return await collection.find_one({"_id": schedule_id})
 
 
-def find_all_schedules(db: Database):
+async def insert_schedule(db: AsyncDatabase, schedule: models.Schedule):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return await collection.insert_one(schedule.model_dump(by_alias=True))
 
 
-def find_schedule_by_id(db: Database, schedule_id: str):
+async def update_schedule_by_id(db: AsyncDatabase, schedule_id: str, update_data: dict):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.find_one({"_id": schedule_id})
+    return await collection.update_one({"_id": schedule_id}, {"$set": update_data})
 
 
-def insert_schedule(db: Database, schedule: models.Schedule):
+async def delete_schedule_by_id(db: AsyncDatabase, schedule_id: str):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.insert_one(schedule.model_dump(by_alias=True))
+    return await collection.delete_one({"_id": schedule_id})
 
 
-def update_schedule_by_id(db: Database, schedule_id: str, update_data: dict):
+async def find_schedules_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.update_one({"_id": schedule_id}, {"$set": update_data})
+    return await collection.find({"institution_id": institution_id}).to_list()
 
 
-def delete_schedule_by_id(db: Database, schedule_id: str):
+async def delete_schedules_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.delete_one({"_id": schedule_id})
+    return await collection.delete_many({"institution_id": institution_id})
 
 
-def find_schedules_by_institution_id(db: Database, institution_id: str):
+async def bump_schedule_version(db: AsyncDatabase, schedule_id: str):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.find({"institution_id": institution_id}).to_list()
+    return await collection.update_one({"_id": schedule_id}, {"$inc": {"version": 1}})
 
 
-def delete_schedules_by_institution_id(db: Database, institution_id: str):
+async def bump_schedule_versions_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.Schedule.COLLECTION_NAME)
-    return collection.delete_many({"institution_id": institution_id})
+    return await collection.update_many({"institution_id": institution_id}, {"$inc": {"version": 1}})
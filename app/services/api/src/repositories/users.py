@@ -1,19 +1,41 @@
-from pymongo.synchronous.database import Database
+from typing import List
+
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
+from app.services.api.src import listing
+
+
+def find_users_by_institution_ids(
+    db: AsyncDatabase,
+    user_id: str,
+    institution_ids: List[str],
+    params: listing.ListParams,
+):
+    """``user_id`` and the members of any of ``institution_ids``."""
+    collection = db.get_collection(models.User.COLLECTION_NAME)
+    query = {"$or": [{"_id": user_id}] + [
+        {f"user_roles.{institution_id}": {"$exists": True}} for institution_id in institution_ids
+    ]}
+    return listing.find(collection, query, models.User, params)
+
+
+def find_users_by_email(db: AsyncDatabase, email: str, params: listing.ListParams):
+    collection = db.get_collection(models.User.COLLECTION_NAME)
+    return listing.find(collection, {"email": email}, models.User, params)
 
 
-def find_all_users(db: Database):
+async def find_user_by_id(db: AsyncDatabase, user_id: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find({}).to_list()
+    return await collection.find_one({"_id": user_id})
 
 
-def find_user_by_id(db: Database, user_id: str):
+async def find_user_roles_by_id(db: AsyncDatabase, user_id: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find_one({"_id": user_id})
+    return await collection.find_one({"_id": user_id}, {"user_roles": 1})
 
 
-def insert_user(db: Database, user: models.User):
+async def insert_user(db: AsyncDatabase, user: models.User):
     collection = db.get_collection(models.User.COLLECTION_NAME)
     # ensure hashed_password is included
     data = user.model_dump(by_alias=True)
@@ -21,72 +43,72 @@ def insert_user(db: Database, user: models.User):
     data.pop("has_password", None)
     if user.hashed_password is not None:
         data["hashed_password"] = user.hashed_password
-    return collection.insert_one(data)
+    return await collection.insert_one(data)
 
 
-def update_user_by_id(db: Database, user_id: str, update_data: dict):
+async def update_user_by_id(db: AsyncDatabase, user_id: str, update_data: dict):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.update_one({"_id": user_id}, {"$set": update_data})
+    return await collection.update_one({"_id": user_id}, {"$set": update_data})
 
 
-def unset_user_field_by_id(db: Database, user_id: str, field: str):
+async def unset_user_field_by_id(db: AsyncDatabase, user_id: str, field: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.update_one({"_id": user_id}, {"$unset": {field: ""}})
+    return await collection.update_one({"_id": user_id}, {"$unset": {field: ""}})
 
 
-def delete_user_by_id(db: Database, user_id: str):
+async def delete_user_by_id(db: AsyncDatabase, user_id: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.delete_one({"_id": user_id})
+    return await collection.delete_one({"_id": user_id})
 
 
-def find_user_by_email(db: Database, email: str):
+async def find_user_by_email(db: AsyncDatabase, email: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find_one({"email": email})
+    return await collection.find_one({"email": email})
 
 
-def find_user_by_provider(db: Database, provider: str, subject: str):
+async def find_user_by_provider(db: AsyncDatabase, provider: str, subject: str):
     """Find a user by an external identity-provider subject id."""
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find_one({f"provider_identities.{provider}": subject})
+    return await collection.find_one({f"provider_identities.{provider}": subject})
 
 
-def find_users_by_institution_id(db: Database, institution_id: str):
+async def find_users_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find({f"user_roles.{institution_id}": {"$exists": True}}).to_list()
+    return await collection.find({f"user_roles.{institution_id}": {"$exists": True}}).to_list()
 
 
-def find_professors_by_institution_id(db: Database, institution_id: str):
+async def find_professors_by_institution_id(db: AsyncDatabase, institution_id: str):
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find({f"user_roles.{institution_id}": models.UserRole.PROFESSOR}).to_list()
+    return await collection.find({f"user_roles.{institution_id}": models.UserRole.PROFESSOR}).to_list()
 
 
-def find_students_by_group_id(db: Database, group_id: str, institution_id: str):
+async def find_students_by_group_id(db: AsyncDatabase, group_id: str, institution_id: str):
     """Users who are members of ``group_id`` AND are flagged STUDENT in
     ``institution_id``.  Used by the group page to render its student
     roster (we deliberately exclude professors/admins of the institution
     who might also have the group in their group_ids - only students are
     "members" of a group in the academic sense)."""
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.find({
+    return await collection.find({
         "group_ids": group_id,
         f"user_roles.{institution_id}": models.UserRole.STUDENT,
     }).to_list()
 
 
-def add_group_to_user_by_id(db: Database, user_id: str, group_id: str):
+async def add_group_to_user_by_id(db: AsyncDatabase, user_id: str, group_id: str):
     """Atomically add ``group_id`` to a user's ``group_ids``.  Uses
     ``$addToSet`` so duplicates are a no-op."""
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.update_one(
+    return await collection.update_one(
         {"_id": user_id},
         {"$addToSet": {"group_ids": group_id}},
     )
 
 
-def remove_group_from_user_by_id(db: Database, user_id: str, group_id: str):
+async def remove_group_from_user_by_id(db: AsyncDatabase, user_id: str, group_id: str):
     """Atomically remove ``group_id`` from a user's ``group_ids``."""
     collection = db.get_collection(models.User.COLLECTION_NAME)
-    return collection.update_one(
+    return await collection.update_one(
         {"_id": user_id},
         {"$pull": {"group_ids": group_id}},
     )
@@ -1,7 +1,9 @@
 from starlette import status
 from fastapi import APIRouter
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import activities as service
@@ -15,11 +17,11 @@ router = APIRouter(prefix="/api/v1/activities", tags=["activities"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllActivities)
-async def get_activities(db: DB, token: AUTH):
-    """Get all activities"""
+async def get_activities(db: DB, token: AUTH, params: listing.LIST):
+    """Get all activities - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = service.get_activities(db, current_user_id)
-    return dto_out.GetAllActivities(activities=activities)
+    activities = await service.get_activities(db, current_user_id, params)
+    return await listing.respond(activities, params, models.Activity, dto_out.GetAllActivities, "activities")
 
 
 @router.get("/{activity_id}",
@@ -28,7 +30,7 @@ async def get_activities(db: DB, token: AUTH):
 async def get_activity_by_id(db: DB, activity_id: str, token: AUTH):
     """Get activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activity = service.get_activity_by_id(db, activity_id, current_user_id)
+    activity = await service.get_activity_by_id(db, activity_id, current_user_id)
     return dto_out.GetActivity(activity=activity)
 
 
@@ -38,7 +40,7 @@ async def get_activity_by_id(db: DB, activity_id: str, token: AUTH):
 async def create_activity(db: DB, request: dto_in.CreateActivity, token: AUTH):
     """Create a new activity"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activity = service.create_activity(db, request, current_user_id)
+    activity = await service.create_activity(db, request, current_user_id)
     return dto_out.GetActivity(activity=activity)
 
 
@@ -47,7 +49,7 @@ async def create_activity(db: DB, request: dto_in.CreateActivity, token: AUTH):
 async def delete_activity(db: DB, activity_id: str, token: AUTH):
     """Delete an activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_activity(db, activity_id, current_user_id)
+    await service.delete_activity(db, activity_id, current_user_id)
 
 
 @router.put("/{activity_id}",
@@ -56,5 +58,5 @@ async def delete_activity(db: DB, activity_id: str, token: AUTH):
 async def update_activity(db: DB, activity_id: str, request: dto_in.UpdateActivity, token: AUTH):
     """Update an activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activity = service.update_activity(db, activity_id, request, current_user_id)
+    activity = await service.update_activity(db, activity_id, request, current_user_id)
     return dto_out.GetActivity(activity=activity)
@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, Response, Request
 from starlette import status
 
 from app.libs.db.db import DB
-from app.services.api.src.auth import token_utils
+from app.services.api.src.auth import cpu_pool, token_utils
+from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import auth as service
 from app.services.api.src.dtos.output import auth as dto_out
 from app.services.api.src.dtos.input import auth as dto_in
@@ -39,7 +40,7 @@ async def get_login_token(response: Response, db: DB, form_data: OAuth2PasswordR
     Returns the short-lived access token in the JSON body.
     Sets the long-lived refresh token as an HttpOnly cookie (inaccessible to JS).
     """
-    access_token, refresh_token = service.get_login_token(db, form_data.username, form_data.password)
+    access_token, refresh_token = await service.get_login_token(db, form_data.username, form_data.password)
     _set_refresh_cookie(response, refresh_token, max_age=token_utils.REFRESH_EXPIRES_DELTA * 60)
     return dto_out.AccessToken(access_token=access_token)
 
@@ -51,7 +52,7 @@ async def google_login(response: Response, db: DB, request: dto_in.GoogleSignIn)
     Verifies the Google ID-token credential, finds/creates/links the user, and
     returns the same access token (+ refresh cookie) as a password login.
     """
-    access_token, refresh_token = service.get_google_login_token(db, request.credential)
+    access_token, refresh_token = await service.get_google_login_token(db, request.credential)
     _set_refresh_cookie(response, refresh_token, max_age=token_utils.REFRESH_EXPIRES_DELTA * 60)
     return dto_out.AccessToken(access_token=access_token)
 
@@ -63,7 +64,7 @@ async def microsoft_login(response: Response, db: DB, request: dto_in.MicrosoftS
     Verifies the Microsoft Entra ID token, finds/creates/links the user, and
     returns the same access token (+ refresh cookie) as a password login.
     """
-    access_token, refresh_token = service.get_microsoft_login_token(db, request.credential)
+    access_token, refresh_token = await service.get_microsoft_login_token(db, request.credential)
     _set_refresh_cookie(response, refresh_token, max_age=token_utils.REFRESH_EXPIRES_DELTA * 60)
     return dto_out.AccessToken(access_token=access_token)
 
@@ -75,14 +76,14 @@ async def forgot_password(db: DB, request: dto_in.ForgotPassword):
     Always returns the same response whether or not the email is registered, so
     the endpoint can't be used to discover which emails have accounts.
     """
-    service.request_password_reset(db, str(request.email))
+    await service.request_password_reset(db, str(request.email))
     return {"message": "If an account exists for that email, a reset link has been sent."}
 
 
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
 async def reset_password(db: DB, request: dto_in.ResetPassword):
     """Set a new password using a valid reset token."""
-    service.reset_password(db, request.token, request.new_password)
+    await service.reset_password(db, request.token, request.new_password)
     return {"message": "Your password has been updated. You can now sign in."}
 
 
@@ -130,3 +131,10 @@ async def refresh_access_token(request: Request):
 async def logout(response: Response):
     """Clear the refresh-token cookie, ending the server-side session."""
     response.delete_cookie(key="refresh_token", path=_COOKIE_PATH)
+
+
+@router.get("/pool-stats", status_code=status.HTTP_200_OK, response_model=dto_out.AuthPoolStats)
+async def get_auth_pool_stats(token: AUTH):
+    """Queue depth and throughput of this process's password-hashing pool."""
+    token_utils.get_user_id_from_token(token)
+    return cpu_pool.stats()
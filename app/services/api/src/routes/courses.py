@@ -1,7 +1,9 @@
 from starlette import status
 from fastapi import APIRouter
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import courses as service
@@ -14,11 +16,11 @@ router = APIRouter(prefix="/api/v1/courses", tags=["courses"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllCourses)
-async def get_courses(db: DB, token: AUTH):
-    """Get all courses"""
+async def get_courses(db: DB, token: AUTH, params: listing.LIST):
+    """Get all courses - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    courses = service.get_courses(db, current_user_id)
-    return dto_out.GetAllCourses(courses=courses)
+    courses = await service.get_courses(db, current_user_id, params)
+    return await listing.respond(courses, params, models.Course, dto_out.GetAllCourses, "courses")
 
 
 @router.get("/{course_id}",
@@ -27,7 +29,7 @@ async def get_courses(db: DB, token: AUTH):
 async def get_course_by_id(db: DB, course_id: str, token: AUTH):
     """Get course by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    course = service.get_course_by_id(db, course_id, current_user_id)
+    course = await service.get_course_by_id(db, course_id, current_user_id)
     return dto_out.GetCourse(course=course)
 
 
@@ -37,7 +39,7 @@ async def get_course_by_id(db: DB, course_id: str, token: AUTH):
 async def create_course(db: DB, request: dto_in.CreateCourse, token: AUTH):
     """Create a new course"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    course = service.create_course(db, request, current_user_id)
+    course = await service.create_course(db, request, current_user_id)
     return dto_out.GetCourse(course=course)
 
 
@@ -47,7 +49,7 @@ async def create_course(db: DB, request: dto_in.CreateCourse, token: AUTH):
 async def update_course(db: DB, course_id: str, request: dto_in.UpdateCourse, token: AUTH):
     """Update an existing course"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    course = service.update_course(db, course_id, request, current_user_id)
+    course = await service.update_course(db, course_id, request, current_user_id)
     return dto_out.GetCourse(course=course)
 
 
@@ -56,7 +58,7 @@ async def update_course(db: DB, course_id: str, request: dto_in.UpdateCourse, to
 async def delete_course(db: DB, course_id: str, token: AUTH):
     """Delete a course by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_course(db, course_id, current_user_id)
+    await service.delete_course(db, course_id, current_user_id)
 
 
 @router.get("/{course_id}/activities",
@@ -65,5 +67,5 @@ async def delete_course(db: DB, course_id: str, token: AUTH):
 async def get_course_activities(db: DB, course_id: str, token: AUTH):
     """Get all activities for a specific course"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = service.get_course_activities(db, course_id, current_user_id)
+    activities = await service.get_course_activities(db, course_id, current_user_id)
     return dto_out.GetCourseActivities(activities=activities)
@@ -1,7 +1,9 @@
 from starlette import status
 from fastapi import APIRouter
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import groups as service
@@ -15,11 +17,11 @@ router = APIRouter(prefix="/api/v1/groups", tags=["groups"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllGroups)
-async def get_groups(db: DB, token: AUTH):
-    """Get all groups"""
+async def get_groups(db: DB, token: AUTH, params: listing.LIST):
+    """Get all groups - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    groups = service.get_groups(db, current_user_id)
-    return dto_out.GetAllGroups(groups=groups)
+    groups = await service.get_groups(db, current_user_id, params)
+    return await listing.respond(groups, params, models.Group, dto_out.GetAllGroups, "groups")
 
 
 @router.get("/{group_id}",
@@ -28,7 +30,7 @@ async def get_groups(db: DB, token: AUTH):
 async def get_group_by_id(db: DB, group_id: str, token: AUTH):
     """Get group by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    group = service.get_group_by_id(db, group_id, current_user_id)
+    group = await service.get_group_by_id(db, group_id, current_user_id)
     return dto_out.GetGroup(group=group)
 
 
@@ -38,7 +40,7 @@ async def get_group_by_id(db: DB, group_id: str, token: AUTH):
 async def create_group(db: DB, request: dto_in.CreateGroup, token: AUTH):
     """Create a new group"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    group = service.create_group(db, request, current_user_id)
+    group = await service.create_group(db, request, current_user_id)
     return dto_out.GetGroup(group=group)
 
 
@@ -47,7 +49,7 @@ async def create_group(db: DB, request: dto_in.CreateGroup, token: AUTH):
 async def delete_group(db: DB, group_id: str, token: AUTH):
     """Delete an group by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_group(db, group_id, current_user_id)
+    await service.delete_group(db, group_id, current_user_id)
 
 
 @router.put("/{group_id}",
@@ -56,7 +58,7 @@ async def delete_group(db: DB, group_id: str, token: AUTH):
 async def update_group(db: DB, group_id: str, request: dto_in.UpdateGroup, token: AUTH):
     """Update an group by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    group = service.update_group(db, group_id, request, current_user_id)
+    group = await service.update_group(db, group_id, request, current_user_id)
     return dto_out.GetGroup(group=group)
 
 
@@ -68,7 +70,7 @@ async def update_group_timeslot_preferences(
 ):
     """Set timeslot preferences for a group (institution admin only)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    group = service.update_group_timeslot_preferences(db, group_id, request, current_user_id)
+    group = await service.update_group_timeslot_preferences(db, group_id, request, current_user_id)
     return dto_out.GetGroup(group=group)
 
 
@@ -78,7 +80,7 @@ async def update_group_timeslot_preferences(
 async def get_group_activities(db: DB, group_id: str, token: AUTH):
     """Get all activities for a specific group"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = service.get_group_activities(db, group_id, current_user_id)
+    activities = await service.get_group_activities(db, group_id, current_user_id)
     return dto_out.GetGroupActivities(activities=activities)
 
 
@@ -88,7 +90,7 @@ async def get_group_activities(db: DB, group_id: str, token: AUTH):
 async def get_group_students(db: DB, group_id: str, token: AUTH):
     """List the students currently belonging to this group."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    students = service.get_group_students(db, group_id, current_user_id)
+    students = await service.get_group_students(db, group_id, current_user_id)
     return dto_out.GetGroupStudents(students=students)
 
 
@@ -98,7 +100,7 @@ async def get_group_students(db: DB, group_id: str, token: AUTH):
 async def add_student_to_group(db: DB, group_id: str, user_id: str, token: AUTH):
     """Add a student to a group (institution admin only)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    user = service.add_student_to_group(db, group_id, user_id, current_user_id)
+    user = await service.add_student_to_group(db, group_id, user_id, current_user_id)
     return dto_out.GetGroupStudentUpdated(user=user)
 
 
@@ -107,4 +109,4 @@ async def add_student_to_group(db: DB, group_id: str, user_id: str, token: AUTH)
 async def remove_student_from_group(db: DB, group_id: str, user_id: str, token: AUTH):
     """Remove a student from a group (institution admin only)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.remove_student_from_group(db, group_id, user_id, current_user_id)
+    await service.remove_student_from_group(db, group_id, user_id, current_user_id)
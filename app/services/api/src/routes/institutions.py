@@ -4,6 +4,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.libs.db import models
 from app.libs.scheduling import eta as eta_helper
 from app.services.api.src.auth import token_utils
@@ -24,11 +25,11 @@ router = APIRouter(prefix="/api/v1/institutions", tags=["institutions"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllInstitutions)
-async def get_institutions(db: DB, token: AUTH):
-    """Get all institutions"""
+async def get_institutions(db: DB, token: AUTH, params: listing.LIST):
+    """Get all institutions - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    institutions = service.get_institutions(db, current_user_id)
-    return dto_out.GetAllInstitutions(institutions=institutions)
+    institutions = await service.get_institutions(db, current_user_id, params)
+    return await listing.respond(institutions, params, models.Institution, dto_out.GetAllInstitutions, "institutions")
 
 
 @router.get("/{institution_id}",
@@ -37,7 +38,7 @@ async def get_institutions(db: DB, token: AUTH):
 async def get_institution_by_id(db: DB, institution_id: str, token: AUTH):
     """Get institution by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    institution = service.get_institution_by_id(db, institution_id, current_user_id)
+    institution = await service.get_institution_by_id(db, institution_id, current_user_id)
     return dto_out.GetInstitution(institution=institution)
 
 
@@ -47,7 +48,7 @@ async def get_institution_by_id(db: DB, institution_id: str, token: AUTH):
 async def create_institution(db: DB, request: dto_in.CreateInstitution, token: AUTH):
     """Create a new institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    institution = service.create_institution(db, request, current_user_id)
+    institution = await service.create_institution(db, request, current_user_id)
     return dto_out.GetInstitution(institution=institution)
 
 
@@ -56,7 +57,7 @@ async def create_institution(db: DB, request: dto_in.CreateInstitution, token: A
 async def delete_institution(db: DB, institution_id: str, token: AUTH):
     """Delete an institution by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_institution(db, institution_id, current_user_id)
+    await service.delete_institution(db, institution_id, current_user_id)
 
 
 @router.put("/{institution_id}",
@@ -70,7 +71,7 @@ async def update_institution(
 ):
     """Update an institution by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    institution = service.update_institution(db, institution_id, request, current_user_id)
+    institution = await service.update_institution(db, institution_id, request, current_user_id)
     return dto_out.GetInstitution(institution=institution)
 
 
@@ -80,7 +81,7 @@ async def update_institution(
 async def get_institution_courses(db: DB, institution_id: str, token: AUTH):
     """Get all courses for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    courses = service.get_institution_courses(db, institution_id, current_user_id)
+    courses = await service.get_institution_courses(db, institution_id, current_user_id)
     return dto_out.GetInstitutionCourses(courses=courses)
 
 
@@ -90,7 +91,7 @@ async def get_institution_courses(db: DB, institution_id: str, token: AUTH):
 async def get_institution_rooms(db: DB, institution_id: str, token: AUTH):
     """Get all rooms for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    rooms = service.get_institution_rooms(db, institution_id, current_user_id)
+    rooms = await service.get_institution_rooms(db, institution_id, current_user_id)
     return dto_out.GetInstitutionRooms(rooms=rooms)
 
 
@@ -100,7 +101,7 @@ async def get_institution_rooms(db: DB, institution_id: str, token: AUTH):
 async def get_institution_groups(db: DB, institution_id: str, token: AUTH):
     """Get all groups for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    groups = service.get_institution_groups(db, institution_id, current_user_id)
+    groups = await service.get_institution_groups(db, institution_id, current_user_id)
     return dto_out.GetInstitutionGroups(groups=groups)
 
 
@@ -110,7 +111,7 @@ async def get_institution_groups(db: DB, institution_id: str, token: AUTH):
 async def get_institution_users(db: DB, institution_id: str, token: AUTH):
     """Get all users for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    users = service.get_institution_users(db, institution_id, current_user_id)
+    users = await service.get_institution_users(db, institution_id, current_user_id)
     return dto_out.GetInstitutionUsers(users=users)
 
 
@@ -120,10 +121,49 @@ async def get_institution_users(db: DB, institution_id: str, token: AUTH):
 async def get_institution_activities(db: DB, institution_id: str, token: AUTH):
     """Get all activities for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = service.get_institution_activities(db, institution_id, current_user_id)
+    activities = await service.get_institution_activities(db, institution_id, current_user_id)
     return dto_out.GetInstitutionActivities(activities=activities)
 
 
+@router.get("/{institution_id}/solver-snapshot",
+            status_code=status.HTTP_200_OK,
+            response_model=dto_out.GetInstitutionSolverSnapshot)
+async def get_institution_solver_snapshot(db: DB, institution_id: str, token: AUTH):
+    """Get the schedule generator's input for an institution in one call:
+    rooms, groups, activities, the professors they reference (reduced to this
+    institution's preferences) and per-group student counts."""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    snapshot = await service.get_institution_solver_snapshot(db, institution_id, current_user_id)
+    return dto_out.GetInstitutionSolverSnapshot(snapshot=snapshot)
+
+
+@router.get("/{institution_id}/solution-hints",
+            status_code=status.HTTP_200_OK,
+            response_model=dto_out.GetInstitutionSolutionHints)
+async def get_institution_solution_hints(db: DB, institution_id: str, token: AUTH):
+    """Get the schedule generator's warm-start hints: each activity's placement
+    in the last generated timetable, keyed by activity fingerprint."""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    hints = await service.get_institution_solution_hints(db, institution_id, current_user_id)
+    return dto_out.GetInstitutionSolutionHints(hints=hints)
+
+
+@router.put("/{institution_id}/solution-hints",
+            status_code=status.HTTP_200_OK,
+            response_model=dto_out.GetInstitutionSolutionHints)
+async def update_institution_solution_hints(
+        db: DB,
+        institution_id: str,
+        request: dto_in.UpdateSolutionHints,
+        token: AUTH
+):
+    """Replace the schedule generator's warm-start hints (written by the worker
+    after each generation)"""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    hints = await service.update_institution_solution_hints(db, institution_id, request, current_user_id)
+    return dto_out.GetInstitutionSolutionHints(hints=hints)
+
+
 @router.get("/{institution_id}/schedule-eta",
             status_code=status.HTTP_200_OK,
             response_model=ScheduleEtaResponse)
@@ -132,21 +172,49 @@ async def get_schedule_eta(db: DB, institution_id: str, token: AUTH):
     institution, in seconds.  Used by the UI to render a progress indicator
     while generation is running."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = service.get_institution_activities(db, institution_id, current_user_id)
+    activities = await service.get_institution_activities(db, institution_id, current_user_id)
+    calibration = await service.get_eta_calibration(db, institution_id, current_user_id)
     num_activities = len(activities)
     return ScheduleEtaResponse(
         num_activities=num_activities,
-        eta_seconds=eta_helper.estimate_total_duration_seconds(num_activities),
+        eta_seconds=eta_helper.estimate_total_duration_seconds(num_activities, calibration),
     )
 
 
+@router.get("/{institution_id}/eta-calibration",
+            status_code=status.HTTP_200_OK,
+            response_model=dto_out.GetEtaCalibration)
+async def get_eta_calibration(db: DB, institution_id: str, token: AUTH):
+    """Get the schedule generator's duration model - the coefficients behind
+    solver budgets, stagnation limits and the ETA - fitted to the deployment's
+    recent runs."""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    calibration = await service.get_eta_calibration(db, institution_id, current_user_id)
+    return dto_out.GetEtaCalibration(calibration=calibration)
+
+
+@router.post("/{institution_id}/solve-telemetry",
+             status_code=status.HTTP_201_CREATED,
+             response_model=models.SolveTelemetry)
+async def record_solve_telemetry(
+        db: DB,
+        institution_id: str,
+        request: dto_in.RecordSolveTelemetry,
+        token: AUTH
+):
+    """Record the features and timings of one schedule generation (written by
+    the worker after each run)"""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    return await service.record_solve_telemetry(db, institution_id, request, current_user_id)
+
+
 @router.get("/{institution_id}/schedules",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetInstitutionSchedules)
 async def get_institution_schedules(db: DB, institution_id: str, token: AUTH):
     """Get all schedules for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    schedules = service.get_institution_schedules(db, institution_id, current_user_id)
+    schedules = await service.get_institution_schedules(db, institution_id, current_user_id)
     return dto_out.GetInstitutionSchedules(schedules=schedules)
 
 
@@ -161,7 +229,7 @@ async def assign_role_to_user(
 ):
     """Assign a role to a user for a specific institution"""
     current_user = token_utils.get_user_id_from_token(token)
-    service.assign_role_to_user(db, user_id, institution_id, role, current_user)
+    await service.assign_role_to_user(db, user_id, institution_id, role, current_user)
 
 
 @router.delete("/{institution_id}/users/{user_id}/roles/{role}",
@@ -175,7 +243,7 @@ async def remove_role_from_user(
 ):
     """Remove a role from a user for a specific institution"""
     current_user = token_utils.get_user_id_from_token(token)
-    service.remove_role_from_user(db, user_id, institution_id, role, current_user)
+    await service.remove_role_from_user(db, user_id, institution_id, role, current_user)
 
 
 @router.delete("/{institution_id}/users/{user_id}",
@@ -188,7 +256,7 @@ async def remove_user_from_institution(
 ):
     """Remove all roles from a user for a specific institution"""
     current_user = token_utils.get_user_id_from_token(token)
-    service.remove_user_from_institution(db, user_id, institution_id, current_user)
+    await service.remove_user_from_institution(db, user_id, institution_id, current_user)
 
 
 @router.put("/{institution_id}/active-schedule",
@@ -202,5 +270,5 @@ async def set_active_schedule(
 ):
     """Set or clear the active schedule for an institution (admin only)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    institution = service.set_active_schedule(db, institution_id, request.schedule_id, current_user_id)
+    institution = await service.set_active_schedule(db, institution_id, request.schedule_id, current_user_id)
     return dto_out.GetInstitution(institution=institution)
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/api/v1", tags=["reservations"])
 async def get_reservations(db: DB, institution_id: str, token: AUTH):
     """List all reservations for an institution (any member)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    reservations = service.get_reservations(db, institution_id, current_user_id)
+    reservations = await service.get_reservations(db, institution_id, current_user_id)
     return dto_out.GetReservations(reservations=reservations)
 
 
@@ -30,7 +30,7 @@ async def create_reservation(
 ):
     """Request a room reservation (any member).  Rejected with 409 on conflict."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    reservation = service.create_reservation(db, institution_id, request, current_user_id)
+    reservation = await service.create_reservation(db, institution_id, request, current_user_id)
     return dto_out.GetReservation(reservation=reservation)
 
 
@@ -42,7 +42,7 @@ async def check_reservation_conflict(
 ):
     """Pre-submit conflict check for a proposed reservation."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    return service.check_conflict(db, institution_id, request, current_user_id)
+    return await service.check_conflict(db, institution_id, request, current_user_id)
 
 
 @router.post("/reservations/{reservation_id}/approve",
@@ -51,7 +51,7 @@ async def check_reservation_conflict(
 async def approve_reservation(db: DB, reservation_id: str, token: AUTH):
     """Approve a pending reservation (admin only)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    reservation = service.approve_reservation(db, reservation_id, current_user_id)
+    reservation = await service.approve_reservation(db, reservation_id, current_user_id)
     return dto_out.GetReservation(reservation=reservation)
 
 
@@ -63,7 +63,7 @@ async def refuse_reservation(
 ):
     """Refuse a reservation with an optional reason (admin only)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    reservation = service.refuse_reservation(db, reservation_id, request, current_user_id)
+    reservation = await service.refuse_reservation(db, reservation_id, request, current_user_id)
     return dto_out.GetReservation(reservation=reservation)
 
 
@@ -72,4 +72,4 @@ async def refuse_reservation(
 async def delete_reservation(db: DB, reservation_id: str, token: AUTH):
     """Delete a reservation (owner if pending, otherwise admin)."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_reservation(db, reservation_id, current_user_id)
+    await service.delete_reservation(db, reservation_id, current_user_id)
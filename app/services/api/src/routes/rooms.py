@@ -1,7 +1,9 @@
 from starlette import status
 from fastapi import APIRouter
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import rooms as service
@@ -15,11 +17,11 @@ router = APIRouter(prefix="/api/v1/rooms", tags=["rooms"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllRooms)
-async def get_rooms(db: DB, token: AUTH):
-    """Get all rooms"""
+async def get_rooms(db: DB, token: AUTH, params: listing.LIST):
+    """Get all rooms - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    rooms = service.get_rooms(db, current_user_id)
-    return dto_out.GetAllRooms(rooms=rooms)
+    rooms = await service.get_rooms(db, current_user_id, params)
+    return await listing.respond(rooms, params, models.Room, dto_out.GetAllRooms, "rooms")
 
 
 @router.get("/{room_id}",
@@ -28,7 +30,7 @@ async def get_rooms(db: DB, token: AUTH):
 async def get_room_by_id(db: DB, room_id: str, token: AUTH):
     """Get room by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    room = service.get_room_by_id(db, room_id, current_user_id)
+    room = await service.get_room_by_id(db, room_id, current_user_id)
     return dto_out.GetRoom(room=room)
 
 
@@ -38,7 +40,7 @@ async def get_room_by_id(db: DB, room_id: str, token: AUTH):
 async def create_room(db: DB, request: dto_in.CreateRoom, token: AUTH):
     """Create a new room"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    room = service.create_room(db, request, current_user_id)
+    room = await service.create_room(db, request, current_user_id)
     return dto_out.GetRoom(room=room)
 
 
@@ -47,7 +49,7 @@ async def create_room(db: DB, request: dto_in.CreateRoom, token: AUTH):
 async def delete_room(db: DB, room_id: str, token: AUTH):
     """Delete a room by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_room(db, room_id, current_user_id)
+    await service.delete_room(db, room_id, current_user_id)
 
 
 @router.put("/{room_id}",
@@ -56,5 +58,5 @@ async def delete_room(db: DB, room_id: str, token: AUTH):
 async def update_room(db: DB, room_id: str, request: dto_in.UpdateRoom, token: AUTH):
     """Update a room by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    room = service.update_room(db, room_id, request, current_user_id)
+    room = await service.update_room(db, room_id, request, current_user_id)
     return dto_out.GetRoom(room=room)
@@ -1,7 +1,11 @@
+from typing import Optional
+
 from starlette import status
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import scheduled_activities as service
@@ -15,11 +19,26 @@ router = APIRouter(prefix="/api/v1/scheduled_activities", tags=["scheduled_activ
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllScheduledActivities)
-async def get_scheduled_activities(db: DB, token: AUTH):
-    """Get all scheduled_activities"""
+async def get_scheduled_activities(
+        db: DB,
+        token: AUTH,
+        params: listing.LIST,
+        schedule_id: Optional[str] = Query(None),
+        room_id: Optional[str] = Query(None),
+        professor_id: Optional[str] = Query(None),
+        group_id: Optional[str] = Query(None),
+        week: Optional[int] = Query(None, ge=0),
+):
+    """Get all scheduled_activities - paginated, projectable and streamable (see ``listing``).
+
+    Filter by schedule, room, professor, group (its own activities and its
+    ancestors') or week (0-based) to fetch only what a view renders."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    scheduled_activities = service.get_scheduled_activities(db, current_user_id)
-    return dto_out.GetAllScheduledActivities(scheduled_activities=scheduled_activities)
+    scheduled_activities = await service.get_scheduled_activities(
+        db, current_user_id, params,
+        schedule_id=schedule_id, room_id=room_id, professor_id=professor_id, group_id=group_id, week=week,
+    )
+    return await listing.respond(scheduled_activities, params, models.ScheduledActivity, dto_out.GetAllScheduledActivities, "scheduled_activities")
 
 
 @router.get("/{scheduled_activity_id}",
@@ -28,7 +47,7 @@ async def get_scheduled_activities(db: DB, token: AUTH):
 async def get_scheduled_activity_by_id(db: DB, scheduled_activity_id: str, token: AUTH):
     """Get scheduled_activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    scheduled_activity = service.get_scheduled_activity_by_id(
+    scheduled_activity = await service.get_scheduled_activity_by_id(
         db, scheduled_activity_id, current_user_id
     )
     return dto_out.GetScheduledActivity(scheduled_activity=scheduled_activity)
@@ -40,7 +59,7 @@ async def get_scheduled_activity_by_id(db: DB, scheduled_activity_id: str, token
 async def create_scheduled_activity(db: DB, request: dto_in.CreateScheduledActivity, token: AUTH):
     """Create a new scheduled_activity"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    scheduled_activity = service.create_scheduled_activity(db, request, current_user_id)
+    scheduled_activity = await service.create_scheduled_activity(db, request, current_user_id)
     return dto_out.GetScheduledActivity(scheduled_activity=scheduled_activity)
 
 
@@ -49,7 +68,7 @@ async def create_scheduled_activity(db: DB, request: dto_in.CreateScheduledActiv
 async def delete_scheduled_activity(db: DB, scheduled_activity_id: str, token: AUTH):
     """Delete a scheduled_activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_scheduled_activity(db, scheduled_activity_id, current_user_id)
+    await service.delete_scheduled_activity(db, scheduled_activity_id, current_user_id)
 
 
 @router.put("/{scheduled_activity_id}",
@@ -63,7 +82,7 @@ async def update_scheduled_activity(
 ):
     """Update a scheduled_activity by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    scheduled_activity = service.update_scheduled_activity(
+    scheduled_activity = await service.update_scheduled_activity(
         db, scheduled_activity_id, request, current_user_id
     )
     return dto_out.GetScheduledActivity(scheduled_activity=scheduled_activity)
@@ -77,4 +96,4 @@ async def insert_scheduled_activities_bulk(
 ):
     """Create scheduled_activities in bulk"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.insert_scheduled_activities_bulk(db, request, current_user_id)
+    await service.insert_scheduled_activities_bulk(db, request, current_user_id)
@@ -1,11 +1,15 @@
 from starlette import status
+from starlette.responses import StreamingResponse
 from fastapi import APIRouter
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import schedules as service
 from app.services.api.src.services import scheduled_activities as sa_service
+from app.services.api.src.services import schedule_progress as progress_service
 from app.services.api.src.dtos.input import schedule as dto_in
 from app.services.api.src.dtos.input import scheduled_activity as sa_dto_in
 from app.services.api.src.dtos.output import schedule as dto_out
@@ -17,16 +21,16 @@ router = APIRouter(prefix="/api/v1/schedules", tags=["schedules"])
 async def trigger_schedule_generation(db: DB, request: dto_in.CreateSchedule, token: AUTH):
     """Trigger the schedule generation process for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    schedule = service.trigger_schedule_generation(db, request, current_user_id, token)
+    schedule = await service.trigger_schedule_generation(db, request, current_user_id, token)
     return dto_out.GetSchedule(schedule=schedule)
 
 
 @router.get("/", status_code=status.HTTP_200_OK, response_model=dto_out.GetAllSchedules)
-async def get_schedules(db: DB, token: AUTH):
-    """Get all schedules"""
+async def get_schedules(db: DB, token: AUTH, params: listing.LIST):
+    """Get all schedules - paginated, projectable and streamable (see ``listing``)"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    schedules = service.get_schedules(db, current_user_id)
-    return dto_out.GetAllSchedules(schedules=schedules)
+    schedules = await service.get_schedules(db, current_user_id, params)
+    return await listing.respond(schedules, params, models.Schedule, dto_out.GetAllSchedules, "schedules")
 
 
 @router.get("/{schedule_id}",
@@ -35,17 +39,32 @@ async def get_schedules(db: DB, token: AUTH):
 async def get_schedule_by_id(db: DB, schedule_id: str, token: AUTH):
     """Get schedule by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    schedule = service.get_schedule_by_id(db, schedule_id, current_user_id)
+    schedule = await service.get_schedule_by_id(db, schedule_id, current_user_id)
     return dto_out.GetSchedule(schedule=schedule)
 
 
+@router.get("/{schedule_id}/progress",
+            status_code=status.HTTP_200_OK,
+            response_class=StreamingResponse)
+async def stream_schedule_progress(db: DB, schedule_id: str, token: AUTH):
+    """Stream the schedule's generation progress as Server-Sent Events (see ``schedule_progress``)"""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    events = await progress_service.stream_schedule_progress(db, schedule_id, current_user_id)
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # No caching, and no buffering in nginx: each event must reach the client as sent.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/{schedule_id}",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetSchedule)
 async def update_schedule(db: DB, schedule_id: str, request: dto_in.UpdateSchedule, token: AUTH):
     """Update a schedule by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    schedule = service.update_schedule(db, schedule_id, request, current_user_id)
+    schedule = await service.update_schedule(db, schedule_id, request, current_user_id)
     return dto_out.GetSchedule(schedule=schedule)
 
 
@@ -53,7 +72,7 @@ async def update_schedule(db: DB, schedule_id: str, request: dto_in.UpdateSchedu
 async def delete_schedule(db: DB, schedule_id: str, token: AUTH):
     """Delete a schedule by ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_schedule(db, schedule_id, current_user_id)
+    await service.delete_schedule(db, schedule_id, current_user_id)
 
 
 @router.put("/{schedule_id}/scheduled-activities",
@@ -67,28 +86,59 @@ async def replace_scheduled_activities(
 ):
     """Replace all scheduled activities for this schedule atomically.
 
-    Used by the worker for intermediate saves during long-running schedule
-    generation: every new incumbent solution is persisted, so the UI can
-    display partial progress without waiting for the solver to terminate."""
+    Used by the worker for the first save of a generation; see the PATCH
+    below for the incremental saves that follow."""
     current_user_id = token_utils.get_user_id_from_token(token)
-    activities = sa_service.replace_scheduled_activities_for_schedule(
+    activities = await sa_service.replace_scheduled_activities_for_schedule(
         db, schedule_id, request, current_user_id
     )
     return dto_out.GetScheduledActivitiesBySchedule(scheduled_activities=activities)
 
 
+@router.patch("/{schedule_id}/scheduled-activities", status_code=status.HTTP_204_NO_CONTENT)
+async def patch_scheduled_activities(
+    db: DB,
+    schedule_id: str,
+    request: sa_dto_in.PatchScheduledActivities,
+    token: AUTH,
+):
+    """Upsert and delete scheduled activities of this schedule in one call.
+
+    Used by the worker for intermediate saves during long-running schedule
+    generation: each new incumbent is sent as its diff from the previous
+    one, so the UI can display partial progress without waiting for the
+    solver to terminate."""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    await sa_service.patch_scheduled_activities_for_schedule(db, schedule_id, request, current_user_id)
+
+
 @router.get("/{schedule_id}/scheduled-activities",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetScheduledActivitiesBySchedule)
 async def get_scheduled_activities_by_schedule_id(db: DB, schedule_id: str, token: AUTH):
     """Get scheduled activities by schedule ID"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    scheduled_activities = service.get_scheduled_activities_by_schedule_id(
+    scheduled_activities = await service.get_scheduled_activities_by_schedule_id(
         db, schedule_id, current_user_id
     )
     return dto_out.GetScheduledActivitiesBySchedule(scheduled_activities=scheduled_activities)
 
 
+@router.get("/{schedule_id}/scheduled-activities/packed",
+            status_code=status.HTTP_200_OK,
+            response_model=dto_out.GetPackedScheduledActivities)
+async def get_packed_scheduled_activities_by_schedule_id(db: DB, schedule_id: str, token: AUTH):
+    """Get scheduled activities by schedule ID as parallel columns.
+
+    Same records as ``/scheduled-activities``, with activity and room ids
+    sent once and every per-record field as an int column - a fraction of
+    the payload and of the serialisation work for large timetables."""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    return await service.get_packed_scheduled_activities_by_schedule_id(
+        db, schedule_id, current_user_id
+    )
+
+
 @router.post("/{schedule_id}/check-conflicts",
              status_code=status.HTTP_200_OK,
              response_model=dto_out.CheckConflictsResponse)
@@ -101,7 +151,7 @@ async def check_conflicts(
     falsely flag itself as a conflict.
     """
     current_user_id = token_utils.get_user_id_from_token(token)
-    return service.check_conflicts(db, schedule_id, request, current_user_id)
+    return await service.check_conflicts(db, schedule_id, request, current_user_id)
 
 
 @router.patch("/{schedule_id}/records",
@@ -115,5 +165,5 @@ async def batch_update_records(
     Returns HTTP 409 with a conflict list when conflicts exist and force=false.
     """
     current_user_id = token_utils.get_user_id_from_token(token)
-    updated = service.batch_update_records(db, schedule_id, request, current_user_id)
+    updated = await service.batch_update_records(db, schedule_id, request, current_user_id)
     return dto_out.GetScheduledActivitiesBySchedule(scheduled_activities=updated)
@@ -1,7 +1,11 @@
+from typing import Optional
+
 from starlette import status
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 
+from app.libs.db import models
 from app.libs.db.db import DB
+from app.services.api.src import listing
 from app.services.api.src.auth import token_utils
 from app.services.api.src.auth.token_utils import AUTH
 from app.services.api.src.services import users as service
@@ -14,17 +18,18 @@ router = APIRouter(prefix="/api/v1/users", tags=["users"])
 @router.get("/",
             status_code=status.HTTP_200_OK,
             response_model=dto_out.GetAllUsers)
-async def get_users(db: DB):
-    """Get all users"""
-    users = service.get_users(db)
-    return dto_out.GetAllUsers(users=users)
+async def get_users(db: DB, token: AUTH, params: listing.LIST, email: Optional[str] = Query(None)):
+    """Get all users - paginated, projectable and streamable (see ``listing``)"""
+    current_user_id = token_utils.get_user_id_from_token(token)
+    users = await service.get_users(db, current_user_id, params, email)
+    return await listing.respond(users, params, models.User, dto_out.GetAllUsers, "users")
 
 
 @router.get("/me", status_code=status.HTTP_200_OK, response_model=dto_out.GetUser)
 async def get_current_user(db: DB, token: AUTH):
     """Get the currently authenticated user"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    user = service.get_user_by_id(db, current_user_id)
+    user = await service.get_user_by_id(db, current_user_id)
     return dto_out.GetUser(user=user)
 
 
@@ -33,7 +38,7 @@ async def get_current_user(db: DB, token: AUTH):
             response_model=dto_out.GetUser)
 async def get_user_by_id(db: DB, user_id: str):
     """Get user by ID"""
-    user = service.get_user_by_id(db, user_id)
+    user = await service.get_user_by_id(db, user_id)
     return dto_out.GetUser(user=user)
 
 
@@ -42,7 +47,7 @@ async def get_user_by_id(db: DB, user_id: str):
              response_model=dto_out.GetUser)
 async def create_user(db: DB, request: dto_in.CreateUser):
     """Create a new user"""
-    user = service.create_user(db, request)
+    user = await service.create_user(db, request)
     return dto_out.GetUser(user=user)
 
 
@@ -52,7 +57,7 @@ async def create_user(db: DB, request: dto_in.CreateUser):
 async def update_user(db: DB, token: AUTH, request: dto_in.UpdateUser):
     """Update current user"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    user = service.update_user(db, current_user_id, request)
+    user = await service.update_user(db, current_user_id, request)
     return dto_out.GetUser(user=user)
 
 
@@ -61,7 +66,7 @@ async def update_user(db: DB, token: AUTH, request: dto_in.UpdateUser):
 async def delete_user(db: DB, token: AUTH):
     """Delete current user"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    service.delete_user(db, current_user_id)
+    await service.delete_user(db, current_user_id)
 
 
 @router.put("/me/timeslot-preferences/{institution_id}",
@@ -70,7 +75,7 @@ async def delete_user(db: DB, token: AUTH):
 async def update_timeslot_preferences(db: DB, token: AUTH, institution_id: str, request: dto_in.UpdateTimeslotPreferences):
     """Set professor timeslot preferences for a specific institution"""
     current_user_id = token_utils.get_user_id_from_token(token)
-    user = service.update_timeslot_preferences(db, current_user_id, institution_id, request)
+    user = await service.update_timeslot_preferences(db, current_user_id, institution_id, request)
     return dto_out.GetUser(user=user)
 
 
@@ -79,5 +84,5 @@ async def update_timeslot_preferences(db: DB, token: AUTH, institution_id: str,
             response_model=dto_out.GetProfessorActivities)
 async def get_professor_activities(db: DB, professor_id: str):
     """Get all activities for a professor"""
-    activities = service.get_professor_activities(db, professor_id)
+    activities = await service.get_professor_activities(db, professor_id)
     return dto_out.GetProfessorActivities(activities=activities)
@@ -1,12 +1,13 @@
-from typing import List
-
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
+from app.services.api.src.services import schedule_snapshots
 from app.services.api.src.dtos.input import activity as dto_in
 from app.services.api.src.repositories import (
     activities as activities_repo,
@@ -19,38 +20,18 @@ from app.services.api.src.repositories import (
 logger = get_logger()
 
 
-def get_activities(db: Database, current_user_id: str) -> List[models.Activity]:
-    """Get all activities"""
+async def get_activities(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the activities of the user's institutions"""
     logger.info("Fetching all activities")
-    try:
-        activities_data = activities_repo.find_all_activities(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve activities: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving activities: {str(e)}"
-        )
-
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-    activities = [models.Activity(**activity) for activity in activities_data
-                  if activity['institution_id'] in user.user_roles]
-    logger.info(f"Fetched {len(activities)} activities")
-
-    return activities
+    user = await principals.get_principal(db, current_user_id)
+    return activities_repo.find_activities_by_institution_ids(db, list(user.user_roles), params)
 
 
-def get_activity_by_id(db: Database, activity_id: str, current_user_id: str) -> models.Activity:
+async def get_activity_by_id(db: AsyncDatabase, activity_id: str, current_user_id: str) -> models.Activity:
     """Get activity by ID"""
     logger.info(f"Fetching activity by id: {activity_id}")
     try:
-        activity_data = activities_repo.find_activity_by_id(db, activity_id)
+        activity_data = await activities_repo.find_activity_by_id(db, activity_id)
     except Exception as e:
         logger.error(f"Failed to retrieve activity {activity_id}: {e}")
         raise HTTPException(
@@ -66,14 +47,14 @@ def get_activity_by_id(db: Database, activity_id: str, current_user_id: str) ->
         )
 
     activity = models.Activity(**activity_data)
-    access_verifiers.raise_activity_forbidden(db, current_user_id, activity)
+    await access_verifiers.raise_activity_forbidden(db, current_user_id, activity)
 
     logger.info(f"Fetched activity: {activity.id}")
 
     return activity
 
 
-def create_activity(db: Database, request: dto_in.CreateActivity, current_user_id: str) -> models.Activity:
+async def create_activity(db: AsyncDatabase, request: dto_in.CreateActivity, current_user_id: str) -> models.Activity:
     """Create a new activity"""
     logger.info(
         f"Creating activity for institution={request.institution_id}"
@@ -81,9 +62,9 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
     )
 
     activity = models.Activity(**request.model_dump())
-    access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
+    await access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
 
-    institution = institutions_repo.find_institution_by_id(db, request.institution_id)
+    institution = await institutions_repo.find_institution_by_id(db, request.institution_id)
     if not institution:
         logger.error(f"Institution not found: {request.institution_id}")
         raise HTTPException(
@@ -91,7 +72,7 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
             detail=f"Institution with id {request.institution_id} not found."
         )
 
-    course = courses_repo.find_course_by_id(db, request.course_id)
+    course = await courses_repo.find_course_by_id(db, request.course_id)
     if not course:
         logger.error(f"Course not found: {request.course_id}")
         raise HTTPException(
@@ -117,7 +98,7 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
         )
 
     for gid in request.group_ids:
-        group_data = groups_repo.find_group_by_id(db, gid)
+        group_data = await groups_repo.find_group_by_id(db, gid)
         if not group_data:
             logger.error(f"Group not found: {gid}")
             raise HTTPException(
@@ -135,7 +116,7 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
                        f" institution with id {request.institution_id}."
             )
 
-    professor = users_repo.find_user_by_id(db, request.professor_id)
+    professor = await users_repo.find_user_by_id(db, request.professor_id)
     if not professor:
         logger.error(f"Professor not found: {request.professor_id}")
         raise HTTPException(
@@ -156,7 +137,7 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
         )
 
     try:
-        activities_repo.insert_activity(db, activity)
+        await activities_repo.insert_activity(db, activity)
     except Exception as e:
         logger.error(f"Failed to create activity: {e}")
         raise HTTPException(
@@ -164,19 +145,20 @@ def create_activity(db: Database, request: dto_in.CreateActivity, current_user_i
             detail=f"Error creating activity: {str(e)}"
         )
 
+    await schedule_snapshots.bump_institution(db, activity.institution_id)
     logger.info(f"Created activity {activity.id}")
     return activity
 
 
-def delete_activity(db: Database, activity_id: str, current_user_id: str) -> None:
+async def delete_activity(db: AsyncDatabase, activity_id: str, current_user_id: str) -> None:
     """Delete an activity by ID"""
     logger.info(f"Deleting activity {activity_id}")
 
-    activity = get_activity_by_id(db, activity_id, current_user_id)
-    access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
+    activity = await get_activity_by_id(db, activity_id, current_user_id)
+    await access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
 
     try:
-        result = activities_repo.delete_activity_by_id(db, activity_id)
+        result = await activities_repo.delete_activity_by_id(db, activity_id)
     except Exception as e:
         logger.error(f"Failed to delete activity {activity_id}: {e}")
         raise HTTPException(
@@ -190,11 +172,12 @@ def delete_activity(db: Database, activity_id: str, current_user_id: str) -> Non
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Activity with id {activity_id} not found."
         )
+    await schedule_snapshots.bump_institution(db, activity.institution_id)
     logger.info(f"Deleted activity {activity_id}")
 
 
-def update_activity(
-        db: Database,
+async def update_activity(
+        db: AsyncDatabase,
         activity_id: str,
         request: dto_in.UpdateActivity,
         current_user_id: str
@@ -203,13 +186,13 @@ def update_activity(
     logger.info(
         f"Updating activity {activity_id} with data {request.model_dump(exclude_unset=True)}"
     )
-    activity = get_activity_by_id(db, activity_id, current_user_id)
-    access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
+    activity = await get_activity_by_id(db, activity_id, current_user_id)
+    await access_verifiers.raise_activity_forbidden(db, current_user_id, activity, admin_only=True)
 
     updated_data = request.model_dump(exclude_unset=True)
 
     if "course_id" in updated_data:
-        course = courses_repo.find_course_by_id(db, updated_data["course_id"])
+        course = await courses_repo.find_course_by_id(db, updated_data["course_id"])
         if not course:
             logger.error(f"Course not found for update: {updated_data['course_id']}")
             raise HTTPException(
@@ -235,7 +218,7 @@ def update_activity(
                 detail="At least one group_id is required."
             )
         for gid in updated_data["group_ids"]:
-            group_data = groups_repo.find_group_by_id(db, gid)
+            group_data = await groups_repo.find_group_by_id(db, gid)
             if not group_data:
                 logger.error(f"Group not found for update: {gid}")
                 raise HTTPException(
@@ -254,7 +237,7 @@ def update_activity(
                 )
 
     if "professor_id" in updated_data:
-        professor = users_repo.find_user_by_id(db, updated_data["professor_id"])
+        professor = await users_repo.find_user_by_id(db, updated_data["professor_id"])
         if not professor:
             logger.error(f"Professor not found for update: {updated_data['professor_id']}")
             raise HTTPException(
@@ -274,7 +257,7 @@ def update_activity(
             )
 
     try:
-        result = activities_repo.update_activity_by_id(db, activity_id, updated_data)
+        result = await activities_repo.update_activity_by_id(db, activity_id, updated_data)
     except Exception as e:
         logger.error(f"Failed to update activity {activity_id}: {e}")
         raise HTTPException(
@@ -289,6 +272,7 @@ def update_activity(
             detail=f"Activity with id {activity_id} not found."
         )
 
-    updated = get_activity_by_id(db, activity_id, current_user_id)
+    updated = await get_activity_by_id(db, activity_id, current_user_id)
+    await schedule_snapshots.bump_institution(db, updated.institution_id)
     logger.info(f"Updated activity {updated.id}")
     return updated
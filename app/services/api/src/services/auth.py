@@ -2,14 +2,14 @@ import os
 import hashlib
 
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
-from app.libs.stringproc import stringproc
 from app.libs.logging.logger import get_logger
 from app.services.api.src.repositories import users as users_repo
-from app.services.api.src.auth import token_utils
+from app.services.api.src.auth import cpu_pool, token_utils
 from app.services.api.src.services import email as email_service
 
 
@@ -44,8 +44,8 @@ MICROSOFT_JWKS_URI = os.getenv(
 _ms_jwks_client = None
 
 
-def _find_or_create_provider_user(
-    db: Database,
+async def _find_or_create_provider_user(
+    db: AsyncDatabase,
     provider: str,
     subject: str,
     email: str | None,
@@ -58,15 +58,15 @@ def _find_or_create_provider_user(
     by *verified* email; 3) else create a new account.  Returns an
     (access_token, refresh_token) tuple - the same session as a password login.
     """
-    user_data = users_repo.find_user_by_provider(db, provider, subject)
+    user_data = await users_repo.find_user_by_provider(db, provider, subject)
     if not user_data and email and email_verified:
-        user_data = users_repo.find_user_by_email(db, email)
+        user_data = await users_repo.find_user_by_email(db, email)
 
     if user_data:
         user = models.User(**user_data)
         if user.provider_identities.get(provider) != subject:
             user.provider_identities[provider] = subject
-            users_repo.update_user_by_id(
+            await users_repo.update_user_by_id(
                 db, str(user.id), {"provider_identities": user.provider_identities}
             )
     else:
@@ -77,13 +77,13 @@ def _find_or_create_provider_user(
             )
         # Don't silently take over an existing (e.g. password) account when the
         # email isn't verified by the provider.
-        if users_repo.find_user_by_email(db, email):
+        if await users_repo.find_user_by_email(db, email):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="An account with this email already exists. Sign in with your password.",
             )
         user = models.User(name=name, email=email, provider_identities={provider: subject})
-        users_repo.insert_user(db, user)
+        await users_repo.insert_user(db, user)
         logger.info(f"Created user {user.id} via {provider} sign-in ({email})")
 
     payload = {"sub": str(user.id), "email": user.email}
@@ -112,17 +112,18 @@ def _verify_google_credential(credential: str) -> dict:
     return idinfo
 
 
-def get_google_login_token(db: Database, credential: str) -> tuple[str, str]:
+async def get_google_login_token(db: AsyncDatabase, credential: str) -> tuple[str, str]:
     """Verify a Google sign-in, find/create/link the user, and return an
     (access_token, refresh_token) tuple - the same session as a password login."""
-    idinfo = _verify_google_credential(credential)
+    # Token verification may fetch the provider's signing keys over HTTP.
+    idinfo = await run_in_threadpool(_verify_google_credential, credential)
     sub = idinfo.get("sub")
     email = idinfo.get("email")
     email_verified = bool(idinfo.get("email_verified"))
     name = idinfo.get("name") or (email.split("@")[0] if email else "User")
     if not sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Google credential.")
-    return _find_or_create_provider_user(db, "google", sub, email, email_verified, name)
+    return await _find_or_create_provider_user(db, "google", sub, email, email_verified, name)
 
 
 def _verify_microsoft_credential(credential: str) -> dict:
@@ -166,10 +167,10 @@ def _verify_microsoft_credential(credential: str) -> dict:
     return claims
 
 
-def get_microsoft_login_token(db: Database, credential: str) -> tuple[str, str]:
+async def get_microsoft_login_token(db: AsyncDatabase, credential: str) -> tuple[str, str]:
     """Verify a Microsoft sign-in, find/create/link the user, and return an
     (access_token, refresh_token) tuple - the same session as a password login."""
-    claims = _verify_microsoft_credential(credential)
+    claims = await run_in_threadpool(_verify_microsoft_credential, credential)
     sub = claims.get("sub")
     # Work/school tokens often carry the address in `preferred_username` (the
     # UPN) rather than `email`; only trust it if it actually looks like an email.
@@ -181,13 +182,13 @@ def get_microsoft_login_token(db: Database, credential: str) -> tuple[str, str]:
     if not sub:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid Microsoft credential.")
     # Microsoft issues and controls these addresses, so treat them as verified.
-    return _find_or_create_provider_user(db, "microsoft", sub, email, bool(email), name)
+    return await _find_or_create_provider_user(db, "microsoft", sub, email, bool(email), name)
 
 
-def get_login_token(db: Database, email: str, password: str) -> tuple[str, str]:
+async def get_login_token(db: AsyncDatabase, email: str, password: str) -> tuple[str, str]:
     """Authenticate user and return an (access_token, refresh_token) tuple."""
     try:
-        user_data = users_repo.find_user_by_email(db, str(email))
+        user_data = await users_repo.find_user_by_email(db, str(email))
     except Exception as e:
         logger.error(f"DB error during login for {email}: {e}")
         raise HTTPException(
@@ -204,7 +205,7 @@ def get_login_token(db: Database, email: str, password: str) -> tuple[str, str]:
 
     user = models.User(**user_data)
 
-    if not stringproc.verify_password(password, user.hashed_password):
+    if not await cpu_pool.verify_password(password, user.hashed_password):
         logger.warning(f"Login failed: password mismatch for user '{email}' (id={user.id})")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -247,7 +248,7 @@ def _reset_email_html(name: str, link: str) -> str:
     """
 
 
-def request_password_reset(db: Database, email: str) -> None:
+async def request_password_reset(db: AsyncDatabase, email: str) -> None:
     """Email a reset link if a *password* account exists for ``email``.
 
     Always returns without signalling whether the email exists - the route
@@ -255,7 +256,7 @@ def request_password_reset(db: Database, email: str) -> None:
     registered (account-enumeration protection).
     """
     try:
-        user_data = users_repo.find_user_by_email(db, email)
+        user_data = await users_repo.find_user_by_email(db, email)
     except Exception as e:
         logger.error(f"DB error during password-reset lookup for {email}: {e}")
         return
@@ -274,17 +275,20 @@ def request_password_reset(db: Database, email: str) -> None:
         "pwh": _password_fingerprint(user.hashed_password),
     })
     link = f"{APP_BASE_URL}/reset-password?token={token}"
-    email_service.send_email(user.email, "Reset your ODES password", _reset_email_html(user.name, link))
+    await run_in_threadpool(
+        email_service.send_email,
+        user.email, "Reset your ODES password", _reset_email_html(user.name, link),
+    )
 
 
-def reset_password(db: Database, token: str, new_password: str) -> None:
+async def reset_password(db: AsyncDatabase, token: str, new_password: str) -> None:
     """Validate a reset token and set the user's new password."""
     payload = token_utils.decode_jwt_token(token)
     if payload.get("type") != "reset":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reset token.")
 
     user_id = payload.get("sub")
-    user_data = users_repo.find_user_by_id(db, user_id) if user_id else None
+    user_data = await users_repo.find_user_by_id(db, user_id) if user_id else None
     if not user_data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reset token.")
 
@@ -303,5 +307,5 @@ def reset_password(db: Database, token: str, new_password: str) -> None:
             detail=f"Password must be at least {_MIN_PASSWORD_LENGTH} characters.",
         )
 
-    users_repo.update_user_by_id(db, user_id, {"hashed_password": stringproc.hash_password(new_password)})
+    await users_repo.update_user_by_id(db, user_id, {"hashed_password": await cpu_pool.hash_password(new_password)})
     logger.info(f"Password reset completed for user {user_id}")
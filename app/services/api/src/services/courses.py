@@ -2,14 +2,16 @@ from typing import List
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
+from app.services.api.src.services import schedule_snapshots
 from app.services.api.src.dtos.input import course as dto_in
 from app.services.api.src.repositories import (
-    users as users_repo,
     courses as courses_repo,
     institutions as institutions_repo,
     activities as activities_repo
@@ -18,38 +20,18 @@ from app.services.api.src.repositories import (
 logger = get_logger()
 
 
-def get_courses(db: Database, current_user_id: str) -> List[models.Course]:
-    """Get all courses"""
+async def get_courses(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the courses of the user's institutions"""
     logger.info("Fetching all courses")
-    try:
-        courses_data = courses_repo.find_all_courses(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve courses: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving courses: {str(e)}"
-        )
-
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-    courses = [models.Course(**course) for course in courses_data
-               if course['institution_id'] in user.user_roles]
-    logger.info(f"Fetched {len(courses)} courses")
-
-    return courses
+    user = await principals.get_principal(db, current_user_id)
+    return courses_repo.find_courses_by_institution_ids(db, list(user.user_roles), params)
 
 
-def get_course_by_id(db: Database, course_id: str, current_user_id: str) -> models.Course:
+async def get_course_by_id(db: AsyncDatabase, course_id: str, current_user_id: str) -> models.Course:
     """Get course by ID"""
     logger.info(f"Fetching course by id: {course_id}")
     try:
-        course_data = courses_repo.find_course_by_id(db, course_id)
+        course_data = await courses_repo.find_course_by_id(db, course_id)
     except Exception as e:
         logger.error(f"Failed to retrieve course {course_id}: {e}")
         raise HTTPException(
@@ -65,20 +47,20 @@ def get_course_by_id(db: Database, course_id: str, current_user_id: str) -> mode
         )
 
     course = models.Course(**course_data)
-    access_verifiers.raise_course_forbidden(db, current_user_id, course)
+    await access_verifiers.raise_course_forbidden(db, current_user_id, course)
     logger.info(f"Fetched course: {course.id}")
 
     return course
 
 
-def create_course(
-        db: Database,
+async def create_course(
+        db: AsyncDatabase,
         request: dto_in.CreateCourse,
         current_user_id: str
 ) -> models.Course:
     """Create a new course"""
     logger.info(f"Creating course {request.name} for institution {request.institution_id}")
-    institution = institutions_repo.find_institution_by_id(db, request.institution_id)
+    institution = await institutions_repo.find_institution_by_id(db, request.institution_id)
     if not institution:
         logger.error(f"Institution not found: {request.institution_id}")
         raise HTTPException(
@@ -87,10 +69,10 @@ def create_course(
         )
 
     course = models.Course(**request.model_dump())
-    access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
+    await access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
 
     try:
-        courses_repo.insert_course(db, course)
+        await courses_repo.insert_course(db, course)
     except Exception as e:
         logger.error(f"Failed to create course: {course}")
         raise HTTPException(
@@ -102,15 +84,15 @@ def create_course(
     return course
 
 
-def delete_course(db: Database, course_id: str, current_user_id: str) -> None:
+async def delete_course(db: AsyncDatabase, course_id: str, current_user_id: str) -> None:
     """Delete a course by ID"""
     logger.info(f"Deleting course {course_id}")
 
-    course = get_course_by_id(db, course_id, current_user_id)
-    access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
+    course = await get_course_by_id(db, course_id, current_user_id)
+    await access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
 
     try:
-        result = courses_repo.delete_course_by_id(db, course_id)
+        result = await courses_repo.delete_course_by_id(db, course_id)
     except Exception as e:
         logger.error(f"Failed to delete course {course_id}: {e}")
         raise HTTPException(
@@ -119,7 +101,7 @@ def delete_course(db: Database, course_id: str, current_user_id: str) -> None:
         )
 
     try:
-        activities_repo.delete_activities_by_course_id(db, course_id)
+        await activities_repo.delete_activities_by_course_id(db, course_id)
     except Exception as e:
         logger.error(f"Failed to delete activities for course {course_id}: {e}")
         raise HTTPException(
@@ -133,11 +115,12 @@ def delete_course(db: Database, course_id: str, current_user_id: str) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Course with id {course_id} not found"
         )
+    await schedule_snapshots.bump_institution(db, course.institution_id)
     logger.info(f"Deleted course {course_id}")
 
 
-def update_course(
-        db: Database,
+async def update_course(
+        db: AsyncDatabase,
         course_id: str,
         request: dto_in.UpdateCourse,
         current_user_id: str
@@ -146,11 +129,11 @@ def update_course(
     update_data = request.model_dump(exclude_unset=True)
     logger.info(f"Updating course {course_id} with data {update_data}")
 
-    course = get_course_by_id(db, course_id, current_user_id)
-    access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
+    course = await get_course_by_id(db, course_id, current_user_id)
+    await access_verifiers.raise_course_forbidden(db, current_user_id, course, admin_only=True)
 
     try:
-        result = courses_repo.update_course_by_id(db, course_id, update_data)
+        result = await courses_repo.update_course_by_id(db, course_id, update_data)
     except Exception as e:
         logger.error(f"Failed to update course {course_id}: {e}")
         raise HTTPException(
@@ -165,20 +148,20 @@ def update_course(
             detail=f"Course with id {course_id} not found"
         )
 
-    updated = get_course_by_id(db, course_id, current_user_id)
+    updated = await get_course_by_id(db, course_id, current_user_id)
     logger.info(f"Updated course {updated.id}")
     return updated
 
 
-def get_course_activities(db: Database, course_id: str, current_user_id: str) -> List[models.Activity]:
+async def get_course_activities(db: AsyncDatabase, course_id: str, current_user_id: str) -> List[models.Activity]:
     """Get all activities for a specific course"""
     logger.info(f"Fetching activities for course {course_id}")
 
-    course = get_course_by_id(db, course_id, current_user_id)
-    access_verifiers.raise_course_forbidden(db, current_user_id, course)
+    course = await get_course_by_id(db, course_id, current_user_id)
+    await access_verifiers.raise_course_forbidden(db, current_user_id, course)
 
     try:
-        activities_data = activities_repo.find_activities_by_course_id(db, course_id)
+        activities_data = await activities_repo.find_activities_by_course_id(db, course_id)
     except Exception as e:
         logger.error(f"Failed to retrieve activities for course {course_id}: {e}")
         raise HTTPException(
@@ -2,11 +2,14 @@ from typing import List
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
+from app.services.api.src.services import schedule_snapshots
 from app.services.api.src.dtos.input import group as dto_in
 from app.services.api.src.repositories import (
     users as users_repo,
@@ -17,7 +20,7 @@ from app.services.api.src.repositories import (
 logger = get_logger()
 
 
-def _ancestor_chain_ids(db: Database, group_id: str) -> List[str]:
+async def _ancestor_chain_ids(db: AsyncDatabase, group_id: str) -> List[str]:
     """Return the list of ancestor group IDs of ``group_id`` (parent →
     grandparent → ... → root), excluding ``group_id`` itself.
 
@@ -25,19 +28,19 @@ def _ancestor_chain_ids(db: Database, group_id: str) -> List[str]:
     cyclic hierarchy can't hang the request."""
     ancestors: List[str] = []
     visited: set = set()
-    row = groups_repo.find_group_by_id(db, group_id)
+    row = await groups_repo.find_group_by_id(db, group_id)
     current_id = row.get("parent_group_id") if row else None
     while current_id is not None:
         if current_id in visited:
             break   # safety net against pre-existing cycles
         visited.add(current_id)
         ancestors.append(current_id)
-        parent_row = groups_repo.find_group_by_id(db, current_id)
+        parent_row = await groups_repo.find_group_by_id(db, current_id)
         current_id = parent_row.get("parent_group_id") if parent_row else None
     return ancestors
 
 
-def _would_create_cycle(db: Database, group_id: str, new_parent_id: str) -> bool:
+async def _would_create_cycle(db: AsyncDatabase, group_id: str, new_parent_id: str) -> bool:
     """
     Return True if making new_parent_id the parent of group_id would introduce
     a cycle in the group hierarchy.
@@ -56,43 +59,23 @@ def _would_create_cycle(db: Database, group_id: str, new_parent_id: str) -> bool
             # Existing cycle in the data - stop to avoid an infinite loop
             break
         visited.add(current_id)
-        row = groups_repo.find_group_by_id(db, current_id)
+        row = await groups_repo.find_group_by_id(db, current_id)
         current_id = row.get("parent_group_id") if row else None
     return False
 
 
-def get_groups(db: Database, current_user_id: str) -> List[models.Group]:
-    """Get all groups"""
+async def get_groups(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the groups of the user's institutions"""
     logger.info("Fetching all groups")
-    try:
-        groups_data = groups_repo.find_all_groups(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve groups: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving groups: {str(e)}"
-        )
-
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-    groups = [models.Group(**group) for group in groups_data
-              if group['institution_id'] in user.user_roles]
-    logger.info(f"Fetched {len(groups)} groups")
-
-    return groups
+    user = await principals.get_principal(db, current_user_id)
+    return groups_repo.find_groups_by_institution_ids(db, list(user.user_roles), params)
 
 
-def get_group_by_id(db: Database, group_id: str, current_user_id: str) -> models.Group:
+async def get_group_by_id(db: AsyncDatabase, group_id: str, current_user_id: str) -> models.Group:
     """Get group by ID"""
     logger.info(f"Fetching group by id: {group_id}")
     try:
-        group_data = groups_repo.find_group_by_id(db, group_id)
+        group_data = await groups_repo.find_group_by_id(db, group_id)
     except Exception as e:
         logger.error(f"Failed to retrieve group {group_id}: {e}")
         raise HTTPException(
@@ -108,21 +91,21 @@ def get_group_by_id(db: Database, group_id: str, current_user_id: str) -> models
         )
 
     group = models.Group(**group_data)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group)
 
     logger.info(f"Fetched group: {group.id}")
 
     return group
 
 
-def create_group(db: Database, request: dto_in.CreateGroup, current_user_id: str) -> models.Group:
+async def create_group(db: AsyncDatabase, request: dto_in.CreateGroup, current_user_id: str) -> models.Group:
     """Create a new group"""
     logger.info(f"Creating group {request.name}")
     group = models.Group(**request.model_dump())
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
     if group.parent_group_id:
-        parent_group = get_group_by_id(db, group.parent_group_id, current_user_id)
+        parent_group = await get_group_by_id(db, group.parent_group_id, current_user_id)
 
         if parent_group.institution_id != group.institution_id:
             logger.error(
@@ -134,7 +117,7 @@ def create_group(db: Database, request: dto_in.CreateGroup, current_user_id: str
             )
 
     try:
-        groups_repo.insert_group(db, group)
+        await groups_repo.insert_group(db, group)
     except Exception as e:
         logger.error(f"Failed to create group: {e}")
         raise HTTPException(
@@ -142,19 +125,20 @@ def create_group(db: Database, request: dto_in.CreateGroup, current_user_id: str
             detail=f"Error creating group: {str(e)}"
         )
 
+    await schedule_snapshots.bump_institution(db, group.institution_id)
     logger.info(f"Created group {group.id}")
     return group
 
 
-def delete_group(db: Database, group_id: str, current_user_id: str) -> None:
+async def delete_group(db: AsyncDatabase, group_id: str, current_user_id: str) -> None:
     """Delete a group by ID"""
     logger.info(f"Deleting group {group_id}")
 
-    group = get_group_by_id(db, group_id, current_user_id)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    group = await get_group_by_id(db, group_id, current_user_id)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
     try:
-        result = groups_repo.delete_group_by_id(db, group_id)
+        result = await groups_repo.delete_group_by_id(db, group_id)
     except Exception as e:
         logger.error(f"Failed to delete group {group_id}: {e}")
         raise HTTPException(
@@ -163,7 +147,7 @@ def delete_group(db: Database, group_id: str, current_user_id: str) -> None:
         )
 
     try:
-        groups_repo.update_groups_by_parent_group_id(db, group_id, {"parent_group_id": None})
+        await groups_repo.update_groups_by_parent_group_id(db, group_id, {"parent_group_id": None})
     except Exception as e:
         logger.error(f"Failed to update child groups of {group_id}: {e}")
         raise HTTPException(
@@ -172,7 +156,7 @@ def delete_group(db: Database, group_id: str, current_user_id: str) -> None:
         )
 
     try:
-        activities_repo.delete_activities_by_group_id(db, group_id)
+        await activities_repo.delete_activities_by_group_id(db, group_id)
     except Exception as e:
         logger.error(f"Failed to delete activities for group {group_id}: {e}")
         raise HTTPException(
@@ -186,19 +170,20 @@ def delete_group(db: Database, group_id: str, current_user_id: str) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Group with id {group_id} not found."
         )
+    await schedule_snapshots.bump_institution(db, group.institution_id)
     logger.info(f"Deleted group {group_id}")
 
 
-def update_group(
-        db: Database,
+async def update_group(
+        db: AsyncDatabase,
         group_id: str,
         request: dto_in.UpdateGroup,
         current_user_id: str
 ) -> models.Group:
     """Update a group by ID"""
     logger.info(f"Updating group {group_id} with data {request.model_dump(exclude_unset=True)}")
-    group = get_group_by_id(db, group_id, current_user_id)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    group = await get_group_by_id(db, group_id, current_user_id)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
     if request.parent_group_id == group_id:
         logger.error(f"Group {group_id} attempted to set itself as parent")
@@ -212,7 +197,7 @@ def update_group(
     if "parent_group_id" in updated_data and updated_data["parent_group_id"] is not None:
         new_parent_id = updated_data["parent_group_id"]
 
-        if _would_create_cycle(db, group_id, new_parent_id):
+        if await _would_create_cycle(db, group_id, new_parent_id):
             logger.error(
                 f"Setting parent of group {group_id} to {new_parent_id} would create a cycle"
             )
@@ -221,7 +206,7 @@ def update_group(
                 detail="Setting this parent would create a cycle in the group hierarchy."
             )
 
-        parent_group = get_group_by_id(db, new_parent_id, current_user_id)
+        parent_group = await get_group_by_id(db, new_parent_id, current_user_id)
 
         if parent_group.institution_id != group.institution_id:
             logger.error(f"Parent group {parent_group.id} not in same institution as {group.id}")
@@ -231,7 +216,7 @@ def update_group(
             )
 
     try:
-        result = groups_repo.update_group_by_id(db, group_id, updated_data)
+        result = await groups_repo.update_group_by_id(db, group_id, updated_data)
     except Exception as e:
         logger.error(f"Failed to update group {group_id}: {e}")
         raise HTTPException(
@@ -246,25 +231,26 @@ def update_group(
             detail=f"Group with id {group_id} not found."
         )
 
-    updated = get_group_by_id(db, group_id, current_user_id)
+    updated = await get_group_by_id(db, group_id, current_user_id)
+    await schedule_snapshots.bump_institution(db, updated.institution_id)
     logger.info(f"Updated group {updated.id}")
     return updated
 
 
-def update_group_timeslot_preferences(
-        db: Database,
+async def update_group_timeslot_preferences(
+        db: AsyncDatabase,
         group_id: str,
         request: dto_in.UpdateGroupTimeslotPreferences,
         current_user_id: str,
 ) -> models.Group:
     """Set timeslot preferences for a group (institution admin only)"""
     logger.info(f"Updating timeslot preferences for group {group_id}")
-    group = get_group_by_id(db, group_id, current_user_id)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    group = await get_group_by_id(db, group_id, current_user_id)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
     prefs_data = [p.model_dump() for p in request.preferences]
     try:
-        groups_repo.update_group_by_id(db, group_id, {"timeslot_preferences": prefs_data})
+        await groups_repo.update_group_by_id(db, group_id, {"timeslot_preferences": prefs_data})
     except Exception as e:
         logger.error(f"Failed to update timeslot preferences for group {group_id}: {e}")
         raise HTTPException(
@@ -272,10 +258,10 @@ def update_group_timeslot_preferences(
             detail=f"Error updating timeslot preferences: {str(e)}",
         )
 
-    return get_group_by_id(db, group_id, current_user_id)
+    return await get_group_by_id(db, group_id, current_user_id)
 
 
-def get_group_students(db: Database, group_id: str, current_user_id: str) -> List[models.User]:
+async def get_group_students(db: AsyncDatabase, group_id: str, current_user_id: str) -> List[models.User]:
     """List the students belonging to a group.
 
     Access: any member of the group's institution can read this (same
@@ -286,9 +272,9 @@ def get_group_students(db: Database, group_id: str, current_user_id: str) -> Lis
         the group in their group_ids).
     """
     logger.info(f"Fetching students for group {group_id}")
-    group = get_group_by_id(db, group_id, current_user_id)   # access check
+    group = await get_group_by_id(db, group_id, current_user_id)   # access check
     try:
-        students_data = users_repo.find_students_by_group_id(
+        students_data = await users_repo.find_students_by_group_id(
             db, group_id, group.institution_id,
         )
     except Exception as e:
@@ -302,8 +288,8 @@ def get_group_students(db: Database, group_id: str, current_user_id: str) -> Lis
     return students
 
 
-def add_student_to_group(
-        db: Database,
+async def add_student_to_group(
+        db: AsyncDatabase,
         group_id: str,
         user_id: str,
         current_user_id: str,
@@ -325,10 +311,10 @@ def add_student_to_group(
         enrollment concept.
     """
     logger.info(f"Adding user {user_id} to group {group_id}")
-    group = get_group_by_id(db, group_id, current_user_id)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    group = await get_group_by_id(db, group_id, current_user_id)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
-    user_data = users_repo.find_user_by_id(db, user_id)
+    user_data = await users_repo.find_user_by_id(db, user_id)
     if not user_data:
         logger.error(f"User not found: {user_id}")
         raise HTTPException(
@@ -348,10 +334,10 @@ def add_student_to_group(
 
     # Group + ancestor chain.  ``$addToSet`` makes each add idempotent so
     # re-adding an already-member student is a safe no-op.
-    target_group_ids = [group_id] + _ancestor_chain_ids(db, group_id)
+    target_group_ids = [group_id] + await _ancestor_chain_ids(db, group_id)
     try:
         for gid in target_group_ids:
-            users_repo.add_group_to_user_by_id(db, user_id, gid)
+            await users_repo.add_group_to_user_by_id(db, user_id, gid)
     except Exception as e:
         logger.error(f"Failed to add group chain to user {user_id}: {e}")
         raise HTTPException(
@@ -364,7 +350,7 @@ def add_student_to_group(
             f"ancestor group(s) of {group_id}."
         )
 
-    updated_user_data = users_repo.find_user_by_id(db, user_id)
+    updated_user_data = await users_repo.find_user_by_id(db, user_id)
     if not updated_user_data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -373,8 +359,8 @@ def add_student_to_group(
     return models.User(**updated_user_data)
 
 
-def remove_student_from_group(
-        db: Database,
+async def remove_student_from_group(
+        db: AsyncDatabase,
         group_id: str,
         user_id: str,
         current_user_id: str,
@@ -383,10 +369,10 @@ def remove_student_from_group(
 
     Idempotent: removing a non-member is a successful no-op."""
     logger.info(f"Removing user {user_id} from group {group_id}")
-    group = get_group_by_id(db, group_id, current_user_id)
-    access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
+    group = await get_group_by_id(db, group_id, current_user_id)
+    await access_verifiers.raise_group_forbidden(db, current_user_id, group, admin_only=True)
 
-    if not users_repo.find_user_by_id(db, user_id):
+    if not await users_repo.find_user_by_id(db, user_id):
         logger.error(f"User not found: {user_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -394,7 +380,7 @@ def remove_student_from_group(
         )
 
     try:
-        users_repo.remove_group_from_user_by_id(db, user_id, group_id)
+        await users_repo.remove_group_from_user_by_id(db, user_id, group_id)
     except Exception as e:
         logger.error(f"Failed to remove group {group_id} from user {user_id}: {e}")
         raise HTTPException(
@@ -403,14 +389,14 @@ def remove_student_from_group(
         )
 
 
-def get_group_activities(db: Database, group_id: str, current_user_id: str) -> List[models.Activity]:
+async def get_group_activities(db: AsyncDatabase, group_id: str, current_user_id: str) -> List[models.Activity]:
     """Get activities for a specific group"""
     logger.info(f"Fetching activities for group {group_id}")
     # Verify group exists
-    get_group_by_id(db, group_id, current_user_id)
+    await get_group_by_id(db, group_id, current_user_id)
 
     try:
-        activities_data = activities_repo.find_activities_by_group_id(db, group_id)
+        activities_data = await activities_repo.find_activities_by_group_id(db, group_id)
     except Exception as e:
         logger.error(f"Failed to retrieve activities for group {group_id}: {e}")
         raise HTTPException(
@@ -2,11 +2,15 @@ from typing import List
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.libs.scheduling import eta, hints as hints_store, telemetry as telemetry_store
+from app.libs.scheduling.snapshot import SolverSnapshot, load_solver_snapshot_async
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
 from app.services.api.src.dtos.input import institution as dto_in
 from app.services.api.src.repositories import (
     rooms as rooms_repo,
@@ -23,48 +27,24 @@ from app.services.api.src.repositories import (
 logger = get_logger()
 
 
-def get_institutions(db: Database, current_user_id: str) -> List[models.Institution]:
-    """Get all institutions"""
+async def get_institutions(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the institutions the user has a role in"""
     logger.info("Fetching all institutions")
-    try:
-        institutions_data = institutions_repo.find_all_institutions(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve institutions: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving institutions: {str(e)}"
-        )
-
-    current_user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not current_user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    current_user = models.User(**current_user_data)
-
-    institutions = [
-        models.Institution(**institution)
-        for institution in institutions_data
-        if institution["_id"] in current_user.user_roles
-    ]
-    logger.info(f"Fetched {len(institutions)} institutions")
-
-    return institutions
+    current_user = await principals.get_principal(db, current_user_id)
+    return institutions_repo.find_institutions_by_ids(db, list(current_user.user_roles), params)
 
 
-def get_institution_by_id(
-        db: Database,
+async def get_institution_by_id(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> models.Institution:
     """Get institution by ID"""
     logger.info(f"Fetching institution by id: {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
 
     try:
-        institution_data = institutions_repo.find_institution_by_id(db, institution_id)
+        institution_data = await institutions_repo.find_institution_by_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve institution {institution_id}: {e}")
         raise HTTPException(
@@ -85,8 +65,8 @@ def get_institution_by_id(
     return institution
 
 
-def create_institution(
-        db: Database,
+async def create_institution(
+        db: AsyncDatabase,
         request: dto_in.CreateInstitution,
         current_user_id: str
 ) -> models.Institution:
@@ -95,7 +75,7 @@ def create_institution(
     institution = models.Institution(**request.model_dump())
 
     try:
-        institutions_repo.insert_institution(db, institution)
+        await institutions_repo.insert_institution(db, institution)
     except Exception as e:
         logger.error(f"Failed to create institution: {institution}")
         raise HTTPException(
@@ -103,20 +83,12 @@ def create_institution(
             detail=f"Error creating institution: {str(e)}"
         )
 
-    current_user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not current_user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    current_user = models.User(**current_user_data)
-    current_user.user_roles[institution.id] = [models.UserRole.ADMIN]
+    await principals.get_principal(db, current_user_id)
     try:
-        users_repo.update_user_by_id(
+        await users_repo.update_user_by_id(
             db,
             current_user_id,
-            {"user_roles": current_user.user_roles}
+            {f"user_roles.{institution.id}": [models.UserRole.ADMIN]}
         )
     except Exception as e:
         logger.error(f"Failed to assign admin role to user {current_user_id}: {e}")
@@ -125,17 +97,19 @@ def create_institution(
             detail=f"Error assigning admin role to user with id {current_user_id}: {str(e)}"
         )
 
+    principals.forget(current_user_id)
+
     logger.info(f"Created institution {institution.id}")
     return institution
 
 
-def delete_institution(db: Database, institution_id: str, current_user_id: str) -> None:
+async def delete_institution(db: AsyncDatabase, institution_id: str, current_user_id: str) -> None:
     """Delete an institution by ID"""
     logger.info(f"Deleting institution id={institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
 
     try:
-        result = institutions_repo.delete_institution_by_id(db, institution_id)
+        result = await institutions_repo.delete_institution_by_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to delete institution {institution_id}: {e}")
         raise HTTPException(
@@ -143,28 +117,29 @@ def delete_institution(db: Database, institution_id: str, current_user_id: str)
             detail=f"Error deleting institution with id {institution_id}: {str(e)}"
         )
 
-    institution_users = users_repo.find_users_by_institution_id(db, institution_id)
+    institution_users = await users_repo.find_users_by_institution_id(db, institution_id)
     try:
-        courses_repo.delete_courses_by_institution_id(db, institution_id)
-        rooms_repo.delete_rooms_by_institution_id(db, institution_id)
-        groups_repo.delete_groups_by_institution_id(db, institution_id)
-        activities_repo.delete_activities_by_institution_id(db, institution_id)
+        await courses_repo.delete_courses_by_institution_id(db, institution_id)
+        await rooms_repo.delete_rooms_by_institution_id(db, institution_id)
+        await groups_repo.delete_groups_by_institution_id(db, institution_id)
+        await activities_repo.delete_activities_by_institution_id(db, institution_id)
 
-        schedules = schedules_repo.find_schedules_by_institution_id(db, institution_id)
+        schedules = await schedules_repo.find_schedules_by_institution_id(db, institution_id)
         for schedule in schedules:
-            scheduled_activities_repo.delete_scheduled_activities_by_schedule_id(
+            await scheduled_activities_repo.delete_scheduled_activities_by_schedule_id(
                 db, schedule["_id"]
             )
 
-        schedules_repo.delete_schedules_by_institution_id(db, institution_id)
-        reservations_repo.delete_reservations_by_institution_id(db, institution_id)
+        await schedules_repo.delete_schedules_by_institution_id(db, institution_id)
+        await reservations_repo.delete_reservations_by_institution_id(db, institution_id)
 
         for user in institution_users:
             if institution_id not in user["user_roles"]:
                 continue
             user["user_roles"].pop(institution_id)
             update_data = {"user_roles": user["user_roles"]}
-            users_repo.update_user_by_id(db, user["_id"], update_data)
+            await users_repo.update_user_by_id(db, user["_id"], update_data)
+            principals.forget(user["_id"])
     except Exception as e:
         logger.error(f"Failed to delete related data for institution {institution_id}: {e}")
         raise HTTPException(
@@ -182,20 +157,20 @@ def delete_institution(db: Database, institution_id: str, current_user_id: str)
     logger.info(f"Deleted institution {institution_id}")
 
 
-def update_institution(
-        db: Database,
+async def update_institution(
+        db: AsyncDatabase,
         institution_id: str,
         request: dto_in.UpdateInstitution,
         current_user_id: str
 ) -> models.Institution:
     """Update an institution by ID"""
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
 
     updated_data = request.model_dump(exclude_unset=True)
     logger.info(f"Updating institution {institution_id} with data {updated_data}")
 
     try:
-        result = institutions_repo.update_institution_by_id(db, institution_id, updated_data)
+        result = await institutions_repo.update_institution_by_id(db, institution_id, updated_data)
     except Exception as e:
         logger.error(f"Failed to update institution {institution_id}: {e}")
         raise HTTPException(
@@ -212,22 +187,22 @@ def update_institution(
 
     logger.info(f"Updated institution {institution_id}")
 
-    return get_institution_by_id(db, institution_id, current_user_id)
+    return await get_institution_by_id(db, institution_id, current_user_id)
 
 
-def get_institution_courses(
-        db: Database,
+async def get_institution_courses(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.Course]:
     """Get courses of an institution"""
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
 
     logger.info(f"Fetching courses for institution {institution_id}")
-    get_institution_by_id(db, institution_id, current_user_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        courses_data = courses_repo.find_courses_by_institution_id(db, institution_id)
+        courses_data = await courses_repo.find_courses_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve courses for institution {institution_id}: {e}")
         raise HTTPException(
@@ -241,19 +216,19 @@ def get_institution_courses(
     return courses
 
 
-def get_institution_rooms(
-        db: Database,
+async def get_institution_rooms(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.Room]:
     """Get rooms of an institution"""
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
 
     logger.info(f"Fetching rooms for institution {institution_id}")
-    get_institution_by_id(db, institution_id, current_user_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        rooms_data = rooms_repo.find_rooms_by_institution_id(db, institution_id)
+        rooms_data = await rooms_repo.find_rooms_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve rooms for institution {institution_id}: {e}")
         raise HTTPException(
@@ -267,18 +242,18 @@ def get_institution_rooms(
     return rooms
 
 
-def get_institution_groups(
-        db: Database,
+async def get_institution_groups(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.Group]:
     """Get groups of an institution"""
     logger.info(f"Fetching groups for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        groups_data = groups_repo.find_groups_by_institution_id(db, institution_id)
+        groups_data = await groups_repo.find_groups_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve groups for institution {institution_id}: {e}")
         raise HTTPException(
@@ -292,18 +267,18 @@ def get_institution_groups(
     return groups
 
 
-def get_institution_users(
-        db: Database,
+async def get_institution_users(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.User]:
     """Get users of an institution"""
     logger.info(f"Fetching users for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        users_data = users_repo.find_users_by_institution_id(db, institution_id)
+        users_data = await users_repo.find_users_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve users for institution {institution_id}: {e}")
         raise HTTPException(
@@ -317,18 +292,18 @@ def get_institution_users(
     return users
 
 
-def get_institution_activities(
-        db: Database,
+async def get_institution_activities(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.Activity]:
     """Get activities of an institution"""
     logger.info(f"Fetching activities for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        activities_data = activities_repo.find_activities_by_institution_id(db, institution_id)
+        activities_data = await activities_repo.find_activities_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve activities for institution {institution_id}: {e}")
         raise HTTPException(
@@ -343,18 +318,51 @@ def get_institution_activities(
     return activities
 
 
-def get_institution_schedules(
-        db: Database,
+async def get_institution_solver_snapshot(
+        db: AsyncDatabase,
+        institution_id: str,
+        current_user_id: str
+) -> SolverSnapshot:
+    """Get everything the schedule generator needs for an institution"""
+    logger.info(f"Fetching solver snapshot for institution {institution_id}")
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+
+    try:
+        snapshot = await load_solver_snapshot_async(db, institution_id)
+    except Exception as e:
+        logger.error(f"Failed to retrieve solver snapshot for institution {institution_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error retrieving solver snapshot for institution with id {institution_id}: "
+                   f"{str(e)}"
+        )
+
+    if snapshot is None:
+        logger.error(f"Institution not found: {institution_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Institution with id {institution_id} not found."
+        )
+
+    logger.info(
+        f"Fetched solver snapshot for institution {institution_id}: "
+        f"{len(snapshot.activities)} activities, {len(snapshot.professors)} professors"
+    )
+    return snapshot
+
+
+async def get_institution_schedules(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.Schedule]:
     """Get schedules of an institution"""
     logger.info(f"Fetching schedules for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
     try:
-        schedules_data = schedules_repo.find_schedules_by_institution_id(db, institution_id)
+        schedules_data = await schedules_repo.find_schedules_by_institution_id(db, institution_id)
     except Exception as e:
         logger.error(f"Failed to retrieve schedules for institution {institution_id}: {e}")
         raise HTTPException(
@@ -368,8 +376,8 @@ def get_institution_schedules(
     return schedules
 
 
-def assign_role_to_user(
-        db: Database,
+async def assign_role_to_user(
+        db: AsyncDatabase,
         user_id: str,
         institution_id: str,
         role: models.UserRole,
@@ -377,10 +385,10 @@ def assign_role_to_user(
 ):
     """Assign a role to a user for a specific institution"""
     logger.info(f"Assigning role {role} to user {user_id} for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
-    user = users_repo.find_user_by_id(db, user_id)
+    user = await users_repo.find_user_by_id(db, user_id)
     if not user:
         logger.error(f"User not found: {user_id}")
         raise HTTPException(
@@ -405,26 +413,27 @@ def assign_role_to_user(
 
     update_data = {"user_roles": user.user_roles}
     try:
-        users_repo.update_user_by_id(db, user_id, update_data)
+        await users_repo.update_user_by_id(db, user_id, update_data)
     except Exception as e:
         logger.error(f"Failed to assign role to user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error assigning role to user with id {user_id}: {str(e)}"
         )
+    principals.forget(user_id)
 
     logger.info(f"Assigned role {role} to user {user_id} for institution {institution_id}")
 
 
-def get_institution_admins(
-        db: Database,
+async def get_institution_admins(
+        db: AsyncDatabase,
         institution_id: str,
         current_user_id: str
 ) -> List[models.User]:
     """Get all admins of an institution"""
     logger.info(f"Fetching admins for institution {institution_id}")
 
-    institution_users = get_institution_users(db, institution_id, current_user_id)
+    institution_users = await get_institution_users(db, institution_id, current_user_id)
 
     admins = [
         user for user in institution_users
@@ -435,8 +444,8 @@ def get_institution_admins(
     return admins
 
 
-def remove_role_from_user(
-        db: Database,
+async def remove_role_from_user(
+        db: AsyncDatabase,
         user_id: str,
         institution_id: str,
         role: models.UserRole,
@@ -444,10 +453,10 @@ def remove_role_from_user(
 ):
     """Remove a role from a user for a specific institution"""
     logger.info(f"Removing role {role} from user {user_id} for institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
-    user = users_repo.find_user_by_id(db, user_id)
+    user = await users_repo.find_user_by_id(db, user_id)
     if not user:
         logger.error(f"User not found: {user_id}")
         raise HTTPException(
@@ -468,7 +477,7 @@ def remove_role_from_user(
         )
 
     if role == models.UserRole.ADMIN:
-        admins = get_institution_admins(db, institution_id, current_user_id)
+        admins = await get_institution_admins(db, institution_id, current_user_id)
         if len(admins) <= 1:
             logger.error(f"Cannot remove the last admin from institution {institution_id}")
             raise HTTPException(
@@ -484,29 +493,30 @@ def remove_role_from_user(
 
     update_data = {"user_roles": user.user_roles}
     try:
-        users_repo.update_user_by_id(db, user_id, update_data)
+        await users_repo.update_user_by_id(db, user_id, update_data)
     except Exception as e:
         logger.error(f"Failed to remove role from user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error removing role from user with id {user_id}: {str(e)}"
         )
+    principals.forget(user_id)
 
     logger.info(f"Removed role {role} from user {user_id} for institution {institution_id}")
 
 
-def remove_user_from_institution(
-        db: Database,
+async def remove_user_from_institution(
+        db: AsyncDatabase,
         user_id: str,
         institution_id: str,
         current_user_id: str
 ):
     """Remove all roles of a user for a specific institution"""
     logger.info(f"Removing user {user_id} from institution {institution_id}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
-    get_institution_by_id(db, institution_id, current_user_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await get_institution_by_id(db, institution_id, current_user_id)
 
-    user = users_repo.find_user_by_id(db, user_id)
+    user = await users_repo.find_user_by_id(db, user_id)
     if not user:
         logger.error(f"User not found: {user_id}")
         raise HTTPException(
@@ -523,7 +533,7 @@ def remove_user_from_institution(
         )
 
     if models.UserRole.ADMIN in user.user_roles[institution_id]:
-        admins = get_institution_admins(db, institution_id, current_user_id)
+        admins = await get_institution_admins(db, institution_id, current_user_id)
         if len(admins) <= 1:
             logger.error(f"Cannot remove the last admin from institution {institution_id}")
             raise HTTPException(
@@ -535,29 +545,30 @@ def remove_user_from_institution(
 
     update_data = {"user_roles": user.user_roles}
     try:
-        users_repo.update_user_by_id(db, user_id, update_data)
+        await users_repo.update_user_by_id(db, user_id, update_data)
     except Exception as e:
         logger.error(f"Failed to remove user from institution {institution_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error removing user from institution with id {institution_id}: {str(e)}"
         )
+    principals.forget(user_id)
 
     logger.info(f"Removed user {user_id} from institution {institution_id}")
 
 
-def set_active_schedule(
-        db: Database,
+async def set_active_schedule(
+        db: AsyncDatabase,
         institution_id: str,
         schedule_id: str | None,
         current_user_id: str
 ) -> models.Institution:
     """Set or clear the active schedule for an institution (admin only)."""
     logger.info(f"Setting active schedule for institution {institution_id} to {schedule_id!r}")
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
 
     if schedule_id is not None:
-        schedule_data = schedules_repo.find_schedule_by_id(db, schedule_id)
+        schedule_data = await schedules_repo.find_schedule_by_id(db, schedule_id)
         if not schedule_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -571,7 +582,7 @@ def set_active_schedule(
             )
 
     try:
-        result = institutions_repo.update_institution_by_id(
+        result = await institutions_repo.update_institution_by_id(
             db, institution_id, {"active_schedule_id": schedule_id}
         )
     except Exception as e:
@@ -588,4 +599,120 @@ def set_active_schedule(
         )
 
     logger.info(f"Active schedule for institution {institution_id} set to {schedule_id!r}")
-    return get_institution_by_id(db, institution_id, current_user_id)
+    return await get_institution_by_id(db, institution_id, current_user_id)
+
+
+async def get_institution_solution_hints(
+        db: AsyncDatabase,
+        institution_id: str,
+        current_user_id: str
+) -> List[models.ActivityHint]:
+    """Get the schedule generator's warm-start hints for an institution"""
+    logger.info(f"Fetching solution hints for institution {institution_id}")
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+
+    try:
+        hints = await hints_store.load_solution_hints_async(db, institution_id)
+    except Exception as e:
+        logger.error(f"Failed to retrieve solution hints for institution {institution_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error retrieving solution hints for institution with id {institution_id}: "
+                   f"{str(e)}"
+        )
+
+    logger.info(f"Fetched {len(hints)} solution hints for institution {institution_id}")
+    return hints
+
+
+async def update_institution_solution_hints(
+        db: AsyncDatabase,
+        institution_id: str,
+        request: dto_in.UpdateSolutionHints,
+        current_user_id: str
+) -> List[models.ActivityHint]:
+    """Replace the schedule generator's warm-start hints for an institution"""
+    logger.info(f"Updating solution hints for institution {institution_id}")
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+
+    if not await institutions_repo.find_institution_by_id(db, institution_id):
+        logger.error(f"Institution not found: {institution_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Institution with id {institution_id} not found."
+        )
+
+    try:
+        await hints_store.save_solution_hints_async(db, institution_id, request.hints)
+    except Exception as e:
+        logger.error(f"Failed to update solution hints for institution {institution_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error updating solution hints for institution with id {institution_id}: "
+                   f"{str(e)}"
+        )
+
+    logger.info(f"Stored {len(request.hints)} solution hints for institution {institution_id}")
+    return request.hints
+
+
+async def record_solve_telemetry(
+        db: AsyncDatabase,
+        institution_id: str,
+        request: dto_in.RecordSolveTelemetry,
+        current_user_id: str
+) -> models.SolveTelemetry:
+    """Record the features and timings of one of the institution's schedule generations"""
+    logger.info(f"Recording solve telemetry of schedule {request.schedule_id}")
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id, admin_only=True)
+
+    try:
+        schedule = await schedules_repo.find_schedule_by_id(db, request.schedule_id)
+    except Exception as e:
+        logger.error(f"Failed to retrieve schedule {request.schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error retrieving schedule with id {request.schedule_id}: {str(e)}"
+        )
+    if not schedule or schedule["institution_id"] != institution_id:
+        logger.error(f"Schedule {request.schedule_id} not found in institution {institution_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Schedule with id {request.schedule_id} not found in institution {institution_id}."
+        )
+
+    telemetry = models.SolveTelemetry(institution_id=institution_id, **request.model_dump())
+    try:
+        await telemetry_store.save_solve_telemetry_async(db, telemetry)
+    except Exception as e:
+        logger.error(f"Failed to record solve telemetry of schedule {request.schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error recording solve telemetry of schedule with id {request.schedule_id}: {str(e)}"
+        )
+
+    logger.info(f"Recorded solve telemetry {telemetry.id} of schedule {request.schedule_id}")
+    return telemetry
+
+
+async def get_eta_calibration(
+        db: AsyncDatabase,
+        institution_id: str,
+        current_user_id: str
+) -> eta.EtaCalibration:
+    """Get the schedule generator's duration model, fitted to the
+    deployment's recent runs"""
+    logger.info(f"Fetching ETA calibration for institution {institution_id}")
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+
+    try:
+        calibration = await telemetry_store.load_eta_calibration_async(db)
+    except Exception as e:
+        logger.error(f"Failed to fit the ETA calibration: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error fitting the ETA calibration: {str(e)}"
+        )
+
+    logger.info(f"Fitted ETA calibration to {calibration.num_runs} runs")
+    return calibration
@@ -3,7 +3,7 @@ from typing import List, Optional, Tuple
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
@@ -26,8 +26,8 @@ def _hhmm(minutes: int) -> str:
     return f"{minutes // 60:02d}:{minutes % 60:02d}"
 
 
-def _load_institution(db: Database, institution_id: str) -> models.Institution:
-    data = institutions_repo.find_institution_by_id(db, institution_id)
+async def _load_institution(db: AsyncDatabase, institution_id: str) -> models.Institution:
+    data = await institutions_repo.find_institution_by_id(db, institution_id)
     if not data:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,8 +62,8 @@ def _resolve_week(
     return None
 
 
-def _compute_conflicts(
-    db: Database,
+async def _compute_conflicts(
+    db: AsyncDatabase,
     institution: models.Institution,
     room_id: str,
     iso_date: str,
@@ -92,16 +92,16 @@ def _compute_conflicts(
     # ── Active-schedule activities in this room ─────────────────────────────
     schedule_id = institution.active_schedule_id
     if schedule_id:
-        sched = db.get_collection(models.ScheduledActivity.COLLECTION_NAME).find(
+        sched = await db.get_collection(models.ScheduledActivity.COLLECTION_NAME).find(
             {"schedule_id": schedule_id, "room_id": room_id}
         ).to_list()
         activity_ids = list({s["activity_id"] for s in sched})
-        acts = db.get_collection(models.Activity.COLLECTION_NAME).find(
+        acts = await db.get_collection(models.Activity.COLLECTION_NAME).find(
             {"_id": {"$in": activity_ids}}
         ).to_list()
         acts_by_id = {a["_id"]: a for a in acts}
         course_ids = list({a.get("course_id") for a in acts if a.get("course_id")})
-        courses = db.get_collection(models.Course.COLLECTION_NAME).find(
+        courses = await db.get_collection(models.Course.COLLECTION_NAME).find(
             {"_id": {"$in": course_ids}}
         ).to_list()
         course_name = {c["_id"]: c.get("name", "") for c in courses}
@@ -131,7 +131,7 @@ def _compute_conflicts(
                 ))
 
     # ── Approved reservations for this room on this date ────────────────────
-    approved = reservations_repo.find_approved_reservations_for_room_on_date(
+    approved = await reservations_repo.find_approved_reservations_for_room_on_date(
         db, room_id, iso_date, exclude_reservation_id
     )
     for r in approved:
@@ -147,45 +147,45 @@ def _compute_conflicts(
 
 # ── public service functions ─────────────────────────────────────────────────
 
-def get_reservations(db: Database, institution_id: str, current_user_id: str) -> List[models.Reservation]:
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    data = reservations_repo.find_reservations_by_institution_id(db, institution_id)
+async def get_reservations(db: AsyncDatabase, institution_id: str, current_user_id: str) -> List[models.Reservation]:
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    data = await reservations_repo.find_reservations_by_institution_id(db, institution_id)
     return [models.Reservation(**r) for r in data]
 
 
-def check_conflict(
-    db: Database,
+async def check_conflict(
+    db: AsyncDatabase,
     institution_id: str,
     request: dto_in.CheckReservationConflict,
     current_user_id: str,
 ) -> dto_out.CheckReservationConflictResponse:
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    institution = _load_institution(db, institution_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    institution = await _load_institution(db, institution_id)
     conflicts: List[dto_out.ReservationConflict] = []
     if request.end_minute <= request.start_minute:
         conflicts.append(dto_out.ReservationConflict(
             type="reservation", description="End time must be after start time."))
     else:
-        conflicts = _compute_conflicts(
+        conflicts = await _compute_conflicts(
             db, institution, request.room_id, request.date,
             request.start_minute, request.end_minute, request.exclude_reservation_id,
         )
     return dto_out.CheckReservationConflictResponse(ok=len(conflicts) == 0, conflicts=conflicts)
 
 
-def create_reservation(
-    db: Database,
+async def create_reservation(
+    db: AsyncDatabase,
     institution_id: str,
     request: dto_in.CreateReservation,
     current_user_id: str,
 ) -> models.Reservation:
-    access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
-    institution = _load_institution(db, institution_id)
+    await access_verifiers.raise_institution_forbidden(db, current_user_id, institution_id)
+    institution = await _load_institution(db, institution_id)
 
     if request.end_minute <= request.start_minute:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="End time must be after start time.")
-    room = rooms_repo.find_room_by_id(db, request.room_id)
+    room = await rooms_repo.find_room_by_id(db, request.room_id)
     if not room or room.get("institution_id") != institution_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail="Room not found in this institution.")
@@ -193,7 +193,7 @@ def create_reservation(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail="The selected date is not within a configured calendar week.")
 
-    conflicts = _compute_conflicts(
+    conflicts = await _compute_conflicts(
         db, institution, request.room_id, request.date,
         request.start_minute, request.end_minute,
     )
@@ -212,28 +212,28 @@ def create_reservation(
         end_minute=request.end_minute,
         reason=request.reason,
     )
-    reservations_repo.insert_reservation(db, reservation)
+    await reservations_repo.insert_reservation(db, reservation)
     logger.info(f"Reservation {reservation.id} created by {current_user_id}")
     return reservation
 
 
-def _load_reservation(db: Database, reservation_id: str) -> models.Reservation:
-    data = reservations_repo.find_reservation_by_id(db, reservation_id)
+async def _load_reservation(db: AsyncDatabase, reservation_id: str) -> models.Reservation:
+    data = await reservations_repo.find_reservation_by_id(db, reservation_id)
     if not data:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Reservation {reservation_id} not found.")
     return models.Reservation(**data)
 
 
-def approve_reservation(db: Database, reservation_id: str, current_user_id: str) -> models.Reservation:
-    reservation = _load_reservation(db, reservation_id)
-    access_verifiers.raise_institution_forbidden(
+async def approve_reservation(db: AsyncDatabase, reservation_id: str, current_user_id: str) -> models.Reservation:
+    reservation = await _load_reservation(db, reservation_id)
+    await access_verifiers.raise_institution_forbidden(
         db, current_user_id, reservation.institution_id, admin_only=True)
 
     # Re-check conflicts at approval time: pending requests don't hold a slot, so
     # an earlier-approved reservation (or schedule) may now collide.
-    institution = _load_institution(db, reservation.institution_id)
-    conflicts = _compute_conflicts(
+    institution = await _load_institution(db, reservation.institution_id)
+    conflicts = await _compute_conflicts(
         db, institution, reservation.room_id, reservation.date,
         reservation.start_minute, reservation.end_minute, exclude_reservation_id=reservation.id,
     )
@@ -244,36 +244,36 @@ def approve_reservation(db: Database, reservation_id: str, current_user_id: str)
                    + "; ".join(c.description for c in conflicts),
         )
 
-    reservations_repo.update_reservation_by_id(db, reservation_id, {
+    await reservations_repo.update_reservation_by_id(db, reservation_id, {
         "status": models.ReservationStatus.APPROVED.value,
         "decided_by": current_user_id,
         "decision_reason": None,
         "decided_at": datetime.now(timezone.utc),
     })
-    return _load_reservation(db, reservation_id)
+    return await _load_reservation(db, reservation_id)
 
 
-def refuse_reservation(
-    db: Database, reservation_id: str, request: dto_in.RefuseReservation, current_user_id: str
+async def refuse_reservation(
+    db: AsyncDatabase, reservation_id: str, request: dto_in.RefuseReservation, current_user_id: str
 ) -> models.Reservation:
-    reservation = _load_reservation(db, reservation_id)
-    access_verifiers.raise_institution_forbidden(
+    reservation = await _load_reservation(db, reservation_id)
+    await access_verifiers.raise_institution_forbidden(
         db, current_user_id, reservation.institution_id, admin_only=True)
-    reservations_repo.update_reservation_by_id(db, reservation_id, {
+    await reservations_repo.update_reservation_by_id(db, reservation_id, {
         "status": models.ReservationStatus.REFUSED.value,
         "decided_by": current_user_id,
         "decision_reason": request.reason,
         "decided_at": datetime.now(timezone.utc),
     })
-    return _load_reservation(db, reservation_id)
+    return await _load_reservation(db, reservation_id)
 
 
-def delete_reservation(db: Database, reservation_id: str, current_user_id: str) -> None:
-    reservation = _load_reservation(db, reservation_id)
+async def delete_reservation(db: AsyncDatabase, reservation_id: str, current_user_id: str) -> None:
+    reservation = await _load_reservation(db, reservation_id)
     is_owner = reservation.requester_id == current_user_id
     is_pending = reservation.status == models.ReservationStatus.PENDING
     if not (is_owner and is_pending):
         # Owners may withdraw their own pending request; otherwise admin only.
-        access_verifiers.raise_institution_forbidden(
+        await access_verifiers.raise_institution_forbidden(
             db, current_user_id, reservation.institution_id, admin_only=True)
-    reservations_repo.delete_reservation_by_id(db, reservation_id)
+    await reservations_repo.delete_reservation_by_id(db, reservation_id)
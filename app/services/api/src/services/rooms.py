@@ -1,16 +1,15 @@
-from typing import List
-
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
 from app.services.api.src.dtos.input import room as dto_in
 from app.services.api.src.repositories import (
     rooms as rooms_repo,
-    users as users_repo,
     institutions as institutions_repo
 )
 
@@ -18,38 +17,18 @@ from app.services.api.src.repositories import (
 logger = get_logger()
 
 
-def get_rooms(db: Database, current_user_id: str) -> List[models.Room]:
-    """Get all rooms"""
+async def get_rooms(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the rooms of the user's institutions"""
     logger.info("Fetching all rooms")
-    try:
-        rooms_data = rooms_repo.find_all_rooms(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve rooms: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving rooms: {str(e)}"
-        )
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-
-    rooms = [models.Room(**room) for room in rooms_data
-             if room['institution_id'] in user.user_roles]
-    logger.info(f"Fetched {len(rooms)} rooms")
-
-    return rooms
+    user = await principals.get_principal(db, current_user_id)
+    return rooms_repo.find_rooms_by_institution_ids(db, list(user.user_roles), params)
 
 
-def get_room_by_id(db: Database, room_id: str, current_user_id: str) -> models.Room:
+async def get_room_by_id(db: AsyncDatabase, room_id: str, current_user_id: str) -> models.Room:
     """Get room by ID"""
     logger.info(f"Fetching room by id: {room_id}")
     try:
-        room_data = rooms_repo.find_room_by_id(db, room_id)
+        room_data = await rooms_repo.find_room_by_id(db, room_id)
     except Exception as e:
         logger.error(f"Failed to retrieve room {room_id}: {e}")
         raise HTTPException(
@@ -65,16 +44,16 @@ def get_room_by_id(db: Database, room_id: str, current_user_id: str) -> models.R
         )
 
     room = models.Room(**room_data)
-    access_verifiers.raise_room_forbidden(db, current_user_id, room)
+    await access_verifiers.raise_room_forbidden(db, current_user_id, room)
 
     logger.info(f"Fetched room: {room.id}")
     return room
 
 
-def create_room(db: Database, request: dto_in.CreateRoom, current_user_id: str) -> models.Room:
+async def create_room(db: AsyncDatabase, request: dto_in.CreateRoom, current_user_id: str) -> models.Room:
     """Create a new room"""
     logger.info(f"Creating room for institution={request.institution_id}")
-    institution = institutions_repo.find_institution_by_id(db, request.institution_id)
+    institution = await institutions_repo.find_institution_by_id(db, request.institution_id)
     if not institution:
         logger.error(f"Institution not found: {request.institution_id}")
         raise HTTPException(
@@ -83,10 +62,10 @@ def create_room(db: Database, request: dto_in.CreateRoom, current_user_id: str)
         )
 
     room = models.Room(**request.model_dump())
-    access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
+    await access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
 
     try:
-        rooms_repo.insert_room(db, room)
+        await rooms_repo.insert_room(db, room)
     except Exception as e:
         logger.error(f"Failed to create room: {room}")
         raise HTTPException(
@@ -98,15 +77,15 @@ def create_room(db: Database, request: dto_in.CreateRoom, current_user_id: str)
     return room
 
 
-def delete_room(db: Database, room_id: str, current_user_id: str) -> None:
+async def delete_room(db: AsyncDatabase, room_id: str, current_user_id: str) -> None:
     """Delete a room by ID"""
     logger.info(f"Deleting room id={room_id}")
 
-    room = get_room_by_id(db, room_id, current_user_id)
-    access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
+    room = await get_room_by_id(db, room_id, current_user_id)
+    await access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
 
     try:
-        result = rooms_repo.delete_room_by_id(db, room_id)
+        result = await rooms_repo.delete_room_by_id(db, room_id)
     except Exception as e:
         logger.error(f"Failed to delete room {room_id}: {e}")
         raise HTTPException(
@@ -123,21 +102,21 @@ def delete_room(db: Database, room_id: str, current_user_id: str) -> None:
     logger.info(f"Deleted room id={room_id}")
 
 
-def update_room(
-        db: Database,
+async def update_room(
+        db: AsyncDatabase,
         room_id: str,
         room_request: dto_in.UpdateRoom,
         current_user_id: str
 ) -> models.Room:
     """Update an existing room"""
-    room = get_room_by_id(db, room_id, current_user_id)
-    access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
+    room = await get_room_by_id(db, room_id, current_user_id)
+    await access_verifiers.raise_room_forbidden(db, current_user_id, room, admin_only=True)
 
     room_dict = room_request.model_dump(exclude_unset=True)
     logger.info(f"Updating room id={room_id} with data={room_dict}")
 
     try:
-        result = rooms_repo.update_room_by_id(db, room_id, room_dict)
+        result = await rooms_repo.update_room_by_id(db, room_id, room_dict)
     except Exception as e:
         logger.error(f"Failed to update room {room_id}: {e}")
         raise HTTPException(
@@ -152,6 +131,6 @@ def update_room(
             detail=f"Room with id {room_id} not found"
         )
 
-    updated_room = get_room_by_id(db, room_id, current_user_id)
+    updated_room = await get_room_by_id(db, room_id, current_user_id)
     logger.info(f"Updated room {updated_room.id}")
     return updated_room
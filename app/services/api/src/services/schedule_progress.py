@@ -0,0 +1,182 @@
+"""Relay of the worker's generation progress to clients, as Server-Sent Events.
+
+The worker publishes ``progress.ProgressEvent``s to the broker (see
+``app.libs.scheduling.progress``).  Each API process runs one ``_Relay``: a
+daemon thread consuming every event from an exclusive queue bound to the
+progress exchange, and handing each to the event loops of the streams
+watching its schedule.  A process holds one broker connection however many
+clients watch; the relay starts with the first stream and reconnects on its
+own (kombu's ``ConsumerMixin``).  It also remembers each schedule's latest
+event, so a client that connects mid-run starts from the current state.
+
+A stream opens with the schedule's state, sends an event whenever the
+worker publishes one - and a comment every ``PROGRESS_KEEPALIVE_SECONDS``,
+so proxies keep the connection open - and ends after the completed or
+failed event.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Optional, Set
+
+from fastapi.exceptions import HTTPException
+from kombu import Connection, Queue
+from kombu.mixins import ConsumerMixin
+from pydantic import ValidationError
+from pymongo.asynchronous.database import AsyncDatabase
+from starlette import status
+
+from app.libs.db import models
+from app.libs.logging.logger import get_logger
+from app.libs.scheduling import progress
+from app.services.api.src.services import schedules as schedules_service
+
+
+PROGRESS_KEEPALIVE_SECONDS = float(os.getenv("PROGRESS_KEEPALIVE_SECONDS", "15"))
+# Schedules whose latest event is remembered, most recently updated last.
+_MAX_LATEST = 256
+# Events held for a slow client before the oldest are dropped.
+_MAX_BUFFERED = 100
+
+logger = get_logger()
+
+
+class _Subscription:
+    def __init__(self, schedule_id: str, loop: asyncio.AbstractEventLoop):
+        self.schedule_id = schedule_id
+        self.loop = loop
+        self.events: "asyncio.Queue[progress.ProgressEvent]" = asyncio.Queue(_MAX_BUFFERED)
+
+    def deliver(self, event: progress.ProgressEvent):
+        """Runs on ``loop``."""
+        if self.events.full():
+            self.events.get_nowait()
+        self.events.put_nowait(event)
+
+
+class _Relay(ConsumerMixin):
+    def __init__(self, broker_url: str):
+        self.connection = Connection(broker_url)
+        self._queue = Queue(
+            f"{progress.EXCHANGE.name}.{uuid.uuid4()}",
+            exchange=progress.EXCHANGE,
+            routing_key="#",
+            exclusive=True,
+            auto_delete=True,
+            durable=False,
+        )
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, Set[_Subscription]] = {}
+        self._latest: "OrderedDict[str, progress.ProgressEvent]" = OrderedDict()
+        self._thread = threading.Thread(target=self.run, name="progress-relay", daemon=True)
+        self._thread.start()
+
+    def get_consumers(self, Consumer, channel):
+        return [Consumer(queues=[self._queue], callbacks=[self._on_message], accept=["json"], no_ack=True)]
+
+    def _on_message(self, body, message):
+        try:
+            event = progress.ProgressEvent(**body)
+        except (TypeError, ValidationError) as e:
+            logger.warning(f"Dropped a malformed progress event: {e}")
+            return
+        with self._lock:
+            self._latest[event.schedule_id] = event
+            self._latest.move_to_end(event.schedule_id)
+            while len(self._latest) > _MAX_LATEST:
+                self._latest.popitem(last=False)
+            subscriptions = list(self._subscriptions.get(event.schedule_id, ()))
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+
+    def subscribe(self, schedule_id: str) -> _Subscription:
+        subscription = _Subscription(schedule_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.setdefault(schedule_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: _Subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.schedule_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.schedule_id]
+
+    def latest(self, schedule_id: str) -> Optional[progress.ProgressEvent]:
+        with self._lock:
+            return self._latest.get(schedule_id)
+
+
+_relay: Optional[_Relay] = None
+_relay_lock = threading.Lock()
+
+
+def _get_relay() -> Optional[_Relay]:
+    global _relay
+    if _relay is None and progress.BROKER_URL:
+        with _relay_lock:
+            if _relay is None:
+                _relay = _Relay(progress.BROKER_URL)
+    return _relay
+
+
+def _frame(event: progress.ProgressEvent) -> str:
+    return f"event: progress\ndata: {event.model_dump_json()}\n\n"
+
+
+def _outcome(schedule: models.Schedule) -> progress.ProgressEvent:
+    phase = (progress.ProgressPhase.COMPLETED if schedule.status == models.ScheduleStatus.COMPLETED
+             else progress.ProgressPhase.FAILED)
+    return progress.ProgressEvent(schedule_id=schedule.id, phase=phase, message=schedule.error_message)
+
+
+async def _events(relay: _Relay, subscription: _Subscription, schedule: models.Schedule) -> AsyncIterator[str]:
+    try:
+        if schedule.status in (models.ScheduleStatus.COMPLETED, models.ScheduleStatus.FAILED):
+            yield _frame(_outcome(schedule))
+            return
+        latest = relay.latest(schedule.id)
+        if latest is not None:
+            yield _frame(latest)
+            if latest.terminal:
+                return
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.events.get(), PROGRESS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _frame(event)
+            if event.terminal:
+                return
+    finally:
+        relay.unsubscribe(subscription)
+
+
+async def stream_schedule_progress(
+        db: AsyncDatabase,
+        schedule_id: str,
+        current_user_id: str,
+) -> AsyncIterator[str]:
+    """Server-Sent Events frames of ``schedule_id``'s generation progress"""
+    logger.info(f"Streaming progress of schedule {schedule_id}")
+    relay = _get_relay()
+    if relay is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Progress streaming is not available: no message broker is configured."
+        )
+
+    # Subscribe before reading the status, so an outcome published in
+    # between is not missed.
+    subscription = relay.subscribe(schedule_id)
+    try:
+        schedule = await schedules_service.get_schedule_by_id(db, schedule_id, current_user_id)
+    except Exception:
+        relay.unsubscribe(subscription)
+        raise
+    return _events(relay, subscription, schedule)
@@ -0,0 +1,145 @@
+"""In-process cache of pre-indexed schedule snapshots for the editor.
+
+The editor's reads and conflict checks each need the schedule's records,
+their activities and the institution's group tree.  A snapshot holds all
+three plus a ``ConflictIndex`` over the records, and is cached under
+``(schedule_id, Schedule.version)``.  Every write that affects a snapshot
+bumps the version *after* the write (see ``bump``/``bump_institution``), so
+a request that reads the new version always rebuilds from the new data,
+and since the version comes from the schedule document each request loads
+for its access check anyway, a hit costs no extra round trip.  The cache
+is per API process; the version keeps every process coherent.
+
+A miss first tries the schedule's packed document (``models.PackedSchedule``),
+one small read instead of one document per record, and falls back to the
+per-record documents - re-packing them for the next miss - when the packed
+document is missing or from an older version.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pymongo.asynchronous.database import AsyncDatabase
+
+from app.libs.db import models
+from app.libs.logging.logger import get_logger
+from app.libs.scheduling import conflict_index, packed
+from app.libs.scheduling.group_index import GroupIndex
+from app.services.api.src.repositories import (
+    activities as activities_repo,
+    groups as groups_repo,
+    packed_schedules as packed_schedules_repo,
+    schedules as schedules_repo,
+    scheduled_activities as scheduled_activities_repo,
+)
+
+
+SCHEDULE_SNAPSHOT_CACHE_SIZE = int(os.getenv("SCHEDULE_SNAPSHOT_CACHE_SIZE", "32"))
+
+logger = get_logger()
+
+
+class ScheduleSnapshot:
+    def __init__(
+        self,
+        schedule: models.Schedule,
+        records: List[models.ScheduledActivity],
+        activities_by_id: Dict[str, models.Activity],
+        group_index: GroupIndex,
+        packed_records: Optional[models.PackedSchedule],
+    ):
+        self.version = schedule.version
+        self.records = records
+        self.packed = packed_records
+        self._packed_columns: Optional[Dict[str, List[int]]] = None
+        self.activities_by_id = activities_by_id
+        self.group_index = group_index
+        self.conflicts = conflict_index.ConflictIndex(
+            [
+                conflict_index.RecordPlacement(
+                    record_id=r.id,
+                    activity_id=r.activity_id,
+                    room_id=r.room_id,
+                    start_timeslot=r.start_timeslot,
+                    active_weeks=tuple(r.active_weeks),
+                )
+                for r in records
+            ],
+            activities_by_id,
+            group_index,
+            schedule.time_grid_config,
+        )
+
+    def packed_columns(self) -> Dict[str, List[int]]:
+        """The packed numeric columns, decoded once per snapshot."""
+        if self._packed_columns is None:
+            self._packed_columns = packed.columns(self.packed)
+        return self._packed_columns
+
+
+# schedule id -> (version, snapshot), least recently used first.
+_cache: "OrderedDict[str, Tuple[int, ScheduleSnapshot]]" = OrderedDict()
+
+
+async def _load_records(
+        db: AsyncDatabase,
+        schedule: models.Schedule,
+) -> Tuple[List[models.ScheduledActivity], Optional[models.PackedSchedule]]:
+    raw_packed = await packed_schedules_repo.find_packed_schedule_by_schedule_id(db, schedule.id)
+    if raw_packed is not None and raw_packed.get("version") == schedule.version:
+        packed_records = models.PackedSchedule(**raw_packed)
+        return packed.unpack(packed_records), packed_records
+
+    records = [
+        models.ScheduledActivity(**raw)
+        for raw in await scheduled_activities_repo.find_scheduled_activities_by_schedule_id(db, schedule.id)
+    ]
+    try:
+        packed_records = packed.pack(schedule.id, schedule.version, records)
+    except ValueError as e:
+        logger.warning(f"Schedule {schedule.id} cannot be packed: {e}")
+        return records, None
+    await packed_schedules_repo.replace_packed_schedule(db, packed_records)
+    return records, packed_records
+
+
+async def _load(db: AsyncDatabase, schedule: models.Schedule) -> ScheduleSnapshot:
+    records, packed_records = await _load_records(db, schedule)
+    activity_ids = list({r.activity_id for r in records})
+    activities_by_id = {
+        raw["_id"]: models.Activity(**raw)
+        for raw in await activities_repo.find_activities_by_ids(db, activity_ids)
+    }
+    raw_groups = await groups_repo.find_groups_by_institution_id(db, schedule.institution_id)
+    group_index = GroupIndex(models.Group(**raw_g) for raw_g in raw_groups)
+    return ScheduleSnapshot(schedule, records, activities_by_id, group_index, packed_records)
+
+
+async def get_snapshot(db: AsyncDatabase, schedule: models.Schedule) -> ScheduleSnapshot:
+    """The snapshot of ``schedule`` at the version it was read at."""
+    cached = _cache.get(schedule.id)
+    if cached is not None and cached[0] == schedule.version:
+        _cache.move_to_end(schedule.id)
+        return cached[1]
+
+    snapshot = await _load(db, schedule)
+    _cache[schedule.id] = (schedule.version, snapshot)
+    _cache.move_to_end(schedule.id)
+    while len(_cache) > SCHEDULE_SNAPSHOT_CACHE_SIZE:
+        _cache.popitem(last=False)
+    logger.info(f"Built snapshot of schedule {schedule.id} v{schedule.version}: "
+                f"{len(snapshot.records)} records")
+    return snapshot
+
+
+async def bump(db: AsyncDatabase, schedule_id: str) -> None:
+    """Invalidate ``schedule_id``'s snapshots; call after writing its records."""
+    _cache.pop(schedule_id, None)
+    await schedules_repo.bump_schedule_version(db, schedule_id)
+
+
+async def bump_institution(db: AsyncDatabase, institution_id: str) -> None:
+    """Invalidate the snapshots of every schedule of ``institution_id``; call
+    after writing its activities or groups."""
+    await schedules_repo.bump_schedule_versions_by_institution_id(db, institution_id)
@@ -1,68 +1,93 @@
-from typing import List
+from typing import List, Optional
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.libs.scheduling.group_index import GroupIndex
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
 from app.services.api.src.dtos.input import scheduled_activity as dto_in
+from app.services.api.src.services import schedule_snapshots
 from app.services.api.src.repositories import (
     scheduled_activities as scheduled_activities_repo,
     schedules as schedules_repo,
     activities as activities_repo,
+    groups as groups_repo,
     rooms as rooms_repo,
-    users as users_repo,
 )
 
 
 logger = get_logger()
 
 
-def get_scheduled_activities(db: Database, current_user_id: str) -> List[models.ScheduledActivity]:
-    """Get all scheduled_activities"""
+async def _activity_ids_for(
+        db: AsyncDatabase,
+        institution_ids: List[str],
+        professor_id: Optional[str],
+        group_id: Optional[str],
+) -> Optional[List[str]]:
+    """Ids of the activities the professor/group filters select, or None
+    when neither is given.  A group sees its own activities and its
+    ancestors', as its timetable does."""
+    if professor_id is None and group_id is None:
+        return None
+    group_ids = None
+    if group_id is not None:
+        group_data = await groups_repo.find_group_by_id(db, group_id)
+        if not group_data or group_data["institution_id"] not in institution_ids:
+            return []
+        raw_groups = await groups_repo.find_groups_by_institution_id(db, group_data["institution_id"])
+        group_ids = GroupIndex(models.Group(**raw_g) for raw_g in raw_groups).lineage(group_id)
+    return await activities_repo.find_activity_ids_by_institution_ids(
+        db, institution_ids, professor_id=professor_id, group_ids=group_ids
+    )
+
+
+async def get_scheduled_activities(
+        db: AsyncDatabase,
+        current_user_id: str,
+        params: listing.ListParams,
+        schedule_id: Optional[str] = None,
+        room_id: Optional[str] = None,
+        professor_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        week: Optional[int] = None,
+) -> AsyncCursor:
+    """Get the scheduled_activities of the user's institutions' schedules,
+    optionally only those of one schedule, room, professor, group or week"""
     logger.info("Fetching all scheduled_activities")
+    user = await principals.get_principal(db, current_user_id)
+    institution_ids = list(user.user_roles)
     try:
-        scheduled_activities_data = scheduled_activities_repo.find_all_scheduled_activities(db)
+        schedule_ids = await schedules_repo.find_schedule_ids_by_institution_ids(db, institution_ids)
+        activity_ids = await _activity_ids_for(db, institution_ids, professor_id, group_id)
     except Exception as e:
-        logger.error(f"Failed to retrieve scheduled_activities: {e}")
+        logger.error(f"Failed to retrieve schedules: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error retrieving scheduled_activities: {str(e)}"
         )
 
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-
-    # Filter scheduled activities by checking if their schedule's institution is accessible to user
-    filtered_scheduled_activities = []
-    for sa_data in scheduled_activities_data:
-        schedule_data = schedules_repo.find_schedule_by_id(db, sa_data['schedule_id'])
-        if schedule_data and schedule_data['institution_id'] in user.user_roles:
-            filtered_scheduled_activities.append(models.ScheduledActivity(**sa_data))
-
-    scheduled_activities = filtered_scheduled_activities
-    logger.info(f"Fetched {len(scheduled_activities)} scheduled_activities")
-
-    return scheduled_activities
+    if schedule_id is not None:
+        schedule_ids = [sid for sid in schedule_ids if sid == schedule_id]
+    return scheduled_activities_repo.find_scheduled_activities_by_schedule_ids(
+        db, schedule_ids, params, room_id=room_id, activity_ids=activity_ids, week=week
+    )
 
 
-def get_scheduled_activity_by_id(
-        db: Database,
+async def get_scheduled_activity_by_id(
+        db: AsyncDatabase,
         scheduled_activity_id: str,
         current_user_id: str
 ) -> models.ScheduledActivity:
     """Get scheduled_activity by ID"""
     logger.info(f"Fetching scheduled_activity by id: {scheduled_activity_id}")
     try:
-        scheduled_activity_data = scheduled_activities_repo.find_scheduled_activity_by_id(
+        scheduled_activity_data = await scheduled_activities_repo.find_scheduled_activity_by_id(
             db, scheduled_activity_id
         )
     except Exception as e:
@@ -80,21 +105,21 @@ def get_scheduled_activity_by_id(
         )
 
     scheduled_activity = models.ScheduledActivity(**scheduled_activity_data)
-    access_verifiers.raise_scheduled_activity_forbidden(db, current_user_id, scheduled_activity)
+    await access_verifiers.raise_scheduled_activity_forbidden(db, current_user_id, scheduled_activity)
 
     logger.info(f"Fetched scheduled_activity: {scheduled_activity.id}")
     return scheduled_activity
 
 
-def create_scheduled_activity(
-        db: Database,
+async def create_scheduled_activity(
+        db: AsyncDatabase,
         request: dto_in.CreateScheduledActivity,
         current_user_id: str
 ) -> models.ScheduledActivity:
     """Create a new scheduled_activity"""
     logger.info(f"Creating scheduled_activity for activity={request.activity_id}")
 
-    schedule = schedules_repo.find_schedule_by_id(db, request.schedule_id)
+    schedule = await schedules_repo.find_schedule_by_id(db, request.schedule_id)
     if not schedule:
         logger.error(f"Schedule not found: {request.schedule_id}")
         raise HTTPException(
@@ -102,7 +127,7 @@ def create_scheduled_activity(
             detail=f"Schedule with id {request.schedule_id} not found"
         )
 
-    activity = activities_repo.find_activity_by_id(db, request.activity_id)
+    activity = await activities_repo.find_activity_by_id(db, request.activity_id)
     if not activity:
         logger.error(f"Activity not found: {request.activity_id}")
         raise HTTPException(
@@ -110,7 +135,7 @@ def create_scheduled_activity(
             detail=f"Activity with id {request.activity_id} not found"
         )
 
-    room = rooms_repo.find_room_by_id(db, request.room_id)
+    room = await rooms_repo.find_room_by_id(db, request.room_id)
     if not room:
         logger.error(f"Room not found: {request.room_id}")
         raise HTTPException(
@@ -119,12 +144,12 @@ def create_scheduled_activity(
         )
 
     scheduled_activity = models.ScheduledActivity(**request.model_dump())
-    access_verifiers.raise_scheduled_activity_forbidden(
+    await access_verifiers.raise_scheduled_activity_forbidden(
         db, current_user_id, scheduled_activity, admin_only=True
     )
 
     try:
-        scheduled_activities_repo.insert_scheduled_activity(db, scheduled_activity)
+        await scheduled_activities_repo.insert_scheduled_activity(db, scheduled_activity)
     except Exception as e:
         logger.error(f"Failed to create scheduled_activity: {scheduled_activity}")
         raise HTTPException(
@@ -132,21 +157,22 @@ def create_scheduled_activity(
             detail=f"Error creating scheduled_activity: {str(e)}"
         )
 
+    await schedule_snapshots.bump(db, scheduled_activity.schedule_id)
     logger.info(f"Created scheduled_activity {scheduled_activity.id}")
     return scheduled_activity
 
 
-def delete_scheduled_activity(db: Database, scheduled_activity_id: str, current_user_id: str) -> None:
+async def delete_scheduled_activity(db: AsyncDatabase, scheduled_activity_id: str, current_user_id: str) -> None:
     """Delete a scheduled_activity by ID"""
     logger.info(f"Deleting scheduled_activity id={scheduled_activity_id}")
 
-    scheduled_activity = get_scheduled_activity_by_id(db, scheduled_activity_id, current_user_id)
-    access_verifiers.raise_scheduled_activity_forbidden(
+    scheduled_activity = await get_scheduled_activity_by_id(db, scheduled_activity_id, current_user_id)
+    await access_verifiers.raise_scheduled_activity_forbidden(
         db, current_user_id, scheduled_activity, admin_only=True
     )
 
     try:
-        result = scheduled_activities_repo.delete_scheduled_activity_by_id(
+        result = await scheduled_activities_repo.delete_scheduled_activity_by_id(
             db, scheduled_activity_id
         )
     except Exception as e:
@@ -162,11 +188,12 @@ def delete_scheduled_activity(db: Database, scheduled_activity_id: str, current_
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"ScheduledActivity with id {scheduled_activity_id} not found"
         )
+    await schedule_snapshots.bump(db, scheduled_activity.schedule_id)
     logger.info(f"Deleted scheduled_activity id={scheduled_activity_id}")
 
 
-def update_scheduled_activity(
-        db: Database,
+async def update_scheduled_activity(
+        db: AsyncDatabase,
         scheduled_activity_id: str,
         scheduled_activity_request: dto_in.UpdateScheduledActivity,
         current_user_id: str
@@ -176,13 +203,13 @@ def update_scheduled_activity(
     logger.info(f"Updating scheduled_activity id={scheduled_activity_id}"
                 f" with data={scheduled_activity_dict}")
 
-    scheduled_activity = get_scheduled_activity_by_id(db, scheduled_activity_id, current_user_id)
-    access_verifiers.raise_scheduled_activity_forbidden(
+    scheduled_activity = await get_scheduled_activity_by_id(db, scheduled_activity_id, current_user_id)
+    await access_verifiers.raise_scheduled_activity_forbidden(
         db, current_user_id, scheduled_activity, admin_only=True
     )
 
     if "room_id" in scheduled_activity_dict:
-        room = rooms_repo.find_room_by_id(db, scheduled_activity_dict.get("room_id"))
+        room = await rooms_repo.find_room_by_id(db, scheduled_activity_dict.get("room_id"))
         if not room:
             logger.error(f"Room not found: {scheduled_activity_dict.get('room_id')}")
             raise HTTPException(
@@ -191,7 +218,7 @@ def update_scheduled_activity(
             )
 
     try:
-        result = scheduled_activities_repo.update_scheduled_activity_by_id(
+        result = await scheduled_activities_repo.update_scheduled_activity_by_id(
             db, scheduled_activity_id, scheduled_activity_dict
         )
     except Exception as e:
@@ -208,34 +235,35 @@ def update_scheduled_activity(
             detail=f"ScheduledActivity with id {scheduled_activity_id} not found"
         )
 
-    updated_scheduled_activity = get_scheduled_activity_by_id(
+    await schedule_snapshots.bump(db, scheduled_activity.schedule_id)
+
+    updated_scheduled_activity = await get_scheduled_activity_by_id(
         db, scheduled_activity_id, current_user_id
     )
     logger.info(f"Updated scheduled_activity {updated_scheduled_activity.id}")
     return updated_scheduled_activity
 
 
-def replace_scheduled_activities_for_schedule(
-        db: Database,
+async def replace_scheduled_activities_for_schedule(
+        db: AsyncDatabase,
         schedule_id: str,
         request: dto_in.InsertManyScheduledActivities,
         current_user_id: str,
 ) -> List[models.ScheduledActivity]:
     """Atomically replace all scheduled activities for a given schedule.
 
-    Used by the worker to persist intermediate solutions during long-running
-    schedule generation (every ~60s a new incumbent is saved so the UI can
-    show partial progress without waiting for the solver to terminate)."""
+    Used by the worker for the first save of a generation; later incumbents
+    are sent as diffs (``patch_scheduled_activities_for_schedule``)."""
     logger.info(f"Replacing scheduled activities for schedule {schedule_id}")
 
-    schedule = schedules_repo.find_schedule_by_id(db, schedule_id)
+    schedule = await schedules_repo.find_schedule_by_id(db, schedule_id)
     if not schedule:
         logger.error(f"Schedule not found: {schedule_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Schedule with id {schedule_id} not found"
         )
-    access_verifiers.raise_schedule_forbidden(
+    await access_verifiers.raise_schedule_forbidden(
         db, current_user_id, models.Schedule(**schedule), admin_only=True
     )
 
@@ -250,9 +278,9 @@ def replace_scheduled_activities_for_schedule(
         new_activities.append(sa_model)
 
     try:
-        scheduled_activities_repo.delete_scheduled_activities_by_schedule_id(db, schedule_id)
+        await scheduled_activities_repo.delete_scheduled_activities_by_schedule_id(db, schedule_id)
         if new_activities:
-            scheduled_activities_repo.insert_many_scheduled_activities(db, new_activities)
+            await scheduled_activities_repo.insert_many_scheduled_activities(db, new_activities)
     except Exception as e:
         logger.error(f"Failed to replace scheduled activities for {schedule_id}: {e}")
         raise HTTPException(
@@ -260,12 +288,61 @@ def replace_scheduled_activities_for_schedule(
             detail=f"Error replacing scheduled activities: {str(e)}"
         )
 
+    await schedule_snapshots.bump(db, schedule_id)
+
     logger.info(f"Replaced with {len(new_activities)} scheduled activities for {schedule_id}")
     return new_activities
 
 
-def insert_scheduled_activities_bulk(
-        db: Database,
+async def patch_scheduled_activities_for_schedule(
+        db: AsyncDatabase,
+        schedule_id: str,
+        request: dto_in.PatchScheduledActivities,
+        current_user_id: str,
+) -> None:
+    """Apply a diff to a schedule's scheduled activities.
+
+    Used by the worker to publish each new incumbent as the change from the
+    previous one, which between incumbents is usually a small fraction of
+    the timetable."""
+    logger.info(f"Patching scheduled activities for schedule {schedule_id}: "
+                f"{len(request.upserts)} upsert(s), {len(request.delete_ids)} deletion(s)")
+
+    schedule = await schedules_repo.find_schedule_by_id(db, schedule_id)
+    if not schedule:
+        logger.error(f"Schedule not found: {schedule_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Schedule with id {schedule_id} not found"
+        )
+    await access_verifiers.raise_schedule_forbidden(
+        db, current_user_id, models.Schedule(**schedule), admin_only=True
+    )
+
+    if any(sa.schedule_id != schedule_id for sa in request.upserts):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="All scheduled activities must belong to the target schedule.",
+        )
+
+    try:
+        await scheduled_activities_repo.apply_scheduled_activities_delta(
+            db, schedule_id, request.upserts, request.delete_ids
+        )
+    except Exception as e:
+        logger.error(f"Failed to patch scheduled activities for {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error patching scheduled activities: {str(e)}"
+        )
+    finally:
+        await schedule_snapshots.bump(db, schedule_id)
+
+    logger.info(f"Patched scheduled activities for {schedule_id}")
+
+
+async def insert_scheduled_activities_bulk(
+        db: AsyncDatabase,
         request: dto_in.InsertManyScheduledActivities,
         current_user_id: str
 ) -> None:
@@ -279,23 +356,23 @@ def insert_scheduled_activities_bulk(
     # Verify permissions for each scheduled activity schedule
     scheduled_activities_by_schedule = {}
     for sa in scheduled_activities:
-        access_verifiers.raise_scheduled_activity_forbidden(db, current_user_id, sa, admin_only=True)
+        await access_verifiers.raise_scheduled_activity_forbidden(db, current_user_id, sa, admin_only=True)
         scheduled_activities_by_schedule[sa.schedule_id] = sa
     
     for schedule_id in scheduled_activities_by_schedule:
-        schedule = schedules_repo.find_schedule_by_id(db, schedule_id)
+        schedule = await schedules_repo.find_schedule_by_id(db, schedule_id)
         if not schedule:
             logger.error(f"Schedule not found: {schedule_id}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Schedule with id {schedule_id} not found"
             )
-        access_verifiers.raise_schedule_forbidden(
+        await access_verifiers.raise_schedule_forbidden(
             db, current_user_id, models.Schedule(**schedule), admin_only=True
         )
 
     try:
-        scheduled_activities_repo.insert_many_scheduled_activities(db, scheduled_activities)
+        await scheduled_activities_repo.insert_many_scheduled_activities(db, scheduled_activities)
     except Exception as e:
         logger.error(f"Failed to insert scheduled_activities in bulk: {e}")
         raise HTTPException(
@@ -303,4 +380,7 @@ def insert_scheduled_activities_bulk(
             detail=f"Error inserting scheduled_activities in bulk: {str(e)}"
         )
 
+    for schedule_id in scheduled_activities_by_schedule:
+        await schedule_snapshots.bump(db, schedule_id)
+
     logger.info(f"Inserted {len(scheduled_activities)} scheduled_activities in bulk")
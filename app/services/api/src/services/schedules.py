@@ -1,22 +1,26 @@
 import os
-from typing import Dict, List, Set
+from typing import List
 
 from celery import Celery
 from starlette import status
+from starlette.concurrency import run_in_threadpool
 from fastapi import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.services.api.src.auth import access_verifiers
+from app.libs.scheduling import conflict_index
+from app.services.api.src.auth import access_verifiers, principals
+from app.services.api.src import listing
 from app.services.api.src.repositories import (
     activities as activities_repo,
-    groups as groups_repo,
     institutions as institutions_repo,
+    packed_schedules as packed_schedules_repo,
     schedules as schedules_repo,
     scheduled_activities as scheduled_activities_repo,
-    users as users_repo,
 )
+from app.services.api.src.services import schedule_snapshots
 from app.services.api.src.dtos.input import schedule as dto_in
 from app.services.api.src.dtos.output import schedule as dto_out
 
@@ -24,18 +28,21 @@ from app.services.api.src.dtos.output import schedule as dto_out
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 celery_client = Celery("api", broker=CELERY_BROKER_URL)
 
+# Apply a batch of record edits all-or-nothing; needs a replica set (Atlas is one).
+BATCH_UPDATE_TRANSACTIONS = os.getenv("BATCH_UPDATE_TRANSACTIONS", "false").lower() == "true"
+
 logger = get_logger()
 
 
-def trigger_schedule_generation(
-        db: Database,
+async def trigger_schedule_generation(
+        db: AsyncDatabase,
         request: dto_in.CreateSchedule,
         current_user_id: str,
         token: str
 ) -> models.Schedule:
     """Trigger schedule generation process"""
     institution_id = request.institution_id
-    institution_data = institutions_repo.find_institution_by_id(db, institution_id)
+    institution_data = await institutions_repo.find_institution_by_id(db, institution_id)
 
     if not institution_data:
         logger.error(f"Institution not found: {institution_id}")
@@ -47,7 +54,7 @@ def trigger_schedule_generation(
     institution = models.Institution(**institution_data)
 
     logger.info(f"Fetching activities for institution {institution_id}")
-    activities = activities_repo.find_activities_by_institution_id(db, institution_id)
+    activities = await activities_repo.find_activities_by_institution_id(db, institution_id)
 
     if not activities:
         logger.error(f"No activities found for institution {institution_id}")
@@ -63,21 +70,31 @@ def trigger_schedule_generation(
         time_grid_config=institution.time_grid_config,
     )
 
+    if request.incremental:
+        if not institution.active_schedule_id:
+            logger.error(f"Institution {institution_id} has no active schedule to re-solve from")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Institution with id {institution_id} has no active schedule; "
+                       f"incremental generation needs one to start from."
+            )
+        schedule.base_schedule_id = institution.active_schedule_id
+
     # IMPORTANT: check authorization BEFORE allocating the schedule number.
     # ``get_next_schedule_number`` mutates the institution's monotonic
     # counter; if we ran it before the auth check, an unauthorized caller
     # could burn schedule numbers and leave permanent gaps in the
     # "Schedule #N" sequence.
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
 
     # Authorized - safe to atomically reserve the next number.  The counter
     # only ever goes up, so deleting an existing schedule does not free its
     # number.
-    next_number = institutions_repo.get_next_schedule_number(db, institution_id)
+    next_number = await institutions_repo.get_next_schedule_number(db, institution_id)
     schedule.name = f"Schedule #{next_number}"
 
     try:
-        schedules_repo.insert_schedule(db, schedule)
+        await schedules_repo.insert_schedule(db, schedule)
     except Exception as e:
         logger.error(f"Failed to insert schedule: {e}")
         raise HTTPException(
@@ -87,14 +104,20 @@ def trigger_schedule_generation(
 
     logger.info(f"Triggering schedule generation process for institution {institution_id}")
 
-    celery_client.send_task(
+    task_kwargs = {
+        "institution_id": institution_id,
+        "schedule_id": schedule.id,
+        "token": token
+    }
+    if schedule.base_schedule_id:
+        task_kwargs["base_schedule_id"] = schedule.base_schedule_id
+
+    # Publishing is a blocking broker round trip; keep it off the event loop.
+    await run_in_threadpool(
+        celery_client.send_task,
         task_id=schedule.id,
         name="generate_schedule",
-        kwargs={
-            "institution_id": institution_id,
-            "schedule_id": schedule.id,
-            "token": token
-        },
+        kwargs=task_kwargs,
         queue="schedule_generator_queue"
     )
 
@@ -104,38 +127,18 @@ def trigger_schedule_generation(
     return schedule
 
 
-def get_schedules(db: Database, current_user_id: str) -> List[models.Schedule]:
-    """Get all schedules"""
+async def get_schedules(db: AsyncDatabase, current_user_id: str, params: listing.ListParams) -> AsyncCursor:
+    """Get the schedules of the user's institutions"""
     logger.info("Fetching all schedules")
-    try:
-        schedules_data = schedules_repo.find_all_schedules(db)
-    except Exception as e:
-        logger.error(f"Failed to retrieve schedules: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving schedules: {str(e)}"
-        )
-
-    user_data = users_repo.find_user_by_id(db, current_user_id)
-    if not user_data:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = models.User(**user_data)
-    schedules = [models.Schedule(**schedule) for schedule in schedules_data
-                 if schedule['institution_id'] in user.user_roles]
-    logger.info(f"Fetched {len(schedules)} schedules")
-
-    return schedules
+    user = await principals.get_principal(db, current_user_id)
+    return schedules_repo.find_schedules_by_institution_ids(db, list(user.user_roles), params)
 
 
-def get_schedule_by_id(db: Database, schedule_id: str, current_user_id: str) -> models.Schedule:
+async def get_schedule_by_id(db: AsyncDatabase, schedule_id: str, current_user_id: str) -> models.Schedule:
     """Get schedule by ID"""
     logger.info(f"Fetching schedule by id: {schedule_id}")
     try:
-        schedule_data = schedules_repo.find_schedule_by_id(db, schedule_id)
+        schedule_data = await schedules_repo.find_schedule_by_id(db, schedule_id)
     except Exception as e:
         logger.error(f"Failed to retrieve schedule {schedule_id}: {e}")
         raise HTTPException(
@@ -151,22 +154,22 @@ def get_schedule_by_id(db: Database, schedule_id: str, current_user_id: str) ->
         )
 
     schedule = models.Schedule(**schedule_data)
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule)
 
     logger.info(f"Fetched schedule: {schedule.id}")
 
     return schedule
 
 
-def delete_schedule(db: Database, schedule_id: str, current_user_id: str) -> None:
+async def delete_schedule(db: AsyncDatabase, schedule_id: str, current_user_id: str) -> None:
     """Delete a schedule by ID"""
     logger.info(f"Deleting schedule id={schedule_id}")
 
-    schedule = get_schedule_by_id(db, schedule_id, current_user_id)
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
 
     try:
-        result = schedules_repo.delete_schedule_by_id(db, schedule_id)
+        result = await schedules_repo.delete_schedule_by_id(db, schedule_id)
     except Exception as e:
         logger.error(f"Failed to delete schedule {schedule_id}: {e}")
         raise HTTPException(
@@ -180,11 +183,12 @@ def delete_schedule(db: Database, schedule_id: str, current_user_id: str) -> Non
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Schedule with id {schedule_id} not found."
         )
+    await packed_schedules_repo.delete_packed_schedule_by_schedule_id(db, schedule_id)
     logger.info(f"Deleted schedule {schedule_id}")
 
 
-def get_scheduled_activities_by_schedule_id(
-        db: Database,
+async def get_scheduled_activities_by_schedule_id(
+        db: AsyncDatabase,
         schedule_id: str,
         current_user_id: str
 ) -> List[models.ScheduledActivity]:
@@ -192,12 +196,10 @@ def get_scheduled_activities_by_schedule_id(
     logger.info(f"Fetching scheduled activities for schedule id: {schedule_id}")
 
     # Verify schedule exists and user has access
-    get_schedule_by_id(db, schedule_id, current_user_id)
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
 
     try:
-        scheduled_activities_data = (
-            scheduled_activities_repo.find_scheduled_activities_by_schedule_id(db, schedule_id)
-        )
+        snapshot = await schedule_snapshots.get_snapshot(db, schedule)
     except Exception as e:
         logger.error(f"Failed to retrieve scheduled activities for schedule {schedule_id}: {e}")
         raise HTTPException(
@@ -205,18 +207,52 @@ def get_scheduled_activities_by_schedule_id(
             detail=f"Error retrieving scheduled activities for schedule id {schedule_id}: {str(e)}"
         )
 
-    scheduled_activities = [
-        models.ScheduledActivity(**scheduled_activity)
-        for scheduled_activity in scheduled_activities_data
-    ]
+    scheduled_activities = list(snapshot.records)
     logger.info(f"Fetched {len(scheduled_activities)} scheduled activities for schedule id: "
                 f"{schedule_id}")
 
     return scheduled_activities
 
 
-def update_schedule(
-        db: Database,
+async def get_packed_scheduled_activities_by_schedule_id(
+        db: AsyncDatabase,
+        schedule_id: str,
+        current_user_id: str
+) -> dto_out.GetPackedScheduledActivities:
+    """Get scheduled activities by schedule ID in the packed, columnar form"""
+    logger.info(f"Fetching packed scheduled activities for schedule id: {schedule_id}")
+
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
+
+    try:
+        snapshot = await schedule_snapshots.get_snapshot(db, schedule)
+    except Exception as e:
+        logger.error(f"Failed to retrieve scheduled activities for schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error retrieving scheduled activities for schedule id {schedule_id}: {str(e)}"
+        )
+
+    if snapshot.packed is None:
+        logger.error(f"Schedule {schedule_id} has no packed form")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Scheduled activities of schedule with id {schedule_id} cannot be packed; "
+                   f"use the expanded form."
+        )
+
+    return dto_out.GetPackedScheduledActivities(
+        schedule_id=schedule_id,
+        version=snapshot.version,
+        record_ids=snapshot.packed.record_ids,
+        activity_ids=snapshot.packed.activity_ids,
+        room_ids=snapshot.packed.room_ids,
+        **snapshot.packed_columns(),
+    )
+
+
+async def update_schedule(
+        db: AsyncDatabase,
         schedule_id: str,
         request: dto_in.UpdateSchedule,
         current_user_id: str
@@ -224,13 +260,13 @@ def update_schedule(
     """Update a schedule by ID"""
     logger.info(f"Updating schedule id={schedule_id}")
 
-    schedule = get_schedule_by_id(db, schedule_id, current_user_id)
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
 
     update_data = request.model_dump(exclude_unset=True)
 
     try:
-        result = schedules_repo.update_schedule_by_id(db, schedule_id, update_data)
+        result = await schedules_repo.update_schedule_by_id(db, schedule_id, update_data)
     except Exception as e:
         logger.error(f"Failed to update schedule {schedule_id}: {e}")
         raise HTTPException(
@@ -245,63 +281,23 @@ def update_schedule(
             detail=f"Schedule with id {schedule_id} not found."
         )
 
-    updated_schedule = get_schedule_by_id(db, schedule_id, current_user_id)
+    updated_schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
     logger.info(f"Updated schedule id={schedule_id}")
 
     return updated_schedule
 
 
-# ── Schedule editing helpers ──────────────────────────────────────────────────
-
-def _build_ancestor_set(group_id: str, groups_map: Dict[str, models.Group]) -> Set[str]:
-    """Return the set of all ancestor group IDs for a given group (not including itself)."""
-    ancestors: Set[str] = set()
-    visited: Set[str] = set()
-    current_id = group_id
-    while True:
-        g = groups_map.get(current_id)
-        if not g or not g.parent_group_id or g.parent_group_id in visited:
-            break
-        ancestors.add(g.parent_group_id)
-        visited.add(current_id)
-        current_id = g.parent_group_id
-    return ancestors
-
-
-def _get_effective_weeks(
-    rec: dict,
-    activity: models.Activity,
-    total_weeks: int,
-) -> Set[int]:
-    """Return the set of 0-indexed week numbers during which a record is active."""
-    if activity.frequency == models.Frequency.WEEKLY:
-        return set(range(total_weeks))
-    return set(rec["active_weeks"])
-
-
-def _timeslots_overlap(
-    rec_a: dict,
-    act_a: models.Activity,
-    rec_b: dict,
-    act_b: models.Activity,
-    tpd: int,
-) -> bool:
-    """Return True if rec_a and rec_b occupy overlapping timeslots on the same day."""
-    day_a = rec_a["start_timeslot"] // tpd
-    day_b = rec_b["start_timeslot"] // tpd
-    if day_a != day_b:
-        return False
-    slot_a = rec_a["start_timeslot"] % tpd
-    slot_b = rec_b["start_timeslot"] % tpd
-    end_a = slot_a + act_a.duration_slots
-    end_b = slot_b + act_b.duration_slots
-    return slot_a < end_b and slot_b < end_a
+# ── Public service functions ──────────────────────────────────────────────────
 
+_CONFLICT_DESCRIPTIONS = {
+    conflict_index.ROOM: "Room is already occupied at this timeslot.",
+    conflict_index.PROFESSOR: "Professor is already assigned to another activity at this timeslot.",
+    conflict_index.GROUP: "Group already has another activity at this timeslot.",
+}
 
-# ── Public service functions ──────────────────────────────────────────────────
 
-def _run_conflict_check(
-    db: Database,
+async def _run_conflict_check(
+    db: AsyncDatabase,
     schedule: models.Schedule,
     changes: List[dto_in.ScheduleChangeItem],
 ) -> List[dto_out.RecordConflicts]:
@@ -309,172 +305,56 @@ def _run_conflict_check(
     Core conflict-detection logic (no auth - callers must have already verified access).
 
     Applies all proposed changes as overrides on top of the current schedule state,
-    then checks every changed record against every other record for:
+    then checks every changed record against the rest of the schedule for:
       • room double-booking
       • professor double-booking
-      • group overlap (including ancestor/descendant groups)
+      • group overlap (groups sharing a leaf - a group and its ancestors/descendants)
 
     Only NEW conflicts are returned - conflicts that already existed between the same
     pair of records in the original schedule are silently skipped.  This means moving
     an activity away from a slot it was already sharing with another activity is never
     flagged, and all pending moves are evaluated simultaneously so that swapping two
     activities never produces a spurious self-conflict.
-    """
-    schedule_id = schedule.id
-    tpd = schedule.time_grid_config.timeslots_per_day
-    total_weeks = schedule.time_grid_config.weeks
-    institution_id = schedule.institution_id
-
-    changes_map: Dict[str, dto_in.ScheduleChangeItem] = {c.record_id: c for c in changes}
-    changed_ids: Set[str] = set(changes_map.keys())
-
-    # Load raw records once; build both the original state and the effective state.
-    raw_records = scheduled_activities_repo.find_scheduled_activities_by_schedule_id(db, schedule_id)
-    original_map: Dict[str, dict] = {}   # rec_id → record at original position
-    effective: List[dict] = []           # all records at their post-change positions
-
-    for raw in raw_records:
-        rec_id = str(raw["_id"])
-        orig = {
-            "id": rec_id,
-            "activity_id": str(raw["activity_id"]),
-            "room_id": str(raw.get("room_id", "")),
-            "start_timeslot": raw["start_timeslot"],
-            "active_weeks": raw.get("active_weeks", []),
-        }
-        original_map[rec_id] = orig
-
-        if rec_id in changes_map:
-            c = changes_map[rec_id]
-            effective.append({
-                "id": rec_id,
-                "activity_id": str(raw["activity_id"]),
-                "room_id": c.new_room_id,
-                "start_timeslot": c.new_start_timeslot,
-                "active_weeks": raw.get("active_weeks", []),
-            })
-        else:
-            effective.append(dict(orig))
-
-    # Load activities (one fetch per unique activity_id)
-    unique_act_ids = list({r["activity_id"] for r in effective})
-    activities_map: Dict[str, models.Activity] = {}
-    for act_id in unique_act_ids:
-        raw_act = activities_repo.find_activity_by_id(db, act_id)
-        if raw_act:
-            act = models.Activity(**raw_act)
-            activities_map[act.id] = act
-
-    # Load groups for ancestor computation
-    raw_groups = groups_repo.find_groups_by_institution_id(db, institution_id)
-    groups_map: Dict[str, models.Group] = {}
-    for raw_g in raw_groups:
-        g = models.Group(**raw_g)
-        groups_map[g.id] = g
-
-    ancestor_cache: Dict[str, Set[str]] = {}
-    for act in activities_map.values():
-        for gid in act.group_ids:
-            if gid not in ancestor_cache:
-                ancestor_cache[gid] = _build_ancestor_set(gid, groups_map)
-
-    conflicts_by_record: Dict[str, List[dto_out.ConflictItem]] = {}
-
-    for rec_a in effective:
-        if rec_a["id"] not in changed_ids:
-            continue
-        act_a = activities_map.get(rec_a["activity_id"])
-        if not act_a:
-            continue
-        weeks_a = _get_effective_weeks(rec_a, act_a, total_weeks)
-        # Expanded group set = all group_ids + all their ancestors
-        anc_a = set(act_a.group_ids) | set().union(*(ancestor_cache.get(gid, set()) for gid in act_a.group_ids))
-        orig_a = original_map[rec_a["id"]]
-
-        for rec_b in effective:
-            if rec_a["id"] == rec_b["id"]:
-                continue
-            act_b = activities_map.get(rec_b["activity_id"])
-            if not act_b:
-                continue
-
-            weeks_b = _get_effective_weeks(rec_b, act_b, total_weeks)
-            if not (weeks_a & weeks_b):
-                continue
-
-            if not _timeslots_overlap(rec_a, act_a, rec_b, act_b, tpd):
-                continue
-
-            # Determine whether this pair already conflicted in the original schedule.
-            # A conflict is pre-existing when both records overlapped at their original
-            # positions - if so, the current move did not introduce it and we skip it.
-            orig_b = original_map.get(rec_b["id"])
-            orig_weeks_a = _get_effective_weeks(orig_a, act_a, total_weeks)
-            orig_weeks_b = _get_effective_weeks(orig_b, act_b, total_weeks) if orig_b else set()
-            originally_overlapping = (
-                orig_b is not None
-                and bool(orig_weeks_a & orig_weeks_b)
-                and _timeslots_overlap(orig_a, act_a, orig_b, act_b, tpd)
-            )
-
-            anc_b = set(act_b.group_ids) | set().union(*(ancestor_cache.get(gid, set()) for gid in act_b.group_ids))
-            rec_conflicts = conflicts_by_record.setdefault(rec_a["id"], [])
-
-            # Room double-booking
-            if rec_a["room_id"] and rec_b["room_id"] and rec_a["room_id"] == rec_b["room_id"]:
-                was_room_conflict = originally_overlapping and orig_b and orig_a["room_id"] == orig_b["room_id"]
-                if not was_room_conflict:
-                    rec_conflicts.append(dto_out.ConflictItem(
-                        type="room",
-                        conflicting_record_id=rec_b["id"],
-                        description="Room is already occupied at this timeslot.",
-                    ))
-
-            # Professor double-booking
-            if (act_a.professor_id and act_b.professor_id
-                    and act_a.professor_id == act_b.professor_id):
-                was_prof_conflict = originally_overlapping
-                if not was_prof_conflict:
-                    rec_conflicts.append(dto_out.ConflictItem(
-                        type="professor",
-                        conflicting_record_id=rec_b["id"],
-                        description="Professor is already assigned to another activity at this timeslot.",
-                    ))
-
-            # Group overlap: any group_id from A shares a hierarchy path with any from B
-            if act_a.group_ids and act_b.group_ids:
-                groups_clash = bool(anc_a & anc_b)
-                if groups_clash:
-                    was_group_conflict = originally_overlapping and groups_clash
-                    if not was_group_conflict:
-                        rec_conflicts.append(dto_out.ConflictItem(
-                            type="group",
-                            conflicting_record_id=rec_b["id"],
-                            description="Group already has another activity at this timeslot.",
-                        ))
 
+    The schedule's conflict index comes from the snapshot cache
+    (``schedule_snapshots``), so a batch costs roughly O(changes x log(records))
+    and, while the schedule is unchanged, no database reads beyond the schedule.
+    """
+    snapshot = await schedule_snapshots.get_snapshot(db, schedule)
+    found = snapshot.conflicts.find_new_conflicts(
+        {c.record_id: (c.new_start_timeslot, c.new_room_id) for c in changes}
+    )
     return [
-        dto_out.RecordConflicts(record_id=rid, conflicts=items)
-        for rid, items in conflicts_by_record.items()
-        if items
+        dto_out.RecordConflicts(
+            record_id=record_id,
+            conflicts=[
+                dto_out.ConflictItem(
+                    type=kind,
+                    conflicting_record_id=other_id,
+                    description=_CONFLICT_DESCRIPTIONS[kind],
+                )
+                for kind, other_id in items
+            ],
+        )
+        for record_id, items in found
     ]
 
 
-def check_conflicts(
-    db: Database,
+async def check_conflicts(
+    db: AsyncDatabase,
     schedule_id: str,
     request: dto_in.CheckConflictsRequest,
     current_user_id: str,
 ) -> dto_out.CheckConflictsResponse:
     """Check what conflicts a batch of proposed moves would introduce."""
-    schedule = get_schedule_by_id(db, schedule_id, current_user_id)
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
-    results = _run_conflict_check(db, schedule, request.changes)
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
+    results = await _run_conflict_check(db, schedule, request.changes)
     return dto_out.CheckConflictsResponse(results=results)
 
 
-def batch_update_records(
-    db: Database,
+async def batch_update_records(
+    db: AsyncDatabase,
     schedule_id: str,
     request: dto_in.BatchUpdateRecordsRequest,
     current_user_id: str,
@@ -484,12 +364,16 @@ def batch_update_records(
 
     If force=False and conflicts exist, raises HTTP 409 with the conflict list.
     If force=True, saves unconditionally.
+
+    The changes go out as one unordered bulk write (in a transaction when
+    BATCH_UPDATE_TRANSACTIONS is set) and the response is the snapshot's
+    records with the changes applied, rather than a re-read of the schedule.
     """
-    schedule = get_schedule_by_id(db, schedule_id, current_user_id)
-    access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
+    schedule = await get_schedule_by_id(db, schedule_id, current_user_id)
+    await access_verifiers.raise_schedule_forbidden(db, current_user_id, schedule, admin_only=True)
 
     if not request.force:
-        conflicts = _run_conflict_check(db, schedule, request.changes)
+        conflicts = await _run_conflict_check(db, schedule, request.changes)
         if conflicts:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -499,12 +383,34 @@ def batch_update_records(
                 },
             )
 
-    for change in request.changes:
-        scheduled_activities_repo.update_scheduled_activity_by_id(
-            db,
-            change.record_id,
-            {"start_timeslot": change.new_start_timeslot, "room_id": change.new_room_id},
+    snapshot = await schedule_snapshots.get_snapshot(db, schedule)
+    updates = {
+        change.record_id: {"start_timeslot": change.new_start_timeslot, "room_id": change.new_room_id}
+        for change in request.changes
+    }
+
+    try:
+        if BATCH_UPDATE_TRANSACTIONS:
+            async with db.client.start_session() as session:
+                await session.with_transaction(
+                    lambda s: scheduled_activities_repo.bulk_update_scheduled_activities(
+                        db, schedule_id, updates, session=s
+                    )
+                )
+        else:
+            await scheduled_activities_repo.bulk_update_scheduled_activities(db, schedule_id, updates)
+    except Exception as e:
+        logger.error(f"Failed to apply record updates to schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error updating records of schedule with id {schedule_id}: {str(e)}"
         )
+    finally:
+        # Without a transaction a failed batch may still have applied in part.
+        await schedule_snapshots.bump(db, schedule_id)
 
-    logger.info(f"Applied {len(request.changes)} record update(s) to schedule {schedule_id}")
-    return get_scheduled_activities_by_schedule_id(db, schedule_id, current_user_id)
+    logger.info(f"Applied {len(updates)} record update(s) to schedule {schedule_id}")
+    return [
+        record.model_copy(update=updates[record.id]) if record.id in updates else record
+        for record in snapshot.records
+    ]
@@ -1,12 +1,14 @@
-from typing import List
+from typing import List, Optional
 
 from starlette import status
 from fastapi.exceptions import HTTPException
-from pymongo.synchronous.database import Database
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
 
 from app.libs.db import models
 from app.libs.logging.logger import get_logger
-from app.libs.stringproc import stringproc
+from app.services.api.src.auth import cpu_pool, principals
+from app.services.api.src import listing
 from app.services.api.src.dtos.input import user as dto_in
 from app.services.api.src.repositories import (
     users as users_repo,
@@ -14,33 +16,43 @@ from app.services.api.src.repositories import (
     institutions as institutions_repo,
     groups as groups_repo
 )
+from app.services.api.src.services import schedule_snapshots
 
 
 logger = get_logger()
 
 
-def get_users(db: Database) -> List[models.User]:
-    """Get all users"""
-    logger.info("Fetching all users")
-    try:
-        users_data = users_repo.find_all_users(db)
-    except Exception as e:
+async def get_users(
+    db: AsyncDatabase,
+    current_user_id: str,
+    params: listing.ListParams,
+    email: Optional[str] = None,
+) -> AsyncCursor:
+    """Get the members of the user's institutions.
+
+    With ``email``, look up the registered user with exactly that address
+    instead, wherever they belong - how an admin finds someone to add to
+    their institution.  Only institution admins may look users up."""
+    user = await principals.get_principal(db, current_user_id)
+    if email is None:
+        logger.info("Fetching all users")
+        return users_repo.find_users_by_institution_ids(db, current_user_id, list(user.user_roles), params)
+
+    if not any(models.UserRole.ADMIN in roles for roles in user.user_roles.values()):
+        logger.error(f"User {current_user_id} is not an admin of any institution")
         raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error retrieving users: {str(e)}"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only institution admins can look up users by email"
         )
-
-    users = [models.User(**user) for user in users_data]
-    logger.info(f"Fetched {len(users)} users")
-
-    return users
+    logger.info(f"Looking up users by email: {email}")
+    return users_repo.find_users_by_email(db, email.strip(), params)
 
 
-def get_user_by_id(db: Database, user_id: str) -> models.User:
+async def get_user_by_id(db: AsyncDatabase, user_id: str) -> models.User:
     """Get user by ID"""
     logger.info(f"Fetching user by id: {user_id}")
     try:
-        user_data = users_repo.find_user_by_id(db, user_id)
+        user_data = await users_repo.find_user_by_id(db, user_id)
     except Exception as e:
         logger.error(f"Failed to retrieve user {user_id}: {e}")
         raise HTTPException(
@@ -61,18 +73,18 @@ def get_user_by_id(db: Database, user_id: str) -> models.User:
     return user
 
 
-def create_user(db: Database, request: dto_in.CreateUser) -> models.User:
+async def create_user(db: AsyncDatabase, request: dto_in.CreateUser) -> models.User:
     """Create a new user"""
     logger.info(f"Creating user {request.email}")
 
     user_data = request.model_dump()
     password = user_data.pop("password")
-    hashed_password = stringproc.hash_password(password)
+    hashed_password = await cpu_pool.hash_password(password)
 
     user = models.User(**user_data)
     user.hashed_password = hashed_password
 
-    existing_user = users_repo.find_user_by_email(db, str(user.email))
+    existing_user = await users_repo.find_user_by_email(db, str(user.email))
     if existing_user:
         logger.error(f"User with email {user.email} already exists")
         raise HTTPException(
@@ -81,7 +93,7 @@ def create_user(db: Database, request: dto_in.CreateUser) -> models.User:
         )
 
     try:
-        users_repo.insert_user(db, user)
+        await users_repo.insert_user(db, user)
     except Exception as e:
         logger.error(f"Failed to create user: {user.email}")
         raise HTTPException(
@@ -93,29 +105,32 @@ def create_user(db: Database, request: dto_in.CreateUser) -> models.User:
     return user
 
 
-def delete_user(db: Database, user_id: str) -> None:
+async def delete_user(db: AsyncDatabase, user_id: str) -> None:
     """Delete an user by ID"""
     logger.info(f"Deleting user {user_id}")
     try:
-        result = users_repo.delete_user_by_id(db, user_id)
+        result = await users_repo.delete_user_by_id(db, user_id)
     except Exception as e:
         logger.error(f"Failed to delete user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error deleting user with id {user_id}: {str(e)}"
         )
+    principals.forget(user_id)
 
-    prof_activities = activities_repo.find_activities_by_professor_id(db, user_id)
+    prof_activities = await activities_repo.find_activities_by_professor_id(db, user_id)
     logger.info(f"Deleting {len(prof_activities)} activities for user {user_id}")
     try:
         for activity in prof_activities:
-            activities_repo.update_activity_by_id(db, activity["_id"], {"professor_id": None})
+            await activities_repo.update_activity_by_id(db, activity["_id"], {"professor_id": None})
     except Exception as e:
         logger.error(f"Failed to delete activities for user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error deleting related data for user with id {user_id}: {str(e)}"
         )
+    for institution_id in {activity["institution_id"] for activity in prof_activities}:
+        await schedule_snapshots.bump_institution(db, institution_id)
 
     if result.deleted_count == 0:
         logger.error(f"User not found for deletion: {user_id}")
@@ -125,17 +140,17 @@ def delete_user(db: Database, user_id: str) -> None:
         )
 
 
-def update_user(db: Database, user_id: str, request: dto_in.UpdateUser) -> models.User:
+async def update_user(db: AsyncDatabase, user_id: str, request: dto_in.UpdateUser) -> models.User:
     """Update an existing user"""
     update_data = request.model_dump(exclude_unset=True)
     logger.info(f"Updating user {user_id} with data {update_data}")
 
     if "password" in update_data:
         password = update_data.pop("password")
-        hashed_password = stringproc.hash_password(password)
+        hashed_password = await cpu_pool.hash_password(password)
         update_data["hashed_password"] = hashed_password
 
-    existing_user = users_repo.find_user_by_email(db, update_data.get("email"))
+    existing_user = await users_repo.find_user_by_email(db, update_data.get("email"))
     if existing_user and existing_user["_id"] != user_id:
         logger.error(f"User with email {request.email} already exists")
         raise HTTPException(
@@ -145,7 +160,7 @@ def update_user(db: Database, user_id: str, request: dto_in.UpdateUser) -> model
 
     if "user_roles" in update_data and update_data.get("user_roles") is not None:
         all_institution_ids = [
-            institution["_id"] for institution in institutions_repo.find_all_institutions(db)
+            institution["_id"] for institution in await institutions_repo.find_all_institutions(db)
         ]
 
         for institution_id in update_data["user_roles"]:
@@ -161,11 +176,11 @@ def update_user(db: Database, user_id: str, request: dto_in.UpdateUser) -> model
         for institution_id in update_data["user_roles"]:
             user_institution_groups.extend(
                 [group["_id"]
-                 for group in groups_repo.find_groups_by_institution_id(db, institution_id)]
+                 for group in await groups_repo.find_groups_by_institution_id(db, institution_id)]
             )
 
         for group_id in update_data["group_ids"]:
-            group_data = groups_repo.find_group_by_id(db, group_id)
+            group_data = await groups_repo.find_group_by_id(db, group_id)
             if not group_data:
                 logger.error(f"Group not found for update: {group_id}")
                 raise HTTPException(
@@ -181,13 +196,15 @@ def update_user(db: Database, user_id: str, request: dto_in.UpdateUser) -> model
                 )
 
     try:
-        result = users_repo.update_user_by_id(db, user_id, update_data)
+        result = await users_repo.update_user_by_id(db, user_id, update_data)
     except Exception as e:
         logger.error(f"Failed to update user {user_id}: {e}")
         raise HTTPException(
             status_code=status.HTTP_424_FAILED_DEPENDENCY,
             detail=f"Error updating user with id {user_id}: {str(e)}"
         )
+    if "user_roles" in update_data:
+        principals.forget(user_id)
 
     if result.matched_count == 0:
         logger.error(f"User not found for update: {user_id}")
@@ -196,16 +213,16 @@ def update_user(db: Database, user_id: str, request: dto_in.UpdateUser) -> model
             detail=f"User with id {user_id} not found"
         )
 
-    return get_user_by_id(db, user_id)
+    return await get_user_by_id(db, user_id)
 
 
-def update_timeslot_preferences(
-    db: Database, user_id: str, institution_id: str, request: dto_in.UpdateTimeslotPreferences
+async def update_timeslot_preferences(
+    db: AsyncDatabase, user_id: str, institution_id: str, request: dto_in.UpdateTimeslotPreferences
 ) -> models.User:
     """Set professor timeslot preferences for a specific institution"""
     logger.info(f"Updating timeslot preferences for user {user_id}, institution {institution_id}")
 
-    user = get_user_by_id(db, user_id)
+    user = await get_user_by_id(db, user_id)
 
     # Verify the user is a professor in this institution
     roles = user.user_roles.get(institution_id, [])
@@ -216,7 +233,7 @@ def update_timeslot_preferences(
         )
 
     # Verify institution exists
-    inst = institutions_repo.find_institution_by_id(db, institution_id)
+    inst = await institutions_repo.find_institution_by_id(db, institution_id)
     if not inst:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -225,7 +242,7 @@ def update_timeslot_preferences(
 
     prefs_data = [p.model_dump() for p in request.preferences]
     try:
-        users_repo.update_user_by_id(
+        await users_repo.update_user_by_id(
             db, user_id, {f"timeslot_preferences.{institution_id}": prefs_data}
         )
     except Exception as e:
@@ -239,11 +256,11 @@ def update_timeslot_preferences(
     max_per_day = request.max_timeslots_per_day
     try:
         if max_per_day is not None and max_per_day > 0:
-            users_repo.update_user_by_id(
+            await users_repo.update_user_by_id(
                 db, user_id, {f"max_timeslots_per_day.{institution_id}": max_per_day}
             )
         else:
-            users_repo.unset_user_field_by_id(
+            await users_repo.unset_user_field_by_id(
                 db, user_id, f"max_timeslots_per_day.{institution_id}"
             )
     except Exception as e:
@@ -253,13 +270,13 @@ def update_timeslot_preferences(
             detail=f"Error updating max timeslots per day: {str(e)}",
         )
 
-    return get_user_by_id(db, user_id)
+    return await get_user_by_id(db, user_id)
 
 
-def get_professor_activities(db: Database, professor_id: str) -> List[models.Activity]:
+async def get_professor_activities(db: AsyncDatabase, professor_id: str) -> List[models.Activity]:
     """Get all activities for a specific professor"""
     logger.info(f"Fetching activities for professor {professor_id}")
-    user = get_user_by_id(db, professor_id)
+    user = await get_user_by_id(db, professor_id)
 
     if not any(models.UserRole.PROFESSOR in user_roles for user_roles in user.user_roles.values()):
         logger.error(f"User with id {professor_id} is not a professor")
@@ -269,7 +286,7 @@ def get_professor_activities(db: Database, professor_id: str) -> List[models.Act
         )
 
     try:
-        activities_data = activities_repo.find_activities_by_professor_id(db, professor_id)
+        activities_data = await activities_repo.find_activities_by_professor_id(db, professor_id)
     except Exception as e:
         logger.error(f"Failed to retrieve activities for professor {professor_id}: {e}")
         raise HTTPException(
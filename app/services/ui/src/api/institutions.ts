@@ -1,5 +1,6 @@
 import { apiDelete, apiGet, apiPatch, apiPost, apiPut } from '../utils/apiClient';
 import { API_INSTITUTIONS_PATH, API_URL } from '../config/constants';
+import { getAuthorizationHeader } from '../utils/auth';
 import { Institution as InstitutionClass } from '../types/institution';
 import type { InstitutionData } from '../types/institution';
 
@@ -187,6 +188,60 @@ export async function getScheduleActivities(scheduleId: string): Promise<Schedul
   return normalizeCollection<ScheduledActivityRecord>(res, 'scheduled_activities');
 }
 
+export interface ScheduleProgressEvent {
+  schedule_id: string;
+  phase: 'loading' | 'feasibility' | 'optimise' | 'saving' | 'completed' | 'failed';
+  elapsed_seconds: number;
+  phase_elapsed_seconds: number;
+  budget_seconds: number | null;
+  best_objective: number | null;
+  best_bound: number | null;
+  gap: number | null;
+  idle_seconds: number | null;
+  stagnation_seconds: number | null;
+  incumbents_published: number;
+  message: string | null;
+}
+
+/**
+ * Follow a schedule's generation progress (Server-Sent Events), calling
+ * `onEvent` for each event.  Resolves when the stream ends - after the
+ * completed / failed event - and rejects when it cannot be opened (e.g. 503
+ * when the API has no message broker) or is aborted through `signal`.
+ */
+export async function streamScheduleProgress(
+  scheduleId: string,
+  onEvent: (event: ScheduleProgressEvent) => void,
+  signal: AbortSignal,
+): Promise<void> {
+  const url = `${API_URL}/api/v1/schedules/${scheduleId}/progress`;
+  const res = await fetch(url, {
+    credentials: 'include',
+    headers: { Accept: 'text/event-stream', Authorization: getAuthorizationHeader() },
+    signal,
+  });
+  if (!res.ok || !res.body) throw new Error(`Progress stream unavailable (${res.status})`);
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    // Frames end with a blank line; comment lines (keep-alives) carry no data.
+    let end = buffer.indexOf('\n\n');
+    while (end >= 0) {
+      const data = buffer.slice(0, end).split('\n')
+        .filter((line) => line.startsWith('data:'))
+        .map((line) => line.slice(5).trim())
+        .join('\n');
+      buffer = buffer.slice(end + 2);
+      if (data) onEvent(JSON.parse(data) as ScheduleProgressEvent);
+      end = buffer.indexOf('\n\n');
+    }
+  }
+}
+
 export async function createInstitution(payload: CreateInstitutionRequest): Promise<InstitutionClass> {
   const url = `${API_URL}${API_INSTITUTIONS_PATH}/`;
   const res = await apiPost<any>(url, payload);
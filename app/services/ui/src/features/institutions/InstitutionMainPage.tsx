@@ -120,6 +120,7 @@ type ListItem = {
 type InstitutionRole = 'student' | 'professor' | 'admin';
 
 const ALL_INSTITUTION_ROLES: InstitutionRole[] = ['admin', 'professor', 'student'];
+const EMAIL_PATTERN = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
 
 async function assignRoleToUser(institutionId: string, userId: string, role: InstitutionRole): Promise<void> {
   await apiPost<void>(`${API_URL}${API_INSTITUTIONS_PATH}/${institutionId}/users/${userId}/roles/${role}`, undefined);
@@ -554,6 +555,7 @@ export default function InstitutionMainPage() {
   const [availableUsers, setAvailableUsers] = useState<InstitutionUser[]>([]);
   const [availableUsersLoading, setAvailableUsersLoading] = useState(false);
   const [availableUsersError, setAvailableUsersError] = useState<string | null>(null);
+  const [memberSearchInput, setMemberSearchInput] = useState('');
 
   const [usersState, setUsersState] = useState<RelatedState<InstitutionUser>>({ data: [], loading: false, error: null });
   const [groupsState, setGroupsState] = useState<RelatedState<InstitutionGroup>>({ data: [], loading: false, error: null });
@@ -694,6 +696,31 @@ export default function InstitutionMainPage() {
     return () => { mounted = false; };
   }, []);
 
+  // GET /users lists only the people the admin already shares an institution
+  // with; anyone else (e.g. a newly registered user) is found by exact email.
+  useEffect(() => {
+    const email = memberSearchInput.trim();
+    if (!isMemberRolesDialogOpen || memberDialogMode !== 'add' || !EMAIL_PATTERN.test(email)) return undefined;
+    if (availableUsers.some((u) => u.email === email)) return undefined;
+    let mounted = true;
+    const timer = window.setTimeout(async () => {
+      try {
+        const res = await apiGet<any>(`${API_URL}/api/v1/users?email=${encodeURIComponent(email)}`);
+        if (!mounted) return;
+        const existingIds = new Set([
+          ...usersState.data.map((u) => String(u.id ?? u._id ?? '')),
+          ...availableUsers.map((u) => String(u.id ?? u._id ?? '')),
+        ]);
+        const found = (Array.isArray(res?.users) ? (res.users as InstitutionUser[]) : [])
+          .filter((u) => !existingIds.has(String(u.id ?? u._id ?? '')));
+        if (found.length > 0) setAvailableUsers([...availableUsers, ...found]);
+      } catch (err) {
+        if (mounted) setAvailableUsersError((err as Error).message || 'Failed to look up user.');
+      }
+    }, 300);
+    return () => { mounted = false; window.clearTimeout(timer); };
+  }, [memberSearchInput, isMemberRolesDialogOpen, memberDialogMode, availableUsers, usersState.data]);
+
   useEffect(() => {
     let mounted = true;
     if (!institutionId || !institution || institutionError) return () => { mounted = false; };
@@ -1317,6 +1344,7 @@ export default function InstitutionMainPage() {
     setSelectedMemberRoles(['student']);
     setAvailableUsers([]);
     setAvailableUsersError(null);
+    setMemberSearchInput('');
     setMemberDialogMode('add');
     setIsMemberRolesDialogOpen(true);
     setAvailableUsersLoading(true);
@@ -2032,7 +2060,7 @@ export default function InstitutionMainPage() {
         <DialogTitle sx={{ fontWeight: 700 }}>Add member</DialogTitle>
         <DialogContent>
           <DialogContentText sx={{ mb: 2 }}>
-            Select a user and assign one or more roles.
+            Select a user, or enter the exact email of someone not listed, and assign one or more roles.
           </DialogContentText>
           <Stack spacing={2.5}>
             <Autocomplete
@@ -2040,6 +2068,7 @@ export default function InstitutionMainPage() {
               loading={availableUsersLoading}
               value={selectedUserToAdd}
               onChange={(_event, value) => setSelectedUserToAdd(value)}
+              onInputChange={(_event, value) => setMemberSearchInput(value)}
               getOptionLabel={(option) => `${option.name ?? 'Unknown user'} (${option.email ?? 'No email'})`}
               isOptionEqualToValue={(option, value) => String(option.id ?? option._id) === String(value.id ?? value._id)}
               disabled={isAddingMember}
@@ -2052,7 +2081,7 @@ export default function InstitutionMainPage() {
                 </Box>
               )}
               renderInput={(params) => (
-                <TextField {...params} label="User" placeholder="Search by name or email" fullWidth />
+                <TextField {...params} label="User" placeholder="Search by name, or enter an email" fullWidth />
               )}
             />
             {availableUsersError && <Alert severity="error">{availableUsersError}</Alert>}
@@ -45,6 +45,7 @@ import {
   getScheduleEta,
   deleteSchedule,
   setActiveSchedule,
+  streamScheduleProgress,
 } from '../../api/institutions';
 import type {
   InstitutionSchedule,
@@ -55,6 +56,7 @@ import type {
   InstitutionActivity,
   ScheduledActivityRecord,
   ScheduleEta,
+  ScheduleProgressEvent,
 } from '../../api/institutions';
 import { parseServerTimestamp, parseServerTimestampMs, formatDuration } from '../../utils/time';
 import type { Institution as InstitutionClass } from '../../types/institution';
@@ -79,6 +81,25 @@ function scheduleStatusColor(status?: string): 'success' | 'warning' | 'error' |
   return 'default';
 }
 
+const PROGRESS_PHASE_LABELS: Record<ScheduleProgressEvent['phase'], string> = {
+  loading: 'Loading data',
+  feasibility: 'Finding a valid timetable',
+  optimise: 'Optimising',
+  saving: 'Saving',
+  completed: 'Completed',
+  failed: 'Failed',
+};
+
+function describeProgress(p: ScheduleProgressEvent): string {
+  const parts = [PROGRESS_PHASE_LABELS[p.phase] ?? p.phase];
+  if (p.best_objective !== null) parts.push(`penalty ${Math.round(p.best_objective)}`);
+  if (p.gap !== null) parts.push(`gap ${(p.gap * 100).toFixed(1)}%`);
+  if (p.idle_seconds !== null && p.idle_seconds >= 30) {
+    parts.push(`no improvement for ${formatDuration(p.idle_seconds)}`);
+  }
+  return parts.join(' · ');
+}
+
 function formatTimestamp(ts?: string): string {
   if (!ts) return '';
   // Parse as UTC - backend emits UTC datetimes and may omit the trailing Z.
@@ -129,9 +150,10 @@ export default function ScheduleViewPage() {
   const [activeToggleError, setActiveToggleError] = useState<string | null>(null);
   const [currentUser, setCurrentUser] = useState<InstitutionUser | null>(null);
   const [eta, setEta] = useState<ScheduleEta | null>(null);
+  // Latest event of the generation progress stream, while running.
+  const [progress, setProgress] = useState<ScheduleProgressEvent | null>(null);
   // Tick once per second while the schedule is running so the countdown +
-  // progress bar update live.  Poll the schedule status every 5 s so we
-  // pick up running → completed without a manual refresh.
+  // progress bar update live.
   const [nowMs, setNowMs] = useState<number>(() => Date.now());
 
   const [activeTab, setActiveTab] = useState(0);
@@ -203,13 +225,17 @@ export default function ScheduleViewPage() {
   useInstitutionSync(schedule?.institution_id);
 
   // While the schedule is running, tick once per second (for the live
-  // countdown) and poll the schedule + scheduled-activities every 5 s so
-  // we transition to "completed" without a manual refresh.
+  // countdown) and follow the worker's progress stream: re-read the
+  // scheduled activities whenever an intermediate timetable is saved, and
+  // the schedule once the stream ends with the outcome.  If the stream is
+  // unavailable or drops, poll the schedule + scheduled-activities every
+  // 5 s instead, so we still transition to "completed" without a manual
+  // refresh.
   const isRunning = schedule?.status?.toLowerCase() === 'running';
   useEffect(() => {
     if (!isRunning || !scheduleId) return;
     const tick = setInterval(() => setNowMs(Date.now()), 1000);
-    const poll = setInterval(() => {
+    const refresh = () => {
       Promise.all([
         getScheduleById(scheduleId),
         getScheduleActivities(scheduleId),
@@ -219,8 +245,28 @@ export default function ScheduleViewPage() {
           setSchedRecords(schedActs);
         })
         .catch(() => {});
-    }, 5000);
-    return () => { clearInterval(tick); clearInterval(poll); };
+    };
+    const controller = new AbortController();
+    let poll: ReturnType<typeof setInterval> | undefined;
+    let published = 0;
+    streamScheduleProgress(scheduleId, (event) => {
+      setProgress(event);
+      if (event.incumbents_published > published) {
+        published = event.incumbents_published;
+        getScheduleActivities(scheduleId).then(setSchedRecords).catch(() => {});
+      }
+    }, controller.signal)
+      .catch(() => {})
+      .finally(() => {
+        if (controller.signal.aborted) return;
+        refresh();
+        poll = setInterval(refresh, 5000);
+      });
+    return () => {
+      clearInterval(tick);
+      controller.abort();
+      if (poll) clearInterval(poll);
+    };
   }, [isRunning, scheduleId]);
 
   // ── Build lookup maps ──────────────────────────────────────────────────────
@@ -758,6 +804,7 @@ export default function ScheduleViewPage() {
                   <Typography variant="caption" color="text.secondary">
                     {remainingLabel}
                     {eta && ` · estimated total ${formatDuration(eta.eta_seconds)} (${eta.num_activities} activities)`}
+                    {progress && ` · ${describeProgress(progress)}`}
                   </Typography>
                 </Box>
               );
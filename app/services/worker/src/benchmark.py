@@ -0,0 +1,246 @@
+"""Offline benchmark for the CP-SAT schedule generator.
+
+Builds the generator's model straight from the YAML sample data in
+``app/libs/db/data`` - no API, RabbitMQ or MongoDB involved - optionally
+scaled up by replicating the whole institution (activities, groups, rooms,
+professors and students) ``k`` times, and records for every scale:
+
+  - model-build time and variable / constraint counts (phase-1 model and the
+    phase-2 model with the objective added),
+  - phase-1 time-to-feasible,
+  - the phase-2 objective-over-time curve (solver wall time, objective, bound),
+  - the final preferred-hours and compactness costs,
+  - the ``eta`` helper's predictions for the same instance, so measured runs
+    can be compared against (and used to re-calibrate) its coefficients.
+
+Results are written as JSON so successive runs can be diffed for regressions.
+``tune_presets`` builds on it to race the solver's parameter presets.
+``--snapshot`` benchmarks a ``Problem`` saved by ``data_sources.save_snapshot``
+(e.g. a production institution) instead of the sample data.
+
+Usage (from the repository root):
+    python -m app.services.worker.src.benchmark --scales 1 2 5 10 \\
+        --solver-seconds 600 --output schedule_benchmark.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+from ortools import __version__ as ortools_version
+
+from app.libs.db import models, seed_data
+from app.libs.logging.logger import get_logger
+from app.libs.scheduling import eta as eta_helper
+from app.services.worker.src import presets, solver
+from app.services.worker.src.problem import Problem, build_problem
+
+
+logger = get_logger()
+
+DEFAULT_SCALES = [1, 2, 5, 10]
+
+
+def _build_seed_copy(institution_id: str):
+    """One full copy of the sample institution's data, with fresh ids."""
+    rooms = seed_data.build_rooms(institution_id)
+    professors = seed_data.build_professors(institution_id)
+    groups = seed_data.build_groups(institution_id)
+    courses = seed_data.build_courses(institution_id)
+    group_ids = {g.name: g.id for g in groups}
+    activities = seed_data.build_activities(
+        institution_id,
+        courses={c.name: c.id for c in courses},
+        groups=group_ids,
+        profs={p.name: p.id for p in professors},
+    )
+    students = seed_data.build_students(institution_id, group_ids)
+    return rooms, groups, professors, students, activities
+
+
+def load_seed_instance(scale: int = 1, max_activities: Optional[int] = None) -> Problem:
+    """Load the sample institution as the worker would receive it.
+
+    ``scale`` replicates every entity ``scale`` times.  Each copy gets its own
+    ids, so copies share nothing except the time grid and - because identical
+    rooms form one pool - proportionally larger room pools.  ``max_activities``
+    truncates the (scaled) activity list, handy for quick smoke runs."""
+    institution = seed_data.build_institution()
+    rooms: List[models.Room] = []
+    groups: List[models.Group] = []
+    professors: List[models.User] = []
+    students: List[models.User] = []
+    activities: List[models.Activity] = []
+    for _ in range(scale):
+        c_rooms, c_groups, c_professors, c_students, c_activities = (
+            _build_seed_copy(institution.id)
+        )
+        rooms.extend(c_rooms)
+        groups.extend(c_groups)
+        professors.extend(c_professors)
+        students.extend(c_students)
+        activities.extend(c_activities)
+
+    if max_activities is not None:
+        activities = activities[:max_activities]
+    return build_problem(institution, rooms, groups, professors, students, activities)
+
+
+def _eta_predictions(num_activities: int) -> Dict[str, int]:
+    return {
+        "model_build_seconds": eta_helper.estimate_model_build_seconds(num_activities),
+        "solver_budget_seconds": eta_helper.estimate_solver_seconds(num_activities),
+        "solver_typical_seconds": eta_helper.estimate_solver_typical_seconds(num_activities),
+        "stagnation_seconds": eta_helper.estimate_stagnation_seconds(num_activities),
+        "total_seconds": eta_helper.estimate_total_duration_seconds(num_activities),
+    }
+
+
+def run_scenario(
+    scale: int,
+    max_activities: Optional[int] = None,
+    snapshot: Optional[str] = None,
+    solver_seconds: Optional[float] = None,
+    stagnation_seconds: Optional[float] = None,
+    feasibility_only: bool = False,
+    num_search_workers: int = 1,
+    decomposition_processes: int = 1,
+    optimizer: str = "cpsat",
+    gap_limit: float = 0.0,
+    max_budget_factor: float = 1.0,
+    phase1_preset: Optional[str] = None,
+    phase2_preset: Optional[str] = None,
+) -> dict:
+    """Load, solve and report one scale.  Solver failures are recorded in the
+    result (``error``) instead of aborting the whole benchmark.  With
+    ``snapshot`` the scale is ignored and the saved problem is solved as is."""
+    load_t0 = time.time()
+    if snapshot:
+        with open(snapshot) as f:
+            problem = Problem.model_validate_json(f.read())
+    else:
+        problem = load_seed_instance(scale, max_activities)
+    load_seconds = time.time() - load_t0
+    logger.info(
+        f"Benchmark scale x{scale}: {len(problem.activities)} activities, "
+        f"{len(problem.rooms)} rooms, {len(problem.groups)} groups, "
+        f"{len(problem.professors)} professors."
+    )
+
+    options = solver.SolveOptions(
+        solver_seconds=solver_seconds,
+        stagnation_seconds=stagnation_seconds,
+        feasibility_only=feasibility_only,
+        num_search_workers=num_search_workers,
+        decomposition_processes=decomposition_processes,
+        optimizer=optimizer,
+        gap_limit=gap_limit,
+        max_budget_factor=max_budget_factor,
+        phase1_preset=phase1_preset,
+        phase2_preset=phase2_preset,
+    )
+    report = solver.SolveReport()
+    error: Optional[str] = None
+    solve_t0 = time.time()
+    try:
+        solver.solve(problem, options, report)
+    except Exception as e:
+        logger.error(f"Benchmark scale x{scale} failed: {e}")
+        error = str(e)
+
+    return {
+        "scale": scale,
+        "load_seconds": load_seconds,
+        "total_seconds": time.time() - solve_t0,
+        "error": error,
+        "report": report.model_dump(),
+        "eta": _eta_predictions(len(problem.activities)),
+    }
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the CP-SAT schedule generator on the YAML sample data.",
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="replication factors to run (default: 1 2 5 10)")
+    parser.add_argument("--snapshot", default=None,
+                        help="solve this Problem JSON snapshot instead of the sample data")
+    parser.add_argument("--max-activities", type=int, default=None,
+                        help="truncate each scaled instance to this many activities")
+    parser.add_argument("--solver-seconds", type=float, default=None,
+                        help="total solver budget per run (default: eta worst-case budget)")
+    parser.add_argument("--stagnation-seconds", type=float, default=None,
+                        help="phase-2 idle limit (default: eta stagnation estimate)")
+    parser.add_argument("--feasibility-only", action="store_true",
+                        help="stop after phase 1")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="CP-SAT search workers (default: NUM_SEARCH_WORKERS or 1)")
+    parser.add_argument("--optimizer", choices=["cpsat", "lns"], default="cpsat",
+                        help="phase-2 strategy (default: cpsat)")
+    parser.add_argument("--gap-limit", type=float, default=0.0,
+                        help="stop phase 2 within this relative gap of the bound (default: 0, off)")
+    parser.add_argument("--max-budget-factor", type=float, default=1.0,
+                        help="let phase 2 run up to this multiple of its budget while improving "
+                             "(default: 1, never)")
+    parser.add_argument("--phase1-preset", choices=list(presets.PRESETS), default=None,
+                        help="CP-SAT preset for phase 1 (default: picked per instance)")
+    parser.add_argument("--phase2-preset", choices=list(presets.PRESETS), default=None,
+                        help="CP-SAT preset for phase 2 (default: picked per instance)")
+    parser.add_argument("--decomposition-processes", type=int, default=1,
+                        help="solve independent components this many at a time (default: 1)")
+    parser.add_argument("--output", default="schedule_benchmark.json",
+                        help="where to write the JSON results")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    workers = args.workers or int(os.getenv("NUM_SEARCH_WORKERS", "1"))
+    results = {
+        "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "ortools_version": ortools_version,
+        "python_version": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "num_search_workers": workers,
+        "solver_seconds": args.solver_seconds,
+        "stagnation_seconds": args.stagnation_seconds,
+        "feasibility_only": args.feasibility_only,
+        "decomposition_processes": args.decomposition_processes,
+        "optimizer": args.optimizer,
+        "gap_limit": args.gap_limit,
+        "max_budget_factor": args.max_budget_factor,
+        "phase1_preset": args.phase1_preset,
+        "phase2_preset": args.phase2_preset,
+        "scenarios": [],
+    }
+    for scale in args.scales:
+        results["scenarios"].append(run_scenario(
+            scale,
+            max_activities=args.max_activities,
+            snapshot=args.snapshot,
+            solver_seconds=args.solver_seconds,
+            stagnation_seconds=args.stagnation_seconds,
+            feasibility_only=args.feasibility_only,
+            num_search_workers=workers,
+            decomposition_processes=args.decomposition_processes,
+            optimizer=args.optimizer,
+            gap_limit=args.gap_limit,
+            max_budget_factor=args.max_budget_factor,
+            phase1_preset=args.phase1_preset,
+            phase2_preset=args.phase2_preset,
+        ))
+        # Rewrite after every scale so a long run still leaves usable data.
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    logger.info(f"Benchmark results written to {args.output}")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
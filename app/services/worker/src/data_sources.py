@@ -0,0 +1,232 @@
+"""Where the worker loads a scheduling ``Problem`` from.
+
+  - ``ApiDataSource``      : the API's solver-snapshot endpoint, authenticated
+                             with the job's token (the default).
+  - ``MongoDataSource``    : straight from MongoDB, skipping the API round
+                             trips - for workers running next to the database.
+  - ``SnapshotDataSource`` : a JSON file written by ``save_snapshot``, for
+                             replaying a production instance offline.
+
+``get_data_source`` picks one from ``SCHEDULE_DATA_SOURCE`` (api | mongo |
+snapshot); ``SCHEDULE_SNAPSHOT_PATH`` names the snapshot file.
+"""
+
+import abc
+import os
+from typing import List, Optional
+
+import requests
+from pymongo.synchronous.database import Database
+
+from app.libs.db import models
+from app.libs.logging.logger import get_logger
+from app.libs.scheduling import eta, hints as hints_store, telemetry as telemetry_store
+from app.libs.scheduling.snapshot import SolverSnapshot, load_solver_snapshot
+from app.services.worker.src.problem import Problem, problem_from_snapshot
+
+
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+logger = get_logger()
+
+
+class DataSource(abc.ABC):
+    @abc.abstractmethod
+    def load_problem(self, institution_id: str) -> Problem:
+        ...
+
+    @abc.abstractmethod
+    def load_scheduled_activities(self, schedule_id: str) -> List[models.ScheduledActivity]:
+        """The rows of an earlier schedule, for incremental generation."""
+
+    @abc.abstractmethod
+    def load_solution_hints(self, institution_id: str) -> List[models.ActivityHint]:
+        """The warm-start cache written after the institution's last generation."""
+
+    @abc.abstractmethod
+    def save_solution_hints(self, institution_id: str, hints: List[models.ActivityHint]) -> None:
+        ...
+
+    @abc.abstractmethod
+    def load_eta_calibration(self, institution_id: str) -> eta.EtaCalibration:
+        """The duration model fitted to the deployment's recent runs."""
+
+    @abc.abstractmethod
+    def save_solve_telemetry(self, telemetry: models.SolveTelemetry) -> None:
+        ...
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# REST API
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ApiDataSource(DataSource):
+    """One GET of ``/institutions/{id}/solver-snapshot``: the API runs the
+    projected queries next to the database and returns only what the solver
+    reads."""
+
+    def __init__(self, token: str):
+        self.token = token
+
+    def load_problem(self, institution_id: str) -> Problem:
+        url = f"{API_URL}/api/v1/institutions/{institution_id}/solver-snapshot"
+        response = requests.get(url, headers={"Authorization": f"Bearer {self.token}"})
+        response.raise_for_status()
+        snapshot = SolverSnapshot(**response.json().get("snapshot"))
+        _log_snapshot(snapshot, "API")
+        return problem_from_snapshot(snapshot)
+
+    def load_scheduled_activities(self, schedule_id: str) -> List[models.ScheduledActivity]:
+        url = f"{API_URL}/api/v1/schedules/{schedule_id}/scheduled-activities"
+        response = requests.get(url, headers={"Authorization": f"Bearer {self.token}"})
+        response.raise_for_status()
+        return [
+            models.ScheduledActivity(**sa)
+            for sa in response.json().get("scheduled_activities", [])
+        ]
+
+    def load_solution_hints(self, institution_id: str) -> List[models.ActivityHint]:
+        url = f"{API_URL}/api/v1/institutions/{institution_id}/solution-hints"
+        response = requests.get(url, headers={"Authorization": f"Bearer {self.token}"})
+        response.raise_for_status()
+        return [models.ActivityHint(**h) for h in response.json().get("hints", [])]
+
+    def save_solution_hints(self, institution_id: str, hints: List[models.ActivityHint]) -> None:
+        url = f"{API_URL}/api/v1/institutions/{institution_id}/solution-hints"
+        response = requests.put(
+            url,
+            json={"hints": [h.model_dump() for h in hints]},
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        response.raise_for_status()
+
+    def load_eta_calibration(self, institution_id: str) -> eta.EtaCalibration:
+        url = f"{API_URL}/api/v1/institutions/{institution_id}/eta-calibration"
+        response = requests.get(url, headers={"Authorization": f"Bearer {self.token}"})
+        response.raise_for_status()
+        return eta.EtaCalibration(**response.json().get("calibration"))
+
+    def save_solve_telemetry(self, telemetry: models.SolveTelemetry) -> None:
+        url = f"{API_URL}/api/v1/institutions/{telemetry.institution_id}/solve-telemetry"
+        response = requests.post(
+            url,
+            json=telemetry.model_dump(mode="json", exclude={"id", "institution_id", "recorded_at"}),
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        response.raise_for_status()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MongoDB
+# ─────────────────────────────────────────────────────────────────────────────
+
+class MongoDataSource(DataSource):
+    """Runs the snapshot queries itself.  ``db`` defaults to the shared
+    client's database from ``app.libs.db.db`` (``MONGODB_URI`` / ``DB_NAME``)."""
+
+    def __init__(self, db: Optional[Database] = None):
+        self._db = db
+
+    @property
+    def db(self) -> Database:
+        if self._db is None:
+            # Imported lazily: the API and snapshot sources never need a client.
+            from app.libs.db import db as db_module
+            self._db = db_module._get_client().get_database(db_module.DB_NAME)
+        return self._db
+
+    def load_problem(self, institution_id: str) -> Problem:
+        snapshot = load_solver_snapshot(self.db, institution_id)
+        if snapshot is None:
+            raise Exception(f"Institution {institution_id} not found")
+        _log_snapshot(snapshot, "MongoDB")
+        return problem_from_snapshot(snapshot)
+
+    def load_scheduled_activities(self, schedule_id: str) -> List[models.ScheduledActivity]:
+        collection = self.db.get_collection(models.ScheduledActivity.COLLECTION_NAME)
+        return [models.ScheduledActivity(**doc) for doc in collection.find({"schedule_id": schedule_id})]
+
+    def load_solution_hints(self, institution_id: str) -> List[models.ActivityHint]:
+        return hints_store.load_solution_hints(self.db, institution_id)
+
+    def save_solution_hints(self, institution_id: str, hints: List[models.ActivityHint]) -> None:
+        hints_store.save_solution_hints(self.db, institution_id, hints)
+
+    def load_eta_calibration(self, institution_id: str) -> eta.EtaCalibration:
+        return telemetry_store.load_eta_calibration(self.db)
+
+    def save_solve_telemetry(self, telemetry: models.SolveTelemetry) -> None:
+        telemetry_store.save_solve_telemetry(self.db, telemetry)
+
+
+def _log_snapshot(snapshot: SolverSnapshot, origin: str):
+    logger.info(
+        f"Loaded institution {snapshot.institution.id} from {origin}: "
+        f"{len(snapshot.activities)} activities, {len(snapshot.rooms)} rooms, "
+        f"{len(snapshot.groups)} groups, {len(snapshot.professors)} professors, "
+        f"{sum(1 for c in snapshot.group_student_counts.values() if c)} groups with students."
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# JSON snapshot
+# ─────────────────────────────────────────────────────────────────────────────
+
+def save_snapshot(problem: Problem, path: str) -> None:
+    with open(path, "w") as f:
+        f.write(problem.model_dump_json(by_alias=True))
+
+
+class SnapshotDataSource(DataSource):
+    def __init__(self, path: str):
+        self.path = path
+
+    def load_problem(self, institution_id: str) -> Problem:
+        with open(self.path) as f:
+            problem = Problem.model_validate_json(f.read())
+        if problem.institution_id != institution_id:
+            logger.warning(
+                f"Snapshot {self.path} is for institution {problem.institution_id}, "
+                f"not {institution_id}; using it anyway."
+            )
+        return problem
+
+    def load_scheduled_activities(self, schedule_id: str) -> List[models.ScheduledActivity]:
+        # A snapshot carries no timetable: replays always solve from scratch.
+        logger.warning(f"Snapshot data source has no schedule {schedule_id}; solving from scratch.")
+        return []
+
+    def load_solution_hints(self, institution_id: str) -> List[models.ActivityHint]:
+        # Hints live next to the snapshot (``<path>.hints.json``) so repeated
+        # offline replays warm-start each other like production runs do.
+        try:
+            with open(self._hints_path) as f:
+                return models.SolutionHints.model_validate_json(f.read()).hints
+        except FileNotFoundError:
+            return []
+
+    def save_solution_hints(self, institution_id: str, hints: List[models.ActivityHint]) -> None:
+        with open(self._hints_path, "w") as f:
+            f.write(models.SolutionHints(institution_id=institution_id, hints=hints).model_dump_json(by_alias=True))
+
+    def load_eta_calibration(self, institution_id: str) -> eta.EtaCalibration:
+        # Replays are for comparing runs, so they keep the fixed defaults.
+        return eta.DEFAULT_CALIBRATION
+
+    def save_solve_telemetry(self, telemetry: models.SolveTelemetry) -> None:
+        # Replays run on a developer's machine: their timings would skew the
+        # deployment's calibration, so they are only logged.
+        logger.info(f"Replay telemetry: {telemetry.model_dump_json(exclude={'id'})}")
+
+    @property
+    def _hints_path(self) -> str:
+        return f"{self.path}.hints.json"
+
+
+def get_data_source(token: str) -> DataSource:
+    kind = os.getenv("SCHEDULE_DATA_SOURCE", "api")
+    if kind == "mongo":
+        return MongoDataSource()
+    if kind == "snapshot":
+        return SnapshotDataSource(os.environ["SCHEDULE_SNAPSHOT_PATH"])
+    return ApiDataSource(token)
@@ -3,23 +3,30 @@ from typing import List
 from pydantic import Field
 
 from app.libs.db.models import (
-    Room,
     Group as GroupModel,
-    Activity as ActivityModel
+    User,
 )
+from app.libs.scheduling.snapshot import SolverProfessor
 
 
-class Activity(ActivityModel):
+class Group(GroupModel):
     """
-    Activity class extending the base Activity model.
+    Group class extending the base Group model.
     Additional methods and properties specific to the worker service can be added here.
     """
-    possible_rooms: List[Room] = Field(default_factory=list)
+    ancestor_ids: List[str] = Field(default_factory=list)
 
 
-class Group(GroupModel):
+class Professor(SolverProfessor):
     """
-    Group class extending the base Group model.
-    Additional methods and properties specific to the worker service can be added here.
+    Solver view of a professor: only the preferences and per-day cap that
+    apply to the institution being scheduled, none of the account data.
     """
-    ancestor_ids: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_user(cls, user: User, institution_id: str) -> "Professor":
+        return cls(
+            id=user.id,
+            timeslot_preferences=user.timeslot_preferences.get(institution_id, []),
+            max_timeslots_per_day=user.max_timeslots_per_day.get(institution_id),
+        )
@@ -0,0 +1,61 @@
+"""Translate between the stored warm-start cache and the solver.
+
+The cache (``models.SolutionHints``) is keyed by activity fingerprint, the
+solver by activity id.  Activities with identical content share a
+fingerprint - e.g. two lab sessions of the same course and group - so
+hints are matched per fingerprint in order; which twin gets which slot
+doesn't matter to the solver.
+"""
+
+from typing import Dict, List
+
+from app.libs.db import models
+from app.libs.scheduling.hints import activity_fingerprint
+from app.services.worker.src.problem import Problem
+from app.services.worker.src.solver import Placement, Solution, merge_assignments, pool_key
+
+
+def warm_start_from_hints(
+    problem: Problem,
+    hints: List[models.ActivityHint],
+) -> Dict[str, Placement]:
+    """Activity id -> cached placement, for every activity whose fingerprint
+    still has a hint."""
+    by_fingerprint: Dict[str, List[models.ActivityHint]] = {}
+    for hint in hints:
+        by_fingerprint.setdefault(hint.fingerprint, []).append(hint)
+
+    warm_start: Dict[str, Placement] = {}
+    for a in problem.activities:
+        remaining = by_fingerprint.get(activity_fingerprint(a))
+        if not remaining:
+            continue
+        hint = remaining.pop(0)
+        warm_start[a.id] = Placement(
+            activity_id=a.id,
+            pool=(tuple(sorted(hint.room_features)), hint.room_capacity),
+            start=hint.start_timeslot,
+            end=hint.start_timeslot + a.duration_slots,
+            active_weeks=hint.active_weeks,
+        )
+    return warm_start
+
+
+def hints_from_solution(problem: Problem, solution: Solution) -> List[models.ActivityHint]:
+    """The cache entries describing ``solution``, in activity order."""
+    rooms_by_id = {r.id: r for r in problem.rooms}
+    by_activity = merge_assignments(solution.assignments)
+    hints = []
+    for a in problem.activities:
+        assignment = by_activity.get(a.id)
+        if assignment is None or assignment.room_id not in rooms_by_id:
+            continue
+        features, capacity = pool_key(rooms_by_id[assignment.room_id])
+        hints.append(models.ActivityHint(
+            fingerprint=activity_fingerprint(a),
+            start_timeslot=assignment.start_timeslot,
+            room_features=list(features),
+            room_capacity=capacity,
+            active_weeks=assignment.active_weeks,
+        ))
+    return hints
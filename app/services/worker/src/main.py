@@ -1,12 +1,21 @@
 import os
+from typing import Optional
 
 from celery import Celery
 
-from app.services.worker.src import schedule_generator as schedule_gen
+from app.libs.scheduling import progress
+from app.services.worker.src import schedule_generator as schedule_gen, solver_threads
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 
 worker_app = Celery("worker", broker=CELERY_BROKER_URL)
+# Several generations at once, in threads of one process so they share
+# ``solver_threads.budget`` (CP-SAT releases the GIL while it searches).
+# Take a message only when a slot is free: the rest stay in RabbitMQ, where
+# KEDA counts them.
+worker_app.conf.worker_pool = "threads"
+worker_app.conf.worker_concurrency = solver_threads.CONCURRENT_JOBS
+worker_app.conf.worker_prefetch_multiplier = 1
 
 
 @worker_app.task(
@@ -19,15 +28,28 @@ worker_app = Celery("worker", broker=CELERY_BROKER_URL)
     acks_late=True,
     reject_on_worker_lost=True,
 )
-def generate_schedule(institution_id: str, schedule_id: str, token: str) -> None:
+def generate_schedule(
+    institution_id: str,
+    schedule_id: str,
+    token: str,
+    base_schedule_id: Optional[str] = None,
+) -> None:
     """Generate schedule"""
     # Replace the user's short-lived token (default 30 min) with a 4-hour
     # service token tied to the same user so the long-running job - plus
     # its intermediate-save callbacks and final error reporting - can keep
     # calling the API past the original token's expiry.
     token = schedule_gen.refresh_worker_token(token)
+    reporter = schedule_gen.ProgressReporter(schedule_id)
     try:
-        return schedule_gen.generate_schedule(institution_id, schedule_id, token)
+        return schedule_gen.generate_schedule(
+            institution_id, schedule_id, token, base_schedule_id=base_schedule_id, reporter=reporter,
+        )
     except Exception as e:
-        schedule_gen.db_update_failed_schedule(schedule_id, str(e), token)
+        try:
+            schedule_gen.db_update_failed_schedule(schedule_id, str(e), token)
+        finally:
+            reporter.emit(progress.ProgressPhase.FAILED, str(e))
         raise
+    finally:
+        reporter.close()
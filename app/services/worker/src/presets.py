@@ -0,0 +1,132 @@
+"""Named CP-SAT parameter sets for the generator's solves, and which one an
+instance gets.
+
+Every solve starts from the same base (search workers, time limit, logging;
+see ``solver._make_solver``) and applies one preset's ``SatParameters`` on top.
+Phase 1 and the hint checks get a feasibility preset, phase 2 an optimisation
+preset picked from the instance's features (``select_phase2_preset``); the
+choice is logged and recorded in the ``SolveReport``, so telemetry and
+benchmark results say which parameters produced them.
+
+``SCHEDULE_PHASE1_PRESET`` / ``SCHEDULE_PHASE2_PRESET`` pin a preset instead.
+``tune_presets`` races the presets on benchmark instances or production
+snapshots; its results are what ``LARGE_INSTANCE_ACTIVITIES`` and the preset
+contents should be set from.
+"""
+
+import os
+from typing import Dict, List, Union
+
+from pydantic import BaseModel
+
+
+BASELINE = "baseline"
+FEASIBILITY_FAST = "feasibility-fast"
+OPTIMISE_SMALL = "optimise-small"
+OPTIMISE_LARGE = "optimise-large"
+LNS_HEAVY = "lns-heavy"
+
+# Phase-2 instances with more free activities than this get a large-instance
+# preset.  Measured (``tune_presets``, sample data, 3 search workers, 60 s of
+# phase 2, 2 repeats): at 80 activities OPTIMISE_SMALL ends lowest (1012 vs
+# 1014 for the rest); at 250, LNS_HEAVY does (median 2513 vs 2532 for
+# OPTIMISE_SMALL and 2538 for OPTIMISE_LARGE and BASELINE).
+LARGE_INSTANCE_ACTIVITIES = int(os.getenv("SCHEDULE_LARGE_INSTANCE_ACTIVITIES", "200"))
+# Large instances go to LNS_HEAVY from this many search workers on: with
+# fewer, CP-SAT has no workers to spare for neighbourhood search.
+LNS_HEAVY_MIN_WORKERS = 3
+
+
+class SolverPreset(BaseModel):
+    name: str
+    description: str
+    # ``SatParameters`` fields, set on top of the base parameters.
+    parameters: Dict[str, Union[bool, int, float, str]]
+
+
+# Every preset keeps presolve probing off unless it says otherwise.  On this
+# model a single probe pass reports only ~1 deterministic unit but burns
+# ~280 s of wall time at 700 activities, so the deterministic-time cap never
+# bites and probing devoured the entire budget before search even started
+# (booleans:0 branches:0 "Stopped after presolve").  Symmetry detection stays
+# on everywhere: interchangeable rooms collapse, and it is a no-op when rooms
+# differ.
+PRESETS: Dict[str, SolverPreset] = {p.name: p for p in [
+    SolverPreset(
+        name=BASELINE,
+        description="The generator's original fixed parameters, kept as the "
+                    "reference the other presets are raced against.",
+        parameters={"symmetry_level": 2, "cp_model_probing_level": 0},
+    ),
+    SolverPreset(
+        name=FEASIBILITY_FAST,
+        description="First feasible timetable without the LP relaxation "
+                    "(there is no objective to bound).",
+        parameters={
+            "symmetry_level": 2,
+            "cp_model_probing_level": 0,
+            "linearization_level": 0,
+        },
+    ),
+    SolverPreset(
+        name=OPTIMISE_SMALL,
+        description="Small models, and LNS sub-solves: cheap enough for light "
+                    "probing and a full LP relaxation, which tighten the bound.",
+        parameters={
+            "symmetry_level": 2,
+            "cp_model_probing_level": 1,
+            "linearization_level": 2,
+        },
+    ),
+    SolverPreset(
+        name=OPTIMISE_LARGE,
+        description="Large models with few search workers: the baseline "
+                    "portfolio with the default LP relaxation.",
+        parameters={
+            "symmetry_level": 2,
+            "cp_model_probing_level": 0,
+            "linearization_level": 1,
+        },
+    ),
+    SolverPreset(
+        name=LNS_HEAVY,
+        description="Large warm-started models: one full-search worker keeps "
+                    "the bound moving, every other worker runs CP-SAT's own "
+                    "neighbourhood search around the incumbent.",
+        parameters={
+            "symmetry_level": 2,
+            "cp_model_probing_level": 0,
+            "num_full_subsolvers": 1,
+            "diversify_lns_params": True,
+        },
+    ),
+]}
+
+PHASE1_PRESETS: List[str] = [BASELINE, FEASIBILITY_FAST]
+PHASE2_PRESETS: List[str] = [BASELINE, OPTIMISE_SMALL, OPTIMISE_LARGE, LNS_HEAVY]
+
+
+def get_preset(name: str) -> SolverPreset:
+    try:
+        return PRESETS[name]
+    except KeyError:
+        raise ValueError(f"Unknown solver preset {name!r}; expected one of {', '.join(PRESETS)}")
+
+
+def select_phase1_preset(num_free_activities: int) -> str:
+    """Preset for phase 1 and the hint checks.
+
+    BASELINE, on the evidence so far: at 250 activities and 3 search workers
+    it reaches feasibility in a median 11 s against 21 s for FEASIBILITY_FAST
+    - the LP relaxation prunes even without an objective - and a violation
+    local-search worker took a third of the workers for no gain either."""
+    return BASELINE
+
+
+def select_phase2_preset(num_free_activities: int, num_search_workers: int, optimizer: str) -> str:
+    """Preset for phase 2 - for LNS, the preset of each neighbourhood re-solve."""
+    if optimizer == "lns" or num_free_activities <= LARGE_INSTANCE_ACTIVITIES:
+        return OPTIMISE_SMALL
+    if num_search_workers >= LNS_HEAVY_MIN_WORKERS:
+        return LNS_HEAVY
+    return OPTIMISE_LARGE
@@ -0,0 +1,94 @@
+"""The solver's input: one institution's scheduling problem, in memory.
+
+A ``Problem`` carries only what the CP-SAT model needs - no user accounts,
+no passwords, no other institutions' preferences.  Students collapse into a
+per-group head count and professors into ``enhanced_models.Professor``.  It is
+a plain pydantic model, so it round-trips through JSON: that is the file
+snapshot format used by ``data_sources.SnapshotDataSource`` and the benchmark.
+(The API / Mongo ``SolverSnapshot`` is the raw form it is built from.)
+"""
+
+from typing import Dict, Iterable, List
+
+from pydantic import BaseModel, Field
+
+from app.libs.db import models
+from app.libs.scheduling.snapshot import SolverSnapshot
+from app.services.worker.src import enhanced_models
+
+
+class Problem(BaseModel):
+    institution_id: str
+    time_grid: models.TimeGridConfig
+    rooms: List[models.Room] = Field(default_factory=list)
+    # Groups carry ``ancestor_ids`` (nearest parent first).
+    groups: List[enhanced_models.Group] = Field(default_factory=list)
+    professors: List[enhanced_models.Professor] = Field(default_factory=list)
+    activities: List[models.Activity] = Field(default_factory=list)
+    # group id -> number of enrolled students.  Enrollment is propagated up to
+    # ancestors, so every group in the hierarchy has its full size here.
+    group_student_counts: Dict[str, int] = Field(default_factory=dict)
+
+
+def attach_ancestor_ids(groups: List[enhanced_models.Group]) -> List[enhanced_models.Group]:
+    """Fill each group's ``ancestor_ids`` (nearest parent first) in place."""
+    by_id = {g.id: g for g in groups}
+    for g in groups:
+        ancestors = []
+        cur = g.parent_group_id
+        while cur is not None:
+            ancestors.append(cur)
+            cur = by_id[cur].parent_group_id
+        g.ancestor_ids = ancestors
+    return groups
+
+
+def count_group_students(students: Iterable[models.User]) -> Dict[str, int]:
+    """Count students whose ``group_ids`` contain each group's id directly.
+
+    Thanks to the ancestor-propagation done on enrollment, a student in
+    Section A also carries Year 1 and Faculty in their group_ids, so iterating
+    the roster once yields correct sizes for every group in the hierarchy
+    without re-walking parents per group."""
+    counts: Dict[str, int] = {}
+    for student in students:
+        for gid in student.group_ids:
+            counts[gid] = counts.get(gid, 0) + 1
+    return counts
+
+
+def problem_from_snapshot(snapshot: SolverSnapshot) -> Problem:
+    """Assemble a ``Problem`` from the API / Mongo solver snapshot."""
+    worker_groups = attach_ancestor_ids([
+        enhanced_models.Group(**g.model_dump()) for g in snapshot.groups
+    ])
+    return Problem(
+        institution_id=snapshot.institution.id,
+        time_grid=snapshot.institution.time_grid_config,
+        rooms=snapshot.rooms,
+        groups=worker_groups,
+        professors=[enhanced_models.Professor(**p.model_dump()) for p in snapshot.professors],
+        activities=snapshot.activities,
+        group_student_counts=snapshot.group_student_counts,
+    )
+
+
+def build_problem(
+    institution: models.Institution,
+    rooms: List[models.Room],
+    groups: List[models.Group],
+    professors: List[models.User],
+    students: List[models.User],
+    activities: List[models.Activity],
+) -> Problem:
+    """Assemble a ``Problem`` from full database models."""
+    return problem_from_snapshot(SolverSnapshot(
+        institution=institution,
+        rooms=rooms,
+        groups=groups,
+        activities=activities,
+        professors=[
+            enhanced_models.Professor.from_user(p, institution.id) for p in professors
+        ],
+        group_student_counts=count_group_students(students),
+    ))
@@ -0,0 +1,2262 @@
+"""
+CP-SAT timetable solver using interval variables.
+
+``solve(problem) -> Solution`` is pure: it reads an in-memory ``Problem`` and
+returns room/timeslot assignments, with no HTTP, database or broker access.
+``schedule_generator`` wires it to the job queue; the benchmark calls it
+directly.
+
+Model overview
+==============
+
+Decision variables (per activity ``a``):
+  - ``start[a]``       : IntVar, domain = allowed starts after unavailability
+                         pre-filtering.
+  - ``end[a]``         : IntVar = start + duration.
+  - ``interval[a]``    : Required IntervalVar(start, dur, end).  Used as the
+                         "always-there" interval for an activity's time
+                         placement.  The interval *itself* doesn't represent
+                         a resource use directly - we derive optional
+                         per-(week, room) and per-week intervals from it for
+                         each resource constraint.
+  - ``day[a]``         : IntVar = start // tpd, channelled via
+                         AddAllowedAssignments over (start, day) pairs.
+  - ``pool_indicator[a][pk]`` : BoolVars, exactly one is 1 (chosen room *pool*).
+                         Rooms with identical (features, capacity) form one
+                         interchangeable pool; an activity picks a pool, not a
+                         specific room.  Concrete rooms are assigned in a sound
+                         post-processing pass.  When an activity has a single
+                         candidate pool the indicator is the constant 1.
+  - ``presence[a][w]`` : Constant 0/1 for fixed-week frequencies; BoolVars
+                         for plain BIWEEKLY (solver picks which week).
+
+Hard constraints
+================
+  - Exactly one pool per activity (AddExactlyOne over pool_indicators).
+  - BIWEEKLY: ``presence[a][0] + presence[a][1] == 1``.
+  - Room-pool capacity per (week, pool):
+        AddCumulative(OptionalIntervalVar(start, dur, end,
+                        is_present = pool_indicator[a][pk] AND presence[a][w]),
+                      demand=1, capacity=#rooms-in-pool)
+        (degenerates to AddNoOverlap for pools of a single room).
+        Concrete rooms are coloured greedily post-solve - the cumulative
+        bounds the max clique by the room count, so colouring always succeeds.
+  - Professor no-overlap per (week, prof):
+        AddNoOverlap(OptionalIntervalVar(..., is_present = presence[a][w])
+                     for each activity a taught by prof)
+  - Group no-overlap per (week, leaf_group): iterate leaves only (by
+        transitivity covers internal groups).  An activity on an ancestor
+        group counts toward every descendant leaf - per the user's
+        clarification, "descendant is busy when ancestor is busy".
+  - Professor unavailable slots and group unavailable slots (own + ancestor)
+        are pre-filtered out of allowed_starts.  No solver-time constraint
+        needed.
+  - Per-day caps: per-institution group cap (every group, not just leaves,
+        because an internal group's cap applies to its own + ancestor
+        activities) and optional per-professor cap.  Implemented as
+        ``sum(duration * is_present_in_day) <= cap``.
+
+Soft objective
+==============
+Two parts, lexicographically weighted so preferred hours dominate gaps:
+  1. Preferred-hours violations: sum over each activity of
+        ``overlap_count * BoolVar(start[a] == s)`` for not-ideal slot overlap.
+  2. Gap minimisation per (entity, week, day):
+        ``span = last_used - first_used`` and ``any_used`` BoolVar.
+        ``gaps_per_day = span + any_used - num_used``.
+        ``sum(num_used)`` is constant across solutions (= total activity
+        duration weighted by active-week count), so minimising
+        ``sum(span) + sum(any_used)`` is exactly equivalent to minimising
+        total gap length.
+On incremental re-solves a third, lowest-weighted part charges ``tpd`` for
+every freed activity that leaves its published start.
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ortools.sat.python import cp_model
+from pydantic import BaseModel, Field
+
+from app.libs.db import models
+from app.libs.logging.logger import get_logger
+from app.libs.scheduling import eta as eta_helper
+from app.libs.scheduling import progress
+from app.libs.scheduling.group_index import GroupIndex
+from app.services.worker.src import presets, time_helpers
+from app.services.worker.src.problem import Problem
+
+
+logger = get_logger()
+
+# A room pool: rooms with identical (sorted features, capacity) are
+# interchangeable for scheduling.  Tuples (not frozensets) keep the key
+# hashable *and* JSON-serialisable.
+PoolKey = Tuple[Tuple[str, ...], int]
+
+
+class SolveError(Exception):
+    """The problem has no valid timetable (or none was found in budget).
+    The message is user-facing: it becomes the schedule's error message."""
+
+
+class SolveOptions(BaseModel):
+    """Knobs for one ``solve`` call.  ``None`` budgets fall back to the
+    ``eta`` helper's estimates for the problem size, under ``eta_calibration``
+    (the deployment's fitted duration model; the hand defaults if unset)."""
+    solver_seconds: Optional[float] = None
+    stagnation_seconds: Optional[float] = None
+    eta_calibration: Optional[eta_helper.EtaCalibration] = None
+    feasibility_only: bool = False
+    num_search_workers: int = 1
+    # >1: split the problem into independent components and solve up to this
+    # many at once, sharing ``num_search_workers`` between them.
+    decomposition_processes: int = 1
+    # Phase-2 strategy: "cpsat" hands the whole model to CP-SAT; "lns" runs
+    # ``LargeNeighbourhoodSearch`` (short re-solves of small neighbourhoods).
+    optimizer: str = "cpsat"
+    lns_step_seconds: float = 10.0
+    lns_max_free_activities: int = 60
+    # Minimum gap between incumbents handed to ``solve``'s ``on_incumbent``;
+    # <= 0 hands over none.
+    publish_interval_seconds: float = 60.0
+    # Minimum gap between search reports handed to ``solve``'s ``on_progress``
+    # (phase changes are always reported).
+    progress_interval_seconds: float = 5.0
+    # Phase 2 (cpsat) stops once the incumbent is within this relative gap
+    # of the best bound; <= 0 only stops on time or stagnation.
+    gap_limit: float = 0.0
+    # Phase 2 (cpsat) may run past its budget, up to this multiple of it,
+    # while each quarter-budget still improves the objective by at least
+    # ``extension_min_improvement`` (relative).  1 never extends.
+    max_budget_factor: float = 1.0
+    extension_min_improvement: float = 0.01
+    # CP-SAT parameter presets (``presets.PRESETS``) for phase 1 and phase 2;
+    # None picks one from the instance's features.
+    phase1_preset: Optional[str] = None
+    phase2_preset: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "SolveOptions":
+        # Search parallelism - read from env so compose (8 CPUs) and k8s (3 CPU)
+        # tune independently.  Default 1 fits the k8s node budget.
+        # SCHEDULE_FEASIBILITY_ONLY=1 skips phase 2 entirely.
+        return cls(
+            feasibility_only=os.getenv("SCHEDULE_FEASIBILITY_ONLY", "0") == "1",
+            num_search_workers=int(os.getenv("NUM_SEARCH_WORKERS", "1")),
+            decomposition_processes=int(os.getenv("SCHEDULE_DECOMPOSITION_PROCESSES", "1")),
+            optimizer=os.getenv("SCHEDULE_OPTIMIZER", "cpsat"),
+            lns_step_seconds=float(os.getenv("SCHEDULE_LNS_STEP_SECONDS", "10")),
+            publish_interval_seconds=float(os.getenv("SCHEDULE_PUBLISH_INTERVAL_SECONDS", "60")),
+            progress_interval_seconds=float(os.getenv("SCHEDULE_PROGRESS_INTERVAL_SECONDS", "5")),
+            gap_limit=float(os.getenv("SCHEDULE_GAP_LIMIT", "0.01")),
+            max_budget_factor=float(os.getenv("SCHEDULE_MAX_BUDGET_FACTOR", "2")),
+            extension_min_improvement=float(os.getenv("SCHEDULE_EXTENSION_MIN_IMPROVEMENT", "0.01")),
+            phase1_preset=os.getenv("SCHEDULE_PHASE1_PRESET") or None,
+            phase2_preset=os.getenv("SCHEDULE_PHASE2_PRESET") or None,
+        )
+
+
+class LnsNeighbourhoodStats(BaseModel):
+    attempts: int = 0
+    improvements: int = 0
+    objective_gain: float = 0.0
+    seconds: float = 0.0
+
+
+class SolveReport(BaseModel):
+    """Timings and model statistics collected by ``solve``.
+
+    Filled in as the solve progresses, so a partially-populated report still
+    tells you how far a failed run got.  The offline benchmark serialises it
+    to JSON; production runs only log the same figures."""
+    num_activities: int = 0
+    num_rooms: int = 0
+    num_groups: int = 0
+    num_professors: int = 0
+    num_room_pools: int = 0
+    # Hard-constraint model (what phase 1 solves).
+    build_seconds: Optional[float] = None
+    num_variables: Optional[int] = None
+    num_constraints: Optional[int] = None
+    phase1_preset: Optional[str] = None
+    phase1_budget_seconds: Optional[float] = None
+    phase1_seconds: Optional[float] = None
+    phase1_status: Optional[str] = None
+    # Objective model (hard constraints + soft objective, phase 2).
+    objective_build_seconds: Optional[float] = None
+    phase2_num_variables: Optional[int] = None
+    phase2_num_constraints: Optional[int] = None
+    phase2_preset: Optional[str] = None
+    phase2_budget_seconds: Optional[float] = None
+    stagnation_seconds: Optional[float] = None
+    phase2_seconds: Optional[float] = None
+    phase2_status: Optional[str] = None
+    # Time granted past ``phase2_budget_seconds`` while the objective was still
+    # improving, and the relative gap to the best bound at the end.
+    phase2_extension_seconds: Optional[float] = None
+    phase2_gap: Optional[float] = None
+    # (solver wall time, objective, best bound) for every phase-2 incumbent.
+    # LNS has no global bound, so its points carry ``None``.
+    objective_curve: List[Tuple[float, float, Optional[float]]] = Field(default_factory=list)
+    lns_stats: Dict[str, LnsNeighbourhoodStats] = Field(default_factory=dict)
+    preference_cost: Optional[int] = None
+    span_total: Optional[int] = None
+    active_days: Optional[int] = None
+    compactness_cost: Optional[int] = None
+    num_scheduled_activities: Optional[int] = None
+    # Decomposed runs: one report per independently solved component.  The
+    # top-level figures then sum the components' model sizes and costs and
+    # take the slowest component's phase times.
+    num_components: int = 1
+    component_reports: List["SolveReport"] = Field(default_factory=list)
+    # Incremental re-solves: activities pinned to the previous timetable, and
+    # activities whose start or room differs from it in the result.
+    num_fixed_activities: Optional[int] = None
+    num_moved_activities: Optional[int] = None
+    # Warm starts: activities hinted from the hint cache, and whether that
+    # hinted timetable was feasible as-is (phase 1 skipped).
+    num_hinted_activities: Optional[int] = None
+    phase1_skipped: bool = False
+
+
+class Placement(BaseModel):
+    """Where the solver put one activity: a room pool, a start slot within the
+    week, and the weeks it runs.  Concrete rooms come later (``assign_rooms``)."""
+    activity_id: str
+    pool: PoolKey
+    start: int
+    end: int
+    active_weeks: List[int]
+
+
+class Assignment(BaseModel):
+    """One timetable row: an activity in a concrete room for some weeks."""
+    activity_id: str
+    room_id: str
+    start_timeslot: int
+    active_weeks: List[int]
+
+
+class Solution(BaseModel):
+    assignments: List[Assignment] = Field(default_factory=list)
+    report: SolveReport = Field(default_factory=SolveReport)
+
+    def to_scheduled_activities(self, schedule_id: str) -> List[models.ScheduledActivity]:
+        return [
+            models.ScheduledActivity(
+                schedule_id=schedule_id,
+                activity_id=a.activity_id,
+                room_id=a.room_id,
+                start_timeslot=a.start_timeslot,
+                active_weeks=a.active_weeks,
+            )
+            for a in self.assignments
+        ]
+
+
+def filter_rooms_by_features(rooms: List[models.Room], required_features: List[str]):
+    if not required_features:
+        return rooms
+    return [r for r in rooms if all(f in r.features for f in required_features)]
+
+
+def filter_rooms_for_activity(
+    rooms: List[models.Room],
+    required_features: List[str],
+    min_capacity: int,
+) -> List[models.Room]:
+    """Return rooms with the required features AND ``capacity >= min_capacity``.
+
+    ``min_capacity`` is the number of students who will attend the activity,
+    which equals the size of the activity's group (counting students whose
+    ``group_ids`` contain that group - descendants count because we
+    propagate enrollment up to ancestors).  When the group has zero
+    students, ``min_capacity`` is 0 and the capacity filter is a no-op."""
+    return [
+        r for r in filter_rooms_by_features(rooms, required_features)
+        if r.capacity >= min_capacity
+    ]
+
+
+def pool_key(room: models.Room) -> PoolKey:
+    return (tuple(sorted(set(room.features or []))), room.capacity)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CP-SAT helpers
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _and_bool(model: cp_model.CpModel, name: str, conditions):
+    """Combine a list of (BoolVar or constant 0/1) into a representation of
+    their AND.  Returns:
+      - 0 (int)        if any condition is constant 0  (AND is always 0)
+      - 1 (int)        if all conditions are constant 1
+      - the lone BoolVar if exactly one real BoolVar remains after dropping 1s
+      - a fresh BoolVar constrained to be the AND otherwise
+
+    Used heavily for "activity a is assigned to room r AND active in week w"
+    kinds of expressions, where many activities have fixed-week presence
+    (constants) and we want to avoid materialising unnecessary BoolVars."""
+    real = []
+    for c in conditions:
+        if isinstance(c, int):
+            if c == 0:
+                return 0
+            # c == 1 → drop
+        else:
+            real.append(c)
+    if not real:
+        return 1
+    if len(real) == 1:
+        return real[0]
+    bv = model.NewBoolVar(name)
+    # bv ≤ each c (so bv = 1 ⇒ all c = 1)
+    for c in real:
+        model.Add(bv <= c)
+    # bv ≥ sum(c) - (n-1)  (so all c = 1 ⇒ bv = 1)
+    model.Add(bv >= sum(real) - (len(real) - 1))
+    return bv
+
+
+def _make_optional_interval(
+    model: cp_model.CpModel,
+    name: str,
+    start, duration: int, end,
+    presence,
+):
+    """Wrap (start, dur, end) into a CP-SAT interval whose presence is
+    governed by ``presence`` (a BoolVar, or the Python int 0/1 used as
+    a constant-presence sentinel).
+
+    Returns the interval var, or None when presence is constant 0.
+
+    Note: we cannot use ``presence == 0`` directly because CP-SAT BoolVars
+    overload ``==`` to return a BoundedLinearExpression, not a Python bool.
+    All constant-vs-variable checks must go through ``isinstance(x, int)``.
+    """
+    if isinstance(presence, int):
+        if presence == 0:
+            return None
+        if presence == 1:
+            return model.NewIntervalVar(start, duration, end, name + "_req")
+    return model.NewOptionalIntervalVar(start, duration, end, presence, name)
+
+
+def _value(solver: cp_model.CpSolver, v) -> int:
+    """Solver value of a BoolVar/IntVar, or the constant itself."""
+    return v if isinstance(v, int) else solver.Value(v)
+
+
+class _IncumbentThrottle:
+    """Hands incumbents to ``solve``'s ``on_incumbent`` at most once per
+    ``interval`` seconds.
+
+    ``offer`` runs on the solve thread - inside the CP-SAT solution callback,
+    where the values are only readable until it returns - so it only reads
+    the placements out; ``on_incumbent`` must queue them and return (room
+    colouring and saving happen elsewhere, see ``schedule_generator``)."""
+
+    def __init__(
+        self,
+        sm: "ScheduleModel",
+        on_incumbent: Optional[Callable[[Dict[str, "Placement"]], None]],
+        interval: float,
+    ):
+        self._sm = sm
+        self._on_incumbent = on_incumbent if interval > 0 else None
+        self._interval = interval
+        self._next_at = 0.0
+
+    def offer(self, values, force: bool = False):
+        """``values``: a solver or solution callback holding an incumbent."""
+        if self._on_incumbent is None:
+            return
+        now = time.monotonic()
+        if not force and now < self._next_at:
+            return
+        self._next_at = now + self._interval
+        try:
+            self._on_incumbent(self._sm.placements(values))
+        except Exception as e:
+            # Publishing is best-effort; never let it abort the search.
+            logger.warning(f"Could not hand over incumbent: {e}")
+
+
+ProgressCallback = Callable[[progress.SolverProgress], None]
+
+
+def _report_progress(on_progress: Optional[ProgressCallback], report: progress.SolverProgress):
+    if on_progress is None:
+        return
+    try:
+        on_progress(report)
+    except Exception as e:
+        # Progress is informational; never let it abort the search.
+        logger.warning(f"Could not report progress: {e}")
+
+
+class _StagnationStopper(cp_model.CpSolverSolutionCallback):
+    """CP-SAT solution callback that records the wall-clock time of the
+    last improving incumbent.  Pairs with ``_StagnationMonitor``: this
+    side only writes timestamps; the monitor thread reads them and
+    decides when to abort the search.  With ``incumbents`` it also offers
+    each incumbent for progressive publishing."""
+
+    def __init__(self, monitor: "_StagnationMonitor", incumbents: Optional[_IncumbentThrottle] = None):
+        super().__init__()
+        self._monitor = monitor
+        self._incumbents = incumbents
+
+    def on_solution_callback(self):
+        self._monitor.report_improvement(
+            self.ObjectiveValue(), self.BestObjectiveBound(), self.WallTime(),
+        )
+        if self._incumbents is not None:
+            self._incumbents.offer(self)
+
+
+class _StagnationMonitor:
+    """Background watchdog over a phase-2 CP-SAT search.  Aborts it when
+
+      - no improving incumbent has been found for ``max_idle_seconds``
+        consecutive seconds (stagnation);
+      - with ``gap_limit`` > 0, the best objective is within that relative
+        gap of the best bound - the rest of the budget could at most close
+        what is left of it;
+      - with ``max_budget`` > ``budget``, the soft ``budget`` runs out.  At
+        the deadline the budget is extended by a quarter of it, up to
+        ``max_budget``, as long as the last quarter improved the objective
+        by at least ``min_improvement`` (relative): hard instances still
+        making progress are not cut off, and ones that have settled stop on
+        time.  The solver's own time limit stays at ``max_budget``.
+
+    The bound comes from the solution callback and, where OR-Tools offers
+    it, from the solver's best-bound callback (see ``watch_bound``), so bound
+    moves between incumbents count too.
+
+    Runs in a daemon thread, polling every 2 s.  ``solver.StopSearch()``
+    is documented as thread-safe, so calling it from here cleanly
+    triggers ``Solve()`` to return in the main thread.  With
+    ``on_progress`` it also reports the search's state, at most every
+    ``progress_interval`` seconds."""
+
+    def __init__(
+        self,
+        solver: cp_model.CpSolver,
+        max_idle_seconds: float,
+        on_progress: Optional[ProgressCallback] = None,
+        progress_interval: float = 5.0,
+        budget: Optional[float] = None,
+        gap_limit: float = 0.0,
+        max_budget: Optional[float] = None,
+        min_improvement: float = 0.01,
+    ):
+        self._solver = solver
+        self._max_idle = max_idle_seconds
+        self._on_progress = on_progress
+        self._progress_interval = progress_interval
+        self._budget = budget
+        self._gap_limit = gap_limit
+        self._max_budget = max_budget
+        self._min_improvement = min_improvement
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self._last_improvement_at = self._started_at
+        self._best_objective: Optional[float] = None
+        self._best_bound: Optional[float] = None
+        # (time.time(), objective) per improving incumbent, for extensions.
+        self._improvements: List[Tuple[float, float]] = []
+        # (solver wall time, objective, best bound) per incumbent - the
+        # objective-over-time curve reported by the benchmark harness.
+        self.history: List[Tuple[float, float, float]] = []
+        self._stop_event = threading.Event()
+        # "stagnation", "gap" or "time limit" once the monitor stopped the
+        # search; None if the search ended on its own.
+        self.stop_reason: Optional[str] = None
+        self.extension_seconds = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def watch_bound(self):
+        """Follow the solver's best bound between incumbents too."""
+        try:
+            self._solver.best_bound_callback = self.report_bound
+        except AttributeError:
+            logger.warning("best_bound_callback unavailable; the bound updates with incumbents only")
+
+    def report_bound(self, bound: float):
+        with self._lock:
+            self._best_bound = bound
+
+    def report_improvement(self, objective: float, bound: float, wall_time: float):
+        with self._lock:
+            self.history.append((wall_time, objective, bound))
+            self._best_bound = bound
+            if self._best_objective is None or objective < self._best_objective:
+                self._best_objective = objective
+                self._last_improvement_at = time.time()
+                self._improvements.append((self._last_improvement_at, objective))
+
+    def _improving(self, now: float, window: float) -> bool:
+        """Whether the objective improved by ``min_improvement`` over the
+        last ``window`` seconds.  Called under the lock."""
+        if not self._improvements:
+            return False
+        before = [obj for at, obj in self._improvements if at <= now - window]
+        if not before:
+            # Every incumbent is younger than the window: still descending.
+            return True
+        reference = before[-1]
+        gain = (reference - self._best_objective) / max(1.0, abs(reference))
+        return gain >= self._min_improvement
+
+    def _halt(self, reason: str, message: str):
+        logger.info(f"Early exit: {message}; current best = {self._best_objective}.")
+        sys.stdout.flush()
+        self.stop_reason = reason
+        self._solver.StopSearch()
+
+    def _loop(self):
+        next_report_at = 0.0
+        budget = self._budget
+        extendable = budget is not None and self._max_budget is not None and self._max_budget > budget
+        while not self._stop_event.is_set():
+            # Check every 2 s; cheap.
+            if self._stop_event.wait(2.0):
+                return
+            now = time.time()
+            elapsed = now - self._started_at
+            with self._lock:
+                idle = now - self._last_improvement_at
+                have_incumbent = self._best_objective is not None
+                best_objective, best_bound = self._best_objective, self._best_bound
+                if extendable and elapsed >= budget:
+                    step = self._budget / 4
+                    if budget < self._max_budget and self._improving(now, step):
+                        budget = min(self._max_budget, budget + step)
+                        self.extension_seconds = budget - self._budget
+                        logger.info(
+                            f"Objective still improving; phase-2 budget extended to {budget:.0f}s "
+                            f"(limit {self._max_budget:.0f}s)."
+                        )
+            gap = progress.relative_gap(best_objective, best_bound)
+            if self._on_progress is not None and now >= next_report_at:
+                next_report_at = now + self._progress_interval
+                _report_progress(self._on_progress, progress.SolverProgress(
+                    phase=progress.ProgressPhase.OPTIMISE,
+                    phase_elapsed_seconds=elapsed,
+                    budget_seconds=budget,
+                    best_objective=best_objective,
+                    best_bound=best_bound,
+                    idle_seconds=idle,
+                    stagnation_seconds=self._max_idle,
+                ))
+            if have_incumbent and idle >= self._max_idle:
+                self._halt("stagnation", f"no improvement for {idle:.1f}s (stagnation limit = {self._max_idle:.0f}s)")
+                return
+            if self._gap_limit > 0 and gap is not None and gap <= self._gap_limit:
+                self._halt("gap", f"gap {gap:.2%} within the {self._gap_limit:.2%} limit")
+                return
+            if extendable and elapsed >= budget:
+                self._halt("time limit", f"budget of {budget:.0f}s spent and the objective has settled")
+                return
+
+
+def _make_solver(
+    options: SolveOptions,
+    max_seconds: float,
+    preset: str,
+    stop_after_first: bool = False,
+) -> cp_model.CpSolver:
+    """A solver with the base parameters and ``preset``'s on top."""
+    s = cp_model.CpSolver()
+    s.parameters.num_search_workers = options.num_search_workers
+    s.parameters.max_time_in_seconds = float(max_seconds)
+    s.parameters.log_search_progress = True
+    for field, value in presets.get_preset(preset).parameters.items():
+        # Guarded: field names can vary across OR-Tools versions.
+        try:
+            setattr(s.parameters, field, value)
+        except (AttributeError, TypeError, ValueError):
+            logger.warning(f"CP-SAT parameter {field} unavailable; preset {preset} applied without it")
+    if stop_after_first:
+        s.parameters.stop_after_first_solution = True
+    return s
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CP-SAT model
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ScheduleModel:
+    """The CP-SAT model for one ``Problem``.
+
+    The constructor pre-filters rooms and start slots and adds every variable
+    and hard constraint; ``build_objective`` adds the soft objective on demand
+    (phase 2 only).  The variable maps are public so callers can hint, fix or
+    read individual activities.  Raises ``SolveError`` when pre-filtering
+    already proves an activity unschedulable."""
+
+    def __init__(self, problem: Problem):
+        self.problem = problem
+        grid = problem.time_grid
+        self.tpd = grid.timeslots_per_day
+        self.days = grid.days
+        self.weeks = grid.weeks
+        self.total_slots = self.days * self.tpd
+
+        self.activities = problem.activities
+        self.activities_by_id = {a.id: a for a in self.activities}
+        self.groups = problem.groups
+        self.groups_by_id = {g.id: g for g in self.groups}
+        self.group_index = GroupIndex(self.groups, self.activities)
+        self.leaf_groups = [self.groups_by_id[gid] for gid in self.group_index.leaf_ids]
+
+        self.model = cp_model.CpModel()
+
+        self._filter_rooms()
+        self._collect_preferences()
+        self._compute_allowed_starts()
+        self._build_pools()
+        self._add_activity_variables()
+        self._check_activity_weeks()
+
+        # NOTE on interval objects: each no-overlap / cumulative constraint
+        # builds its OWN optional interval per activity, even though the
+        # professor and group constraints gate on the same expression (presence
+        # in week w).  Reusing a single shared interval across multiple
+        # no-overlap constraints is NOT safe: when an activity is pinned
+        # (selected_timeslot), its start collapses to a constant and presolve's
+        # "merge constant contiguous intervals" rewrites the interval inside
+        # one constraint, corrupting the shared reference in the others -
+        # CP-SAT then rejects the model with MODEL_INVALID.  Creating fresh
+        # intervals is correct; presolve de-duplicates the identical copies on
+        # its own ("duplicate: remapped duplicate intervals"), so the solved
+        # model is no larger.
+        self._add_pool_capacity()
+        self._add_professor_no_overlap()
+        self._add_group_no_overlap()
+
+        # Cached by (activity, week, day): the same "present in this day-week"
+        # bool is requested by the professor cap, by every group cap that
+        # contains the activity, and by the compactness objective.  Without the
+        # cache each caller minted a fresh BoolVar + reifying constraints for
+        # the identical AND, producing thousands of duplicates (presolve was
+        # removing ~27k of them).
+        self._present_in_day_cache: Dict[Tuple[str, int, int], object] = {}
+        self._add_professor_day_caps()
+        self._add_group_day_caps()
+
+        self.pref_terms: List[Tuple[int, cp_model.IntVar]] = []
+        self.moved_terms: List[cp_model.IntVar] = []
+        self.span_vars: List[cp_model.IntVar] = []
+        self.any_used_vars: List[cp_model.IntVar] = []
+        self._start_eq_cache: Dict[Tuple[str, int], cp_model.IntVar] = {}
+
+    # ── Pre-solve filtering ─────────────────────────────────────────────────
+
+    def _filter_rooms(self):
+        """Per-activity feasible rooms: features + capacity."""
+        rooms = self.problem.rooms
+        counts = self.problem.group_student_counts
+        self.possible_rooms: Dict[str, List[models.Room]] = {}
+        for a in self.activities:
+            required_capacity = sum(counts.get(gid, 0) for gid in a.group_ids)
+            possible = filter_rooms_for_activity(
+                rooms=rooms,
+                required_features=a.required_room_features,
+                min_capacity=required_capacity,
+            )
+            if not possible:
+                # Diagnose precisely so the user knows which constraint failed.
+                feat_only = filter_rooms_by_features(rooms, a.required_room_features)
+                if not feat_only:
+                    msg = f"No room with required features for activity {a.id}."
+                else:
+                    max_feat_capacity = max((r.capacity for r in feat_only), default=0)
+                    msg = (
+                        f"No room with required features AND capacity ≥ "
+                        f"{required_capacity} for activity {a.id} "
+                        f"(group has {required_capacity} students; "
+                        f"largest matching room seats {max_feat_capacity})."
+                    )
+                logger.error(msg)
+                raise SolveError(msg)
+            self.possible_rooms[a.id] = possible
+
+    def _collect_preferences(self):
+        """Preferences (unavailable = hard, not_ideal = soft penalty), as slot
+        bitmasks (``time_helpers.slot_mask``).  Group masks already include
+        every ancestor's, so an activity's effective mask is an OR over its
+        professor and its own groups."""
+        unavailable = models.TimeslotPreferenceValue.UNAVAILABLE
+        not_ideal = models.TimeslotPreferenceValue.NOT_IDEAL
+
+        self.prof_unavail: Dict[str, int] = {}
+        self.prof_not_ideal: Dict[str, int] = {}
+        for p in self.problem.professors:
+            prefs = p.timeslot_preferences
+            u = time_helpers.slot_mask(pr.slot for pr in prefs if pr.preference == unavailable)
+            n = time_helpers.slot_mask(pr.slot for pr in prefs if pr.preference == not_ideal)
+            if u: self.prof_unavail[p.id] = u
+            if n: self.prof_not_ideal[p.id] = n
+
+        own_unavail: Dict[str, int] = {}
+        own_not_ideal: Dict[str, int] = {}
+        for g in self.groups:
+            prefs = g.timeslot_preferences
+            own_unavail[g.id] = time_helpers.slot_mask(pr.slot for pr in prefs if pr.preference == unavailable)
+            own_not_ideal[g.id] = time_helpers.slot_mask(pr.slot for pr in prefs if pr.preference == not_ideal)
+        self.group_unavail: Dict[str, int] = {}
+        self.group_not_ideal: Dict[str, int] = {}
+        for g in self.groups:
+            u = n = 0
+            for gid in [g.id] + g.ancestor_ids:
+                u |= own_unavail.get(gid, 0)
+                n |= own_not_ideal.get(gid, 0)
+            if u: self.group_unavail[g.id] = u
+            if n: self.group_not_ideal[g.id] = n
+
+    def _activity_mask(self, a, prof_masks: Dict[str, int], group_masks: Dict[str, int]) -> int:
+        mask = prof_masks.get(a.professor_id, 0) if a.professor_id else 0
+        for gid in a.group_ids:
+            mask |= group_masks.get(gid, 0)
+        return mask
+
+    def activity_forbidden_mask(self, a) -> int:
+        """Effective unavailable slots (own group + ancestors + prof), as a mask."""
+        return self._activity_mask(a, self.prof_unavail, self.group_unavail)
+
+    def activity_not_ideal_mask(self, a) -> int:
+        """Not-ideal slots (prof + group + ancestors), as a mask."""
+        return self._activity_mask(a, self.prof_not_ideal, self.group_not_ideal)
+
+    def _compute_allowed_starts(self):
+        """Allowed starts after pre-filter."""
+        self.allowed_starts_map: Dict[str, List[int]] = {}
+        raw_by_duration: Dict[int, List[int]] = {}
+        for a in self.activities:
+            raw = raw_by_duration.get(a.duration_slots)
+            if raw is None:
+                raw = time_helpers.allowed_starts(self.problem.time_grid, a.duration_slots)
+                raw_by_duration[a.duration_slots] = raw
+
+            # Pinned timeslot: an admin explicitly fixed this activity to a
+            # specific start slot.  Honour it as a hard constraint - its domain
+            # collapses to that single start - overriding soft/unavailable
+            # preferences (the pin is a deliberate override).  The week pattern
+            # is still governed by the activity's frequency; only the
+            # within-week start is pinned.  The slot must remain grid-valid
+            # (fit within a day, in range), so it must be one of the raw
+            # allowed starts for this duration.
+            sel = a.selected_timeslot
+            if sel is not None:
+                pinned = sel.start_timeslot
+                if pinned not in raw:
+                    msg = (
+                        f"Activity {a.id} is pinned to start slot {pinned}, which is "
+                        f"not a valid start for a {a.duration_slots}-slot activity "
+                        f"(it would cross a day boundary or fall outside the grid)."
+                    )
+                    logger.error(msg)
+                    raise SolveError(msg)
+                self.allowed_starts_map[a.id] = [pinned]
+                continue
+
+            forbidden = self.activity_forbidden_mask(a)
+            usable = time_helpers.starts_clear_of(forbidden, raw, a.duration_slots)
+            if not usable:
+                msg = (
+                    f"Activity {a.id} has no feasible start (blocked entirely by "
+                    f"unavailable preferences)."
+                )
+                logger.error(msg)
+                raise SolveError(msg)
+            self.allowed_starts_map[a.id] = usable
+
+    def _build_pools(self):
+        """Room pools.
+
+        Rooms with identical (features, capacity) are fully interchangeable
+        for scheduling.  Instead of giving each activity one Boolean per
+        candidate *room* and a per-room disjunctive no-overlap (which created
+        ~52k optional intervals and a brutal room-relabelling symmetry - 27!
+        for the lab rooms alone), we model each pool as ONE cumulative
+        resource of capacity = pool size.  An activity picks a pool (Boolean
+        per candidate pool, usually just one) and consumes one unit of it;
+        concrete rooms are assigned in a sound post-processing pass after the
+        solve.  This collapses the symmetry that made the feasible instance
+        intractable.
+
+        possible_rooms is always a union of *whole* pools: the room filter keys
+        on exactly (features, capacity), so if one room of a pool qualifies
+        they all do.  Hence an activity's candidate pools partition its
+        possible_rooms."""
+        self.rooms_by_id: Dict[str, models.Room] = {r.id: r for r in self.problem.rooms}
+        self.pool_rooms: Dict[PoolKey, List[models.Room]] = {}
+        for r in self.problem.rooms:
+            self.pool_rooms.setdefault(pool_key(r), []).append(r)
+        self.pool_index: Dict[PoolKey, int] = {pk: i for i, pk in enumerate(self.pool_rooms)}
+
+        self.possible_pools: Dict[str, List[PoolKey]] = {}
+        for a in self.activities:
+            seen, pks = set(), []
+            for r in self.possible_rooms[a.id]:
+                pk = pool_key(r)
+                if pk not in seen:
+                    seen.add(pk)
+                    pks.append(pk)
+            self.possible_pools[a.id] = pks
+
+    # ── Variables ───────────────────────────────────────────────────────────
+
+    def _add_activity_variables(self):
+        model = self.model
+        tpd, days, weeks = self.tpd, self.days, self.weeks
+        self.start_var: Dict[str, cp_model.IntVar] = {}
+        self.end_var: Dict[str, cp_model.IntVar] = {}
+        self.interval_var: Dict[str, cp_model.IntervalVar] = {}
+        self.day_var: Dict[str, cp_model.IntVar] = {}
+        self.is_day_bv: Dict[Tuple[str, int], cp_model.IntVar] = {}
+        # pool_indicator[(a.id, pool_key)] is a BoolVar (1 = activity uses this
+        # pool) when the activity has >1 candidate pool, or the int 1 when it
+        # has exactly one (no choice to make).
+        self.pool_indicator: Dict[Tuple[str, PoolKey], object] = {}
+        self.presence: Dict[Tuple[str, int], object] = {}   # value is BoolVar | 0 | 1
+
+        for a in self.activities:
+            starts = self.allowed_starts_map[a.id]
+            domain = cp_model.Domain.FromValues(starts)
+            s = model.NewIntVarFromDomain(domain, f"start_{a.id}")
+            e = model.NewIntVar(a.duration_slots, self.total_slots, f"end_{a.id}")
+            iv = model.NewIntervalVar(s, a.duration_slots, e, f"iv_{a.id}")
+            self.start_var[a.id] = s
+            self.end_var[a.id] = e
+            self.interval_var[a.id] = iv
+
+            # day = start // tpd - channel via AllowedAssignments
+            d = model.NewIntVar(0, days - 1, f"day_{a.id}")
+            self.day_var[a.id] = d
+            model.AddAllowedAssignments([s, d], [(st, st // tpd) for st in starts])
+
+            # Per-day equality BoolVars: needed for per-day caps and compactness
+            for di in range(days):
+                b = model.NewBoolVar(f"is_day_{a.id}_{di}")
+                model.Add(d == di).OnlyEnforceIf(b)
+                model.Add(d != di).OnlyEnforceIf(b.Not())
+                self.is_day_bv[(a.id, di)] = b
+
+            # Exactly-one-pool.  With a single candidate pool there's nothing to
+            # decide - store the constant 1 so downstream gating collapses cleanly.
+            pks = self.possible_pools[a.id]
+            if len(pks) == 1:
+                self.pool_indicator[(a.id, pks[0])] = 1
+            else:
+                for pk in pks:
+                    self.pool_indicator[(a.id, pk)] = model.NewBoolVar(
+                        f"pi_{a.id}_p{self.pool_index[pk]}"
+                    )
+                model.AddExactlyOne(self.pool_indicator[(a.id, pk)] for pk in pks)
+
+            # Presence per week - populated for every w in range(weeks) so we
+            # never KeyError downstream.  Semantics generalise via w % 2:
+            #   WEEKLY         → active in every week.
+            #   BIWEEKLY_ODD   → active on even-indexed weeks  (0, 2, 4, …).
+            #   BIWEEKLY_EVEN  → active on odd-indexed weeks   (1, 3, 5, …).
+            #   BIWEEKLY       → solver picks the phase (odd-week or even-week
+            #                    parity); a single ``phase`` BoolVar selects
+            #                    which side is active and the other becomes
+            #                    ``phase.Not()``.  This naturally handles
+            #                    weeks > 2 - e.g. with weeks=4 and phase=1,
+            #                    the activity is active in weeks 0 and 2.
+            presence = self.presence
+            if a.frequency == models.Frequency.WEEKLY:
+                for w in range(weeks):
+                    presence[(a.id, w)] = 1
+            elif a.frequency == models.Frequency.BIWEEKLY_ODD:
+                for w in range(weeks):
+                    presence[(a.id, w)] = 1 if w % 2 == 0 else 0
+            elif a.frequency == models.Frequency.BIWEEKLY_EVEN:
+                for w in range(weeks):
+                    presence[(a.id, w)] = 1 if w % 2 == 1 else 0
+            else:   # plain BIWEEKLY - solver picks the phase
+                if weeks <= 1:
+                    # Only one week available; the activity must be in it.
+                    presence[(a.id, 0)] = 1
+                else:
+                    phase = model.NewBoolVar(f"pres_{a.id}_phase")
+                    for w in range(weeks):
+                        presence[(a.id, w)] = phase if w % 2 == 0 else phase.Not()
+
+    def _check_activity_weeks(self):
+        """Sanity check: every activity must be active in at least one week,
+        otherwise it's silently dropped from the schedule.  This catches
+        configuration mistakes like ``BIWEEKLY_EVEN`` with ``weeks=1``."""
+        for a in self.activities:
+            can_be_active = False
+            for w in range(self.weeks):
+                pv = self.presence[(a.id, w)]
+                if isinstance(pv, int):
+                    if pv == 1:
+                        can_be_active = True
+                        break
+                else:
+                    # Variable presence - could be 1
+                    can_be_active = True
+                    break
+            if not can_be_active:
+                msg = (
+                    f"Activity {a.id} (frequency={a.frequency}) has no possible "
+                    f"active week given institution weeks={self.weeks}."
+                )
+                logger.error(msg)
+                raise SolveError(msg)
+
+    # ── Hard constraints ────────────────────────────────────────────────────
+
+    def _weeks_to_emit(self, acts) -> List[int]:
+        """No-overlap week-collapsing.
+
+        The no-overlap loops iterate per week.  When *every* activity in a set
+        is unconditionally present in *every* week (presence == 1 for all w),
+        the per-week constraints are byte-for-byte identical copies and we can
+        emit a single one.  This is purely structural - it reads the actual
+        ``presence`` values, so a set containing any biweekly /
+        solver-chosen-phase activity (presence differs across weeks, or is a
+        BoolVar) keeps the full per-week split and stays correct."""
+        for a in acts:
+            for w in range(self.weeks):
+                pv = self.presence[(a.id, w)]
+                if not (isinstance(pv, int) and pv == 1):
+                    return list(range(self.weeks))
+        return [0]   # all members present in all weeks → one representative
+
+    def _add_pool_capacity(self):
+        """Room-pool capacity per (week, pool).
+
+        One cumulative constraint per (pool, week): at most `capacity`
+        activities (= rooms in the pool) may run simultaneously.  An activity
+        contributes an optional interval to a pool, present iff it's active
+        that week AND it selected that pool.  Pools of size 1 degenerate to a
+        plain no-overlap."""
+        model = self.model
+        self.activities_by_pool: Dict[PoolKey, List] = {}
+        for a in self.activities:
+            for pk in self.possible_pools[a.id]:
+                self.activities_by_pool.setdefault(pk, []).append(a)
+
+        for pk, acts in self.activities_by_pool.items():
+            capacity = len(self.pool_rooms[pk])
+            pidx = self.pool_index[pk]
+            for w in self._weeks_to_emit(acts):
+                intervals, demands = [], []
+                for a in acts:
+                    pres = _and_bool(
+                        model, f"pres_{a.id}_p{pidx}_w{w}",
+                        [self.presence[(a.id, w)], self.pool_indicator[(a.id, pk)]],
+                    )
+                    iv = _make_optional_interval(
+                        model, f"oiv_{a.id}_p{pidx}_w{w}",
+                        self.start_var[a.id], a.duration_slots, self.end_var[a.id], pres,
+                    )
+                    if iv is not None:
+                        intervals.append(iv)
+                        demands.append(1)
+                if not intervals:
+                    continue
+                if capacity == 1:
+                    if len(intervals) > 1:
+                        model.AddNoOverlap(intervals)
+                else:
+                    model.AddCumulative(intervals, demands, capacity)
+
+    def _add_professor_no_overlap(self):
+        """Professor no-overlap per (week, prof)."""
+        model = self.model
+        self.activities_by_prof: Dict[str, List] = {}
+        for a in self.activities:
+            if a.professor_id:
+                self.activities_by_prof.setdefault(a.professor_id, []).append(a)
+
+        for p_id, acts in self.activities_by_prof.items():
+            for w in self._weeks_to_emit(acts):
+                intervals = []
+                for a in acts:
+                    iv = _make_optional_interval(
+                        model, f"oiv_p{p_id}_a{a.id}_w{w}",
+                        self.start_var[a.id], a.duration_slots, self.end_var[a.id],
+                        self.presence[(a.id, w)],
+                    )
+                    if iv is not None:
+                        intervals.append(iv)
+                if len(intervals) > 1:
+                    model.AddNoOverlap(intervals)
+
+    def _add_group_no_overlap(self):
+        """Group no-overlap per (week, leaf_group).  Iterate leaves only: a
+        conflict in any internal group surfaces in at least one leaf
+        descendant of that group."""
+        model = self.model
+        self.activities_by_leaf: Dict[str, List] = {}
+        self.leaves_by_activity: Dict[str, List[str]] = {}
+        for L in self.leaf_groups:
+            relevant = self.group_index.activities_on_lineage(L.id)
+            if not relevant:
+                continue
+            self.activities_by_leaf[L.id] = relevant
+            for a in relevant:
+                self.leaves_by_activity.setdefault(a.id, []).append(L.id)
+            for w in self._weeks_to_emit(relevant):
+                intervals = []
+                for a in relevant:
+                    iv = _make_optional_interval(
+                        model, f"oiv_g{L.id}_a{a.id}_w{w}",
+                        self.start_var[a.id], a.duration_slots, self.end_var[a.id],
+                        self.presence[(a.id, w)],
+                    )
+                    if iv is not None:
+                        intervals.append(iv)
+                if len(intervals) > 1:
+                    model.AddNoOverlap(intervals)
+
+    def present_in_day(self, a, w, d):
+        """``activity a runs in day d of week w`` as a BoolVar or constant."""
+        key = (a.id, w, d)
+        if key not in self._present_in_day_cache:
+            pa = self.presence[(a.id, w)]
+            is_d = self.is_day_bv[(a.id, d)]
+            self._present_in_day_cache[key] = _and_bool(
+                self.model, f"pid_{a.id}_w{w}_d{d}", [pa, is_d]
+            )
+        return self._present_in_day_cache[key]
+
+    def _add_day_cap(self, acts, w, d, cap):
+        terms = []
+        for a in acts:
+            bv = self.present_in_day(a, w, d)
+            if isinstance(bv, int) and bv == 0: continue
+            if isinstance(bv, int) and bv == 1:
+                # Always in this (week, day) - counts unconditionally
+                terms.append((a.duration_slots, None))
+            else:
+                terms.append((a.duration_slots, bv))
+        if not terms:
+            return
+        # Sum: constant + sum(dur * BoolVar)
+        const = sum(dur for dur, bv in terms if bv is None)
+        expr = sum(dur * bv for dur, bv in terms if bv is not None) + const
+        self.model.Add(expr <= cap)
+
+    def _add_professor_day_caps(self):
+        """Professor per-day cap (when configured below tpd)."""
+        for p in self.problem.professors:
+            cap = p.max_timeslots_per_day
+            if not cap or cap >= self.tpd:
+                continue
+            acts = self.activities_by_prof.get(p.id, [])
+            if not acts:
+                continue
+            for w in range(self.weeks):
+                for d in range(self.days):
+                    self._add_day_cap(acts, w, d, cap)
+
+    def _add_group_day_caps(self):
+        """Per-group per-day cap (institution config).
+
+        Iterate ALL groups (not just leaves) because each group's cap counts
+        its own + ancestor activities, which is a distinct set per internal
+        group.  Compare against tpd (not total_slots): the cap is per-day, so
+        any value >= tpd is structurally unreachable and we'd just be emitting
+        redundant constraints."""
+        group_cap = self.problem.time_grid.max_timeslots_per_day_per_group
+        if not group_cap or group_cap >= self.tpd:
+            return
+        for grp in self.groups:
+            relevant = self.group_index.activities_on_lineage(grp.id)
+            if not relevant:
+                continue
+            for w in range(self.weeks):
+                for d in range(self.days):
+                    self._add_day_cap(relevant, w, d, group_cap)
+
+    # ── Soft objective ──────────────────────────────────────────────────────
+
+    def start_eq(self, a_id, s):
+        key = (a_id, s)
+        if key not in self._start_eq_cache:
+            b = self.model.NewBoolVar(f"start_{a_id}_eq_{s}")
+            self.model.Add(self.start_var[a_id] == s).OnlyEnforceIf(b)
+            self.model.Add(self.start_var[a_id] != s).OnlyEnforceIf(b.Not())
+            self._start_eq_cache[key] = b
+        return self._start_eq_cache[key]
+
+    def add_entity_compactness(self, tag: str, relevant):
+        """Add span + any_used vars for each (week, day) of this entity.
+
+        Per (week, day):
+          first / last : IntVar in [0, tpd-1]
+          any_used     : BoolVar = OR of "activity present in this day-week"
+          For each relevant activity a:
+            present_a_wd = presence[a][w] AND day[a] == d
+            present_a_wd ⇒ first ≤ start[a] - d*tpd
+            present_a_wd ⇒ last  ≥ end[a] - 1 - d*tpd
+          When ¬any_used: pin first = last = 0 → span = 0.
+          span = last - first.
+        Sum of (span + any_used) across entity-days equals the total gap
+        slot count modulo a constant (= total activity duration across
+        active weeks for this entity)."""
+        model, tpd = self.model, self.tpd
+        for w in range(self.weeks):
+            for d in range(self.days):
+                presents = []
+                for a in relevant:
+                    bv = self.present_in_day(a, w, d)
+                    if isinstance(bv, int) and bv == 0:
+                        continue
+                    presents.append((a, bv))
+                if not presents:
+                    continue
+                # any_used = OR of bv values (treat constant 1 as "always used")
+                any_used = model.NewBoolVar(f"any_{tag}_w{w}_d{d}")
+                real_bvs = [bv for _, bv in presents if not (isinstance(bv, int) and bv == 1)]
+                if any(isinstance(bv, int) and bv == 1 for _, bv in presents):
+                    model.Add(any_used == 1)
+                elif real_bvs:
+                    for bv in real_bvs:
+                        model.AddImplication(bv, any_used)
+                    model.AddBoolOr([any_used.Not()] + real_bvs)
+                else:
+                    # presents is empty after filter - already handled above
+                    continue
+
+                first = model.NewIntVar(0, tpd - 1, f"first_{tag}_w{w}_d{d}")
+                last = model.NewIntVar(0, tpd - 1, f"last_{tag}_w{w}_d{d}")
+                day_start = d * tpd
+
+                for a, bv in presents:
+                    if isinstance(bv, int) and bv == 1:
+                        model.Add(first <= self.start_var[a.id] - day_start)
+                        model.Add(last >= self.end_var[a.id] - 1 - day_start)
+                    else:
+                        model.Add(first <= self.start_var[a.id] - day_start).OnlyEnforceIf(bv)
+                        model.Add(last >= self.end_var[a.id] - 1 - day_start).OnlyEnforceIf(bv)
+
+                # Pin to 0 when nothing is used so span contributes 0
+                model.Add(first == 0).OnlyEnforceIf(any_used.Not())
+                model.Add(last == 0).OnlyEnforceIf(any_used.Not())
+
+                span = model.NewIntVar(0, tpd - 1, f"span_{tag}_w{w}_d{d}")
+                model.Add(span == last - first)
+                self.span_vars.append(span)
+                self.any_used_vars.append(any_used)
+
+    def build_objective(self, anchor_starts: Optional[Dict[str, int]] = None):
+        """Populate pref_terms / span_vars / any_used_vars and set the Minimize
+        objective.  Called only for phase 2 - phase 1 is a pure feasibility
+        search, so none of this machinery (and its ~9k vars + reified
+        constraints) burdens the first-solution search.
+
+        ``anchor_starts`` (incremental re-solves) maps activities to their start
+        in the published timetable; moving one costs ``tpd`` - a full day of
+        gaps - so re-optimisation only reshuffles when it clearly pays off."""
+        # Preferred-hours violations: overlap_count * (start[a] == s).
+        for a in self.activities:
+            ni = self.activity_not_ideal_mask(a)
+            if not ni:
+                continue
+            starts = self.allowed_starts_map[a.id]
+            for s, overlap in zip(starts, time_helpers.overlap_counts(ni, starts, a.duration_slots)):
+                if overlap > 0:
+                    self.pref_terms.append((overlap, self.start_eq(a.id, s)))
+
+        # Gap minimisation per (entity, week, day).
+        for p in self.problem.professors:
+            acts = self.activities_by_prof.get(p.id, [])
+            if acts:
+                self.add_entity_compactness(f"p{p.id}", acts)
+        for leaf_id, relevant in self.activities_by_leaf.items():
+            self.add_entity_compactness(f"g{leaf_id}", relevant)
+
+        logger.info(
+            f"Compactness: {len(self.span_vars)} spans, {len(self.any_used_vars)} active flags."
+        )
+        if self.pref_terms:
+            logger.info(f"Preferred-hours penalties: {len(self.pref_terms)} terms.")
+
+        # Stability: "activity a left its published start".
+        for a_id, s in (anchor_starts or {}).items():
+            if s in self.allowed_starts_map[a_id]:
+                self.moved_terms.append(self.start_eq(a_id, s).Not())
+
+        # Worst-case compactness (+ stability) cost bounds the lower terms;
+        # weight preferred-hours penalties above that so they always dominate.
+        max_compact_cost = len(self.span_vars) * (self.tpd - 1) + len(self.any_used_vars)
+        max_compact_cost += len(self.moved_terms) * self.tpd
+        pref_weight = max(1, max_compact_cost) + 1
+        objective_terms = []
+        if self.pref_terms:
+            objective_terms.extend(pref_weight * wt * v for wt, v in self.pref_terms)
+        objective_terms.extend(self.span_vars)
+        objective_terms.extend(self.any_used_vars)
+        objective_terms.extend(self.tpd * v for v in self.moved_terms)
+        if objective_terms:
+            self.model.Minimize(sum(objective_terms))
+            logger.info(
+                f"Objective: {len(self.pref_terms)} pref penalties (weight ×{pref_weight}) + "
+                f"{len(self.span_vars) + len(self.any_used_vars)} compactness terms (weight ×1)"
+            )
+
+    def objective_breakdown(self, solver: cp_model.CpSolver) -> Tuple[int, int, int]:
+        """(preferred-hours penalty, total span, active entity-days)."""
+        pref_cost = sum(wt * solver.Value(v) for wt, v in self.pref_terms)
+        span_total = sum(solver.Value(v) for v in self.span_vars)
+        active_days = sum(solver.Value(v) for v in self.any_used_vars)
+        return pref_cost, span_total, active_days
+
+    # ── Reading solutions ───────────────────────────────────────────────────
+
+    def decision_vars(self, a) -> List[cp_model.IntVar]:
+        """The variables that pin down activity ``a``'s placement: its start,
+        its pool choice (when it has one) and its biweekly phase (when the
+        solver picks it).  Every other variable is implied by these."""
+        decision = [self.start_var[a.id]]
+        for pk in self.possible_pools[a.id]:
+            pv_pool = self.pool_indicator[(a.id, pk)]
+            if not isinstance(pv_pool, int):
+                decision.append(pv_pool)
+        # A plain-BIWEEKLY activity has ONE phase BoolVar, exposed as
+        # presence[(a,0)] = phase and presence[(a,odd)] = phase.Not() - the
+        # same underlying variable.  Hinting more than one of these feeds
+        # CP-SAT the same variable twice and makes the whole hint invalid
+        # ("solution hint contains duplicate variables"), which silently
+        # kills phase-2 optimisation.  presence[(a,0)] is always the positive
+        # phase, so return just that one.
+        pv0 = self.presence[(a.id, 0)]
+        if not isinstance(pv0, int):
+            decision.append(pv0)
+        return decision
+
+    def placement_values(self, a, placement: Placement) -> List[Tuple[object, int]]:
+        """``decision_vars(a)`` paired with the values that reproduce
+        ``placement``."""
+        values: List[Tuple[object, int]] = [(self.start_var[a.id], placement.start)]
+        for pk in self.possible_pools[a.id]:
+            pv_pool = self.pool_indicator[(a.id, pk)]
+            if not isinstance(pv_pool, int):
+                values.append((pv_pool, int(pk == placement.pool)))
+        pv0 = self.presence[(a.id, 0)]
+        if not isinstance(pv0, int):
+            values.append((pv0, int(0 in placement.active_weeks)))
+        return values
+
+    def assignment_values(self, a, assignment: Assignment) -> List[Tuple[object, int]]:
+        """``placement_values`` for ``assignment`` (a row of an earlier
+        timetable)."""
+        room = self.rooms_by_id.get(assignment.room_id)
+        return self.placement_values(a, Placement(
+            activity_id=a.id,
+            pool=pool_key(room) if room is not None else ((), -1),
+            start=assignment.start_timeslot,
+            end=assignment.start_timeslot + a.duration_slots,
+            active_weeks=assignment.active_weeks,
+        ))
+
+    def week_patterns(self, a) -> List[List[int]]:
+        """The active-week lists ``a``'s frequency allows."""
+        patterns = []
+        for phase in (1, 0):
+            weeks = []
+            for w in range(self.weeks):
+                pv = self.presence[(a.id, w)]
+                if isinstance(pv, int):
+                    active = pv
+                else:
+                    # presence is phase on even weeks and phase.Not() on odd.
+                    active = phase if w % 2 == 0 else 1 - phase
+                if active:
+                    weeks.append(w)
+            if weeks not in patterns:
+                patterns.append(weeks)
+        return patterns
+
+    def accepts(self, a, assignment: Assignment) -> bool:
+        """Whether ``assignment`` is still a valid placement of ``a`` on its
+        own: a start the grid, pin and unavailability filters allow, a room
+        that passes the feature and capacity filters, and a week pattern the
+        frequency allows.  Conflicts *between* activities are not checked."""
+        return (
+            assignment.start_timeslot in self.allowed_starts_map[a.id]
+            and any(r.id == assignment.room_id for r in self.possible_rooms[a.id])
+            and sorted(assignment.active_weeks) in self.week_patterns(a)
+        )
+
+    def accepts_placement(self, a, placement: Placement) -> bool:
+        """``accepts`` for a pool-level placement (a warm-start hint)."""
+        return (
+            placement.start in self.allowed_starts_map[a.id]
+            and placement.pool in self.possible_pools[a.id]
+            and sorted(placement.active_weeks) in self.week_patterns(a)
+        )
+
+    def fix(self, a, assignment: Assignment):
+        """Pin ``a`` to ``assignment`` with hard constraints."""
+        for var, value in self.assignment_values(a, assignment):
+            self.model.Add(var == value)
+
+    def solution_hints(self, solver: cp_model.CpSolver) -> List[Tuple[object, int]]:
+        """The decision variables' values in ``solver``'s solution, as
+        (var, value) pairs ready for ``model.AddHint``."""
+        return [
+            (v, solver.Value(v))
+            for a in self.activities
+            for v in self.decision_vars(a)
+        ]
+
+    def placements(self, solver: cp_model.CpSolver) -> Dict[str, Placement]:
+        """The solver fixed each activity's start, active weeks, and chosen
+        *pool*; concrete rooms are assigned by ``assign_rooms``."""
+        placements: Dict[str, Placement] = {}
+        for a in self.activities:
+            chosen_pk = None
+            for pk in self.possible_pools[a.id]:
+                if _value(solver, self.pool_indicator[(a.id, pk)]) == 1:
+                    chosen_pk = pk
+                    break
+            if chosen_pk is None:
+                logger.error(f"No pool chosen by solver for activity {a.id}")
+                continue
+            start = solver.Value(self.start_var[a.id])
+            active_weeks = [
+                w for w in range(self.weeks)
+                if _value(solver, self.presence[(a.id, w)]) == 1
+            ]
+            placements[a.id] = Placement(
+                activity_id=a.id,
+                pool=chosen_pk,
+                start=start,
+                end=start + a.duration_slots,
+                active_weeks=active_weeks,
+            )
+        return placements
+
+
+def assign_rooms(
+    problem: Problem,
+    placements: Dict[str, Placement],
+    preferred_rooms: Optional[Dict[str, str]] = None,
+) -> List[Assignment]:
+    """Colour each pool's placements with concrete rooms.
+
+    Per (pool, week) the cumulative guaranteed ≤ capacity simultaneous
+    activities, i.e. the interval graph's max clique ≤ #rooms.  So the classic
+    interval-colouring greedy (process by start time, take the lowest-indexed
+    room that's free) is guaranteed to find a room within the pool - it never
+    needs more colours than the clique number.  This makes the cumulative
+    relaxation exact: a valid room assignment always exists and we construct
+    it.
+
+    We assign each activity ONE room for all of its active weeks whenever
+    possible, so it shows up as a single entry in the timetable (no per-week
+    duplication): pick the lowest-indexed room that is free in *every* active
+    week of the activity.  If the pool is so saturated that no single room is
+    free across all those weeks, fall back to independent per-week assignment
+    - the cumulative guarantees a free room exists within each individual week
+    - and emit one row per (room, weeks) group, which the data model already
+    supports via active_weeks.
+
+    ``preferred_rooms`` (activity id -> room id, from the published timetable
+    on incremental re-solves) is tried first, and rooms still preferred by a
+    later activity last.  Taking *any* free room keeps the greedy's guarantee,
+    so the ordering costs nothing."""
+    weeks = problem.time_grid.weeks
+    preferred_rooms = preferred_rooms or {}
+    pool_rooms: Dict[PoolKey, List[models.Room]] = {}
+    for r in problem.rooms:
+        pool_rooms.setdefault(pool_key(r), []).append(r)
+    pool_index = {pk: i for i, pk in enumerate(pool_rooms)}
+
+    room_of: Dict[Tuple[str, int], str] = {}
+    for pk, rms in pool_rooms.items():
+        room_ids = [r.id for r in rms]
+        free_at = {rid: [0] * weeks for rid in room_ids}   # free time per room, per week
+        pool_acts = sorted(
+            (p for p in placements.values() if p.pool == pk),
+            key=lambda p: p.start,
+        )
+        pending_claims: Dict[str, int] = {}
+        for p in pool_acts:
+            rid = preferred_rooms.get(p.activity_id)
+            if rid in free_at:
+                pending_claims[rid] = pending_claims.get(rid, 0) + 1
+        for p in pool_acts:
+            preferred = preferred_rooms.get(p.activity_id)
+            candidates = room_ids
+            if preferred in free_at:
+                pending_claims[preferred] -= 1
+            if pending_claims:
+                candidates = sorted(
+                    room_ids, key=lambda rid: (rid != preferred, pending_claims.get(rid, 0) > 0),
+                )
+            chosen = next(
+                (rid for rid in candidates if all(free_at[rid][w] <= p.start for w in p.active_weeks)),
+                None,
+            )
+            if chosen is not None:
+                for w in p.active_weeks:
+                    free_at[chosen][w] = p.end
+                    room_of[(p.activity_id, w)] = chosen
+            else:
+                for w in p.active_weeks:
+                    rw = next((rid for rid in candidates if free_at[rid][w] <= p.start), None)
+                    if rw is None:
+                        # Cumulative guarantees this can't happen; guard anyway.
+                        logger.error(
+                            f"Room colouring overflow for activity {p.activity_id} in pool "
+                            f"{pool_index[pk]} week {w}; capacity may be exceeded."
+                        )
+                        rw = room_ids[0]
+                    free_at[rw][w] = p.end
+                    room_of[(p.activity_id, w)] = rw
+
+    # Build rows, grouping each activity's weeks by room.
+    assignments: List[Assignment] = []
+    for a in problem.activities:
+        p = placements.get(a.id)
+        if p is None:
+            continue
+        weeks_by_room: Dict[str, List[int]] = {}
+        for w in p.active_weeks:
+            rid = room_of.get((a.id, w))
+            if rid is not None:
+                weeks_by_room.setdefault(rid, []).append(w)
+        for rid, wks in weeks_by_room.items():
+            assignments.append(Assignment(
+                activity_id=a.id,
+                room_id=rid,
+                start_timeslot=p.start,
+                active_weeks=sorted(wks),
+            ))
+    return assignments
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Decomposition
+# ─────────────────────────────────────────────────────────────────────────────
+
+def decompose(problem: Problem) -> List[Problem]:
+    """Split ``problem`` into sub-problems that share no constraint.
+
+    Two activities interact only through a professor, a leaf group (an
+    activity on an internal group occupies every leaf below it) or a room pool
+    both could use - and the per-day caps and objective terms are per
+    professor / group too.  The connected components of that graph can
+    therefore be solved as separate models with the same combined optimum.
+    Sub-problems keep every room and group (the group tree is needed for
+    ancestor look-ups) but only their own activities and professors.
+    Returned largest first; ``[problem]`` when it doesn't split."""
+    activities = problem.activities
+    parent = list(range(len(activities)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[Tuple[str, object], int] = {}
+
+    def link(i: int, key: Tuple[str, object]):
+        ri, rj = find(i), find(owner.setdefault(key, i))
+        if ri != rj:
+            parent[ri] = rj
+
+    group_index = GroupIndex(problem.groups)
+    counts = problem.group_student_counts
+    for i, a in enumerate(activities):
+        if a.professor_id:
+            link(i, ("professor", a.professor_id))
+        for leaf_id in group_index.leaves_of(a):
+            link(i, ("leaf", leaf_id))
+        required_capacity = sum(counts.get(gid, 0) for gid in a.group_ids)
+        for r in filter_rooms_for_activity(problem.rooms, a.required_room_features, required_capacity):
+            link(i, ("pool", pool_key(r)))
+
+    members: Dict[int, List[models.Activity]] = {}
+    for i, a in enumerate(activities):
+        members.setdefault(find(i), []).append(a)
+    if len(members) <= 1:
+        return [problem]
+
+    components = []
+    for acts in sorted(members.values(), key=len, reverse=True):
+        professor_ids = {a.professor_id for a in acts if a.professor_id}
+        components.append(problem.model_copy(update={
+            "activities": acts,
+            "professors": [p for p in problem.professors if p.id in professor_ids],
+        }))
+    return components
+
+
+def _solve_component(
+    problem: Problem,
+    options: SolveOptions,
+    previous: Optional[Dict[str, Assignment]] = None,
+    warm_start: Optional[Dict[str, Placement]] = None,
+) -> Tuple[Dict[str, Placement], SolveReport]:
+    """Process-pool entry point: solve one component, return its placements."""
+    report = SolveReport(
+        num_activities=len(problem.activities),
+        num_rooms=len(problem.rooms),
+        num_groups=len(problem.groups),
+        num_professors=len(problem.professors),
+    )
+    return _solve_placements(problem, options, report, previous, warm_start), report
+
+
+def _restrict(by_activity: Optional[Dict[str, object]], problem: Problem):
+    """The entries of ``by_activity`` for ``problem``'s activities."""
+    if by_activity is None:
+        return None
+    return {a.id: by_activity[a.id] for a in problem.activities if a.id in by_activity}
+
+
+def _component_executor(max_workers: int) -> Executor:
+    # A Celery prefork child is a daemon process, and daemons may not fork
+    # children of their own.  CP-SAT releases the GIL while searching, so a
+    # thread pool still runs the solves in parallel there - only the
+    # (pure-Python) model builds serialise.
+    if multiprocessing.current_process().daemon:
+        logger.info("Running inside a daemon process; solving components in threads.")
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def _solve_components(
+    components: List[Problem],
+    options: SolveOptions,
+    report: SolveReport,
+    previous: Optional[Dict[str, Assignment]] = None,
+    warm_start: Optional[Dict[str, Placement]] = None,
+) -> Dict[str, Placement]:
+    # Never more processes than search workers: a job leasing N solver
+    # threads (``solver_threads``) must not run more than N between them.
+    processes = min(options.decomposition_processes, len(components), max(1, options.num_search_workers))
+    component_options = options.model_copy(update={
+        "num_search_workers": max(1, options.num_search_workers // processes),
+        "decomposition_processes": 1,
+    })
+    logger.info(
+        f"Decomposed into {len(components)} independent components "
+        f"(sizes {[len(c.activities) for c in components]}); solving {processes} at a time "
+        f"with {component_options.num_search_workers} search worker(s) each."
+    )
+    sys.stdout.flush()
+    report.num_components = len(components)
+
+    placements: Dict[str, Placement] = {}
+    executor = _component_executor(processes)
+    try:
+        futures = [
+            executor.submit(
+                _solve_component, c, component_options,
+                _restrict(previous, c), _restrict(warm_start, c),
+            )
+            for c in components
+        ]
+        for future in futures:
+            component_placements, component_report = future.result()
+            placements.update(component_placements)
+            report.component_reports.append(component_report)
+    except BaseException:
+        # Don't wait for the remaining components: the job has failed anyway.
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    parts = report.component_reports
+    report.num_room_pools = len({pool_key(r) for r in components[0].rooms})
+    report.build_seconds = sum(r.build_seconds or 0.0 for r in parts)
+    report.num_variables = sum(r.num_variables or 0 for r in parts)
+    report.num_constraints = sum(r.num_constraints or 0 for r in parts)
+    report.phase1_seconds = max(r.phase1_seconds or 0.0 for r in parts)
+    report.phase2_seconds = max(r.phase2_seconds or 0.0 for r in parts)
+    report.phase1_skipped = all(r.phase1_skipped for r in parts)
+    for field in (
+        "preference_cost", "span_total", "active_days", "compactness_cost",
+        "num_fixed_activities", "num_hinted_activities",
+    ):
+        values = [getattr(r, field) for r in parts]
+        if all(v is not None for v in values):
+            setattr(report, field, sum(values))
+    return placements
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Warm start
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Wall-time cap on checking a fully hinted timetable: with every variable fixed
+# the search is propagation only, so anything slower means it isn't feasible.
+HINT_CHECK_SECONDS = 10.0
+
+
+def _add_warm_start(sm: ScheduleModel, warm_start: Dict[str, Placement]) -> int:
+    """Hint every activity whose cached placement is still valid for it;
+    return how many were hinted."""
+    hinted = 0
+    for a in sm.activities:
+        placement = warm_start.get(a.id)
+        if placement is None or not sm.accepts_placement(a, placement):
+            continue
+        for var, val in sm.placement_values(a, placement):
+            sm.model.AddHint(var, val)
+        hinted += 1
+    logger.info(f"Warm start: hinted {hinted} of {len(sm.activities)} activities from the hint cache.")
+    return hinted
+
+
+def _check_hinted(
+    sm: ScheduleModel,
+    options: SolveOptions,
+    max_seconds: float,
+) -> Tuple[Optional[cp_model.CpSolver], Optional[int]]:
+    """Solve with every hinted variable fixed to its hint.  Returns the solver
+    and status when the hinted timetable is feasible, ``(None, None)``
+    otherwise (phase 1 then searches as usual, still hinted)."""
+    solver = _make_solver(options, max_seconds, options.phase1_preset, stop_after_first=True)
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    status = solver.Solve(sm.model)
+    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        logger.info(f"Hinted timetable is feasible ({solver.WallTime():.1f}s); skipping phase-1 search.")
+        return solver, status
+    logger.info(f"Hinted timetable is not feasible ({solver.StatusName(status)}); running phase 1.")
+    return None, None
+
+
+def _complete_hints(sm: ScheduleModel, options: SolveOptions) -> Optional[float]:
+    """Replace the model's hints (decision variables only) with a hint on
+    *every* variable, derived by solving with the hinted ones fixed.
+
+    CP-SAT only adopts a hint as its first incumbent if it can complete it
+    quickly; with the objective's span / any-used auxiliaries left open it
+    routinely gives up and phase 2 starts from scratch, far above the hinted
+    timetable's cost.  Fixing the decision variables turns completion into
+    pure propagation.  Returns the hinted objective, or ``None`` (hints left
+    as they were) if the hints don't complete."""
+    solver = _make_solver(options, HINT_CHECK_SECONDS, options.phase1_preset, stop_after_first=True)
+    solver.parameters.fix_variables_to_their_hinted_value = True
+    solver.parameters.log_search_progress = False
+    status = solver.Solve(sm.model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    values = solver.ResponseProto().solution
+    sm.model.ClearHints()
+    for i, value in enumerate(values):
+        sm.model.AddHint(sm.model.GetIntVarFromProtoIndex(i), value)
+    return solver.ObjectiveValue()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Two-phase solve
+# ─────────────────────────────────────────────────────────────────────────────
+
+def solve(
+    problem: Problem,
+    options: Optional[SolveOptions] = None,
+    report: Optional[SolveReport] = None,
+    previous: Optional[List[Assignment]] = None,
+    warm_start: Optional[Dict[str, Placement]] = None,
+    on_incumbent: Optional[Callable[[Dict[str, Placement]], None]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Solution:
+    """Build the CP-SAT model for ``problem``, solve it, and assign rooms.
+
+    With ``options.decomposition_processes > 1`` the problem is first split
+    into independent components (``decompose``), solved in parallel
+    processes; their placements are merged before room colouring.
+
+    ``previous`` (the rows of the published timetable) makes the solve
+    incremental: activities the edit did not touch stay where they were and
+    only the affected neighbourhood is re-optimised
+    (``incremental_free_activities``).
+
+    ``warm_start`` (activity id -> placement, from ``hint_cache``) hints a
+    from-scratch solve; when it covers every activity and is still feasible,
+    phase 1 is skipped.  Ignored on incremental solves, which hint from
+    ``previous``.
+
+    ``on_incumbent`` receives intermediate placements (before room
+    colouring) while phase 2 runs: the phase-1 timetable, then improving
+    incumbents at most every ``options.publish_interval_seconds``.  It is
+    called on the solve thread and must not block.  Not called for
+    decomposed solves, whose components run in other processes.
+
+    ``on_progress`` receives a ``progress.SolverProgress`` as each phase
+    starts and, while phase 2 runs, the search state (best objective and
+    bound, time since the last improvement) at most every
+    ``options.progress_interval_seconds``.  Like ``on_incumbent`` it must not
+    block, is called from the solve and watchdog threads, and is not called
+    for decomposed solves.
+
+    Raises ``SolveError`` when no valid timetable exists or phase 1 finds none
+    within its budget.  Pass ``report`` to keep the statistics of a run that
+    ends up raising."""
+    if options is None:
+        options = SolveOptions.from_env()
+    if report is None:
+        report = SolveReport()
+    activities = problem.activities
+    report.num_activities = len(activities)
+    report.num_rooms = len(problem.rooms)
+    report.num_groups = len(problem.groups)
+    report.num_professors = len(problem.professors)
+    if not activities:
+        report.num_scheduled_activities = 0
+        return Solution(report=report)
+
+    previous_by_activity = merge_assignments(previous) if previous is not None else None
+
+    components = decompose(problem) if options.decomposition_processes > 1 else [problem]
+    if len(components) > 1:
+        placements = _solve_components(
+            components, options, report, previous_by_activity, warm_start,
+        )
+    else:
+        placements = _solve_placements(
+            problem, options, report, previous_by_activity, warm_start, on_incumbent, on_progress,
+        )
+
+    preferred_rooms = None
+    if previous_by_activity is not None:
+        preferred_rooms = {a_id: p.room_id for a_id, p in previous_by_activity.items()}
+    assignments = assign_rooms(problem, placements, preferred_rooms)
+    report.num_scheduled_activities = len(assignments)
+    if previous_by_activity is not None:
+        moved = set()
+        for row in assignments:
+            before = previous_by_activity.get(row.activity_id)
+            if (before is None or before.start_timeslot != row.start_timeslot
+                    or before.room_id != row.room_id):
+                moved.add(row.activity_id)
+        report.num_moved_activities = len(moved)
+        logger.info(f"Incremental re-solve moved {len(moved)} of {len(activities)} activities.")
+    return Solution(assignments=assignments, report=report)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Incremental re-solve
+# ─────────────────────────────────────────────────────────────────────────────
+
+def merge_assignments(rows: List[Assignment]) -> Dict[str, Assignment]:
+    """One ``Assignment`` per activity: ``assign_rooms`` splits an activity
+    across rooms week by week when no single room is free in all its weeks.
+    The merged row keeps the first room and every week."""
+    merged: Dict[str, Assignment] = {}
+    for row in rows:
+        seen = merged.get(row.activity_id)
+        if seen is None:
+            merged[row.activity_id] = row.model_copy(update={"active_weeks": list(row.active_weeks)})
+        else:
+            seen.active_weeks = sorted(set(seen.active_weeks) | set(row.active_weeks))
+    return merged
+
+
+def incremental_free_activities(
+    sm: ScheduleModel,
+    previous: Dict[str, Assignment],
+) -> Set[str]:
+    """The activities an incremental re-solve must be allowed to move.
+
+    An activity is *touched* when it has no previous placement (new), the old
+    one is no longer valid on its own (``ScheduleModel.accepts`` - its start,
+    room, professor unavailability or frequency changed) or it now collides
+    with another kept activity in a room, professor or leaf group.  Everything
+    sharing a professor or a leaf group with a touched activity is freed as
+    well, so the solver has room to fit the change in; the rest is fixed."""
+    touched: Set[str] = set()
+    occupied: Dict[Tuple[str, str, int, int], str] = {}
+    for a in sm.activities:
+        row = previous.get(a.id)
+        if row is None or not sm.accepts(a, row):
+            touched.add(a.id)
+            continue
+        entities = [("room", row.room_id)]
+        if a.professor_id:
+            entities.append(("professor", a.professor_id))
+        entities.extend(("leaf", leaf_id) for leaf_id in sm.leaves_by_activity.get(a.id, []))
+        for w in row.active_weeks:
+            for t in range(row.start_timeslot, row.start_timeslot + a.duration_slots):
+                for kind, entity_id in entities:
+                    other = occupied.setdefault((kind, entity_id, w, t), a.id)
+                    if other != a.id:
+                        touched.update((a.id, other))
+
+    free = set(touched)
+    for a_id in touched:
+        a = sm.activities_by_id[a_id]
+        if a.professor_id:
+            free.update(b.id for b in sm.activities_by_prof.get(a.professor_id, []))
+        for leaf_id in sm.leaves_by_activity.get(a_id, []):
+            free.update(b.id for b in sm.activities_by_leaf[leaf_id])
+    return free
+
+
+def _pin_unaffected(
+    sm: ScheduleModel,
+    previous: Dict[str, Assignment],
+    report: SolveReport,
+) -> Tuple[Set[str], Dict[str, int]]:
+    """Fix every activity ``incremental_free_activities`` leaves alone, hint
+    the rest with their previous placement, and return the freed ids with the
+    starts the stability objective anchors them to."""
+    free = incremental_free_activities(sm, previous)
+    anchors: Dict[str, int] = {}
+    for a in sm.activities:
+        row = previous.get(a.id)
+        if a.id not in free:
+            sm.fix(a, row)
+        elif row is not None and sm.accepts(a, row):
+            anchors[a.id] = row.start_timeslot
+            for var, val in sm.assignment_values(a, row):
+                sm.model.AddHint(var, val)
+    report.num_fixed_activities = len(sm.activities) - len(free)
+    logger.info(
+        f"Incremental re-solve: {len(free)} of {len(sm.activities)} activities free, "
+        f"{report.num_fixed_activities} fixed to the previous timetable."
+    )
+    return free, anchors
+
+
+def _solve_placements(
+    problem: Problem,
+    options: SolveOptions,
+    report: SolveReport,
+    previous: Optional[Dict[str, Assignment]] = None,
+    warm_start: Optional[Dict[str, Placement]] = None,
+    on_incumbent: Optional[Callable[[Dict[str, Placement]], None]] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Dict[str, Placement]:
+    """Two-phase solve of one model.
+
+    Phase 1 solves the *hard-constraint model only* (no objective) - a pure
+    feasibility search on the leanest model, which is what reliably yields a
+    first valid timetable fast.  Phase 2 then adds the soft objective
+    (preferred hours + gap compactness), warm-starts from the phase-1 solution
+    via hints, and optimises within the remaining budget.  If phase 2 finds no
+    solution before timing out, we fall back to the phase-1 schedule, so we
+    always return *a* valid timetable instead of failing.
+
+    With ``previous`` the unaffected activities are fixed first
+    (``_pin_unaffected``) and budgets are sized for the freed ones only; if
+    the pinned model turns out infeasible, the solve restarts from scratch.
+    With ``warm_start`` the hints go into phase 1; if they cover every
+    activity, a short check with every variable fixed to its hint runs first
+    and, when it succeeds, stands in for the phase-1 search."""
+    activities = problem.activities
+    build_t0 = time.time()
+    sm = ScheduleModel(problem)
+    model = sm.model
+    report.num_room_pools = len(sm.pool_rooms)
+    report.build_seconds = time.time() - build_t0
+    report.num_variables = len(model.Proto().variables)
+    report.num_constraints = len(model.Proto().constraints)
+    logger.info(
+        f"Model built in {report.build_seconds:.1f}s: {report.num_variables} variables, "
+        f"{report.num_constraints} constraints."
+    )
+
+    anchors: Dict[str, int] = {}
+    num_free = len(activities)
+    if previous is not None:
+        free, anchors = _pin_unaffected(sm, previous, report)
+        num_free = len(free)
+    elif warm_start:
+        report.num_hinted_activities = _add_warm_start(sm, warm_start)
+
+    requested = options
+    options = options.model_copy(update={
+        "phase1_preset": options.phase1_preset or presets.select_phase1_preset(num_free),
+        "phase2_preset": options.phase2_preset or presets.select_phase2_preset(
+            num_free, options.num_search_workers, options.optimizer,
+        ),
+    })
+    report.phase1_preset = options.phase1_preset
+    logger.info(
+        f"Solver presets: {options.phase1_preset} (phase 1), {options.phase2_preset} (phase 2) "
+        f"for {num_free} free activities, {options.num_search_workers} search worker(s)."
+    )
+
+    solver_seconds = options.solver_seconds
+    if solver_seconds is None:
+        solver_seconds = eta_helper.estimate_solver_seconds(num_free, options.eta_calibration)
+    total_budget = float(solver_seconds)
+    # Feasibility is usually quick; cap its slice so most of the budget is left
+    # for optimisation, but allow up to half if the instance is hard to satisfy.
+    feas_budget = min(600.0, total_budget * 0.5)
+    report.phase1_budget_seconds = feas_budget
+
+    # ── Phase 1: feasibility ─────────────────────────────────────────────────
+    logger.info(f"Phase 1 (feasibility): time budget {feas_budget:.0f}s...")
+    sys.stdout.flush()
+    _report_progress(on_progress, progress.SolverProgress(
+        phase=progress.ProgressPhase.FEASIBILITY, budget_seconds=feas_budget,
+    ))
+    t0 = time.time()
+    phase1_solver, res1 = None, None
+    if report.num_hinted_activities == len(activities):
+        phase1_solver, res1 = _check_hinted(sm, options, min(feas_budget, HINT_CHECK_SECONDS))
+        report.phase1_skipped = phase1_solver is not None
+    if phase1_solver is None:
+        phase1_solver = _make_solver(options, feas_budget, options.phase1_preset, stop_after_first=True)
+        res1 = phase1_solver.Solve(model)
+    feas_elapsed = time.time() - t0
+    report.phase1_seconds = feas_elapsed
+    report.phase1_status = phase1_solver.StatusName(res1)
+
+    if res1 not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        status_name = {
+            cp_model.UNKNOWN: "UNKNOWN (timeout or no solution found)",
+            cp_model.MODEL_INVALID: "MODEL_INVALID",
+            cp_model.INFEASIBLE: "INFEASIBLE (proven no solution exists)",
+        }.get(res1, f"status_code={res1}")
+        msg = (f"Unable to find a feasible schedule. CP-SAT status: {status_name} "
+               f"after {feas_elapsed:.1f}s (phase 1, feasibility).")
+        if previous is not None:
+            logger.warning(f"{msg} Retrying without the previous timetable fixed.")
+            report.num_fixed_activities = None
+            return _solve_placements(
+                problem, requested, report, on_incumbent=on_incumbent, on_progress=on_progress,
+            )
+        logger.error(msg)
+        raise SolveError(msg)
+
+    logger.info(f"Phase 1 found a feasible schedule in {feas_elapsed:.1f}s.")
+
+    # Solver we extract from - upgraded to phase 2 only if it returns a solution.
+    solver = phase1_solver
+
+    # ── Phase 2: optimise (warm-started from phase 1) ────────────────────────
+    if not options.feasibility_only:
+        incumbents = _IncumbentThrottle(sm, on_incumbent, options.publish_interval_seconds)
+        # Phase 2 can run for an hour; show the first valid timetable now.
+        incumbents.offer(phase1_solver, force=True)
+        # Capture the phase-1 assignment as hints before extending the model.
+        hints = sm.solution_hints(phase1_solver)
+
+        objective_t0 = time.time()
+        sm.build_objective(anchors)
+        model.ClearHints()
+        for var, val in hints:
+            model.AddHint(var, val)
+        hinted_objective = _complete_hints(sm, options)
+        if hinted_objective is not None:
+            logger.info(f"Phase 2 starts from the phase-1 timetable (objective {hinted_objective:.0f}).")
+        report.objective_build_seconds = time.time() - objective_t0
+        report.phase2_num_variables = len(model.Proto().variables)
+        report.phase2_num_constraints = len(model.Proto().constraints)
+
+        opt_budget = max(1.0, total_budget - feas_elapsed)
+        stagnation_seconds = options.stagnation_seconds
+        if stagnation_seconds is None:
+            stagnation_seconds = eta_helper.estimate_stagnation_seconds(num_free, options.eta_calibration)
+        report.phase2_budget_seconds = opt_budget
+        report.phase2_preset = options.phase2_preset
+        report.stagnation_seconds = stagnation_seconds
+        _report_progress(on_progress, progress.SolverProgress(
+            phase=progress.ProgressPhase.OPTIMISE,
+            budget_seconds=opt_budget,
+            best_objective=hinted_objective,
+            idle_seconds=0.0,
+            stagnation_seconds=stagnation_seconds,
+        ))
+        t0 = time.time()
+        if options.optimizer == "lns":
+            logger.info(
+                f"Phase 2 (LNS): time budget {opt_budget:.0f}s, "
+                f"stagnation limit {stagnation_seconds:.0f}s, "
+                f"{options.lns_step_seconds:.0f}s per neighbourhood..."
+            )
+            sys.stdout.flush()
+            lns = LargeNeighbourhoodSearch(sm, options, incumbents=incumbents, on_progress=on_progress)
+            phase2_solver, status = lns.run(phase1_solver, opt_budget, stagnation_seconds)
+            report.objective_curve = lns.history
+            report.lns_stats = lns.stats
+        else:
+            phase2_solver, status = _optimise_cpsat(
+                sm, options, opt_budget, stagnation_seconds, report, incumbents, on_progress,
+            )
+        opt_elapsed = time.time() - t0
+        report.phase2_seconds = opt_elapsed
+        report.phase2_status = status
+
+        if phase2_solver is not None:
+            solver = phase2_solver
+            pref_cost, span_total, active_days = sm.objective_breakdown(phase2_solver)
+            report.preference_cost = pref_cost
+            report.span_total = span_total
+            report.active_days = active_days
+            report.compactness_cost = span_total + active_days
+            logger.info(
+                f"Phase 2 ({opt_elapsed:.1f}s): preferred-hours penalty = {pref_cost}, "
+                f"span = {span_total}, active entity-days = {active_days}, "
+                f"compactness cost = {span_total + active_days} ({status})"
+            )
+        else:
+            logger.warning(
+                f"Phase 2 returned no solution after {opt_elapsed:.1f}s; "
+                f"falling back to the phase-1 feasible schedule."
+            )
+
+    return sm.placements(solver)
+
+
+def _optimise_cpsat(
+    sm: ScheduleModel,
+    options: SolveOptions,
+    budget: float,
+    stagnation_seconds: float,
+    report: SolveReport,
+    incumbents: Optional[_IncumbentThrottle] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[Optional[cp_model.CpSolver], str]:
+    """Optimise the whole model in one CP-SAT run, stopped by the stagnation
+    watchdog.  Returns the solver (``None`` without a solution) and a status."""
+    max_budget = budget * max(1.0, options.max_budget_factor)
+    phase2_solver = _make_solver(options, max_budget, options.phase2_preset)
+    stagnation_monitor = _StagnationMonitor(
+        phase2_solver, max_idle_seconds=stagnation_seconds, on_progress=on_progress,
+        progress_interval=options.progress_interval_seconds, budget=budget,
+        gap_limit=options.gap_limit, max_budget=max_budget,
+        min_improvement=options.extension_min_improvement,
+    )
+    stagnation_monitor.watch_bound()
+    stagnation_callback = _StagnationStopper(stagnation_monitor, incumbents)
+
+    logger.info(
+        f"Phase 2 (optimise): time budget {budget:.0f}s (up to {max_budget:.0f}s while improving), "
+        f"stagnation limit {stagnation_seconds:.0f}s, gap limit {options.gap_limit:.2%} (warm-started)..."
+    )
+    sys.stdout.flush()
+    stagnation_monitor.start()
+    try:
+        res2 = phase2_solver.Solve(sm.model, stagnation_callback)
+    finally:
+        stagnation_monitor.stop()
+    report.objective_curve = list(stagnation_monitor.history)
+    report.phase2_extension_seconds = stagnation_monitor.extension_seconds
+
+    if res2 not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None, phase2_solver.StatusName(res2)
+    report.phase2_gap = progress.relative_gap(phase2_solver.ObjectiveValue(), phase2_solver.BestObjectiveBound())
+    if res2 == cp_model.OPTIMAL:
+        status = "OPTIMAL"
+    elif stagnation_monitor.stop_reason in ("stagnation", "gap"):
+        status = f"feasible ({stagnation_monitor.stop_reason})"
+    else:
+        status = "feasible (time limit)"
+    return phase2_solver, status
+
+
+class LargeNeighbourhoodSearch:
+    """Phase-2 alternative to a single long CP-SAT run.
+
+    Keeps an incumbent (the decision variables' values, see
+    ``ScheduleModel.decision_vars``) and repeatedly frees a small, structured
+    neighbourhood of it - every activity of one professor, the activities of
+    one leaf group on one day, or the activities in one room pool - fixes
+    everything else to the incumbent, and re-solves that sub-model with a
+    short time limit, hinted with the incumbent.  Improvements are accepted
+    greedily.  Neighbourhood kinds are tried round-robin and their hit rates
+    logged, so it's visible which kind is doing the work.
+
+    Stops at the time budget, after ``stagnation_seconds`` without an
+    improvement, or at objective 0."""
+
+    NEIGHBOURHOODS = ("professor", "group_day", "room_pool")
+
+    def __init__(
+        self,
+        sm: ScheduleModel,
+        options: SolveOptions,
+        seed: int = 0,
+        incumbents: Optional[_IncumbentThrottle] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ):
+        self.sm = sm
+        self.options = options
+        self.incumbents = incumbents
+        self.on_progress = on_progress
+        self.rng = random.Random(seed)
+        self.history: List[Tuple[float, float, Optional[float]]] = []
+        self.stats: Dict[str, LnsNeighbourhoodStats] = {
+            kind: LnsNeighbourhoodStats() for kind in self.NEIGHBOURHOODS
+        }
+        self._professor_ids = sorted(sm.activities_by_prof)
+        self._leaf_ids = sorted(sm.activities_by_leaf)
+
+    def _values(self, solver: cp_model.CpSolver) -> Dict[int, int]:
+        return {
+            v.Index(): solver.Value(v)
+            for a in self.sm.activities
+            for v in self.sm.decision_vars(a)
+        }
+
+    def _pool_of(self, a, values: Dict[int, int]) -> PoolKey:
+        pks = self.sm.possible_pools[a.id]
+        for pk in pks:
+            pv_pool = self.sm.pool_indicator[(a.id, pk)]
+            if isinstance(pv_pool, int) or values[pv_pool.Index()] == 1:
+                return pk
+        return pks[0]
+
+    def _neighbourhood(self, kind: str, values: Dict[int, int]) -> Set[str]:
+        sm = self.sm
+        if kind == "professor":
+            if not self._professor_ids:
+                return set()
+            acts = sm.activities_by_prof[self.rng.choice(self._professor_ids)]
+        elif kind == "group_day":
+            if not self._leaf_ids:
+                return set()
+            leaf_id = self.rng.choice(self._leaf_ids)
+            day = self.rng.randrange(sm.days)
+            acts = [
+                a for a in sm.activities_by_leaf[leaf_id]
+                if values[sm.start_var[a.id].Index()] // sm.tpd == day
+            ]
+        else:
+            pools_in_use = sorted({self._pool_of(a, values) for a in sm.activities})
+            pk = self.rng.choice(pools_in_use)
+            acts = [a for a in sm.activities if self._pool_of(a, values) == pk]
+        if len(acts) > self.options.lns_max_free_activities:
+            acts = self.rng.sample(acts, self.options.lns_max_free_activities)
+        return {a.id for a in acts}
+
+    def _solve_neighbourhood(
+        self,
+        free: Set[str],
+        values: Dict[int, int],
+        seconds: float,
+    ) -> Tuple[Optional[cp_model.CpSolver], Optional[float]]:
+        """Re-solve with every activity outside ``free`` fixed to ``values``.
+        The clone shares variable indices with the full model, so the returned
+        solver's ``Value`` works on the full model's variables."""
+        sub = self.sm.model.Clone()
+        proto = sub.Proto()
+        for a in self.sm.activities:
+            if a.id in free:
+                continue
+            for v in self.sm.decision_vars(a):
+                domain = proto.variables[v.Index()].domain
+                domain.clear()
+                domain.extend([values[v.Index()], values[v.Index()]])
+        sub.ClearHints()
+        for index, value in values.items():
+            sub.AddHint(sub.GetIntVarFromProtoIndex(index), value)
+
+        solver = _make_solver(self.options, max(0.1, seconds), self.options.phase2_preset)
+        solver.parameters.log_search_progress = False
+        res = solver.Solve(sub)
+        if res not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None, None
+        return solver, solver.ObjectiveValue()
+
+    def _log_stats(self):
+        for kind, st in self.stats.items():
+            if st.attempts:
+                logger.info(
+                    f"LNS {kind}: {st.improvements}/{st.attempts} improving, "
+                    f"gain {st.objective_gain:.0f}, {st.seconds:.1f}s"
+                )
+
+    def run(
+        self,
+        incumbent_solver: cp_model.CpSolver,
+        budget: float,
+        stagnation_seconds: float,
+    ) -> Tuple[Optional[cp_model.CpSolver], str]:
+        t0 = time.time()
+        deadline = t0 + budget
+        values = self._values(incumbent_solver)
+
+        # The phase-1 solution has no objective value yet: score it by solving
+        # the empty neighbourhood (everything fixed, so it's just propagation).
+        best_solver, objective = self._solve_neighbourhood(set(), values, deadline - t0)
+        if best_solver is None:
+            return None, "UNKNOWN (could not evaluate the phase-1 schedule)"
+        self.history.append((time.time() - t0, objective, None))
+        logger.info(f"LNS: phase-1 schedule scores {objective:.0f}.")
+
+        status = "feasible (time limit)"
+        last_improvement = time.time()
+        next_report_at = 0.0
+        iteration = 0
+        while time.time() < deadline:
+            if self.on_progress is not None and time.time() >= next_report_at:
+                next_report_at = time.time() + self.options.progress_interval_seconds
+                _report_progress(self.on_progress, progress.SolverProgress(
+                    phase=progress.ProgressPhase.OPTIMISE,
+                    phase_elapsed_seconds=time.time() - t0,
+                    budget_seconds=budget,
+                    best_objective=objective,
+                    idle_seconds=time.time() - last_improvement,
+                    stagnation_seconds=stagnation_seconds,
+                ))
+            if objective <= 0:
+                status = "OPTIMAL"
+                break
+            if time.time() - last_improvement >= stagnation_seconds:
+                logger.info(
+                    f"Early exit: no LNS improvement for {stagnation_seconds:.0f}s; "
+                    f"current best = {objective:.0f}."
+                )
+                status = "feasible (stagnation)"
+                break
+            kind = self.NEIGHBOURHOODS[iteration % len(self.NEIGHBOURHOODS)]
+            iteration += 1
+            free = self._neighbourhood(kind, values)
+            if not free:
+                continue
+
+            step_t0 = time.time()
+            seconds = min(self.options.lns_step_seconds, deadline - step_t0)
+            solver, sub_objective = self._solve_neighbourhood(free, values, seconds)
+            st = self.stats[kind]
+            st.attempts += 1
+            st.seconds += time.time() - step_t0
+            if solver is not None and sub_objective < objective:
+                st.improvements += 1
+                st.objective_gain += objective - sub_objective
+                objective = sub_objective
+                best_solver = solver
+                values = self._values(solver)
+                last_improvement = time.time()
+                self.history.append((time.time() - t0, objective, None))
+                logger.info(
+                    f"LNS {kind} ({len(free)} activities freed): objective {objective:.0f}"
+                )
+                if self.incumbents is not None:
+                    self.incumbents.offer(solver)
+            if iteration % 60 == 0:
+                self._log_stats()
+            sys.stdout.flush()
+
+        self._log_stats()
+        return best_solver, status
@@ -0,0 +1,123 @@
+"""The node's CP-SAT search threads, shared by the generation jobs running on it.
+
+The worker runs ``SCHEDULE_CONCURRENT_JOBS`` jobs at once (Celery's thread
+pool: CP-SAT releases the GIL while it searches, so the jobs' solves run in
+parallel within one process).  Before it solves, each job leases search
+threads from ``SolverThreadBudget`` and passes the grant to CP-SAT as its
+``num_search_workers``; all jobs together never use more than
+``SCHEDULE_MAX_SOLVER_THREADS``.
+
+A grant is fixed for the whole solve - CP-SAT cannot shrink a running
+search - so a huge job must not take every thread: normal-priority jobs
+leave ``SCHEDULE_RESERVED_SOLVER_THREADS`` of them to high-priority ones
+(small institutions and incremental re-solves, see ``job_priority``).  A
+small job arriving during a multi-hour solve starts on the reserve at once
+instead of waiting for it.
+High-priority jobs also go first whenever jobs wait for threads.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Iterator, Optional
+
+from app.libs.logging.logger import get_logger
+
+
+CONCURRENT_JOBS = int(os.getenv("SCHEDULE_CONCURRENT_JOBS", "1"))
+MAX_SOLVER_THREADS = int(os.getenv("SCHEDULE_MAX_SOLVER_THREADS", os.getenv("NUM_SEARCH_WORKERS", "1")))
+RESERVED_SOLVER_THREADS = int(os.getenv(
+    "SCHEDULE_RESERVED_SOLVER_THREADS", "1" if CONCURRENT_JOBS > 1 else "0",
+))
+# Institutions with at most this many activities are high priority.
+SMALL_JOB_ACTIVITIES = int(os.getenv("SCHEDULE_SMALL_JOB_ACTIVITIES", "200"))
+
+logger = get_logger()
+
+
+class JobPriority(str, Enum):
+    HIGH = "high"
+    NORMAL = "normal"
+
+
+def job_priority(num_activities: int, incremental: bool) -> JobPriority:
+    """Incremental re-solves free only an edit's neighbourhood, and small
+    institutions finish in minutes: neither should wait behind a large
+    from-scratch generation."""
+    if incremental or num_activities <= SMALL_JOB_ACTIVITIES:
+        return JobPriority.HIGH
+    return JobPriority.NORMAL
+
+
+class SolverThreadBudget:
+    def __init__(self, total: int, reserved: int = 0):
+        self.total = max(1, total)
+        # Normal-priority jobs always leave at least one thread to the rest.
+        self.reserved = max(0, min(reserved, self.total - 1))
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._in_use_normal = 0
+        self._high_waiting = 0
+
+    def _available(self, priority: JobPriority) -> int:
+        free = self.total - self._in_use
+        if priority == JobPriority.HIGH:
+            return free
+        if self._high_waiting:
+            return 0
+        return min(free, self.total - self.reserved - self._in_use_normal)
+
+    @contextmanager
+    def lease(
+        self,
+        wanted: int,
+        priority: JobPriority,
+        on_wait: Optional[Callable[[], None]] = None,
+    ) -> Iterator[int]:
+        """Hold up to ``wanted`` threads (at least one) for the ``with`` block,
+        waiting until one is free.  ``on_wait`` is called first if none is."""
+        wanted = max(1, wanted)
+        waited_at = None
+        if on_wait is not None:
+            with self._cond:
+                must_wait = self._available(priority) < 1
+            if must_wait:
+                on_wait()
+        with self._cond:
+            if priority == JobPriority.HIGH:
+                self._high_waiting += 1
+            try:
+                while self._available(priority) < 1:
+                    if waited_at is None:
+                        waited_at = time.time()
+                        logger.info(
+                            f"Waiting for solver threads ({self._in_use}/{self.total} in use, "
+                            f"{priority.value} priority)."
+                        )
+                    self._cond.wait()
+            finally:
+                if priority == JobPriority.HIGH:
+                    self._high_waiting -= 1
+            granted = min(wanted, self._available(priority))
+            self._in_use += granted
+            if priority == JobPriority.NORMAL:
+                self._in_use_normal += granted
+            in_use = self._in_use
+        waited = f" after waiting {time.time() - waited_at:.0f}s" if waited_at is not None else ""
+        logger.info(
+            f"Leased {granted} of {wanted} requested solver threads ({priority.value} priority){waited}; "
+            f"{in_use}/{self.total} in use."
+        )
+        try:
+            yield granted
+        finally:
+            with self._cond:
+                self._in_use -= granted
+                if priority == JobPriority.NORMAL:
+                    self._in_use_normal -= granted
+                self._cond.notify_all()
+
+
+budget = SolverThreadBudget(MAX_SOLVER_THREADS, RESERVED_SOLVER_THREADS)
@@ -1,4 +1,4 @@
-from typing import Set, List
+from typing import Iterable, Set, List
 
 from app.libs.db import models
 
@@ -17,3 +17,35 @@ def allowed_starts(grid: models.TimeGridConfig, duration: int) -> List[int]:
         for s in range(grid.timeslots_per_day - duration + 1):
             starts.append(day_slot_index(d, s, grid.timeslots_per_day))
     return starts
+
+
+# Slot sets as int bitmasks: bit ``i`` set <=> slot ``i`` is in the set.  A
+# start ``s`` of a ``duration``-slot activity overlaps a set iff bit ``s`` of
+# the set "dilated" by the duration window is set, and the overlap size is
+# the popcount of the window at ``s``.
+
+def slot_mask(slots: Iterable[int]) -> int:
+    mask = 0
+    for slot in slots:
+        mask |= 1 << slot
+    return mask
+
+
+def window_mask(duration: int) -> int:
+    return (1 << duration) - 1
+
+
+def starts_clear_of(mask: int, starts: List[int], duration: int) -> List[int]:
+    """The ``starts`` whose ``duration``-slot window avoids every slot in ``mask``."""
+    if not mask:
+        return list(starts)
+    blocked = 0
+    for k in range(duration):
+        blocked |= mask >> k
+    return [s for s in starts if not (blocked >> s) & 1]
+
+
+def overlap_counts(mask: int, starts: List[int], duration: int) -> List[int]:
+    """For each of ``starts``, how many slots of its window are in ``mask``."""
+    window = window_mask(duration)
+    return [((mask >> s) & window).bit_count() for s in starts]
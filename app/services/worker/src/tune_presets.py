@@ -0,0 +1,166 @@
+"""Race the solver's CP-SAT parameter presets on benchmark instances.
+
+For every instance - a scale of the sample data, or a ``Problem`` snapshot
+saved from production by ``data_sources.save_snapshot`` - each candidate
+preset is run ``--repeats`` times per phase through ``benchmark.run_scenario``:
+
+  - phase 1: feasibility only, scored by the time to the first feasible
+    timetable;
+  - phase 2: a fixed budget with no early stop, scored by the final
+    objective.  Phase 1 uses the automatic preset, so only phase 2 differs.
+
+A failed run (``null`` in the results) scores worst.  The preset with the
+best median wins; the results list it next to the preset ``presets`` would
+select, so a mismatch shows where the selection rule (or
+``SCHEDULE_LARGE_INSTANCE_ACTIVITIES``) should move.
+
+Usage (from the repository root):
+    python -m app.services.worker.src.tune_presets --scales 1 2 \\
+        --snapshots prod_a.json --seconds 300 --repeats 2 \\
+        --output preset_tuning.json
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import statistics
+import sys
+from typing import Dict, List, Optional
+
+from ortools import __version__ as ortools_version
+
+from app.libs.logging.logger import get_logger
+from app.services.worker.src import benchmark, presets
+from app.services.worker.src.problem import Problem
+
+
+logger = get_logger()
+
+
+def _phase1_score(result: dict) -> Optional[float]:
+    report = result["report"]
+    if result["error"] or report["phase1_status"] not in ("OPTIMAL", "FEASIBLE"):
+        return None
+    return report["phase1_seconds"]
+
+
+def _phase2_score(result: dict) -> Optional[float]:
+    curve = result["report"]["objective_curve"]
+    if result["error"] or not curve:
+        return None
+    return curve[-1][1]
+
+
+def _race(instance: dict, phase: int, candidates: List[str], args: argparse.Namespace) -> Dict[str, dict]:
+    races = {}
+    for preset in candidates:
+        scores = []
+        for _ in range(args.repeats):
+            if phase == 1:
+                result = benchmark.run_scenario(
+                    instance["scale"], max_activities=args.max_activities, snapshot=instance["snapshot"],
+                    # Phase 1 gets half the solver budget.
+                    solver_seconds=2 * args.seconds, feasibility_only=True,
+                    num_search_workers=args.workers, phase1_preset=preset,
+                )
+                scores.append(_phase1_score(result))
+            else:
+                result = benchmark.run_scenario(
+                    instance["scale"], max_activities=args.max_activities, snapshot=instance["snapshot"],
+                    solver_seconds=args.seconds, stagnation_seconds=args.seconds,
+                    num_search_workers=args.workers, phase2_preset=preset,
+                )
+                scores.append(_phase2_score(result))
+        median = statistics.median(math.inf if score is None else score for score in scores)
+        races[preset] = {"scores": scores, "median": median if math.isfinite(median) else None}
+        logger.info(f"{instance['name']} phase {phase} {preset}: scores {scores}")
+        sys.stdout.flush()
+    return races
+
+
+def _winner(races: Dict[str, dict]) -> Optional[str]:
+    finished = {name: race["median"] for name, race in races.items() if race["median"] is not None}
+    return min(finished, key=finished.get) if finished else None
+
+
+def _instances(args: argparse.Namespace) -> List[dict]:
+    instances = []
+    for scale in args.scales:
+        problem = benchmark.load_seed_instance(scale, args.max_activities)
+        instances.append({"name": f"x{scale}", "scale": scale, "snapshot": None,
+                          "num_activities": len(problem.activities)})
+    for path in args.snapshots:
+        with open(path) as f:
+            problem = Problem.model_validate_json(f.read())
+        instances.append({"name": path, "scale": 1, "snapshot": path,
+                          "num_activities": len(problem.activities)})
+    return instances
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Race the schedule generator's CP-SAT parameter presets.",
+    )
+    parser.add_argument("--scales", type=int, nargs="*", default=[1],
+                        help="sample-data replication factors to race on (default: 1)")
+    parser.add_argument("--snapshots", nargs="*", default=[],
+                        help="Problem JSON snapshots to race on as well")
+    parser.add_argument("--max-activities", type=int, default=None,
+                        help="truncate each scaled instance to this many activities")
+    parser.add_argument("--seconds", type=float, default=120.0,
+                        help="time limit per run and phase (default: 120)")
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="runs per preset and phase; the median counts (default: 1)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="CP-SAT search workers (default: NUM_SEARCH_WORKERS or 1)")
+    parser.add_argument("--phase1-presets", nargs="+", choices=list(presets.PRESETS),
+                        default=presets.PHASE1_PRESETS, help="phase-1 candidates")
+    parser.add_argument("--phase2-presets", nargs="+", choices=list(presets.PRESETS),
+                        default=presets.PHASE2_PRESETS, help="phase-2 candidates")
+    parser.add_argument("--output", default="preset_tuning.json",
+                        help="where to write the JSON results")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = _parse_args(argv)
+    args.workers = args.workers or int(os.getenv("NUM_SEARCH_WORKERS", "1"))
+    results = {
+        "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "ortools_version": ortools_version,
+        "cpu_count": os.cpu_count(),
+        "num_search_workers": args.workers,
+        "seconds": args.seconds,
+        "repeats": args.repeats,
+        "presets": {name: p.model_dump() for name, p in presets.PRESETS.items()},
+        "instances": [],
+    }
+    for instance in _instances(args):
+        n = instance["num_activities"]
+        phase1 = _race(instance, 1, args.phase1_presets, args)
+        phase2 = _race(instance, 2, args.phase2_presets, args)
+        instance.update({
+            "phase1": phase1,
+            "phase1_winner": _winner(phase1),
+            "phase1_selected": presets.select_phase1_preset(n),
+            "phase2": phase2,
+            "phase2_winner": _winner(phase2),
+            "phase2_selected": presets.select_phase2_preset(n, args.workers, "cpsat"),
+        })
+        results["instances"].append(instance)
+        logger.info(
+            f"{instance['name']} ({n} activities): phase 1 won by {instance['phase1_winner']} "
+            f"(selected {instance['phase1_selected']}), phase 2 won by {instance['phase2_winner']} "
+            f"(selected {instance['phase2_selected']})."
+        )
+        # Rewrite after every instance so a long run still leaves usable data.
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    logger.info(f"Preset tuning results written to {args.output}")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()